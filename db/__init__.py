@@ -31,6 +31,32 @@ from db.schema_retrieval import (
     get_postgres_available_schemas,
 )
 
+from db.metadata_store import (
+    MetadataStore,
+    get_metadata_store,
+    metadata_reader,
+    close_metadata_store,
+)
+
+from db.query_stats import (
+    fingerprint_query,
+    get_top_query_fingerprints,
+    get_fingerprint_timeline,
+)
+
+from db.process_history import (
+    PROCESS_TIME_FORMAT,
+    record_process_started,
+    record_process_finished,
+    record_process_error,
+    get_process_page,
+    get_process_status_counts,
+)
+
+from db.pg_catalog_cache import invalidate_pg_catalog_cache
+
+from db.grid_edits import GridEditResult, apply_grid_edits
+
 from db.db_modifications import (
     add_connection_group,
     add_connection,
@@ -39,6 +65,8 @@ from db.db_modifications import (
     delete_connection,
     save_query_history,
     get_query_history,
+    get_query_history_page,
+    search_query_history,
     delete_history,
     delete_all_history,
     add_connection_type,
@@ -81,6 +109,8 @@ __all__ = [
     "delete_connection",
     "save_query_history",
     "get_query_history",
+    "get_query_history_page",
+    "search_query_history",
     "delete_history",
     "delete_all_history",
     "get_sqlite_schema",
@@ -104,4 +134,20 @@ __all__ = [
     "terminate_postgres_backend",
     "cancel_postgres_backend",
     "get_postgres_server_logs",
+    "MetadataStore",
+    "get_metadata_store",
+    "metadata_reader",
+    "close_metadata_store",
+    "fingerprint_query",
+    "get_top_query_fingerprints",
+    "get_fingerprint_timeline",
+    "PROCESS_TIME_FORMAT",
+    "record_process_started",
+    "record_process_finished",
+    "record_process_error",
+    "get_process_page",
+    "get_process_status_counts",
+    "invalidate_pg_catalog_cache",
+    "GridEditResult",
+    "apply_grid_edits",
 ]
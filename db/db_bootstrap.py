@@ -1,6 +1,7 @@
 import os
 import sqlite3 as sqlite
 from db.db_connections import DB_FILE
+from db.process_history import compact_process_history
 
 DEFAULT_CONNECTION_TYPES = (
     ("POSTGRES", "PostgreSQL Databases"),
@@ -53,6 +54,26 @@ SCHEMA_STATEMENTS = (
         rows_affected INTEGER,
         execution_time_sec REAL,
         timestamp TEXT,
+        fingerprint TEXT,
+        FOREIGN KEY (connection_id) REFERENCES usf_connections(id) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS usf_query_fingerprints (
+        connection_id INTEGER NOT NULL,
+        fingerprint TEXT NOT NULL,
+        normalized_query TEXT,
+        calls INTEGER NOT NULL DEFAULT 0,
+        errors INTEGER NOT NULL DEFAULT 0,
+        total_time_sec REAL NOT NULL DEFAULT 0,
+        max_time_sec REAL NOT NULL DEFAULT 0,
+        p50_time_sec REAL,
+        p95_time_sec REAL,
+        total_rows INTEGER NOT NULL DEFAULT 0,
+        duration_histogram TEXT,
+        first_seen TEXT,
+        last_seen TEXT,
+        PRIMARY KEY (connection_id, fingerprint),
         FOREIGN KEY (connection_id) REFERENCES usf_connections(id) ON DELETE CASCADE
     )
     """,
@@ -70,13 +91,110 @@ SCHEMA_STATEMENTS = (
         details TEXT
     )
     """,
+    """
+    CREATE TABLE IF NOT EXISTS usf_pg_type_cache (
+        conn_key TEXT NOT NULL,
+        type_oid INTEGER NOT NULL,
+        type_name TEXT,
+        PRIMARY KEY (conn_key, type_oid)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS usf_pg_column_cache (
+        conn_key TEXT NOT NULL,
+        table_oid INTEGER NOT NULL,
+        attnum INTEGER NOT NULL,
+        catalog_version TEXT NOT NULL,
+        data_type TEXT,
+        not_null INTEGER,
+        is_pk INTEGER,
+        is_fk INTEGER,
+        PRIMARY KEY (conn_key, table_oid, attnum)
+    )
+    """,
     "CREATE INDEX IF NOT EXISTS idx_usf_connection_groups_type ON usf_connection_groups(connection_type_id)",
     "CREATE INDEX IF NOT EXISTS idx_usf_connections_group ON usf_connections(connection_group_id)",
     "CREATE INDEX IF NOT EXISTS idx_usf_query_history_connection ON usf_query_history(connection_id)",
+    "CREATE INDEX IF NOT EXISTS idx_usf_query_history_connection_ts ON usf_query_history(connection_id, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_usf_query_fingerprints_total ON usf_query_fingerprints(connection_id, total_time_sec)",
     "CREATE INDEX IF NOT EXISTS idx_usf_processes_server ON usf_processes(server)",
     "CREATE INDEX IF NOT EXISTS idx_usf_processes_status ON usf_processes(status)",
 )
 
+# Columns added after the first release: (table, column, type)
+COLUMN_MIGRATIONS = (
+    ("usf_query_history", "fingerprint", "TEXT"),
+    ("usf_processes", "started_at", "REAL"),
+)
+
+# Statements that depend on migrated columns
+POST_MIGRATION_STATEMENTS = (
+    "CREATE INDEX IF NOT EXISTS idx_usf_query_history_fingerprint ON usf_query_history(connection_id, fingerprint, timestamp)",
+)
+
+
+def _apply_column_migrations(conn):
+    """Add columns missing from databases created by older versions."""
+    for table, column, column_type in COLUMN_MIGRATIONS:
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if column not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+
+
+# External-content FTS5 index over query text, kept in sync by triggers.
+HISTORY_FTS_TABLE = "usf_query_history_fts"
+
+HISTORY_FTS_STATEMENTS = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {HISTORY_FTS_TABLE} USING fts5(
+        query_text,
+        content='usf_query_history',
+        content_rowid='id'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_usf_query_history_fts_insert
+    AFTER INSERT ON usf_query_history BEGIN
+        INSERT INTO {HISTORY_FTS_TABLE}(rowid, query_text) VALUES (new.id, new.query_text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_usf_query_history_fts_delete
+    AFTER DELETE ON usf_query_history BEGIN
+        INSERT INTO {HISTORY_FTS_TABLE}({HISTORY_FTS_TABLE}, rowid, query_text)
+        VALUES ('delete', old.id, old.query_text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_usf_query_history_fts_update
+    AFTER UPDATE OF query_text ON usf_query_history BEGIN
+        INSERT INTO {HISTORY_FTS_TABLE}({HISTORY_FTS_TABLE}, rowid, query_text)
+        VALUES ('delete', old.id, old.query_text);
+        INSERT INTO {HISTORY_FTS_TABLE}(rowid, query_text) VALUES (new.id, new.query_text);
+    END
+    """,
+)
+
+
+def _ensure_history_fts(conn):
+    """Create the history FTS index, back-filling it on first creation.
+
+    Builds without FTS5 skip the index; history search then falls back to LIKE.
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (HISTORY_FTS_TABLE,)
+    ).fetchone()
+    try:
+        for statement in HISTORY_FTS_STATEMENTS:
+            conn.execute(statement)
+    except Exception as e:
+        # hierarchy.db may be opened through sqlcipher3, whose errors are not sqlite3 types
+        print(f"Query history full-text index unavailable: {e}")
+        return
+    if not exists:
+        conn.execute(f"INSERT INTO {HISTORY_FTS_TABLE}({HISTORY_FTS_TABLE}) VALUES ('rebuild')")
+
+
 def ensure_hierarchy_db():
     """Bootstraps the database schema and default tables if they do not exist."""
     db_dir = os.path.dirname(DB_FILE)
@@ -87,6 +205,11 @@ def ensure_hierarchy_db():
         conn.execute("PRAGMA foreign_keys = ON")
         for statement in SCHEMA_STATEMENTS:
             conn.execute(statement)
+        _apply_column_migrations(conn)
+        for statement in POST_MIGRATION_STATEMENTS:
+            conn.execute(statement)
+        _ensure_history_fts(conn)
+        compact_process_history(conn)
 
         conn.executemany(
             "INSERT OR IGNORE INTO usf_connection_types (code, name) VALUES (?, ?)",
@@ -1,7 +1,10 @@
 #db_modifications.py
 import sqlite3 as sqlite
 import datetime
+import re
 from db.db_connections import DB_FILE, create_postgres_connection
+from db.metadata_store import get_metadata_store
+from db.query_stats import record_query_execution
 
 def terminate_postgres_backend(conn_data, pid):
     """Terminates a PostgreSQL backend session by PID."""
@@ -182,39 +185,94 @@ def delete_connection(connection_id):
         c.execute("DELETE FROM usf_connections WHERE id = ?", (connection_id,))
         c.execute(
             "DELETE FROM usf_query_history WHERE connection_id = ?", (connection_id,))
+        c.execute(
+            "DELETE FROM usf_query_fingerprints WHERE connection_id = ?", (connection_id,))
         conn.commit()
 
 
 def save_query_history(conn_id, query, status, rows, duration):
-    with sqlite.connect(DB_FILE) as conn:
-        c = conn.cursor()
-        c.execute("""
-            INSERT INTO usf_query_history 
-            (connection_id, query_text, status, rows_affected, execution_time_sec, timestamp) 
-            VALUES (?, ?, ?, ?, ?, ?)""",
-                  (conn_id, query, status, rows, duration, datetime.datetime.now().isoformat()))
-        conn.commit()
+    """Queue a history row; the metadata writer thread fingerprints it, stores
+    it and updates the per-fingerprint aggregates in a batched transaction."""
+    get_metadata_store().call(
+        record_query_execution,
+        conn_id, query, status, rows, duration, datetime.datetime.now().isoformat())
 
 def get_query_history(conn_id):
-    with sqlite.connect(DB_FILE) as conn:
-        c = conn.cursor()
-        c.execute("""
-            SELECT id, query_text, timestamp, status, rows_affected, execution_time_sec 
-            FROM usf_query_history WHERE connection_id = ? ORDER BY timestamp DESC""",
-                  (conn_id,))
-        return c.fetchall()
+    return get_metadata_store().fetchall("""
+        SELECT id, query_text, timestamp, status, rows_affected, execution_time_sec 
+        FROM usf_query_history WHERE connection_id = ? ORDER BY timestamp DESC""",
+        (conn_id,))
+
+_HISTORY_COLUMNS = "h.id, h.query_text, h.timestamp, h.status, h.rows_affected, h.execution_time_sec"
+_history_fts_available = None
+
+
+def history_fts_available():
+    """True when the usf_query_history_fts index exists (FTS5 compiled in)."""
+    global _history_fts_available
+    if _history_fts_available is None:
+        rows = get_metadata_store().fetchall(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'usf_query_history_fts'")
+        _history_fts_available = bool(rows)
+    return _history_fts_available
+
+
+def _build_fts_match(search_text):
+    """Turn free text into an FTS5 query: every word must match as a prefix."""
+    terms = re.findall(r"\w+", search_text or "")
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def get_query_history_page(conn_id, limit=200, before=None):
+    """Return one page of history, newest first.
+
+    ``before`` is the ``(timestamp, id)`` of the last row already loaded, so
+    each page is a keyset seek on idx_usf_query_history_connection_ts rather
+    than an OFFSET scan.
+    """
+    if before is None:
+        return get_metadata_store().fetchall(f"""
+            SELECT {_HISTORY_COLUMNS} FROM usf_query_history h
+            WHERE h.connection_id = ?
+            ORDER BY h.timestamp DESC, h.id DESC LIMIT ?""",
+            (conn_id, limit))
+    before_ts, before_id = before
+    return get_metadata_store().fetchall(f"""
+        SELECT {_HISTORY_COLUMNS} FROM usf_query_history h
+        WHERE h.connection_id = ?
+          AND (h.timestamp < ? OR (h.timestamp = ? AND h.id < ?))
+        ORDER BY h.timestamp DESC, h.id DESC LIMIT ?""",
+        (conn_id, before_ts, before_ts, before_id, limit))
+
+
+def search_query_history(conn_id, search_text, limit=200, offset=0):
+    """Return history rows matching ``search_text``, best matches first."""
+    match = _build_fts_match(search_text)
+    if not match:
+        return []
+    if history_fts_available():
+        return get_metadata_store().fetchall(f"""
+            SELECT {_HISTORY_COLUMNS}
+            FROM usf_query_history_fts f
+            JOIN usf_query_history h ON h.id = f.rowid
+            WHERE usf_query_history_fts MATCH ? AND h.connection_id = ?
+            ORDER BY bm25(usf_query_history_fts), h.timestamp DESC
+            LIMIT ? OFFSET ?""",
+            (match, conn_id, limit, offset))
+    return get_metadata_store().fetchall(f"""
+        SELECT {_HISTORY_COLUMNS} FROM usf_query_history h
+        WHERE h.connection_id = ? AND h.query_text LIKE ?
+        ORDER BY h.timestamp DESC LIMIT ? OFFSET ?""",
+        (conn_id, f"%{search_text.strip()}%", limit, offset))
+
 
 def delete_history(history_id):
-    with sqlite.connect(DB_FILE) as conn:
-        c = conn.cursor()
-        c.execute("DELETE FROM usf_query_history WHERE id = ?", (history_id,))
-        conn.commit()
+    get_metadata_store().execute("DELETE FROM usf_query_history WHERE id = ?", (history_id,))
 
 def delete_all_history(conn_id):
-    with sqlite.connect(DB_FILE) as conn:
-        c = conn.cursor()
-        c.execute("DELETE FROM usf_query_history WHERE connection_id = ?", (conn_id,))
-        conn.commit()
+    store = get_metadata_store()
+    store.execute("DELETE FROM usf_query_history WHERE connection_id = ?", (conn_id,))
+    store.execute("DELETE FROM usf_query_fingerprints WHERE connection_id = ?", (conn_id,))
 #{moitre}
 
 def add_connection_type(name, code):
@@ -1,12 +1,13 @@
 #db_retrival.py
 import sqlite3 as sqlite
-from db.db_connections import DB_FILE, get_pooled_postgres_connection, return_pooled_postgres_connection
+from db.db_connections import get_pooled_postgres_connection, return_pooled_postgres_connection
+from db.metadata_store import metadata_reader
 from db.type_utils import normalize_type  # noqa: F401 – re-exported for backward compatibility
 from workers.signals import tracker
 
 def get_all_connections_from_db():
     """Returns a list of dicts with full hierarchical connection info from usf_connections table."""
-    with sqlite.connect(DB_FILE) as conn:
+    with metadata_reader() as conn:
         c = conn.cursor()
         c.execute("""
             SELECT 
@@ -43,7 +44,7 @@ def get_all_connections_from_db():
 
 def get_hierarchy_data():
     """Returns all usf_connection_types, usf_connection_groups, and usf_connections for the main tree view."""
-    with sqlite.connect(DB_FILE) as conn:
+    with metadata_reader() as conn:
         c = conn.cursor()
         c.execute("SELECT id, code, name FROM usf_connection_types")
         usf_connection_types = c.fetchall()
@@ -452,7 +453,7 @@ def get_postgres_server_logs(conn_data):
 
 def get_connection_types():
     """Returns all available connection types."""
-    with sqlite.connect(DB_FILE) as conn:
+    with metadata_reader() as conn:
         c = conn.cursor()
         c.execute("SELECT id, code, name FROM usf_connection_types ORDER BY name")
         rows = c.fetchall()
@@ -460,7 +461,7 @@ def get_connection_types():
 
 def get_groups_by_type(type_id):
     """Returns all connection groups for a specific connection type."""
-    with sqlite.connect(DB_FILE) as conn:
+    with metadata_reader() as conn:
         c = conn.cursor()
         c.execute("SELECT id, name FROM usf_connection_groups WHERE connection_type_id = ? ORDER BY name", (type_id,))
         rows = c.fetchall()
@@ -468,7 +469,7 @@ def get_groups_by_type(type_id):
 
 #kallany
 def get_data_sources_by_connection(connection_id):
-    with sqlite.connect(DB_FILE) as conn:
+    with metadata_reader() as conn:
         conn.row_factory = sqlite.Row
         c = conn.cursor()
 
@@ -0,0 +1,262 @@
+# grid_edits.py
+"""
+Batched, transactional writer for result-grid edits.
+
+The grid collects pending edits cell by cell. ``apply_grid_edits`` groups
+them per row and writes inserts, updates and deletes in one transaction:
+
+- PostgreSQL runs on a pooled connection. Rows are shipped as one JSON
+  array per statement and typed by the server through
+  ``json_populate_record(NULL::<table>, ...)``, so an update touching
+  10k rows is a single ``UPDATE ... FROM`` round trip and a delete is a
+  single ``DELETE ... WHERE pk = ANY(...)``. ``RETURNING`` reports which
+  primary keys actually matched.
+- SQLite and ServiceNow use ``executemany`` for updates and chunked
+  ``IN (...)`` lists for deletes.
+
+Updated rows are grouped by the set of columns they change, one statement
+per group. Any statement error rolls the whole batch back.
+"""
+
+import json
+import logging
+
+from db.db_connections import (
+    create_servicenow_connection,
+    create_sqlite_connection,
+    get_pooled_postgres_connection,
+    return_pooled_postgres_connection,
+)
+from db.query_context import quote_identifier
+
+logger = logging.getLogger(__name__)
+
+# Stay under SQLite's default host-parameter limit (999)
+SQLITE_DELETE_CHUNK = 500
+
+
+class GridEditResult:
+    """
+    Outcome of one ``apply_grid_edits`` batch.
+
+    Attributes:
+        inserted: Number of rows inserted
+        updated_keys: Primary-key values of rows that were updated, or
+            ``None`` when the driver can only report a total (see ``updated``)
+        updated: Number of rows updated
+        deleted_keys: Primary-key values of rows that were deleted, or
+            ``None`` when the driver can only report a total
+        deleted: Number of rows deleted
+    """
+
+    def __init__(self):
+        self.inserted = 0
+        self.updated_keys = None
+        self.updated = 0
+        self.deleted_keys = None
+        self.deleted = 0
+
+
+def group_row_updates(row_updates):
+    """
+    Group ``{pk_val: {column: value}}`` by the columns each row changes.
+
+    Returns:
+        dict: ``{(column, ...): [(pk_val, {column: value}), ...]}`` with
+        column tuples sorted so equal sets share one statement
+    """
+    groups = {}
+    for pk_val, changes in row_updates.items():
+        if not changes:
+            continue
+        groups.setdefault(tuple(sorted(changes)), []).append((pk_val, changes))
+    return groups
+
+
+def _json_rows(rows):
+    # Values are editor text or driver-typed keys; the server parses them
+    # back into column types, so str() is the right fallback for dates, UUIDs...
+    return json.dumps(rows, default=str)
+
+
+def _open_connection(conn_data, db_code):
+    if db_code == "POSTGRES":
+        return get_pooled_postgres_connection(conn_data, application_name="Grid editor", use_pool=True)
+    if "SQLITE" in db_code:
+        return create_sqlite_connection(conn_data.get("db_path"))
+    if "SERVICENOW" in db_code:
+        return create_servicenow_connection(conn_data)
+    raise ValueError(f"Unsupported DB type for grid edits: {db_code}")
+
+
+def _release_connection(conn_data, db_code, conn):
+    if db_code == "POSTGRES":
+        return_pooled_postgres_connection(conn_data, conn=conn)
+    else:
+        conn.close()
+
+
+# --- PostgreSQL ---
+
+def _postgres_insert(cursor, table, columns, rows):
+    from psycopg2.extras import execute_values
+
+    cols_sql = ", ".join(quote_identifier(c) for c in columns)
+    sql = f"INSERT INTO {table} ({cols_sql}) VALUES %s"
+    execute_values(cursor, sql, rows, page_size=max(len(rows), 1))
+    return len(rows)
+
+
+def _postgres_update(cursor, table, pk_col, row_updates):
+    pk = quote_identifier(pk_col)
+    updated_keys = []
+    for columns, rows in group_row_updates(row_updates).items():
+        # New values and the row key travel separately so edits to the key
+        # column itself still find their row.
+        set_sql = ", ".join(f"{quote_identifier(c)} = (r.v).{quote_identifier(c)}" for c in columns)
+        payload = [{"k": {pk_col: pk_val}, "v": changes} for pk_val, changes in rows]
+        cursor.execute(
+            f"UPDATE {table} AS t SET {set_sql} "
+            f"FROM (SELECT json_populate_record(NULL::{table}, e->'v') AS v, "
+            f"json_populate_record(NULL::{table}, e->'k') AS k "
+            f"FROM json_array_elements(%s::json) AS e) AS r "
+            f"WHERE t.{pk} = (r.k).{pk} RETURNING (r.k).{pk}",
+            (_json_rows(payload),),
+        )
+        updated_keys.extend(row[0] for row in cursor.fetchall())
+    return updated_keys
+
+
+def _postgres_delete(cursor, table, pk_col, pk_values):
+    pk = quote_identifier(pk_col)
+    payload = [{pk_col: pk_val} for pk_val in pk_values]
+    cursor.execute(
+        f"DELETE FROM {table} WHERE {pk} = ANY(ARRAY("
+        f"SELECT k.{pk} FROM json_populate_recordset(NULL::{table}, %s::json) AS k"
+        f")) RETURNING {pk}",
+        (_json_rows(payload),),
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+# --- SQLite / ServiceNow ---
+
+def _dbapi_insert(cursor, table, columns, rows, quote):
+    cols_sql = ", ".join(quote(c) for c in columns)
+    placeholders = ", ".join(["?"] * len(columns))
+    cursor.executemany(f"INSERT INTO {table} ({cols_sql}) VALUES ({placeholders})", rows)
+    return len(rows)
+
+
+def _dbapi_update(cursor, table, pk_col, row_updates, quote):
+    updated = 0
+    for columns, rows in group_row_updates(row_updates).items():
+        set_sql = ", ".join(f"{quote(c)} = ?" for c in columns)
+        params = [[changes[c] for c in columns] + [pk_val] for pk_val, changes in rows]
+        cursor.executemany(f"UPDATE {table} SET {set_sql} WHERE {quote(pk_col)} = ?", params)
+        if getattr(cursor, "rowcount", -1) >= 0:
+            updated += cursor.rowcount
+        else:
+            updated += len(rows)
+    return updated
+
+
+def _dbapi_delete(cursor, table, pk_col, pk_values, quote):
+    deleted = 0
+    pk_values = list(pk_values)
+    for start in range(0, len(pk_values), SQLITE_DELETE_CHUNK):
+        chunk = pk_values[start:start + SQLITE_DELETE_CHUNK]
+        placeholders = ", ".join(["?"] * len(chunk))
+        cursor.execute(f"DELETE FROM {table} WHERE {quote(pk_col)} IN ({placeholders})", chunk)
+        if getattr(cursor, "rowcount", -1) >= 0:
+            deleted += cursor.rowcount
+        else:
+            deleted += len(chunk)
+    return deleted
+
+
+def _servicenow_quote(name):
+    return str(name)
+
+
+def apply_grid_edits(conn_data, qualified_table_name, pk_col=None, row_updates=None,
+                     deleted_keys=None, insert_columns=None, insert_rows=None):
+    """
+    Write a batch of grid edits in one transaction.
+
+    Args:
+        conn_data: Connection data dict of the worksheet
+        qualified_table_name: Already-quoted target table
+        pk_col: Primary-key column used to address updated/deleted rows
+        row_updates: ``{pk_val: {column: value}}`` pending cell edits per row
+        deleted_keys: Primary-key values of rows to delete
+        insert_columns: Column names for ``insert_rows``
+        insert_rows: Value lists (one per new row) to insert
+
+    Returns:
+        GridEditResult
+
+    Raises:
+        ConnectionError: If no connection could be opened
+        Exception: Any driver error; the batch is rolled back first
+    """
+    row_updates = row_updates or {}
+    deleted_keys = list(deleted_keys or [])
+    insert_rows = list(insert_rows or [])
+    result = GridEditResult()
+    if not (row_updates or deleted_keys or insert_rows):
+        return result
+    if (row_updates or deleted_keys) and not pk_col:
+        raise ValueError("A primary key is required to update or delete rows.")
+
+    db_code = (conn_data.get("code") or conn_data.get("db_type", "")).upper()
+    conn = _open_connection(conn_data, db_code)
+    if not conn:
+        raise ConnectionError("Could not create database connection.")
+
+    previous_session = None
+    if db_code == "POSTGRES":
+        # Pooled connections keep whatever session other callers set (the
+        # dashboard and metadata readers leave them read-only/autocommit)
+        previous_session = (conn.readonly, conn.autocommit)
+
+    try:
+        if previous_session is not None:
+            conn.set_session(readonly=False, autocommit=False)
+        cursor = conn.cursor()
+        if db_code == "POSTGRES":
+            if insert_rows:
+                result.inserted = _postgres_insert(cursor, qualified_table_name, insert_columns, insert_rows)
+            if row_updates:
+                result.updated_keys = _postgres_update(cursor, qualified_table_name, pk_col, row_updates)
+                result.updated = len(result.updated_keys)
+            if deleted_keys:
+                result.deleted_keys = _postgres_delete(cursor, qualified_table_name, pk_col, deleted_keys)
+                result.deleted = len(result.deleted_keys)
+        else:
+            quote = _servicenow_quote if "SERVICENOW" in db_code else quote_identifier
+            if "SQLITE" in db_code:
+                # create_sqlite_connection opens in autocommit mode; without an
+                # explicit BEGIN every statement commits on its own
+                cursor.execute("BEGIN")
+            if insert_rows:
+                result.inserted = _dbapi_insert(cursor, qualified_table_name, insert_columns, insert_rows, quote)
+            if row_updates:
+                result.updated = _dbapi_update(cursor, qualified_table_name, pk_col, row_updates, quote)
+            if deleted_keys:
+                result.deleted = _dbapi_delete(cursor, qualified_table_name, pk_col, deleted_keys, quote)
+        conn.commit()
+        return result
+    except Exception:
+        try:
+            conn.rollback()
+        except Exception as rollback_error:
+            logger.debug(f"Grid edit rollback failed: {rollback_error}")
+        raise
+    finally:
+        if previous_session is not None:
+            try:
+                conn.set_session(readonly=previous_session[0], autocommit=previous_session[1])
+            except Exception as session_error:
+                logger.debug(f"Grid edit session restore failed: {session_error}")
+        _release_connection(conn_data, db_code, conn)
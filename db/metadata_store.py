@@ -0,0 +1,319 @@
+# metadata_store.py
+"""
+Metadata Store Service for hierarchy.db
+
+Owns the long-lived SQLite connections to the app's metadata database so that
+per-query bookkeeping (query history, process rows) no longer pays for a
+fresh connect on every call. With transparent encryption enabled every
+connect re-reads the file header and runs SQLCipher key derivation plus a
+validation query, which is expensive by design.
+
+- One writer thread holds a single WAL-mode connection and applies queued
+  writes in batched transactions, off the GUI thread.
+- A small pool of reader connections serves SELECTs; readers wait for
+  writes queued before them so callers always read their own writes.
+"""
+
+import logging
+import queue
+import sqlite3 as sqlite
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterable, Optional, Sequence
+
+from db.db_connections import DB_FILE
+
+logger = logging.getLogger(__name__)
+
+
+class _FlushMarker:
+    """Queue entry that signals once everything queued before it is committed."""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class MetadataStore:
+    """
+    Queue-fed writer thread plus a reader pool for the metadata database.
+
+    Features:
+    - Single persistent encrypted writer connection (WAL journal)
+    - Batched write transactions (up to ``max_batch_size`` ops per commit)
+    - Fire-and-forget writes: submitting costs a queue put
+    - Bounded pool of reusable reader connections
+    """
+
+    def __init__(self,
+                 db_file: str = DB_FILE,
+                 max_readers: int = 3,
+                 max_batch_size: int = 500,
+                 busy_timeout_ms: int = 5000):
+        """
+        Initialize the store. Connections are opened lazily.
+
+        Args:
+            db_file: Path to the metadata database (default: hierarchy.db)
+            max_readers: Maximum number of pooled reader connections (default: 3)
+            max_batch_size: Maximum writes applied per transaction (default: 500)
+            busy_timeout_ms: SQLite busy timeout for all connections (default: 5000)
+        """
+        self.db_file = db_file
+        self.max_readers = max_readers
+        self.max_batch_size = max_batch_size
+        self.busy_timeout_ms = busy_timeout_ms
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._pending = 0
+        self._pending_cond = threading.Condition()
+
+        self._readers: list = []
+        self._readers_created = 0
+        self._readers_cond = threading.Condition()
+
+        self._writer_thread: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._closed = False
+
+    # --- Connections ---
+
+    def _connect(self):
+        """Open a connection through sqlite3.connect so encryption patches apply."""
+        conn = sqlite.connect(self.db_file, isolation_level=None, check_same_thread=False)
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        return conn
+
+    def _ensure_writer(self):
+        with self._writer_lock:
+            if self._writer_thread is None:
+                self._writer_thread = threading.Thread(
+                    target=self._writer_loop, name="MetadataStoreWriter", daemon=True
+                )
+                self._writer_thread.start()
+
+    # --- Writes ---
+
+    def execute(self, sql: str, params: Sequence = ()):
+        """Queue a single write statement. Returns immediately."""
+        self._submit(("execute", sql, tuple(params)))
+
+    def executemany(self, sql: str, seq_of_params: Iterable[Sequence]):
+        """Queue a statement executed once per parameter tuple. Returns immediately."""
+        self._submit(("executemany", sql, [tuple(p) for p in seq_of_params]))
+
+    def call(self, fn: Callable, *args):
+        """
+        Queue ``fn(conn, *args)`` to run on the writer thread inside the batch
+        transaction. Use for read-modify-write bookkeeping; ``fn`` must not
+        commit or roll back. Returns immediately.
+        """
+        self._submit(("call", fn, args))
+
+    def _submit(self, op):
+        if self._closed:
+            raise RuntimeError("Metadata store is closed")
+        self._ensure_writer()
+        with self._pending_cond:
+            self._pending += 1
+        self._queue.put(op)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every write queued so far has been committed.
+
+        Returns:
+            True if the queue drained within ``timeout`` seconds
+        """
+        with self._pending_cond:
+            if self._pending == 0:
+                return True
+        marker = _FlushMarker()
+        self._queue.put(marker)
+        return marker.done.wait(timeout)
+
+    def _writer_loop(self):
+        conn = None
+        try:
+            conn = self._connect()
+            mode = conn.execute("PRAGMA journal_mode = WAL").fetchone()
+            conn.execute("PRAGMA synchronous = NORMAL")
+            logger.debug(f"Metadata writer connected (journal_mode={mode[0] if mode else '?'})")
+        except Exception as e:
+            logger.error(f"Metadata writer failed to connect: {e}")
+
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            ops = [item for item in batch if isinstance(item, tuple)]
+            if ops:
+                try:
+                    self._apply_batch(conn, ops)
+                except Exception as e:
+                    # Never let the writer thread die: flushes and readers wait on it
+                    logger.error(f"Metadata batch of {len(ops)} writes failed: {e}")
+                finally:
+                    with self._pending_cond:
+                        self._pending -= len(ops)
+                        self._pending_cond.notify_all()
+
+            stop = False
+            for item in batch:
+                if isinstance(item, _FlushMarker):
+                    item.done.set()
+                elif item is None:
+                    stop = True
+            if stop:
+                break
+
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def _apply_batch(self, conn, ops):
+        """Apply one batch of writes inside a single transaction."""
+        if conn is None:
+            logger.error(f"Dropping {len(ops)} metadata writes: no writer connection")
+            return
+        try:
+            conn.execute("BEGIN")
+            for kind, target, args in ops:
+                # A failing statement does not abort the SQLite transaction, so
+                # one bad row never costs the rest of the batch.
+                try:
+                    if kind == "execute":
+                        conn.execute(target, args)
+                    elif kind == "executemany":
+                        conn.executemany(target, args)
+                    else:
+                        target(conn, *args)
+                except Exception as e:
+                    logger.error(f"Metadata write failed: {e} -- {self._describe_op(kind, target)}")
+            conn.execute("COMMIT")
+        except Exception as e:
+            # hierarchy.db may be opened through sqlcipher3, whose errors are not sqlite3.Error
+            logger.error(f"Metadata batch of {len(ops)} writes failed: {e}")
+            try:
+                conn.execute("ROLLBACK")
+            except Exception:
+                pass
+
+    @staticmethod
+    def _describe_op(kind, target):
+        if kind == "call":
+            return getattr(target, "__name__", repr(target))
+        return target.strip()[:120]
+
+    # --- Reads ---
+
+    @contextmanager
+    def reader(self, wait_for_writes: bool = True, timeout: float = 5.0):
+        """
+        Borrow a pooled reader connection.
+
+        Args:
+            wait_for_writes: Flush queued writes first so reads see them (default: True)
+            timeout: How long to wait for a free reader (seconds)
+        """
+        if self._closed:
+            raise RuntimeError("Metadata store is closed")
+        if wait_for_writes and not self.flush(timeout):
+            logger.warning(f"Metadata writes still pending after {timeout}s; reading without them")
+
+        conn = self._acquire_reader(timeout)
+        try:
+            yield conn
+        finally:
+            self._release_reader(conn)
+
+    def fetchall(self, sql: str, params: Sequence = ()):
+        """Run a SELECT on a pooled reader and return all rows."""
+        with self.reader() as conn:
+            return conn.execute(sql, tuple(params)).fetchall()
+
+    def _acquire_reader(self, timeout: float):
+        with self._readers_cond:
+            while not self._readers and self._readers_created >= self.max_readers:
+                if not self._readers_cond.wait(timeout):
+                    raise TimeoutError("Timed out waiting for a metadata reader connection")
+            if self._readers:
+                return self._readers.pop()
+            self._readers_created += 1
+
+        try:
+            return self._connect()
+        except Exception:
+            with self._readers_cond:
+                self._readers_created -= 1
+                self._readers_cond.notify()
+            raise
+
+    def _release_reader(self, conn):
+        # Undo per-call customisation before the connection is reused
+        conn.row_factory = None
+        if conn.in_transaction:
+            try:
+                conn.execute("ROLLBACK")
+            except Exception:
+                pass
+        with self._readers_cond:
+            if self._closed:
+                conn.close()
+                self._readers_created -= 1
+            else:
+                self._readers.append(conn)
+            self._readers_cond.notify()
+
+    # --- Lifecycle ---
+
+    def close(self, timeout: float = 5.0):
+        """Commit outstanding writes, stop the writer and close all connections."""
+        if self._closed:
+            return
+        self._closed = True
+
+        if self._writer_thread is not None:
+            self._queue.put(None)
+            self._writer_thread.join(timeout)
+
+        with self._readers_cond:
+            for conn in self._readers:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._readers_created -= len(self._readers)
+            self._readers = []
+
+
+_metadata_store: Optional[MetadataStore] = None
+_metadata_store_lock = threading.Lock()
+
+
+def get_metadata_store() -> MetadataStore:
+    """Return the process-wide metadata store, creating it on first use."""
+    global _metadata_store
+    with _metadata_store_lock:
+        if _metadata_store is None:
+            _metadata_store = MetadataStore()
+        return _metadata_store
+
+
+def metadata_reader(wait_for_writes: bool = True):
+    """Shortcut for ``get_metadata_store().reader(...)``."""
+    return get_metadata_store().reader(wait_for_writes=wait_for_writes)
+
+
+def close_metadata_store():
+    """Flush and close the metadata store. Call on application shutdown."""
+    global _metadata_store
+    with _metadata_store_lock:
+        store, _metadata_store = _metadata_store, None
+    if store is not None:
+        store.close()
@@ -0,0 +1,318 @@
+# pg_catalog_cache.py
+"""
+Persistent PostgreSQL type and column-spec cache for result metadata.
+
+Result grids label columns from ``pg_type`` and ``pg_attribute``/
+``pg_constraint``. Instead of loading all of ``pg_type`` per process and
+querying the catalog on every result, entries are fetched lazily -- only
+the type OIDs and ``(table_oid, attnum)`` pairs a result actually returns --
+and kept in memory and in hierarchy.db, keyed by server/database.
+
+Column entries carry a per-table catalog version (a hash over the xmin of
+the table's ``pg_class``, ``pg_attribute`` and ``pg_constraint`` rows). The
+first time a session meets a cached table it compares versions in one small
+query and refetches stale tables; after that, repeat results need no catalog
+round trip. DDL run from the app (``invalidate_pg_catalog_cache``) forces a
+recheck.
+"""
+
+import logging
+import threading
+
+from db.metadata_store import get_metadata_store
+
+logger = logging.getLogger(__name__)
+
+# OIDs below this are built into the server and never change meaning
+FIRST_NORMAL_OBJECT_ID = 16384
+
+_TABLE_VERSION_SQL = """
+    md5(
+        c.xmin::text
+        || '|' || COALESCE((
+            SELECT string_agg(a.attnum::text || '.' || a.xmin::text, ',' ORDER BY a.attnum)
+            FROM pg_attribute a
+            WHERE a.attrelid = c.oid AND a.attnum > 0
+        ), '')
+        || '|' || COALESCE((
+            SELECT string_agg(k.oid::text || '.' || k.xmin::text, ',' ORDER BY k.oid)
+            FROM pg_constraint k
+            WHERE k.conrelid = c.oid
+        ), '')
+    )
+"""
+
+_lock = threading.Lock()
+_type_names = {}         # conn_key -> {type_oid: type_name}
+_loaded_type_keys = set()
+_columns = {}            # conn_key -> {(table_oid, attnum): (data_type, not_null, is_pk, is_fk)}
+_table_versions = {}     # conn_key -> {table_oid: catalog_version}
+_loaded_tables = {}      # conn_key -> table oids read from hierarchy.db
+_validated_tables = {}   # conn_key -> table oids checked against the server this session
+
+
+def pg_catalog_cache_key(conn_data):
+    """Return the cache key (``host:port/database``) for a PostgreSQL connection."""
+    conn_data = conn_data or {}
+    return f"{conn_data.get('host')}:{int(conn_data.get('port') or 5432)}/{conn_data.get('database')}"
+
+
+# --- Persistence ---
+
+def _read_persisted(sql, params):
+    try:
+        with get_metadata_store().reader(wait_for_writes=False) as conn:
+            return conn.execute(sql, tuple(params)).fetchall()
+    except Exception as e:
+        logger.warning("Could not read the PostgreSQL catalog cache: %s", e)
+        return []
+
+
+def _write_persisted(sql, params, many=False):
+    try:
+        store = get_metadata_store()
+        if many:
+            store.executemany(sql, params)
+        else:
+            store.execute(sql, params)
+    except Exception as e:
+        logger.warning("Could not update the PostgreSQL catalog cache: %s", e)
+
+
+# --- Types ---
+
+def get_pg_type_names(conn, conn_key, type_oids):
+    """
+    Return ``{type_oid: format_type name}`` for ``type_oids``.
+
+    Args:
+        conn: Open PostgreSQL connection, used only for OIDs not cached yet
+        conn_key: Key from ``pg_catalog_cache_key``
+        type_oids: OIDs of the result's column types
+    """
+    type_oids = {int(oid) for oid in type_oids if oid}
+
+    with _lock:
+        load_persisted = conn_key not in _loaded_type_keys
+    if load_persisted:
+        rows = _read_persisted(
+            "SELECT type_oid, type_name FROM usf_pg_type_cache WHERE conn_key = ?", (conn_key,)
+        )
+        with _lock:
+            cached = _type_names.setdefault(conn_key, {})
+            for oid, type_name in rows:
+                cached.setdefault(int(oid), type_name)
+            _loaded_type_keys.add(conn_key)
+
+    with _lock:
+        cached = _type_names.setdefault(conn_key, {})
+        missing = sorted(oid for oid in type_oids if oid not in cached)
+
+    if missing:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                "SELECT oid::bigint, format_type(oid, NULL) FROM pg_type WHERE oid = ANY(%s::oid[])",
+                (missing,),
+            )
+            fetched = [(int(oid), type_name) for oid, type_name in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+        with _lock:
+            cached.update(fetched)
+        _write_persisted(
+            "INSERT OR REPLACE INTO usf_pg_type_cache (conn_key, type_oid, type_name) VALUES (?, ?, ?)",
+            [(conn_key, oid, type_name) for oid, type_name in fetched],
+            many=True,
+        )
+
+    with _lock:
+        return {oid: cached[oid] for oid in type_oids if oid in cached}
+
+
+# --- Column specs ---
+
+def _load_persisted_tables(conn_key, table_oids):
+    with _lock:
+        loaded = _loaded_tables.setdefault(conn_key, set())
+        pending = sorted(table_oids - loaded)
+    if not pending:
+        return
+
+    placeholders = ", ".join("?" for _ in pending)
+    rows = _read_persisted(
+        f"""
+        SELECT table_oid, attnum, catalog_version, data_type, not_null, is_pk, is_fk
+        FROM usf_pg_column_cache
+        WHERE conn_key = ? AND table_oid IN ({placeholders})
+        """,
+        (conn_key, *pending),
+    )
+    with _lock:
+        columns = _columns.setdefault(conn_key, {})
+        versions = _table_versions.setdefault(conn_key, {})
+        for table_oid, attnum, version, data_type, not_null, is_pk, is_fk in rows:
+            key = (int(table_oid), int(attnum))
+            columns.setdefault(key, (data_type, bool(not_null), bool(is_pk), bool(is_fk)))
+            versions.setdefault(int(table_oid), version)
+        loaded.update(pending)
+
+
+def _drop_tables(conn_key, table_oids):
+    """Forget cached columns of ``table_oids`` (memory and disk)."""
+    if not table_oids:
+        return
+    with _lock:
+        columns = _columns.setdefault(conn_key, {})
+        versions = _table_versions.setdefault(conn_key, {})
+        for key in [key for key in columns if key[0] in table_oids]:
+            del columns[key]
+        for table_oid in table_oids:
+            versions.pop(table_oid, None)
+    _write_persisted(
+        "DELETE FROM usf_pg_column_cache WHERE conn_key = ? AND table_oid = ?",
+        [(conn_key, table_oid) for table_oid in table_oids],
+        many=True,
+    )
+
+
+def _validate_tables(conn, conn_key, table_oids):
+    """Compare cached catalog versions of ``table_oids`` with the server's; drop stale ones."""
+    with _lock:
+        versions = dict(_table_versions.get(conn_key, {}))
+    cached = sorted(oid for oid in table_oids if oid in versions)
+
+    if cached:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                f"SELECT c.oid::bigint, {_TABLE_VERSION_SQL} FROM pg_class c WHERE c.oid = ANY(%s::oid[])",
+                (cached,),
+            )
+            server_versions = {int(oid): version for oid, version in cursor.fetchall()}
+        finally:
+            cursor.close()
+        _drop_tables(conn_key, {oid for oid in cached if server_versions.get(oid) != versions[oid]})
+
+    with _lock:
+        _validated_tables.setdefault(conn_key, set()).update(table_oids)
+
+
+def _fetch_columns(conn, conn_key, requested):
+    """Query the catalog for ``requested`` ``(table_oid, attnum)`` pairs and cache the answer."""
+    cursor = conn.cursor()
+    try:
+        values_clause = ", ".join(
+            cursor.mogrify("(%s, %s)", values).decode("utf-8") for values in sorted(requested)
+        )
+        cursor.execute(
+            f"""
+            WITH requested_cols(table_oid, column_index) AS (
+                VALUES {values_clause}
+            )
+            SELECT
+                rc.table_oid,
+                rc.column_index,
+                UPPER(format_type(a.atttypid, a.atttypmod)) AS data_type,
+                a.attnotnull,
+                EXISTS (
+                    SELECT 1
+                    FROM pg_constraint k
+                    WHERE k.conrelid = rc.table_oid::oid
+                      AND k.contype = 'p'
+                      AND a.attnum = ANY(k.conkey)
+                ) AS is_pk,
+                EXISTS (
+                    SELECT 1
+                    FROM pg_constraint k
+                    WHERE k.conrelid = rc.table_oid::oid
+                      AND k.contype = 'f'
+                      AND a.attnum = ANY(k.conkey)
+                ) AS is_fk,
+                {_TABLE_VERSION_SQL} AS catalog_version
+            FROM requested_cols rc
+            JOIN pg_attribute a
+              ON a.attrelid = rc.table_oid::oid
+             AND a.attnum = rc.column_index::int2
+            JOIN pg_class c
+              ON c.oid = a.attrelid
+            WHERE NOT a.attisdropped
+            """
+        )
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+
+    persisted = []
+    with _lock:
+        columns = _columns.setdefault(conn_key, {})
+        versions = _table_versions.setdefault(conn_key, {})
+        for table_oid, attnum, data_type, not_null, is_pk, is_fk, version in rows:
+            table_oid, attnum = int(table_oid), int(attnum)
+            columns[(table_oid, attnum)] = (data_type, bool(not_null), bool(is_pk), bool(is_fk))
+            versions[table_oid] = version
+            persisted.append((conn_key, table_oid, attnum, version, data_type, int(bool(not_null)), int(bool(is_pk)), int(bool(is_fk))))
+
+    _write_persisted(
+        """
+        INSERT OR REPLACE INTO usf_pg_column_cache
+        (conn_key, table_oid, attnum, catalog_version, data_type, not_null, is_pk, is_fk)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        persisted,
+        many=True,
+    )
+
+
+def get_pg_column_specs(conn, conn_key, requested):
+    """
+    Return cached catalog metadata for result columns.
+
+    Args:
+        conn: Open PostgreSQL connection, used only for unchecked or missing tables
+        conn_key: Key from ``pg_catalog_cache_key``
+        requested: Iterable of ``(table_oid, attnum)`` from the cursor description
+
+    Returns:
+        ``{(table_oid, attnum): (data_type, not_null, is_pk, is_fk)}``; pairs
+        the catalog no longer has are left out
+    """
+    requested = {(int(table_oid), int(attnum)) for table_oid, attnum in requested}
+    if not requested:
+        return {}
+    table_oids = {table_oid for table_oid, _attnum in requested}
+
+    _load_persisted_tables(conn_key, table_oids)
+    with _lock:
+        unchecked = table_oids - _validated_tables.get(conn_key, set())
+    if unchecked:
+        _validate_tables(conn, conn_key, unchecked)
+
+    with _lock:
+        columns = _columns.setdefault(conn_key, {})
+        missing = {key for key in requested if key not in columns}
+    if missing:
+        _fetch_columns(conn, conn_key, missing)
+
+    with _lock:
+        return {key: columns[key] for key in requested if key in columns}
+
+
+def invalidate_pg_catalog_cache(conn_data):
+    """
+    Force a recheck after DDL on a PostgreSQL connection.
+
+    Cached tables are revalidated against the server on next use, and
+    user-defined type names are dropped (builtin ones never change).
+    """
+    conn_key = pg_catalog_cache_key(conn_data)
+    with _lock:
+        _validated_tables.pop(conn_key, None)
+        types = _type_names.get(conn_key, {})
+        for oid in [oid for oid in types if oid >= FIRST_NORMAL_OBJECT_ID]:
+            del types[oid]
+    _write_persisted(
+        "DELETE FROM usf_pg_type_cache WHERE conn_key = ? AND type_oid >= ?",
+        (conn_key, FIRST_NORMAL_OBJECT_ID),
+    )
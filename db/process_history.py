@@ -0,0 +1,171 @@
+# process_history.py
+"""
+Persistence for the process tracker (exports, backups, restores).
+
+Rows live in ``usf_processes`` in hierarchy.db. Writes are queued on the
+metadata store; the UI keeps its models current from the process signals and
+only reads pages from here, newest first, keyed by rowid. Old rows are trimmed
+by ``compact_process_history`` so the table stays bounded.
+"""
+
+import time
+
+from db.metadata_store import get_metadata_store
+
+PROCESS_COLUMNS = (
+    "pid", "process_name", "type", "status", "server", "object",
+    "time_taken", "start_time", "end_time", "details",
+)
+
+PROCESS_TIME_FORMAT = "%Y-%m-%d, %I:%M:%S %p"
+
+# Retention policy applied at startup
+PROCESS_RETENTION_MAX_ROWS = 5000
+PROCESS_RETENTION_DAYS = 30
+
+_SELECT_COLUMNS = ", ".join(PROCESS_COLUMNS)
+
+
+def record_process_started(row, conn_id=None):
+    """
+    Queue the insert of a new process row.
+
+    Args:
+        row: Values in ``PROCESS_COLUMNS`` order
+        conn_id: Connection whose leftover 'Running' rows are dropped first
+    """
+    store = get_metadata_store()
+    if conn_id:
+        store.execute(
+            """
+            DELETE FROM usf_processes
+            WHERE status = 'Running'
+              AND server = (
+                  SELECT short_name FROM usf_connections WHERE id = ?
+               )
+            """,
+            (conn_id,),
+        )
+    store.execute(
+        f"""
+        INSERT OR REPLACE INTO usf_processes
+        ({_SELECT_COLUMNS}, started_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (*row, time.time()),
+    )
+
+
+def record_process_finished(process_id, status, time_taken, end_time, message):
+    """Queue the completion of a process. Backup/Restore rows keep their details."""
+    get_metadata_store().execute(
+        """
+        UPDATE usf_processes
+        SET status = ?,
+            time_taken = ?,
+            end_time = ?,
+            details = CASE
+                WHEN type LIKE '%Backup%' OR type LIKE '%Restore%' THEN details
+                ELSE ?
+            END
+        WHERE pid = ?
+        """,
+        (status, time_taken, end_time, message, process_id),
+    )
+
+
+def record_process_error(process_id, end_time, error_message):
+    """Queue the failure of a process."""
+    get_metadata_store().execute(
+        """
+        UPDATE usf_processes
+        SET status = ?, end_time = ?, details = ?
+        WHERE pid = ?
+        """,
+        ("Error", end_time, error_message, process_id),
+    )
+
+
+def get_process_page(status=None, limit=200, before_rowid=None):
+    """
+    Return one page of process rows, newest first.
+
+    Args:
+        status: Only rows with this stored status (e.g. 'Running'); None for all
+        limit: Page size
+        before_rowid: Keyset cursor -- the rowid of the last row already shown
+
+    Returns:
+        List of ``(rowid, *PROCESS_COLUMNS)`` tuples
+    """
+    clauses = []
+    params = []
+    if status:
+        clauses.append("status = ?")
+        params.append(status)
+    if before_rowid is not None:
+        clauses.append("rowid < ?")
+        params.append(before_rowid)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    params.append(limit)
+
+    return get_metadata_store().fetchall(
+        f"""
+        SELECT rowid, {_SELECT_COLUMNS}
+        FROM usf_processes
+        {where}
+        ORDER BY rowid DESC
+        LIMIT ?
+        """,
+        params,
+    )
+
+
+def get_process_status_counts():
+    """Return ``{stored_status: row_count}`` for the whole process table."""
+    rows = get_metadata_store().fetchall(
+        "SELECT status, COUNT(*) FROM usf_processes GROUP BY status"
+    )
+    return {status: count for status, count in rows}
+
+
+def compact_process_history(conn,
+                            max_rows=PROCESS_RETENTION_MAX_ROWS,
+                            max_age_days=PROCESS_RETENTION_DAYS):
+    """
+    Close out interrupted processes and trim old rows.
+
+    Runs once during bootstrap, before any process of this session starts.
+
+    Args:
+        conn: Open hierarchy.db connection; the caller commits
+        max_rows: Keep at most this many finished rows (newest by rowid)
+        max_age_days: Drop finished rows started longer ago than this
+    """
+    # Nothing survives a restart, so rows still marked Running were interrupted
+    conn.execute(
+        """
+        UPDATE usf_processes
+        SET status = 'Error',
+            details = 'Interrupted: the application closed while this process was running.'
+                || CASE WHEN COALESCE(details, '') = '' THEN '' ELSE char(10) || details END
+        WHERE status = 'Running'
+        """
+    )
+
+    if max_age_days is not None:
+        conn.execute(
+            "DELETE FROM usf_processes WHERE started_at IS NOT NULL AND started_at < ?",
+            (time.time() - max_age_days * 86400,),
+        )
+
+    if max_rows is not None:
+        conn.execute(
+            """
+            DELETE FROM usf_processes
+            WHERE rowid <= (
+                SELECT rowid FROM usf_processes ORDER BY rowid DESC LIMIT 1 OFFSET ?
+            )
+            """,
+            (max_rows,),
+        )
@@ -14,10 +14,6 @@ FROM_TABLE_PATTERN = re.compile(
     re.IGNORECASE | re.VERBOSE,
 )
 COMMENT_PATTERN = re.compile(r"--.*?$|/\*.*?\*/", re.MULTILINE | re.DOTALL)
-CLAUSE_BOUNDARY_PATTERN = re.compile(
-    r"\bWHERE\b|\bGROUP\s+BY\b|\bORDER\s+BY\b|\bHAVING\b|\bLIMIT\b|\bOFFSET\b|\bFETCH\b|\bFOR\b|\bWINDOW\b",
-    re.IGNORECASE,
-)
 COMPLEX_FROM_PATTERN = re.compile(r"\bJOIN\b|\bUNION\b|\bINTERSECT\b|\bEXCEPT\b", re.IGNORECASE)
 
 
@@ -48,112 +44,103 @@ def build_qualified_table_name(schema_name, table_name):
     return quote_identifier(table_name)
 
 
-def _find_top_level_keyword(sql, keyword):
-    keyword_lower = keyword.lower()
-    in_single_quote = False
-    in_double_quote = False
-    in_brackets = False
-    in_backticks = False
-    depth = 0
-
-    for idx, char in enumerate(sql):
-        if in_single_quote:
-            if char == "'" and (idx == 0 or sql[idx - 1] != "\\"):
-                in_single_quote = False
-            continue
-        if in_double_quote:
-            if char == '"':
-                in_double_quote = False
-            continue
-        if in_brackets:
-            if char == "]":
-                in_brackets = False
-            continue
-        if in_backticks:
-            if char == "`":
-                in_backticks = False
-            continue
-
-        if char == "'":
-            in_single_quote = True
-            continue
-        if char == '"':
-            in_double_quote = True
-            continue
-        if char == "[":
-            in_brackets = True
-            continue
-        if char == "`":
-            in_backticks = True
-            continue
-        if char == "(":
-            depth += 1
-            continue
-        if char == ")":
-            depth = max(0, depth - 1)
-            continue
-
-        if depth != 0:
-            continue
-
-        if sql[idx:idx + len(keyword_lower)].lower() != keyword_lower:
-            continue
-
-        before_char = sql[idx - 1] if idx > 0 else " "
-        after_index = idx + len(keyword_lower)
-        after_char = sql[after_index] if after_index < len(sql) else " "
-        if (before_char.isalnum() or before_char == "_") or (after_char.isalnum() or after_char == "_"):
-            continue
-        return idx
-
-    return -1
-
-
-def resolve_writable_table_context(query):
-    sql = strip_sql_comments(query).strip().rstrip(";")
-    if not sql:
-        return None
-    if re.match(r"^\s*WITH\b", sql, re.IGNORECASE):
-        return None
-    if not re.match(r"^\s*SELECT\b", sql, re.IGNORECASE):
-        return None
-
-    from_index = _find_top_level_keyword(sql, "from")
-    if from_index < 0:
-        return None
-
-    from_sql = sql[from_index + 4:].lstrip()
-    match = FROM_TABLE_PATTERN.match(from_sql)
-    if not match:
-        return None
-
-    remainder = from_sql[match.end():]
-    boundary_offset = -1
-    for boundary in ("where", "group by", "order by", "having", "limit", "offset", "fetch", "for", "window"):
-        match_index = _find_top_level_keyword(remainder, boundary)
-        if match_index >= 0 and (boundary_offset < 0 or match_index < boundary_offset):
-            boundary_offset = match_index
-    boundary_match = CLAUSE_BOUNDARY_PATTERN.search(remainder) if boundary_offset < 0 else None
-    if boundary_offset >= 0:
-        from_tail = remainder[:boundary_offset]
-    else:
-        from_tail = remainder[:boundary_match.start()] if boundary_match else remainder
-
-    if COMPLEX_FROM_PATTERN.search(from_tail):
-        return None
-    if "," in from_tail:
-        return None
-    if "(" in from_tail or ")" in from_tail:
-        return None
-
-    schema_name = strip_identifier_quotes(match.group("schema") or "") or None
-    table_name = strip_identifier_quotes(match.group("table") or "")
-    if not table_name:
-        return None
-
-    return {
-        "schema_name": schema_name,
-        "real_table_name": table_name,
-        "table_name": f"{schema_name}.{table_name}" if schema_name else table_name,
-        "qualified_table_name": build_qualified_table_name(schema_name, table_name),
-    }
+# --- Grid sort/filter push-down ---
+
+GRID_PUSHDOWN_ALIAS = "usf_grid"
+GRID_PUSHDOWN_DIALECTS = ("POSTGRES", "SQLITE")
+NUMERIC_LITERAL_PATTERN = re.compile(r"^[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?$")
+
+
+def sql_string_literal(value):
+    escaped = str(value).replace("'", "''")
+    return f"'{escaped}'"
+
+
+def _sql_comparison_literal(operand, dialect):
+    text = str(operand).strip()
+    # PostgreSQL types a quoted literal from the column it is compared with,
+    # while a bare number would fail against a text column. SQLite applies
+    # the column's affinity either way, but a bare number also compares
+    # numerically with untyped expression columns.
+    if dialect == "SQLITE" and NUMERIC_LITERAL_PATTERN.match(text):
+        return text
+    return sql_string_literal(text)
+
+
+def _sql_contains(column_sql, text, dialect):
+    escaped = str(text).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    like = "ILIKE" if dialect == "POSTGRES" else "LIKE"
+    # NULL cells read as 'NULL', as in the grid
+    return f"COALESCE(CAST({column_sql} AS TEXT), 'NULL') {like} {sql_string_literal(f'%{escaped}%')} ESCAPE '\\'"
+
+
+def _sql_predicate(column_sql, predicate, dialect):
+    op = predicate.op
+    if op == "is_null":
+        return f"{column_sql} IS NULL"
+    if op == "not_null":
+        return f"{column_sql} IS NOT NULL"
+    if op == "contains":
+        return _sql_contains(column_sql, predicate.operand, dialect)
+    if op == "not_contains":
+        return f"NOT ({_sql_contains(column_sql, predicate.operand, dialect)})"
+    if op in ("=", "!=", ">", ">=", "<", "<="):
+        return f"{column_sql} {'<>' if op == '!=' else op} {_sql_comparison_literal(predicate.operand, dialect)}"
+    raise ValueError(f"Unsupported column filter: {predicate.text}")
+
+
+def build_grid_pushdown_query(base_query, column_names, sort_column=-1, descending=False,
+                              column_predicates=None, search_text="", dialect="POSTGRES"):
+    """
+    Wrap a SELECT so a result grid's sort and filters run in the database.
+
+    ``column_predicates`` maps column positions to objects exposing ``op``,
+    ``operand`` and ``text`` (see ``workers.grid_filter.ColumnPredicate``).
+    Returns the wrapped SQL without a trailing semicolon; LIMIT/OFFSET are
+    left to the caller's pagination. Raises ValueError when a referenced
+    column cannot be addressed unambiguously.
+    """
+    dialect = (dialect or "").upper()
+    if dialect not in GRID_PUSHDOWN_DIALECTS:
+        raise ValueError(f"Server-side sorting is not supported for {dialect or 'this connection'}.")
+
+    # Comments are left in place: the tokenizer skips them (and string
+    # literals) to find the statement, and the newline before the closing
+    # parenthesis ends a trailing -- comment.
+    from db.query_info import analyze_query  # query_info builds on this module
+
+    info = analyze_query(base_query)
+    if info.statement_kinds != ("SELECT",):
+        raise ValueError("Only SELECT queries can be sorted or filtered on the server.")
+    start, end = info.statement_spans[0]
+    sql = info.text[start:end]
+
+    names = [str(name) for name in column_names]
+
+    def column_sql(position):
+        if not 0 <= position < len(names):
+            raise ValueError(f"Unknown result column {position + 1}.")
+        name = names[position]
+        if names.count(name) > 1:
+            raise ValueError(f"Column '{name}' appears more than once in the result; alias it to sort or filter on the server.")
+        return f"{GRID_PUSHDOWN_ALIAS}.{quote_identifier(name)}"
+
+    conditions = [
+        _sql_predicate(column_sql(position), predicate, dialect)
+        for position, predicate in sorted((column_predicates or {}).items())
+    ]
+
+    if search_text:
+        unique_columns = [i for i, name in enumerate(names) if names.count(name) == 1]
+        if unique_columns:
+            conditions.append(
+                "(" + " OR ".join(_sql_contains(column_sql(i), search_text, dialect) for i in unique_columns) + ")"
+            )
+
+    wrapped = f"SELECT * FROM (\n{sql}\n) AS {GRID_PUSHDOWN_ALIAS}"
+    if conditions:
+        wrapped += "\nWHERE " + "\n  AND ".join(conditions)
+    if sort_column is not None and sort_column >= 0:
+        direction = "DESC NULLS FIRST" if descending else "ASC NULLS LAST"
+        wrapped += f"\nORDER BY {column_sql(sort_column)} {direction}"
+    return wrapped
@@ -0,0 +1,281 @@
+# query_info.py
+"""
+Single-pass classification of worksheet query text.
+
+``analyze_query`` tokenizes a query once -- skipping comments, string
+literals and quoted identifiers, tracking parenthesis depth and BEGIN/CASE
+... END blocks -- and derives everything the execution and rendering paths
+ask about it: statement spans and kinds, whether the (last) statement
+already has LIMIT/OFFSET, and the single table a plain SELECT reads from.
+Results are cached by query text, so the worker that ran the query and the
+UI that renders it share one analysis.
+"""
+
+import re
+from functools import lru_cache
+
+from db.query_context import (
+    COMMENT_PATTERN,
+    COMPLEX_FROM_PATTERN,
+    FROM_TABLE_PATTERN,
+    build_qualified_table_name,
+    strip_identifier_quotes,
+)
+
+QUERY_INFO_CACHE_SIZE = 64
+
+STRUCTURAL_KINDS = frozenset({"CREATE", "DROP", "ALTER", "TRUNCATE", "GRANT", "REVOKE", "COMMENT", "RENAME"})
+
+# Statement kinds a WITH clause can lead into
+_CTE_BODY_KINDS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE", "MERGE", "VALUES"})
+_FROM_BOUNDARY_WORDS = frozenset({"WHERE", "HAVING", "LIMIT", "OFFSET", "FETCH", "FOR", "WINDOW"})
+_SET_OPERATORS = frozenset({"UNION", "INTERSECT", "EXCEPT"})
+_LEADING_WORDS = 8
+
+_TOKEN_PATTERN = re.compile(
+    r"""
+      (?P<comment>--[^\n]*|/\*.*?(?:\*/|\Z))
+    | (?P<string>'(?:[^'\\]|\\.|'')*(?:'|\Z))
+    | (?P<dollar>\$(?P<tag>(?:[A-Za-z_]\w*)?)\$.*?(?:\$(?P=tag)\$|\Z))
+    | (?P<quoted>"[^"]*(?:"|\Z)|\[[^\]]*(?:\]|\Z)|`[^`]*(?:`|\Z))
+    | (?P<word>[A-Za-z_][\w$]*)
+    | (?P<punct>[();])
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+
+class QueryInfo:
+    """
+    What one analysis pass learned about a query.
+
+    Attributes:
+        text: The analyzed query text
+        statement_spans: ``(start, end)`` offsets of each statement in
+            ``text``, without leading comments or the terminating ``;``
+        statement_kinds: Upper-case kind per statement (``SELECT``,
+            ``INSERT``, ``CREATE``...); WITH resolves to the statement it leads into
+        kind: Kind of the first statement, or ``""`` for empty text
+        first_keyword: First word of the first statement, upper-case
+        leading_words: First top-level words of the first statement
+        has_limit / has_offset: The last statement has a top-level
+            LIMIT (or FETCH) / OFFSET
+        table_context: Editable single-table context of a plain SELECT, or None
+        source_table: Table named by the first top-level FROM, even when the
+            query is not editable
+    """
+
+    def __init__(self, text, statement_spans, statement_kinds, first_keyword, leading_words,
+                 has_limit, has_offset, table_context, source_table):
+        self.text = text
+        self.statement_spans = statement_spans
+        self.statement_kinds = statement_kinds
+        self.kind = statement_kinds[0] if statement_kinds else ""
+        self.first_keyword = first_keyword
+        self.leading_words = leading_words
+        self.has_limit = has_limit
+        self.has_offset = has_offset
+        self.table_context = table_context
+        self.source_table = source_table
+
+    @property
+    def is_select(self):
+        return self.kind == "SELECT"
+
+    @property
+    def is_structural(self):
+        return self.kind in STRUCTURAL_KINDS
+
+    @property
+    def changes_schema(self):
+        """True when any statement is DDL."""
+        return any(kind in STRUCTURAL_KINDS for kind in self.statement_kinds)
+
+    @property
+    def is_editable(self):
+        return self.table_context is not None
+
+    @property
+    def table_name(self):
+        """Unqualified table name for titles: the editable table, else the first FROM table."""
+        if self.table_context:
+            return self.table_context["real_table_name"]
+        return self.source_table
+
+    def statements(self):
+        """Return the text of each statement."""
+        return [self.text[start:end] for start, end in self.statement_spans]
+
+    def __repr__(self):
+        return f"QueryInfo(kind={self.kind!r}, statements={len(self.statement_spans)}, table={self.table_name!r})"
+
+
+class _Statement:
+    __slots__ = ("start", "end", "words", "first_nested_word")
+
+    def __init__(self, start):
+        self.start = start
+        self.end = start
+        self.words = []            # top-level (UPPER, start, end)
+        self.first_nested_word = None
+
+    def close(self, text, stop):
+        # Numbers and operators are not tokens, so the span runs up to the terminator
+        self.end = self.start + len(text[self.start:stop].rstrip())
+        return self
+
+
+def _scan_statements(text):
+    statements = []
+    current = None
+    depth = 0
+    blocks = 0
+
+    for match in _TOKEN_PATTERN.finditer(text):
+        group = match.lastgroup
+        if group == "comment":
+            continue
+
+        if group == "punct" and match.group() == ";" and depth == 0 and blocks == 0:
+            if current is not None:
+                statements.append(current.close(text, match.start()))
+                current = None
+            continue
+
+        if current is None:
+            current = _Statement(match.start())
+            depth = 0
+            blocks = 0
+
+        if group == "punct":
+            char = match.group()
+            if char == "(":
+                depth += 1
+            elif char == ")":
+                depth = max(0, depth - 1)
+            continue
+        if group != "word":
+            continue
+
+        word = match.group().upper()
+        # Trigger bodies and CASE expressions keep their semicolons; a leading
+        # BEGIN/END is a transaction statement instead
+        if word in ("BEGIN", "CASE") and (current.words or depth):
+            blocks += 1
+        elif word == "END" and blocks:
+            blocks -= 1
+
+        if depth == 0:
+            current.words.append((word, match.start(), match.end()))
+        elif current.first_nested_word is None:
+            current.first_nested_word = word
+
+    if current is not None:
+        statements.append(current.close(text, len(text)))
+    return statements
+
+
+def _statement_kind(statement):
+    words = statement.words
+    if not words:
+        return statement.first_nested_word or ""
+    kind = words[0][0]
+    if kind == "WITH":
+        for word, _start, _end in words[1:]:
+            if word in _CTE_BODY_KINDS:
+                return word
+    return kind
+
+
+def _from_clause(text, statement):
+    """Return the first top-level FROM clause, comments removed, up to the next clause; or None."""
+    words = statement.words
+    for index, (word, _start, end) in enumerate(words):
+        if word != "FROM":
+            continue
+        boundary = statement.end
+        for next_index in range(index + 1, len(words)):
+            next_word = words[next_index][0]
+            if next_word in _FROM_BOUNDARY_WORDS or next_word in _SET_OPERATORS:
+                boundary = words[next_index][1]
+                break
+            if next_word in ("GROUP", "ORDER") and next_index + 1 < len(words) and words[next_index + 1][0] == "BY":
+                boundary = words[next_index][1]
+                break
+        return COMMENT_PATTERN.sub(" ", text[end:boundary]).strip()
+    return None
+
+
+def _resolve_table_context(text, statement, kind):
+    from_sql = _from_clause(text, statement)
+    if not from_sql:
+        return None, None
+
+    match = FROM_TABLE_PATTERN.match(from_sql)
+    if not match:
+        return None, None
+    schema_name = strip_identifier_quotes(match.group("schema") or "") or None
+    table_name = strip_identifier_quotes(match.group("table") or "")
+    if not table_name:
+        return None, None
+
+    if kind != "SELECT" or statement.words[0][0] != "SELECT":
+        return None, table_name
+    if any(word in _SET_OPERATORS for word, _start, _end in statement.words):
+        return None, table_name
+
+    remainder = from_sql[match.end():]
+    if COMPLEX_FROM_PATTERN.search(from_sql) or "," in remainder or "(" in remainder or ")" in remainder:
+        return None, table_name
+
+    return {
+        "schema_name": schema_name,
+        "real_table_name": table_name,
+        "table_name": f"{schema_name}.{table_name}" if schema_name else table_name,
+        "qualified_table_name": build_qualified_table_name(schema_name, table_name),
+    }, table_name
+
+
+@lru_cache(maxsize=QUERY_INFO_CACHE_SIZE)
+def _analyze(text):
+    statements = _scan_statements(text)
+    kinds = tuple(_statement_kind(statement) for statement in statements)
+    spans = tuple((statement.start, statement.end) for statement in statements)
+
+    if not statements:
+        return QueryInfo(text, spans, kinds, "", (), False, False, None, None)
+
+    first = statements[0]
+    leading_words = tuple(word for word, _start, _end in first.words[:_LEADING_WORDS])
+    first_keyword = leading_words[0] if leading_words else (first.first_nested_word or "")
+
+    last_words = {word for word, _start, _end in statements[-1].words}
+    has_limit = "LIMIT" in last_words or "FETCH" in last_words
+    has_offset = "OFFSET" in last_words
+
+    table_context = None
+    source_table = None
+    if first.words:
+        table_context, source_table = _resolve_table_context(text, first, kinds[0])
+        # Only the last statement's rows reach the grid
+        if len(statements) > 1:
+            table_context = None
+
+    return QueryInfo(
+        text, spans, kinds, first_keyword, leading_words,
+        has_limit, has_offset, table_context, source_table,
+    )
+
+
+def analyze_query(query):
+    """
+    Return the cached ``QueryInfo`` for ``query``.
+
+    Args:
+        query: SQL text; None is treated as empty
+
+    Returns:
+        QueryInfo shared by every caller asking about the same text -- treat
+        it (including ``table_context``) as read-only
+    """
+    return _analyze(query if isinstance(query, str) else str(query or ""))
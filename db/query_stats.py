@@ -0,0 +1,207 @@
+# query_stats.py
+"""
+Query fingerprinting and per-fingerprint performance aggregates.
+
+Every executed query is normalized into a "shape" (literals replaced by ``?``,
+comments dropped, whitespace and keyword case canonicalized) and hashed into a
+fingerprint stored alongside its ``usf_query_history`` row. Aggregates per
+(connection, fingerprint) are maintained incrementally in
+``usf_query_fingerprints`` -- a client-side take on pg_stat_statements.
+
+Durations are kept in a sparse log-bucketed histogram (buckets grow by
+``HISTOGRAM_GROWTH``), so p50/p95 are updated in constant space and are
+accurate to within one bucket width.
+"""
+
+import hashlib
+import json
+import math
+import re
+
+import sqlparse.lexer
+from sqlparse import tokens as T
+
+from db.metadata_store import get_metadata_store
+
+# Longer statements are fingerprinted on their leading part only; generated
+# multi-megabyte INSERTs would otherwise stall the metadata writer thread.
+MAX_FINGERPRINT_INPUT = 64 * 1024
+
+HISTOGRAM_MIN_SEC = 0.0001
+HISTOGRAM_GROWTH = 1.2
+
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_VALUES_ROWS_RE = re.compile(r"\(\?\+\)(?:\s*,\s*\(\?\+\))+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Whitelisted ORDER BY expressions for get_top_query_fingerprints
+RANKING_ORDER = {
+    "total": "total_time_sec",
+    "mean": "total_time_sec / MAX(calls, 1)",
+    "p95": "p95_time_sec",
+    "max": "max_time_sec",
+    "calls": "calls",
+    "rows": "total_rows",
+}
+
+
+def normalize_query(query):
+    """Return the canonical shape of ``query`` with literals stripped."""
+    text = (query or "")[:MAX_FINGERPRINT_INPUT]
+    parts = []
+    for ttype, value in sqlparse.lexer.tokenize(text):
+        if ttype in T.Comment:
+            parts.append(" ")
+        elif ttype in T.Whitespace or ttype in T.Newline:
+            parts.append(" ")
+        elif ttype in T.Literal.String.Single or ttype in T.Literal.Number or ttype in T.Name.Placeholder:
+            parts.append("?")
+        elif ttype in T.Keyword:
+            parts.append(value.upper())
+        elif ttype is T.Name:
+            parts.append(value.lower())
+        else:
+            parts.append(value)
+
+    normalized = _WHITESPACE_RE.sub(" ", "".join(parts)).strip().rstrip(";").strip()
+    # IN (?, ?, ?) and multi-row VALUES lists collapse regardless of length
+    normalized = _IN_LIST_RE.sub("(?+)", normalized)
+    normalized = _VALUES_ROWS_RE.sub("(?+), ...", normalized)
+    return normalized
+
+
+def fingerprint_query(query):
+    """Return ``(fingerprint, normalized_query)`` for a query."""
+    try:
+        normalized = normalize_query(query)
+    except Exception:
+        normalized = _WHITESPACE_RE.sub(" ", (query or "")[:MAX_FINGERPRINT_INPUT]).strip()
+    fingerprint = hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+    return fingerprint, normalized
+
+
+def _histogram_bucket(duration):
+    duration = max(float(duration or 0.0), HISTOGRAM_MIN_SEC)
+    return int(math.ceil(math.log(duration / HISTOGRAM_MIN_SEC, HISTOGRAM_GROWTH)))
+
+
+def _histogram_quantile(histogram, quantile):
+    """Return the upper bound of the bucket holding ``quantile`` (0..1)."""
+    total = sum(histogram.values())
+    if total == 0:
+        return None
+    target = quantile * total
+    seen = 0
+    for bucket in sorted(histogram):
+        seen += histogram[bucket]
+        if seen >= target:
+            return HISTOGRAM_MIN_SEC * (HISTOGRAM_GROWTH ** bucket)
+    return HISTOGRAM_MIN_SEC * (HISTOGRAM_GROWTH ** max(histogram))
+
+
+def _clamped_quantile(histogram, quantile, max_time):
+    # A bucket's upper bound can exceed the slowest run actually observed
+    value = _histogram_quantile(histogram, quantile)
+    return min(value, max_time) if value is not None else None
+
+
+def record_query_execution(conn, conn_id, query, status, rows, duration, timestamp):
+    """Insert one history row and fold it into its fingerprint's aggregates.
+
+    Runs on the metadata writer thread inside its batch transaction.
+    """
+    fingerprint, normalized = fingerprint_query(query)
+    conn.execute(
+        """
+        INSERT INTO usf_query_history
+        (connection_id, query_text, status, rows_affected, execution_time_sec, timestamp, fingerprint)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        (conn_id, query, status, rows, duration, timestamp, fingerprint),
+    )
+
+    existing = conn.execute(
+        """
+        SELECT calls, errors, total_time_sec, max_time_sec, total_rows, duration_histogram, first_seen
+        FROM usf_query_fingerprints WHERE connection_id = ? AND fingerprint = ?
+        """,
+        (conn_id, fingerprint),
+    ).fetchone()
+
+    if existing:
+        calls, errors, total_time, max_time, total_rows, histogram_json, first_seen = existing
+        histogram = {int(k): v for k, v in json.loads(histogram_json or "{}").items()}
+    else:
+        calls, errors, total_time, max_time, total_rows, histogram, first_seen = 0, 0, 0.0, 0.0, 0, {}, timestamp
+
+    # Like pg_stat_statements, timings and row counts only cover successful runs
+    if str(status or "").upper() == "SUCCESS":
+        duration = float(duration or 0.0)
+        calls += 1
+        total_time += duration
+        max_time = max(max_time, duration)
+        total_rows += max(int(rows or 0), 0)
+        bucket = _histogram_bucket(duration)
+        histogram[bucket] = histogram.get(bucket, 0) + 1
+    else:
+        errors += 1
+
+    conn.execute(
+        """
+        INSERT OR REPLACE INTO usf_query_fingerprints
+        (connection_id, fingerprint, normalized_query, calls, errors, total_time_sec, max_time_sec,
+         p50_time_sec, p95_time_sec, total_rows, duration_histogram, first_seen, last_seen)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            conn_id,
+            fingerprint,
+            normalized,
+            calls,
+            errors,
+            total_time,
+            max_time,
+            _clamped_quantile(histogram, 0.50, max_time),
+            _clamped_quantile(histogram, 0.95, max_time),
+            total_rows,
+            json.dumps(histogram),
+            first_seen,
+            timestamp,
+        ),
+    )
+
+
+def get_top_query_fingerprints(conn_id, order_by="total", limit=100):
+    """Return the heaviest query shapes for a connection as a list of dicts."""
+    order_expr = RANKING_ORDER.get(order_by, RANKING_ORDER["total"])
+    rows = get_metadata_store().fetchall(
+        f"""
+        SELECT fingerprint, normalized_query, calls, errors, total_time_sec,
+               total_time_sec / MAX(calls, 1), p50_time_sec, p95_time_sec, max_time_sec,
+               total_rows, first_seen, last_seen
+        FROM usf_query_fingerprints
+        WHERE connection_id = ?
+        ORDER BY {order_expr} DESC
+        LIMIT ?
+        """,
+        (conn_id, limit),
+    )
+    keys = (
+        "fingerprint", "query", "calls", "errors", "total_time", "mean_time",
+        "p50_time", "p95_time", "max_time", "rows", "first_seen", "last_seen",
+    )
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def get_fingerprint_timeline(conn_id, fingerprint, limit=500):
+    """Return recent ``(timestamp, execution_time_sec, status)`` runs of one query shape."""
+    return get_metadata_store().fetchall(
+        """
+        SELECT timestamp, execution_time_sec, status
+        FROM usf_query_history
+        WHERE connection_id = ? AND fingerprint = ?
+        ORDER BY timestamp DESC
+        LIMIT ?
+        """,
+        (conn_id, fingerprint, limit),
+    )
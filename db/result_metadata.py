@@ -1,5 +1,6 @@
+from db.pg_catalog_cache import get_pg_column_specs, get_pg_type_names, pg_catalog_cache_key
 from db.type_utils import normalize_type
-from db.query_context import resolve_writable_table_context
+from db.query_info import analyze_query
 
 
 PG_COMMON_OID_MAP = {
@@ -23,8 +24,6 @@ PG_COMMON_OID_MAP = {
     3802: "JSONB",
 }
 
-PG_OID_TYPE_CACHE = {}
-
 
 def _description_value(desc, attr_name, index, default=None):
     if hasattr(desc, attr_name):
@@ -50,33 +49,6 @@ def _normalize_postgres_type(type_name):
     return normalize_type(type_name) if type_name else ""
 
 
-def _postgres_cache_key(conn_data):
-    return (
-        conn_data.get("host"),
-        int(conn_data.get("port") or 5432),
-        conn_data.get("database"),
-    )
-
-
-def _load_postgres_oid_cache(conn, conn_data):
-    cache_key = _postgres_cache_key(conn_data)
-    cached = PG_OID_TYPE_CACHE.get(cache_key)
-    if cached is not None:
-        return cached
-
-    oid_cache = dict(PG_COMMON_OID_MAP)
-    cursor = conn.cursor()
-    try:
-        cursor.execute("SELECT oid, format_type(oid, NULL) FROM pg_type")
-        for oid, type_name in cursor.fetchall():
-            oid_cache[int(oid)] = _normalize_postgres_type(type_name)
-    finally:
-        cursor.close()
-
-    PG_OID_TYPE_CACHE[cache_key] = oid_cache
-    return oid_cache
-
-
 def _postgres_fallback_type(desc, oid_cache):
     type_oid = int(_description_value(desc, "type_code", 1, 0) or 0)
     base_type = oid_cache.get(type_oid) or PG_COMMON_OID_MAP.get(type_oid, "")
@@ -93,7 +65,12 @@ def _postgres_fallback_type(desc, oid_cache):
 
 
 def _resolve_postgres_column_specs(conn, conn_data, description):
-    oid_cache = _load_postgres_oid_cache(conn, conn_data)
+    conn_key = pg_catalog_cache_key(conn_data)
+    oid_cache = get_pg_type_names(
+        conn,
+        conn_key,
+        {_description_value(desc, "type_code", 1, 0) for desc in description},
+    )
     specs = []
     requested_columns = []
 
@@ -113,53 +90,20 @@ def _resolve_postgres_column_specs(conn, conn_data, description):
     if not requested_columns:
         return specs
 
-    metadata_cursor = conn.cursor()
-    try:
-        values_clause = ", ".join(
-            metadata_cursor.mogrify("(%s, %s, %s)", values).decode("utf-8")
-            for values in requested_columns
-        )
-        metadata_cursor.execute(
-            f"""
-            WITH requested_cols(result_index, table_oid, column_index) AS (
-                VALUES {values_clause}
-            )
-            SELECT
-                rc.result_index,
-                UPPER(format_type(a.atttypid, a.atttypmod)) AS data_type,
-                a.attnotnull,
-                EXISTS (
-                    SELECT 1
-                    FROM pg_constraint c
-                    WHERE c.conrelid = rc.table_oid::oid
-                      AND c.contype = 'p'
-                      AND a.attnum = ANY(c.conkey)
-                ) AS is_pk,
-                EXISTS (
-                    SELECT 1
-                    FROM pg_constraint c
-                    WHERE c.conrelid = rc.table_oid::oid
-                      AND c.contype = 'f'
-                      AND a.attnum = ANY(c.conkey)
-                ) AS is_fk
-            FROM requested_cols rc
-            JOIN pg_attribute a
-              ON a.attrelid = rc.table_oid::oid
-             AND a.attnum = rc.column_index::int2
-            WHERE NOT a.attisdropped
-            """
-        )
-
-        for result_index, data_type, attnotnull, is_pk, is_fk in metadata_cursor.fetchall():
-            if 0 <= result_index < len(specs):
-                specs[result_index].update({
-                    "data_type": _normalize_postgres_type(data_type),
-                    "pk": bool(is_pk),
-                    "fk": bool(is_fk),
-                    "nullable": not bool(attnotnull),
-                })
-    finally:
-        metadata_cursor.close()
+    column_metadata = get_pg_column_specs(
+        conn, conn_key, [(table_oid, column_index) for _index, table_oid, column_index in requested_columns]
+    )
+    for result_index, table_oid, column_index in requested_columns:
+        metadata = column_metadata.get((table_oid, column_index))
+        if metadata is None:
+            continue
+        data_type, attnotnull, is_pk, is_fk = metadata
+        specs[result_index].update({
+            "data_type": _normalize_postgres_type(data_type),
+            "pk": is_pk,
+            "fk": is_fk,
+            "nullable": not attnotnull,
+        })
 
     return specs
 
@@ -175,7 +119,7 @@ def _resolve_sqlite_table_info(cursor, table_name):
 
 def _resolve_sqlite_column_specs(conn, query, description):
     specs = [_default_column_spec(desc[0]) for desc in description]
-    table_context = resolve_writable_table_context(query)
+    table_context = analyze_query(query).table_context
     if not table_context:
         return specs
     table_name = table_context["real_table_name"]
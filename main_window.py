@@ -580,6 +580,12 @@ class MainWindow(QMainWindow):
             except Exception as e:
                 print(f"Error closing connection pools: {e}")
 
+            # Commit queued history/process writes and close hierarchy.db
+            try:
+                db.close_metadata_store()
+            except Exception as e:
+                print(f"Error closing metadata store: {e}")
+
             event.accept()
         else:
             event.ignore()
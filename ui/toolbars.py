@@ -246,6 +246,14 @@ class ResultsInfoToolbar(QWidget):
         self.download_btn.clicked.connect(lambda: manager.download_result(self.tab_content))
         layout.addWidget(self.download_btn)
 
+        self.save_snapshot_btn = IconButton(qta.icon("fa5s.camera", color="#555555"), "Save result snapshot")
+        self.save_snapshot_btn.clicked.connect(lambda: manager.save_result_snapshot(self.tab_content))
+        layout.addWidget(self.save_snapshot_btn)
+
+        self.open_snapshot_btn = IconButton(qta.icon("fa5s.folder-open", color="#555555"), "Open result snapshot")
+        self.open_snapshot_btn.clicked.connect(lambda: manager.open_result_snapshot(self.tab_content))
+        layout.addWidget(self.open_snapshot_btn)
+
         # Table Search
         self.search_box = SearchBox()
         self.search_box.setFixedHeight(24)
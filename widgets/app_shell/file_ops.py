@@ -45,9 +45,10 @@ def open_sql_file(main_window):
                 return
 
         try:
-            with open(file_name, "r", encoding="utf-8") as f:
-                content = f.read()
-                editor.setPlainText(content)
+            editor.load_file(file_name)
+            if editor.large_file_mode:
+                main_window.status.showMessage(f"File opened in large-file mode: {file_name}", 5000)
+            else:
                 main_window.status.showMessage(f"File opened: {file_name}", 3000)
         except Exception as e:
             QMessageBox.critical(main_window, "Error", f"Could not read file:\n{e}")
@@ -1,5 +1,7 @@
+import glob
 import json
 import os
+import tempfile
 
 
 from PySide6.QtCore import QByteArray
@@ -7,6 +9,58 @@ from PySide6.QtWidgets import QApplication, QComboBox, QLabel, QWidget
 
 from widgets.worksheet.code_editor import CodeEditor
 
+SESSION_BUFFERS_DIR = "session_buffers"
+
+
+def _session_buffers_dir(session_file):
+    return os.path.join(os.path.dirname(os.path.abspath(session_file)), SESSION_BUFFERS_DIR)
+
+
+def _persist_large_editor_content(editor, session_file):
+    """Return a file path holding a large-file-mode editor's content.
+
+    Unmodified files opened from disk are referenced in place; edited buffers
+    are spilled to a sidecar file next to the session file so the session
+    JSON never inlines megabytes of SQL. Each editor keeps its sidecar file
+    across saves, so tab reordering never makes two tabs share one.
+    """
+    if editor.source_path and not editor.document().isModified():
+        return editor.source_path
+
+    buffer_path = editor.session_buffer_path
+    if not buffer_path:
+        buffers_dir = _session_buffers_dir(session_file)
+        os.makedirs(buffers_dir, exist_ok=True)
+        fd, buffer_path = tempfile.mkstemp(prefix="worksheet_", suffix=".sql", dir=buffers_dir)
+        os.close(fd)
+        editor.session_buffer_path = buffer_path
+    with open(buffer_path, "w", encoding="utf-8") as f:
+        f.write(editor.toPlainText())
+    return buffer_path
+
+
+def _prune_session_buffers(session_file, keep):
+    """Delete sidecar buffers the session no longer references."""
+    keep = {os.path.abspath(path) for path in keep if path}
+    for path in glob.glob(os.path.join(_session_buffers_dir(session_file), "worksheet_*.sql")):
+        if os.path.abspath(path) not in keep:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def discard_session_buffer(tab):
+    """Delete the sidecar buffer of a worksheet tab that is being closed."""
+    editor = tab.findChild(CodeEditor, "query_editor") if tab is not None else None
+    if editor is None or not editor.session_buffer_path:
+        return
+    try:
+        os.remove(editor.session_buffer_path)
+    except OSError:
+        pass
+    editor.session_buffer_path = None
+
 
 def save_main_window_session(main_window, session_file):
     main_window.connection_manager._save_tree_expansion_state()
@@ -44,7 +98,11 @@ def save_main_window_session(main_window, session_file):
         if tab_type == "worksheet":
             editor = tab.findChild(CodeEditor, "query_editor")
             db_combo = tab.findChild(QComboBox, "db_combo_box")
-            tab_data["sql_content"] = editor.toPlainText() if editor else ""
+            if editor and editor.large_file_mode:
+                tab_data["sql_file_path"] = _persist_large_editor_content(editor, session_file)
+                tab_data["sql_source_path"] = editor.source_path
+            else:
+                tab_data["sql_content"] = editor.toPlainText() if editor else ""
             tab_data["selected_connection_index"] = db_combo.currentIndex() if db_combo else 0
             tab_data["current_limit"] = getattr(tab, "current_limit", 0)
             tab_data["current_offset"] = getattr(tab, "current_offset", 0)
@@ -60,6 +118,10 @@ def save_main_window_session(main_window, session_file):
             json.dump(session_data, f, indent=4)
     except Exception as e:
         print(f"Error saving session: {e}")
+        return
+
+    # Buffers of closed tabs, or of tabs that are no longer large or edited
+    _prune_session_buffers(session_file, [tab.get("sql_file_path") for tab in session_data["tabs"]])
 
 
 def restore_main_window_session(main_window, session_file):
@@ -142,7 +204,16 @@ def restore_main_window_session(main_window, session_file):
 
                 editor = current_tab.findChild(CodeEditor, "query_editor")
                 if editor:
-                    editor.setPlainText(tab_data.get("sql_content", ""))
+                    sql_file_path = tab_data.get("sql_file_path")
+                    if sql_file_path and os.path.exists(sql_file_path):
+                        editor.load_file(sql_file_path)
+                        # A spilled buffer still belongs to the original file
+                        editor.source_path = tab_data.get("sql_source_path") or None
+                        editor.document().setModified(sql_file_path != editor.source_path)
+                        if os.path.dirname(os.path.abspath(sql_file_path)) == _session_buffers_dir(session_file):
+                            editor.session_buffer_path = os.path.abspath(sql_file_path)
+                    else:
+                        editor.setPlainText(tab_data.get("sql_content", ""))
 
                 db_combo = current_tab.findChild(QComboBox, "db_combo_box")
                 if db_combo:
@@ -172,6 +243,11 @@ def restore_main_window_session(main_window, session_file):
 
         # Removed redundant session sanitization loop from the end of restore
 
+        # Buffers the restored tabs were loaded from stay until the next save
+        # or until their tab closes, so a crash before then loses nothing;
+        # anything else left in the directory is from an older session.
+        _prune_session_buffers(session_file, [tab.get("sql_file_path") for tab in tabs])
+
 
     except Exception as e:
         print(f"Error restoring session: {e}")
@@ -4,6 +4,8 @@ from PySide6.QtCore import QUrl
 import qtawesome as qta
 import traceback
 
+from widgets.app_shell.session import discard_session_buffer
+
 def close_current_tab(main_window):
     index = main_window.tab_widget.currentIndex()
     if index != -1:
@@ -36,6 +38,8 @@ def close_tab(main_window, index):
         del wm.tab_timers[tab]
     if main_window.tab_widget.count() > 1:
         main_window.tab_widget.removeTab(index)
+        main_window.results_manager.cleanup_tab_resources(tab)
+        discard_session_buffer(tab)
         main_window.renumber_tabs()
     else:
         main_window.status.showMessage("Must keep at least one tab", 3000)
@@ -113,8 +113,8 @@ class ConnectionActions:
 
         results_manager = self.manager.main_window.results_manager
         signals.finished.connect(
-            lambda cd, q, res, cols, specs, rc, et, isq: results_manager.handle_query_result(
-                current_tab, cd, q, res, cols, specs, rc, et, isq
+            lambda cd, q, res, cols, specs, rc, et, isq, qi: results_manager.handle_query_result(
+                current_tab, cd, q, res, cols, specs, rc, et, isq, query_info=qi
             )
         )
         signals.error.connect(self.handle_count_error)
@@ -1525,7 +1525,7 @@ SERVER "{data["server"]}"
         full_process_id = str(uuid.uuid4())
         short_id = full_process_id[:8]
 
-        def on_data_fetched_for_export(_conn_data, _query, results, columns, _column_specs, row_count, _elapsed_time, _is_select_query):
+        def on_data_fetched_for_export(_conn_data, _query, results, columns, _column_specs, row_count, _elapsed_time, _is_select_query, _query_info=None):
             self.manager.status_message_label.setText("Data fetched. Starting export process...")
             model = QStandardItemModel()
             model.setColumnCount(len(columns))
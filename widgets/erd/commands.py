@@ -405,6 +405,9 @@ class UpdateTableCommand(QUndoCommand):
         if old_full_name in self.scene.tables:
             del self.scene.tables[old_full_name]
         self.scene.tables[new_full_name] = self.table_item
+        self.scene.table_index.update(self.table_item)
+        # Slot order follows table names
+        self.scene.slot_allocator.item_moved(self.table_item)
 
         if old_full_name in self.widget.schema_data:
             data = self.widget.schema_data.pop(old_full_name)
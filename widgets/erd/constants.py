@@ -32,3 +32,10 @@ SELF_LOOP_LOOP_DIST_STEP: int = 10  # additional offset per column index
 # Animation constants for flow-mode marching dashes
 FLOW_ANIM_DURATION_MS: int = 800    # full dash-cycle duration in milliseconds
 FLOW_ANIM_END_VALUE: float = 14.0   # one full dash-cycle offset (dash=8 + gap=6)
+
+# Level-of-detail thresholds (view scale) for large diagrams
+LOD_DETAIL_SCALE: float = 0.5    # below this tables paint their header only, no column rows
+LOD_BOX_SCALE: float = 0.25      # below this tables are plain boxes and connections plain lines
+EFFECTS_MIN_SCALE: float = 0.5   # drop shadows and flow animations pause below this zoom
+PAN_SETTLE_MS: int = 150         # effects resume this long after the last scroll step
+CF_CULL_MARGIN: int = 24         # connection ends this far outside the exposed area skip their markers
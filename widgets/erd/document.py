@@ -0,0 +1,236 @@
+"""SQLite-backed .erd documents with per-table records and incremental saves.
+
+A document holds one row per table (schema definition and view state as
+compact JSON, plus its bounds), a spatial index over those bounds, and the
+free items and viewport as metadata. Saving compares each table against
+what is already on disk and rewrites only the rows that changed, so saving
+a large model after moving one table touches one row. Loading reads the
+tables under the saved viewport first and streams the rest nearest-first.
+
+Files written by earlier versions are plain JSON; ``is_erd_document`` tells
+the two apart.
+"""
+import json
+import os
+import sqlite3
+import tempfile
+
+from PySide6.QtCore import QRectF
+
+ERD_DOCUMENT_APP_ID: int = 0x45524431   # "ERD1", stored in the SQLite header
+ERD_DOCUMENT_VERSION: int = 4           # continues the JSON format's "version" numbering
+_SQLITE_MAGIC = b"SQLite format 3\x00"
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE tables (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    definition TEXT NOT NULL,
+    view TEXT NOT NULL,
+    min_x REAL NOT NULL, max_x REAL NOT NULL,
+    min_y REAL NOT NULL, max_y REAL NOT NULL
+);
+"""
+_RTREE = "CREATE VIRTUAL TABLE table_bounds USING rtree(id, min_x, max_x, min_y, max_y)"
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def _bounds(view: dict) -> tuple[float, float, float, float]:
+    x, y = float(view.get("x", 0.0)), float(view.get("y", 0.0))
+    return x, x + float(view.get("width", 0.0)), y, y + float(view.get("height", 0.0))
+
+
+def is_erd_document(file_path: str) -> bool:
+    """True if *file_path* is an SQLite .erd document rather than a legacy JSON one."""
+    try:
+        with open(file_path, "rb") as f:
+            return f.read(len(_SQLITE_MAGIC)) == _SQLITE_MAGIC
+    except OSError:
+        return False
+
+
+class ERDDocument:
+    """An open .erd document; remembers what is on disk so saves can be incremental."""
+
+    def __init__(self, file_path: str, connection: sqlite3.Connection) -> None:
+        self.file_path = file_path
+        self._conn = connection
+        self._spatial = self._has_table("table_bounds")
+        # name -> (definition, view) exactly as stored, to detect changed rows
+        self._stored: dict[str, tuple[str, str]] = {}
+        self._stored_meta: dict[str, str] = dict(self._conn.execute("SELECT key, value FROM meta"))
+        self._target_path: str | None = None  # set by ``create`` until the first save moves the file into place
+
+    # --- Opening ---
+
+    @classmethod
+    def open(cls, file_path: str) -> "ERDDocument":
+        conn = sqlite3.connect(file_path)
+        app_id = conn.execute("PRAGMA application_id").fetchone()[0]
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if app_id != ERD_DOCUMENT_APP_ID:
+            conn.close()
+            raise ValueError(f"{os.path.basename(file_path)} is not an ERD document")
+        if version > ERD_DOCUMENT_VERSION:
+            conn.close()
+            raise ValueError(f"ERD document version {version} is newer than this application supports")
+        return cls(file_path, conn)
+
+    @classmethod
+    def create(cls, file_path: str) -> "ERDDocument":
+        """Start an empty document at *file_path*; the file is only replaced when the first save commits."""
+        directory = os.path.dirname(os.path.abspath(file_path))
+        fd, temp_path = tempfile.mkstemp(suffix=".erd", dir=directory)
+        os.close(fd)
+        conn = sqlite3.connect(temp_path)
+        conn.execute(f"PRAGMA application_id = {ERD_DOCUMENT_APP_ID}")
+        conn.execute(f"PRAGMA user_version = {ERD_DOCUMENT_VERSION}")
+        conn.executescript(_SCHEMA)
+        try:
+            conn.execute(_RTREE)
+        except sqlite3.OperationalError:
+            pass  # SQLite built without R*Tree: fall back to scanning the bounds columns
+        conn.commit()
+        document = cls(temp_path, conn)
+        document._target_path = file_path
+        return document
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _has_table(self, name: str) -> bool:
+        row = self._conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone()
+        return row is not None
+
+    # --- Reading ---
+
+    def meta(self, key: str, default=None):
+        value = self._stored_meta.get(key)
+        return default if value is None else json.loads(value)
+
+    def table_count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM tables").fetchone()[0]
+
+    def iter_tables(self, viewport: QRectF | None = None):
+        """Yield ``(name, definition, view_state)``: tables under *viewport* first, then nearest first.
+
+        Rows are fetched lazily, so callers can stop or pause between
+        tables; nothing beyond the current row is parsed.
+        """
+        if viewport is None:
+            cursor = self._conn.execute("SELECT name, definition, view FROM tables ORDER BY id")
+            yield from self._parse_rows(cursor)
+            return
+        cx, cy = viewport.center().x(), viewport.center().y()
+        box = (viewport.left(), viewport.right(), viewport.top(), viewport.bottom())
+        distance = "((min_x + max_x) / 2 - ?) * ((min_x + max_x) / 2 - ?) + ((min_y + max_y) / 2 - ?) * ((min_y + max_y) / 2 - ?)"
+        if self._spatial:
+            visible = (
+                "SELECT t.id FROM table_bounds b JOIN tables t ON t.id = b.id "
+                "WHERE b.min_x <= ?2 AND b.max_x >= ?1 AND b.min_y <= ?4 AND b.max_y >= ?3"
+            )
+            visible_ids = [row[0] for row in self._conn.execute(visible, box)]
+        else:
+            visible_ids = [row[0] for row in self._conn.execute(
+                "SELECT id FROM tables WHERE min_x <= ?2 AND max_x >= ?1 AND min_y <= ?4 AND max_y >= ?3", box,
+            )]
+        for start in range(0, len(visible_ids), 500):
+            chunk = visible_ids[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            cursor = self._conn.execute(
+                f"SELECT name, definition, view FROM tables WHERE id IN ({marks}) ORDER BY {distance}",
+                (*chunk, cx, cx, cy, cy),
+            )
+            yield from self._parse_rows(cursor)
+        cursor = self._conn.execute(
+            "SELECT name, definition, view FROM tables "
+            f"WHERE NOT (min_x <= ? AND max_x >= ? AND min_y <= ? AND max_y >= ?) ORDER BY {distance}",
+            (box[1], box[0], box[3], box[2], cx, cx, cy, cy),
+        )
+        yield from self._parse_rows(cursor)
+
+    def _parse_rows(self, cursor):
+        for name, definition, view in cursor:
+            self._stored[name] = (definition, view)
+            yield name, json.loads(definition), json.loads(view)
+
+    # --- Saving ---
+
+    def save(self, schema_data: dict, table_views: dict, meta: dict) -> int:
+        """Write tables whose definition or view state changed, drop removed ones; returns rows written.
+
+        *table_views* maps table name to its view state (``x``, ``y``,
+        ``width``, ``height``, ...). *meta* values are stored as JSON and
+        likewise only rewritten when they differ.
+        """
+        written = 0
+        conn = self._conn
+        # The on-disk caches only learn about rows once the transaction has committed
+        removed: list[str] = []
+        stored: dict[str, tuple[str, str]] = {}
+        stored_meta: dict[str, str] = {}
+        with conn:
+            for name in self._stored.keys() - schema_data.keys():
+                row = conn.execute("SELECT id FROM tables WHERE name = ?", (name,)).fetchone()
+                conn.execute("DELETE FROM tables WHERE name = ?", (name,))
+                if row and self._spatial:
+                    conn.execute("DELETE FROM table_bounds WHERE id = ?", row)
+                removed.append(name)
+                written += 1
+            for name, info in schema_data.items():
+                definition = _dumps(info)
+                view = _dumps(table_views.get(name, {}))
+                if self._stored.get(name) == (definition, view):
+                    continue
+                bounds = _bounds(table_views.get(name, {}))
+                if name in self._stored:
+                    conn.execute(
+                        "UPDATE tables SET definition = ?, view = ?, min_x = ?, max_x = ?, min_y = ?, max_y = ? "
+                        "WHERE name = ?",
+                        (definition, view, *bounds, name),
+                    )
+                    table_id = conn.execute("SELECT id FROM tables WHERE name = ?", (name,)).fetchone()[0]
+                else:
+                    table_id = conn.execute(
+                        "INSERT INTO tables (name, definition, view, min_x, max_x, min_y, max_y) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (name, definition, view, *bounds),
+                    ).lastrowid
+                if self._spatial:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO table_bounds (id, min_x, max_x, min_y, max_y) VALUES (?, ?, ?, ?, ?)",
+                        (table_id, *bounds),
+                    )
+                stored[name] = (definition, view)
+                written += 1
+            for key, value in meta.items():
+                encoded = _dumps(value)
+                if self._stored_meta.get(key) == encoded:
+                    continue
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, encoded))
+                stored_meta[key] = encoded
+                written += 1
+        for name in removed:
+            del self._stored[name]
+        self._stored.update(stored)
+        self._stored_meta.update(stored_meta)
+        if self._target_path is not None:
+            # First save of a new document: move the finished file into place
+            conn.close()
+            os.replace(self.file_path, self._target_path)
+            self.file_path, self._target_path = self._target_path, None
+            self._conn = sqlite3.connect(self.file_path)
+        return written
+
+    def discard(self) -> None:
+        """Close a document created with ``create`` that was never saved, removing its temp file."""
+        self._conn.close()
+        if self._target_path is not None:
+            try:
+                os.remove(self.file_path)
+            except OSError:
+                pass
@@ -4,7 +4,7 @@ Extracted to satisfy the SRP: ERDConnectionItem was ~935 lines because it
 combined path routing, painting, interaction, animation, and menus.  This
 module owns exclusively the animation state-machine and line-style management.
 """
-from PySide6.QtCore import QPropertyAnimation, QEasingCurve, Property, Qt
+from PySide6.QtCore import QAbstractAnimation, QPropertyAnimation, QEasingCurve, Property, Qt
 from PySide6.QtGui import QPen, QColor
 
 from widgets.erd.constants import FLOW_ANIM_DURATION_MS, FLOW_ANIM_END_VALUE
@@ -44,12 +44,24 @@ class ERDConnectionAnimMixin:
     def set_animated(self, animated: bool) -> None:
         self._is_animated = animated
         if animated:
-            self._animation.start()
+            self.sync_animation()
         else:
             self._animation.stop()
             self._dash_offset = 0.0
         self.update()
 
+    def sync_animation(self) -> None:
+        """Run the flow animation only while it is on and the scene allows effects."""
+        running = self._is_animated and getattr(self.scene(), "effects_enabled", True)
+        state = self._animation.state()
+        if running:
+            if state == QAbstractAnimation.State.Paused:
+                self._animation.resume()
+            elif state == QAbstractAnimation.State.Stopped:
+                self._animation.start()
+        elif state == QAbstractAnimation.State.Running:
+            self._animation.pause()
+
     def set_flow_mode(self, mode: str) -> None:
         self._flow_mode = mode
         self.update()
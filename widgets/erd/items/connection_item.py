@@ -14,11 +14,13 @@ from PySide6.QtCore import Qt, QPointF, QObject
 from widgets.erd.constants import (
     RELATION_TYPES,
     DRAG_ENDPOINT_RADIUS,
+    LOD_BOX_SCALE,
     SELF_LOOP_STUB, SELF_LOOP_LOOP_DIST_BASE, SELF_LOOP_LOOP_DIST_STEP,
 )
 from widgets.erd.items.connection_anim import ERDConnectionAnimMixin
 from widgets.erd.items.connection_menu import build_connection_context_menu
 from widgets.erd.path_planner import ERDConnectionPathPlanner
+from widgets.erd.slot_allocator import connection_side_changed, invalidate_slots
 from widgets.erd.items.connection_paint import (
     draw_crows_foot as _draw_cf,
     draw_crows_foot_direct as _draw_cf_direct,
@@ -90,6 +92,7 @@ class ERDConnectionItem(ERDConnectionAnimMixin, QObject, QGraphicsPathItem):
         is_unique: bool = False,
         relation_name: str | None = None,
         fk_meta: dict | None = None,
+        route: bool = True,
     ) -> None:
         QObject.__init__(self)
         QGraphicsPathItem.__init__(self)
@@ -145,14 +148,19 @@ class ERDConnectionItem(ERDConnectionAnimMixin, QObject, QGraphicsPathItem):
         self.setZValue(-1)
         self.setAcceptHoverEvents(True)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, True)
+        # Paint receives the exposed rect so off-screen end markers are culled
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption, True)
         self.setToolTip(self.tooltip_text)
 
         self._init_anim()
 
         source_item.connections.append(self)
         target_item.connections.append(self)
+        invalidate_slots(source_item, target_item)
 
-        self.updatePath()
+        # Bulk loaders pass route=False and route once every table has settled
+        if route:
+            self.updatePath()
 
     # Animation/line-style methods are provided by ERDConnectionAnimMixin.
 
@@ -449,7 +457,8 @@ class ERDConnectionItem(ERDConnectionAnimMixin, QObject, QGraphicsPathItem):
         trimmed_points = self._trim_orthogonal_points(points, start_trim, end_trim)
         return self._build_path_from_points(trimmed_points)
 
-    def updatePath(self) -> None:
+    def updatePath(self, preview: bool = False) -> None:
+        """Re-route the connection; ``preview`` uses the planner's cheap drag-time path."""
         if getattr(self, '_drag_side', None):
             path = QPainterPath()
             if self._drag_side == "start":
@@ -492,9 +501,17 @@ class ERDConnectionItem(ERDConnectionAnimMixin, QObject, QGraphicsPathItem):
                 self.updateSelfLoopPath()
                 return
 
-            best_points, best_s_side, best_t_side = self.path_planner.compute_best_path()
-            self._last_source_side = best_s_side
-            self._last_target_side = best_t_side
+            if preview:
+                best_points, _s_side, _t_side = self.path_planner.compute_preview_path()
+            else:
+                best_points, best_s_side, best_t_side = self.path_planner.compute_best_path()
+                # Slot order on an item depends on which side each connection uses
+                if best_s_side != self._last_source_side:
+                    connection_side_changed(self.source_item, self, best_s_side)
+                if best_t_side != self._last_target_side:
+                    connection_side_changed(self.target_item, self, best_t_side)
+                self._last_source_side = best_s_side
+                self._last_target_side = best_t_side
 
             path = QPainterPath()
             if best_points:
@@ -575,6 +592,12 @@ class ERDConnectionItem(ERDConnectionAnimMixin, QObject, QGraphicsPathItem):
 
         pen = self._apply_line_style_to_pen(QPen(self.pen()), hovered=bool(is_hovered))
 
+        if option.levelOfDetailFromTransform(painter.worldTransform()) < LOD_BOX_SCALE:
+            # Zoomed far out: the bare line, without bridges, flow dashes or end markers
+            painter.setPen(pen)
+            painter.drawPath(path)
+            return
+
         should_snap = (
             hasattr(self.source_item, "table_name")
             and hasattr(self.target_item, "table_name")
@@ -623,9 +646,9 @@ class ERDConnectionItem(ERDConnectionAnimMixin, QObject, QGraphicsPathItem):
 
         # 3. Draw Crow's Foot Ends
         if self._is_chen_connection():
-            self._draw_chen_connection_ends(painter, path, display_path, is_hovered, pen)
+            self._draw_chen_connection_ends(painter, path, display_path, is_hovered, pen, option.exposedRect)
         else:
-            self._draw_crows_foot_ends(painter, path, display_path, is_hovered, pen)
+            self._draw_crows_foot_ends(painter, path, display_path, is_hovered, pen, option.exposedRect)
 
         # 4. Draw Flow Arrows (ONLY if no crow's foot notation)
         if self._flow_mode in ("forward", "bidirectional") and target_type == 'none':
@@ -645,8 +668,8 @@ class ERDConnectionItem(ERDConnectionAnimMixin, QObject, QGraphicsPathItem):
         # Keep label positioned at midpoint
         self._update_label_pos()
 
-    def _draw_crows_foot_ends(self, painter, raw_path, rendered_path, is_hovered, bridge_pen):
-        _draw_cf_ends(painter, raw_path, self.RELATION_TYPES, self.relation_type, is_hovered, bridge_pen)
+    def _draw_crows_foot_ends(self, painter, raw_path, rendered_path, is_hovered, bridge_pen, visible_rect=None):
+        _draw_cf_ends(painter, raw_path, self.RELATION_TYPES, self.relation_type, is_hovered, bridge_pen, visible_rect)
 
     @staticmethod
     def _find_direction_point(path, start_idx: int, forward: bool = True):
@@ -655,8 +678,8 @@ class ERDConnectionItem(ERDConnectionAnimMixin, QObject, QGraphicsPathItem):
     def _draw_crows_foot_at(self, painter, origin, direction_point, rel_part, is_hovered, bridge_pen):
         _draw_cf_at(painter, origin, direction_point, rel_part, is_hovered)
 
-    def _draw_chen_connection_ends(self, painter, raw_path, rendered_path, is_hovered, bridge_pen):
-        _draw_chen_ends(painter, raw_path, rendered_path, self.RELATION_TYPES, self.relation_type, is_hovered, bridge_pen)
+    def _draw_chen_connection_ends(self, painter, raw_path, rendered_path, is_hovered, bridge_pen, visible_rect=None):
+        _draw_chen_ends(painter, raw_path, rendered_path, self.RELATION_TYPES, self.relation_type, is_hovered, bridge_pen, visible_rect)
 
  
     # Relation type management
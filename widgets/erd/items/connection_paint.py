@@ -6,7 +6,7 @@ from PySide6.QtCore import Qt, QPointF
 
 from widgets.erd.constants import (
     CF_BAR_NEAR, CF_BAR_FAR, CF_FOOT_TIP, CF_FOOT_SPREAD, CF_FOOT_WIDTH,
-    CF_CIRCLE_ONE, CF_CIRCLE_MANY, CF_CIRCLE_RADIUS,
+    CF_CIRCLE_ONE, CF_CIRCLE_MANY, CF_CIRCLE_RADIUS, CF_CULL_MARGIN,
 )
 
 
@@ -211,9 +211,19 @@ def draw_arrow(painter, P: QPointF, angle: float, is_hovered: bool) -> None:
     painter.restore()
 
 
+def _end_visible(visible_rect, point: QPointF) -> bool:
+    return visible_rect is None or visible_rect.adjusted(
+        -CF_CULL_MARGIN, -CF_CULL_MARGIN, CF_CULL_MARGIN, CF_CULL_MARGIN
+    ).contains(point)
+
+
 def draw_crows_foot_ends(painter, raw_path, RELATION_TYPES: dict,
-                          relation_type: str, is_hovered: bool, bridge_pen: QPen) -> None:
-    """Draw crow's foot symbols at both ends of a Manhattan connection."""
+                          relation_type: str, is_hovered: bool, bridge_pen: QPen,
+                          visible_rect=None) -> None:
+    """Draw crow's foot symbols at both ends of a Manhattan connection.
+
+    Ends outside *visible_rect* (item coordinates) are skipped.
+    """
     if raw_path.elementCount() < 2:
         return
     rel_info = RELATION_TYPES.get(relation_type, RELATION_TYPES['many-to-one'])
@@ -222,19 +232,23 @@ def draw_crows_foot_ends(painter, raw_path, RELATION_TYPES: dict,
     p0 = raw_path.elementAt(0)
     origin_s = QPointF(p0.x, p0.y)
     direction_s = find_direction_point(raw_path, 0, forward=True)
-    if direction_s is not None:
+    if direction_s is not None and _end_visible(visible_rect, origin_s):
         draw_crows_foot_at(painter, origin_s, direction_s, source_type, is_hovered)
     last_idx = raw_path.elementCount() - 1
     pn = raw_path.elementAt(last_idx)
     origin_t = QPointF(pn.x, pn.y)
     direction_t = find_direction_point(raw_path, last_idx, forward=False)
-    if direction_t is not None:
+    if direction_t is not None and _end_visible(visible_rect, origin_t):
         draw_crows_foot_at(painter, origin_t, direction_t, target_type, is_hovered)
 
 
 def draw_chen_connection_ends(painter, raw_path, rendered_path, RELATION_TYPES: dict,
-                               relation_type: str, is_hovered: bool, bridge_pen: QPen) -> None:
-    """Draw crow's foot symbols at both ends of a Chen (free-angle) connection."""
+                               relation_type: str, is_hovered: bool, bridge_pen: QPen,
+                               visible_rect=None) -> None:
+    """Draw crow's foot symbols at both ends of a Chen (free-angle) connection.
+
+    Ends outside *visible_rect* (item coordinates) are skipped.
+    """
     if raw_path.elementCount() < 2 or rendered_path.elementCount() < 2:
         return
     rel_info = RELATION_TYPES.get(relation_type, RELATION_TYPES['many-to-one'])
@@ -242,13 +256,15 @@ def draw_chen_connection_ends(painter, raw_path, rendered_path, RELATION_TYPES:
     target_type = rel_info.get('target', 'one')
     raw_p0 = raw_path.elementAt(0)
     p1 = rendered_path.elementAt(1)
-    draw_crows_foot_direct(
-        painter, QPointF(raw_p0.x, raw_p0.y), QPointF(p1.x, p1.y),
-        source_type, is_hovered, bridge_pen,
-    )
+    if _end_visible(visible_rect, QPointF(raw_p0.x, raw_p0.y)):
+        draw_crows_foot_direct(
+            painter, QPointF(raw_p0.x, raw_p0.y), QPointF(p1.x, p1.y),
+            source_type, is_hovered, bridge_pen,
+        )
     pn_1 = rendered_path.elementAt(rendered_path.elementCount() - 2)
     raw_pn = raw_path.elementAt(raw_path.elementCount() - 1)
-    draw_crows_foot_direct(
-        painter, QPointF(raw_pn.x, raw_pn.y), QPointF(pn_1.x, pn_1.y),
-        target_type, is_hovered, bridge_pen,
-    )
+    if _end_visible(visible_rect, QPointF(raw_pn.x, raw_pn.y)):
+        draw_crows_foot_direct(
+            painter, QPointF(raw_pn.x, raw_pn.y), QPointF(pn_1.x, pn_1.y),
+            target_type, is_hovered, bridge_pen,
+        )
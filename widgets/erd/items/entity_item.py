@@ -9,6 +9,7 @@ from PySide6.QtCore import Qt, QPointF, QSizeF
 from widgets.erd.commands import DeleteItemCommand, ResizeItemCommand
 from widgets.erd.constants import PORT_HIT_RADIUS_SQ
 from widgets.erd.items.resizable import ResizableItemMixin, item_visual_scene_rect
+from widgets.erd.route_scheduler import notify_item_moved
 from widgets.erd.items.floating_connection import arm_port_drag, maybe_start_port_drag, cancel_port_drag
 
 
@@ -249,8 +250,7 @@ class ERDEntityItem(QGraphicsRectItem, ResizableItemMixin):
 
     def itemChange(self, change, value):
         if change == QGraphicsItem.GraphicsItemChange.ItemPositionHasChanged:
-            for conn in self.connections:
-                conn.updatePath()
+            notify_item_moved(self)
         return super().itemChange(change, value)
 
     def hoverEnterEvent(self, event):
@@ -90,16 +90,7 @@ class ConnectionHandle(QGraphicsEllipseItem):
             return
             
         # Clean previous highlights
-        for item in self.scene().items():
-            if hasattr(item, "target_highlight") and item.target_highlight:
-                item.target_highlight = False
-                item.update()
-            if isinstance(item, _get_table_item_class()):
-                if hasattr(item, '_drag_highlighted_col') and item._drag_highlighted_col:
-                    if item._drag_highlighted_col in item.highlighted_cols:
-                        item.highlighted_cols.remove(item._drag_highlighted_col)
-                    item._drag_highlighted_col = None
-                    item.update()
+        self.scene().clear_drag_highlights()
         
         # Highlight new one
         items_under = self.scene().items(scene_pos)
@@ -120,6 +111,7 @@ class ConnectionHandle(QGraphicsEllipseItem):
         if target_item:
             target_item.target_highlight = True
             target_item.update()
+            self.scene().mark_drag_highlight(target_item)
             # Store it so we can clean it up later
             self._current_target_item = target_item
         else:
@@ -187,16 +179,7 @@ class ConnectionHandle(QGraphicsEllipseItem):
                 self.setPos(self.parent_conn.mapFromScene(target_item.get_column_anchor_pos(None, side)))
 
         # Clean drag highlighting
-        for item in self.scene().items():
-            if hasattr(item, "target_highlight") and item.target_highlight:
-                item.target_highlight = False
-                item.update()
-            if isinstance(item, _get_table_item_class()):
-                if hasattr(item, '_drag_highlighted_col') and item._drag_highlighted_col:
-                    if item._drag_highlighted_col in item.highlighted_cols:
-                        item.highlighted_cols.remove(item._drag_highlighted_col)
-                    item._drag_highlighted_col = None
-                    item.update()
+        self.scene().clear_drag_highlights()
 
         # Check if both handles are now anchored to finish the connection
         self.parent_conn.check_anchors()
@@ -3,6 +3,8 @@ from typing import Any
 from PySide6.QtCore import QPointF, QRectF, QSizeF, Qt
 from PySide6.QtGui import QColor, QBrush, QCursor, QPainterPath, QPen
 
+from widgets.erd.route_scheduler import notify_item_moved
+
 
 def item_visual_scene_rect(item: Any) -> QRectF:
     if hasattr(item, "resize_bounds"):
@@ -198,11 +200,5 @@ class ResizableItemMixin:
             self.unsetCursor()
 
     def _after_geometry_changed(self) -> None:
-        for conn in getattr(self, "connections", []):
-            conn.updatePath()
-        scene = self.scene()
-        if scene and hasattr(scene, "_router_cache"):
-            scene._router_cache = None
-        if scene and hasattr(scene, "update_scene_rect"):
-            scene.update_scene_rect()
+        notify_item_moved(self)
         self.update()
@@ -2,15 +2,78 @@ import math
 import qtawesome as qta
 from PySide6.QtWidgets import QGraphicsRectItem, QGraphicsItem, QStyle, QGraphicsDropShadowEffect, QMenu
 from PySide6.QtGui import QPainter, QPen, QBrush, QColor, QFont, QPainterPath, QFontMetrics
-from PySide6.QtCore import Qt, QRectF, QPointF, QLineF, QSizeF
+from PySide6.QtCore import Qt, QRectF, QPointF, QSizeF
 
 from widgets.erd.commands import DeleteItemCommand, MoveTableCommand, ResizeItemCommand
-from widgets.erd.constants import DRAG_ENDPOINT_RADIUS
+from widgets.erd.constants import DRAG_ENDPOINT_RADIUS, LOD_BOX_SCALE, LOD_DETAIL_SCALE
 from widgets.erd.items.resizable import ResizableItemMixin, item_visual_scene_rect
+from widgets.erd.route_scheduler import notify_item_moved
 import widgets.erd.items.connection_item
 from widgets.erd.items.floating_connection import arm_port_drag, maybe_start_port_drag, cancel_port_drag
 
 GRID_SNAP: float = 20.0  # pixel grid for snap-to-grid during drag
+TABLE_MIN_WIDTH: float = 180.0  # narrowest a table can be auto-sized or resized to
+TABLE_ROW_HEIGHT: int = 20  # height of one column row
+
+_ICON_PIXMAPS = {}  # shared header/column icons, rendered once per process
+
+
+def _icon_pixmaps() -> dict:
+    # Pre-render icons to QPixmap so SVG/PDF export embeds them correctly
+    # (qtawesome draws glyphs via drawText; pre-rasterising avoids missing font in SVG)
+    if not _ICON_PIXMAPS:
+        _ICON_PIXMAPS.update(
+            schema=qta.icon('fa5s.layer-group', color='#D93025').pixmap(12, 12),
+            table=qta.icon('fa5s.table', color='#1A73E8').pixmap(14, 12),
+            pk=qta.icon('fa5s.key', color='#F9AB00').pixmap(12, 12),
+            fk=qta.icon('fa5s.key', color='#1A73E8').pixmap(12, 12),
+            col=qta.icon('mdi.table-column', color='#34A853').pixmap(12, 12),
+        )
+    return _ICON_PIXMAPS
+
+
+def table_header_height(schema_name: str | None) -> int:
+    return 40 if schema_name else 30
+
+
+def table_auto_size(table_name: str, schema_name: str | None, columns: list,
+                    show_columns: bool = True, show_types: bool = True,
+                    header_height: int | None = None, row_height: int = TABLE_ROW_HEIGHT) -> tuple[float, float]:
+    """Auto-size ``(width, height)`` of a table, without creating its item."""
+    if header_height is None:
+        header_height = table_header_height(schema_name)
+
+    # Calculate width
+    font_header = QFont("Segoe UI", 10, QFont.Weight.Bold)
+    fm_header = QFontMetrics(font_header)
+    max_width = fm_header.horizontalAdvance(table_name) + 40
+    
+    if schema_name:
+        font_schema = QFont("Segoe UI", 8, QFont.Weight.Normal)
+        fm_schema = QFontMetrics(font_schema)
+        max_width = max(max_width, fm_schema.horizontalAdvance(schema_name) + 40)
+        
+    if show_columns:
+        font_col = QFont("Segoe UI", 9, QFont.Weight.Normal)
+        fm_col = QFontMetrics(font_col)
+        
+        for col in columns:
+            col_name = col['name']
+            content_width = 30 + fm_col.horizontalAdvance(col_name)
+            
+            if show_types:
+                type_name = col.get('type', '')
+                content_width += fm_col.horizontalAdvance(type_name) + 40
+            
+            max_width = max(max_width, content_width + 20)
+    
+    width = max(TABLE_MIN_WIDTH, max_width)
+    
+    min_height = header_height + (row_height if show_columns else 20)
+    content_height = (len(columns) * row_height) if show_columns else 0
+    total_height = header_height + content_height
+    height = math.ceil(total_height / 20.0) * 20.0
+    return float(width), float(max(min_height, height))
 
 
 class ERDTableItem(QGraphicsRectItem, ResizableItemMixin):
@@ -20,8 +83,8 @@ class ERDTableItem(QGraphicsRectItem, ResizableItemMixin):
         self.table_name = table_name
         self.schema_name = schema_name
         self.columns = columns
-        self.header_height = 40 if schema_name else 30
-        self.row_height = 20
+        self.header_height = table_header_height(schema_name)
+        self.row_height = TABLE_ROW_HEIGHT
         self.show_columns = True
         self.show_types = True
         self.connections = []
@@ -31,7 +94,8 @@ class ERDTableItem(QGraphicsRectItem, ResizableItemMixin):
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemSendsGeometryChanges)
-        self.setCacheMode(QGraphicsItem.CacheMode.NoCache)
+        # Pans and moves reuse the cached pixmap; zooming or update() re-renders it
+        self.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
         self.setZValue(1)
         
         self.group_color = QColor("#E8F0FE") # Default
@@ -60,19 +124,18 @@ class ERDTableItem(QGraphicsRectItem, ResizableItemMixin):
             
         self.columns.sort(key=col_sort_key)
         
-        # Pre-render icons to QPixmap so SVG/PDF export embeds them correctly
-        # (qtawesome draws glyphs via drawText; pre-rasterising avoids missing font in SVG)
-        self.icon_schema = qta.icon('fa5s.layer-group', color='#D93025').pixmap(12, 12)
-        self.icon_table = qta.icon('fa5s.table', color='#1A73E8').pixmap(14, 12)
-        self.icon_pk = qta.icon('fa5s.key', color='#F9AB00').pixmap(12, 12)
-        self.icon_fk = qta.icon('fa5s.key', color='#1A73E8').pixmap(12, 12)
-        self.icon_col = qta.icon('mdi.table-column', color='#34A853').pixmap(12, 12)
+        icons = _icon_pixmaps()
+        self.icon_schema = icons['schema']
+        self.icon_table = icons['table']
+        self.icon_pk = icons['pk']
+        self.icon_fk = icons['fk']
+        self.icon_col = icons['col']
         
         self.update_geometry()
 
     def minimum_size(self):
         min_height = self.header_height + (self.row_height if self.show_columns else 20)
-        return QSizeF(180.0, float(min_height))
+        return QSizeF(TABLE_MIN_WIDTH, float(min_height))
 
     def resize_bounds(self):
         return self.rect()
@@ -87,36 +150,10 @@ class ERDTableItem(QGraphicsRectItem, ResizableItemMixin):
         self.setRect(0, 0, self.width, self.height)
 
     def compute_auto_size(self):
-        # Calculate width
-        font_header = QFont("Segoe UI", 10, QFont.Weight.Bold)
-        fm_header = QFontMetrics(font_header)
-        max_width = fm_header.horizontalAdvance(self.table_name) + 40
-        
-        if self.schema_name:
-            font_schema = QFont("Segoe UI", 8, QFont.Weight.Normal)
-            fm_schema = QFontMetrics(font_schema)
-            max_width = max(max_width, fm_schema.horizontalAdvance(self.schema_name) + 40)
-            
-        if self.show_columns:
-            font_col = QFont("Segoe UI", 9, QFont.Weight.Normal)
-            fm_col = QFontMetrics(font_col)
-            
-            for col in self.columns:
-                col_name = col['name']
-                content_width = 30 + fm_col.horizontalAdvance(col_name)
-                
-                if self.show_types:
-                    type_name = col.get('type', '')
-                    content_width += fm_col.horizontalAdvance(type_name) + 40
-                
-                max_width = max(max_width, content_width + 20)
-        
-        width = max(self.minimum_size().width(), max_width)
-        
-        content_height = (len(self.columns) * self.row_height) if self.show_columns else 0
-        total_height = self.header_height + content_height
-        height = math.ceil(total_height / 20.0) * 20.0
-        return float(width), float(max(self.minimum_size().height(), height))
+        return table_auto_size(
+            self.table_name, self.schema_name, self.columns,
+            self.show_columns, self.show_types, self.header_height, self.row_height,
+        )
         
     def boundingRect(self):
         # Override to include the pen width
@@ -153,6 +190,10 @@ class ERDTableItem(QGraphicsRectItem, ResizableItemMixin):
             
         # Selection highlight
         is_selected = option.state & QStyle.StateFlag.State_Selected
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        if lod < LOD_BOX_SCALE:
+            self._paint_box(painter, is_selected)
+            return
         
         # 1. Draw Background Body (Fill only)
         painter.setPen(Qt.PenStyle.NoPen)
@@ -204,7 +245,7 @@ class ERDTableItem(QGraphicsRectItem, ResizableItemMixin):
             painter.setPen(QPen(Qt.GlobalColor.black))
             painter.drawText(header_rect.adjusted(28, 0, 0, 0), Qt.AlignmentFlag.AlignVCenter, self.table_name)
         
-        if self.show_columns:
+        if self.show_columns and lod >= LOD_DETAIL_SCALE:
             rows_bottom = self.header_height + (self._visible_row_limit() * self.row_height)
             painter.save()
             painter.setClipRect(QRectF(0, self.header_height, self.width, max(0, rows_bottom - self.header_height)))
@@ -275,6 +316,25 @@ class ERDTableItem(QGraphicsRectItem, ResizableItemMixin):
             painter.setBrush(QColor(255, 255, 255, 200)) # Semi-transparent white
             painter.drawRoundedRect(self.rect(), 4, 4)
 
+    def _paint_box(self, painter, is_selected) -> None:
+        """Zoomed-out rendering: a plain box in the group colour, no text or icons."""
+        if self.target_highlight:
+            border_color = QColor("#10B981")
+        elif is_selected or self.is_highlighted:
+            border_color = QColor("#1A73E8")
+        else:
+            border_color = QColor("#B0B0B0")
+        fill = self.group_color
+        if self.is_dimmed and not is_selected and not self.is_highlighted:
+            fill = QColor("#F4F4F4")
+        painter.setPen(QPen(border_color, 2 if (is_selected or self.is_highlighted or self.target_highlight) else 1))
+        painter.setBrush(QBrush(fill))
+        painter.drawRect(self.rect())
+
+    def sync_shadow(self) -> None:
+        """Show the drop shadow only on selected tables, and only while the scene allows effects."""
+        self.shadow.setEnabled(self.isSelected() and getattr(self.scene(), "effects_enabled", True))
+
     def hoverEnterEvent(self, event):
         if hasattr(self.scene(), "highlight_related"):
             self.scene().highlight_related(self)
@@ -384,15 +444,14 @@ class ERDTableItem(QGraphicsRectItem, ResizableItemMixin):
                 self.scene().undo_stack.endMacro()
             
             # Clear snap lines from scene
-            if hasattr(self.scene(), 'alignment_lines'):
-                self.scene().alignment_lines = []
-                self.scene().update_alignment_guides()
+            if hasattr(self.scene(), 'clear_alignment_guides'):
+                self.scene().clear_alignment_guides()
                 
             del self.scene()._drag_start_positions
 
     def itemChange(self, change, value):
         if change == QGraphicsItem.GraphicsItemChange.ItemSelectedHasChanged:
-            self.shadow.setEnabled(self.isSelected())
+            self.sync_shadow()
             return value
             
         if change == QGraphicsItem.GraphicsItemChange.ItemPositionChange and self.scene():
@@ -402,52 +461,20 @@ class ERDTableItem(QGraphicsRectItem, ResizableItemMixin):
             x, y = new_pos.x(), new_pos.y()
             
             if is_grabber:
-                snap_x, snap_y = x, y
-                lines = []
                 tolerance = 5.0
-                
-                my_w = self.width
-                my_h = self.height
-                
-                for item in self.scene().items():
-                    if isinstance(item, ERDTableItem) and item != self and not item.isSelected():
-                        other_pos = item.pos()
-                        other_w = item.width
-                        other_h = item.height
-                        
-                        # Left Edge
-                        if abs(x - other_pos.x()) < tolerance:
-                            snap_x = other_pos.x()
-                            lines.append(QLineF(snap_x, 0, snap_x, 1))
-                            
-                        # Top Edge
-                        if abs(y - other_pos.y()) < tolerance:
-                            snap_y = other_pos.y()
-                            lines.append(QLineF(0, snap_y, 1, snap_y))
-                            
-                        # Horizontal Center
-                        if abs((x + my_w/2) - (other_pos.x() + other_w/2)) < tolerance:
-                            snap_x = other_pos.x() + other_w/2 - my_w/2
-                            center_x = snap_x + my_w/2
-                            lines.append(QLineF(center_x, 0, center_x, 1))
-                            
-                        # Vertical Center
-                        if abs((y + my_h/2) - (other_pos.y() + other_h/2)) < tolerance:
-                            snap_y = other_pos.y() + other_h/2 - my_h/2
-                            center_y = snap_y + my_h/2
-                            lines.append(QLineF(0, center_y, 1, center_y))
-
-                if lines:
+                skip = {id(self)} | {id(item) for item in self.scene().selectedItems()}
+                snap_x, snap_y, vertical, horizontal = self.scene().table_index.snap(
+                    x, y, self.width, self.height, tolerance, skip
+                )
+                if vertical or horizontal:
                     x, y = snap_x, snap_y
-                    self.scene().alignment_lines = lines
                 else:
-                    self.scene().alignment_lines = []
                     # Snap to grid fallback
                     x = round(x / GRID_SNAP) * GRID_SNAP
                     y = round(y / GRID_SNAP) * GRID_SNAP
-                
-                if hasattr(self.scene(), "update_alignment_guides"):
-                    self.scene().update_alignment_guides()
+
+                if hasattr(self.scene(), "set_alignment_guides"):
+                    self.scene().set_alignment_guides(vertical, horizontal)
             else:
                 # Still snap followers to grid for consistent spacing
                 x = round(x / GRID_SNAP) * GRID_SNAP
@@ -456,12 +483,12 @@ class ERDTableItem(QGraphicsRectItem, ResizableItemMixin):
             return QPointF(x, y)
             
         if change == QGraphicsItem.GraphicsItemChange.ItemPositionHasChanged:
-            for conn in self.connections:
-                conn.updatePath()
-            if self.scene() and hasattr(self.scene(), 'update_scene_rect'):
-                self.scene().update_scene_rect()
-            if self.scene() and hasattr(self.scene(), '_router_cache'):
-                self.scene()._router_cache = None
+            table_index = getattr(self.scene(), "table_index", None)
+            if table_index is not None:
+                # Snapping and search read the index straight away
+                table_index.update(self)
+            # Routing, the obstacle index and the scene rect catch up once per frame
+            notify_item_moved(self)
         return super().itemChange(change, value)
 
     def get_column_anchor_pos(self, column_name: str | None, side: str = "left") -> QPointF:
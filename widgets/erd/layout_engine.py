@@ -1,158 +1,634 @@
-"""Sugiyama-style hierarchical auto-layout for ERD diagrams."""
-from collections import deque
+"""Hierarchical and force-directed auto-layout for ERD diagrams.
 
+The engine works on plain data (table names, sizes and FK edges) so it can run
+on the thread pool: ``layout_input`` snapshots the scene, ``compute_layout``
+returns table positions and ``apply_layout`` moves the items in one batch.
+"""
+import math
 
-def _build_bidirectional_adjacency(schema_data: dict) -> dict:
-    """Return an undirected adjacency list from FK relationships."""
-    adj: dict = {name: [] for name in schema_data.keys()}
+import numpy as np
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+LAYOUT_MODES = ("auto", "hierarchical", "force")
+
+LAYOUT_MARGIN = 100            # top-left corner of the laid-out diagram
+LAYOUT_PADDING_X = 180         # gap between hierarchy ranks
+LAYOUT_PADDING_Y = 60          # gap between tables in one rank
+LAYOUT_COMPONENT_GAP = 150     # gap between packed connected components
+LAYOUT_SWEEPS = 8              # alternating down/up median sweeps per component
+LAYOUT_MAX_RANK_TABLES = 60    # 'auto' lays a component out with forces past this rank height...
+LAYOUT_DENSE_EDGE_RATIO = 2.0  # ...or past this many FK edges per table
+LAYOUT_FORCE_GAP = 120         # preferred clearance between force-laid-out tables
+LAYOUT_COARSEST_SIZE = 40      # multilevel coarsening stops at this many clusters
+LAYOUT_FORCE_ITERATIONS = 250  # force iterations on the coarsest level
+LAYOUT_REFINE_ITERATIONS = 30  # force iterations on each finer level...
+LAYOUT_REFINE_WORK = 30000     # ...capped at this many node-iterations per level on large levels...
+LAYOUT_MIN_REFINE_ITERATIONS = 8  # ...but never fewer than this
+LAYOUT_EXACT_REPULSION = 400   # levels up to this size use exact all-pairs repulsion
+LAYOUT_CELL_TABLES = 8         # average tables per Barnes-Hut grid cell
+LAYOUT_FORCE_AREA = 2.5        # force drawings are scaled to this multiple of the tables' area
+LAYOUT_OVERLAP_PASSES = 80     # overlap-removal passes after force layout
+LAYOUT_GRID_MAX_SIDE = 1024    # cap on grid cells per side for neighbour queries
+LAYOUT_ASYNC_MIN_TABLES = 150  # smaller diagrams are laid out on the GUI thread
+
+
+def _never() -> bool:
+    return False
+
+
+def layout_input(schema_data: dict, item_map: dict) -> tuple[list, list, list]:
+    """Snapshot the tables in *item_map* as ``(names, sizes, edges)``; see ``layout_input_from_sizes``."""
+    sizes = {}
+    for name, item in item_map.items():
+        rect = item.rect()
+        sizes[name] = (rect.width(), rect.height())
+    return layout_input_from_sizes(schema_data, sizes)
+
+
+def layout_input_from_sizes(schema_data: dict, sizes: dict) -> tuple[list, list, list]:
+    """Layout input for the tables in *sizes* (name -> ``(width, height)``), before any item exists.
+
+    Returns ``(names, sizes, edges)`` where ``sizes`` is a list parallel to
+    ``names`` and ``edges`` holds distinct ``(referenced, referencing)`` index
+    pairs, one per FK between two tables.
+    """
+    names = list(sizes.keys())
+    index = {name: i for i, name in enumerate(names)}
+    edges = set()
     for full_name, table_info in schema_data.items():
+        u = index.get(full_name)
+        if u is None:
+            continue
         for fk in table_info.get('foreign_keys', []):
-            target = fk['table']
-            if target in schema_data:
-                adj[full_name].append(target)
-                adj[target].append(full_name)
-    return adj
+            v = index.get(fk['table'])
+            if v is not None and v != u:
+                edges.add((v, u))
+    return names, [sizes[name] for name in names], sorted(edges)
+
+
+def apply_layout(item_map: dict, positions: dict) -> None:
+    """Move the tables in *item_map* to *positions* (table name -> top-left corner)."""
+    for name, (x, y) in positions.items():
+        item = item_map.get(name)
+        if item is not None and item.scene() is not None:
+            item.setPos(x, y)
+
+
+def compute_layout(names: list, sizes: list, edges: list, mode: str = "auto",
+                   is_cancelled=_never) -> dict | None:
+    """Lay out the tables and return ``{name: (x, y)}``, or None if cancelled.
+
+    Each connected component is laid out on its own and the components are
+    shelf-packed, largest first. ``mode`` picks the algorithm: "hierarchical"
+    (ranked columns with median crossing minimization), "force" (multilevel
+    force-directed) or "auto", which uses forces only for components whose
+    ranks grow too tall or whose FK graph is dense.
+    """
+    if mode not in LAYOUT_MODES:
+        raise ValueError(f"Unknown layout mode: {mode}")
+    if not names:
+        return {}
+
+    adj = [[] for _ in names]
+    for u, v in edges:
+        adj[u].append(v)
+        adj[v].append(u)
+    components = _detect_components(adj)
+    component_of = [0] * len(names)
+    for c, comp in enumerate(components):
+        for node in comp:
+            component_of[node] = c
+    component_edges = [[] for _ in components]
+    for u, v in edges:
+        component_edges[component_of[u]].append((u, v))
+
+    blocks = []
+    for comp, comp_edges in zip(components, component_edges):
+        if is_cancelled():
+            return None
+        block = _layout_component(comp, comp_edges, sizes, mode, is_cancelled)
+        if block is None:
+            return None
+        blocks.append(block)
+
+    positions = _pack_components(blocks)
+    return {names[node]: pos for node, pos in positions.items()}
+
+
+def auto_layout(schema_data: dict, item_map: dict, mode: str = "auto") -> None:
+    """Lay out and move all items in *item_map* on the calling thread."""
+    if not item_map:
+        return
+    names, sizes, edges = layout_input(schema_data, item_map)
+    apply_layout(item_map, compute_layout(names, sizes, edges, mode))
+
 
+# --- Components ---
 
-def _detect_components(schema_data: dict, adj: dict) -> list[list[str]]:
+def _detect_components(adj: list) -> list[list[int]]:
     """Return connected components via stack-based DFS, largest first."""
-    visited: set = set()
-    components: list = []
-    for name in schema_data.keys():
-        if name not in visited:
-            comp: list = []
-            stack = [name]
-            while stack:
-                u = stack.pop()
-                if u not in visited:
-                    visited.add(u)
-                    comp.append(u)
-                    for v in adj[u]:
-                        if v not in visited:
-                            stack.append(v)
-            if comp:
-                components.append(comp)
+    visited = [False] * len(adj)
+    components = []
+    for start in range(len(adj)):
+        if visited[start]:
+            continue
+        visited[start] = True
+        comp = []
+        stack = [start]
+        while stack:
+            u = stack.pop()
+            comp.append(u)
+            for v in adj[u]:
+                if not visited[v]:
+                    visited[v] = True
+                    stack.append(v)
+        components.append(comp)
     components.sort(key=len, reverse=True)
     return components
 
 
-def _rank_component(comp_nodes: list, schema_data: dict) -> tuple[dict, dict, dict]:
-    """
-    Assign ranks (columns) to each node in one component via Kahn's BFS.
-    Returns (sub_adj, ranks, layers) dictionaries.
-    """
-    sub_adj: dict = {n: [] for n in comp_nodes}
-    sub_in_degree: dict = {n: 0 for n in comp_nodes}
-    sub_total_degree: dict = {n: 0 for n in comp_nodes}
-
-    for u in comp_nodes:
-        info = schema_data[u]
-        for fk in info.get('foreign_keys', []):
-            target = fk['table']
-            if target in sub_adj and target != u:
-                sub_adj[target].append(u)
-                sub_in_degree[u] += 1
-                sub_total_degree[u] += 1
-                sub_total_degree[target] += 1
-
-    # STEP: RANKING (Sugiyama Layering)
-    ranks: dict = {n: 0 for n in comp_nodes}
-    queue: deque = deque(n for n in comp_nodes if sub_in_degree[n] == 0)
-    while queue:
-        u = queue.popleft()
-        for v in sub_adj[u]:
-            sub_in_degree[v] -= 1
-            ranks[v] = max(ranks[v], ranks[u] + 1)
-            if sub_in_degree[v] == 0:
-                queue.append(v)
-
-    layers: dict = {}
-    for n in comp_nodes:
-        r = ranks[n]
-        if r not in layers:
-            layers[r] = []
-        layers[r].append(n)
-
-    return sub_total_degree, ranks, layers
-
-
-def _reduce_crossings(layers: dict, sub_total_degree: dict) -> None:
-    """
-    Sort nodes within each rank by degree (Barycenter heuristic) to reduce
-    edge crossings, placing high-degree nodes in the center of each column.
-    Mutates *layers* in-place.
+def _layout_component(comp: list, comp_edges: list, sizes: list, mode: str, is_cancelled):
+    """Lay out one component; returns ``({node: (x, y)}, width, height)`` or None if cancelled."""
+    if len(comp) == 1:
+        width, height = sizes[comp[0]]
+        return {comp[0]: (0.0, 0.0)}, width, height
+
+    if mode != "force":
+        ranks = _rank_component(comp, comp_edges)
+        layers: dict = {}
+        for node in comp:
+            layers.setdefault(ranks[node], []).append(node)
+        dense = len(comp_edges) > LAYOUT_DENSE_EDGE_RATIO * len(comp)
+        too_tall = max(len(layer) for layer in layers.values()) > LAYOUT_MAX_RANK_TABLES
+        if mode == "hierarchical" or not (dense or too_tall):
+            if not _order_layers(layers, comp_edges, ranks, is_cancelled):
+                return None
+            return _position_layers(layers, sizes)
+
+    return _force_component(comp, comp_edges, sizes, is_cancelled)
+
+
+def _pack_components(blocks: list) -> dict:
+    """Shelf-pack component blocks into rows as wide as the widest block or the square root of their area."""
+    area = sum((w + LAYOUT_COMPONENT_GAP) * (h + LAYOUT_COMPONENT_GAP) for _, w, h in blocks)
+    row_width = max(max(w for _, w, _ in blocks), math.sqrt(area))
+    positions = {}
+    x = y = row_height = 0.0
+    for local, width, height in blocks:
+        if x > 0 and x + width > row_width:
+            x = 0.0
+            y += row_height + LAYOUT_COMPONENT_GAP
+            row_height = 0.0
+        for node, (px, py) in local.items():
+            positions[node] = (LAYOUT_MARGIN + x + px, LAYOUT_MARGIN + y + py)
+        x += width + LAYOUT_COMPONENT_GAP
+        row_height = max(row_height, height)
+    return positions
+
+
+# --- Hierarchical layout ---
+
+def _rank_component(comp: list, comp_edges: list) -> dict:
+    """Longest-path ranks, referenced tables left of the tables referencing them.
+
+    FK cycles are broken by ignoring the DFS back edges that close them, so
+    every table gets a rank.
     """
-    for r in sorted(layers.keys()):
-        nodes = layers[r]
-        nodes.sort(key=lambda n: sub_total_degree[n], reverse=True)
-        central: deque = deque()
-        left = True
-        for node in nodes:
-            if left:
-                central.appendleft(node)
+    out: dict = {node: [] for node in comp}
+    has_parent = set()
+    for u, v in comp_edges:
+        out[u].append(v)
+        has_parent.add(v)
+
+    # Reverse DFS post-order is a topological order of the graph without back edges
+    state = dict.fromkeys(comp, 0)  # 0 unseen, 1 on the DFS stack, 2 finished
+    order = []
+    for root in sorted(comp, key=lambda node: node in has_parent):
+        if state[root]:
+            continue
+        state[root] = 1
+        stack = [(root, iter(out[root]))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if state[child] == 0:
+                    state[child] = 1
+                    stack.append((child, iter(out[child])))
+                    break
             else:
-                central.append(node)
-            left = not left
-        layers[r] = list(central)
+                stack.pop()
+                state[node] = 2
+                order.append(node)
+    order.reverse()
 
+    position = {node: i for i, node in enumerate(order)}
+    ranks = dict.fromkeys(comp, 0)
+    for u in order:
+        for v in out[u]:
+            if position[v] > position[u]:
+                ranks[v] = max(ranks[v], ranks[u] + 1)
+    return ranks
 
-def _position_component(
-    comp_nodes: list,
-    layers: dict,
-    item_map: dict,
-    current_y_offset: float,
-) -> float:
-    """
-    Set item positions for one component using left-to-right flow.
-    Returns the updated y-offset for the next component.
+
+def _centre_by_degree(nodes: list, degree: dict) -> list:
+    """Initial rank order: high-degree tables in the middle, alternating outwards."""
+    ordered = sorted(nodes, key=lambda n: degree[n], reverse=True)
+    return ordered[1::2][::-1] + ordered[0::2]
+
+
+def _median_key(values: list) -> tuple[float, float]:
+    """Median of sorted *values* (mean of the middle two for even counts), barycenter as tie-break."""
+    mid = len(values) // 2
+    median = values[mid] if len(values) % 2 else (values[mid - 1] + values[mid]) / 2
+    return median, sum(values) / len(values)
+
+
+def _count_inversions(values: list, size: int) -> int:
+    """Pairs i < j with values[i] > values[j], via a Fenwick tree over 0..size-1."""
+    tree = [0] * (size + 1)
+    inversions = 0
+    for seen, value in enumerate(values):
+        i = value + 1
+        not_greater = 0
+        while i > 0:
+            not_greater += tree[i]
+            i -= i & -i
+        inversions += seen - not_greater
+        i = value + 1
+        while i <= size:
+            tree[i] += 1
+            i += i & -i
+    return inversions
+
+
+def _count_crossings(layers: dict, comp_edges: list, ranks: dict, index: dict) -> int:
+    """Edge crossings between adjacent ranks for the current order."""
+    between: dict = {}
+    for u, v in comp_edges:
+        if ranks[v] == ranks[u] + 1:
+            between.setdefault(ranks[u], []).append((index[u], index[v]))
+        elif ranks[u] == ranks[v] + 1:
+            between.setdefault(ranks[v], []).append((index[v], index[u]))
+    crossings = 0
+    for r, pairs in between.items():
+        pairs.sort()
+        crossings += _count_inversions([b for _, b in pairs], len(layers[r + 1]))
+    return crossings
+
+
+def _order_layers(layers: dict, comp_edges: list, ranks: dict, is_cancelled) -> bool:
+    """Order every rank by alternating down/up median sweeps, keeping the order with the fewest crossings.
+
+    Edges spanning several ranks take part through the neighbour's relative
+    position in its own rank. Mutates *layers*; returns False if cancelled.
     """
-    padding_x = 180
-    padding_y = 60
-    sorted_ranks = sorted(layers.keys())
-
-    node_sizes = {
-        n: (item_map[n].rect().width(), item_map[n].rect().height())
-        for n in comp_nodes
-    }
-
-    layer_heights = []
-    max_comp_height = 0.0
-    for r in sorted_ranks:
-        h = sum(node_sizes[n][1] + padding_y for n in layers[r]) - padding_y
-        layer_heights.append(h)
-        max_comp_height = max(max_comp_height, h)
-
-    current_x = 100.0
-    for i, r in enumerate(sorted_ranks):
+    neighbours: dict = {node: [] for layer in layers.values() for node in layer}
+    for u, v in comp_edges:
+        neighbours[u].append(v)
+        neighbours[v].append(u)
+    degree = {node: len(adj) for node, adj in neighbours.items()}
+    keys = sorted(layers)
+    index: dict = {}
+    pos: dict = {}
+
+    def reindex(r):
+        layer = layers[r]
+        for i, node in enumerate(layer):
+            index[node] = i
+            pos[node] = (i + 0.5) / len(layer)
+
+    for r in keys:
+        layers[r] = _centre_by_degree(layers[r], degree)
+        reindex(r)
+    best = {r: list(layers[r]) for r in keys}
+    best_crossings = _count_crossings(layers, comp_edges, ranks, index)
+
+    for sweep in range(LAYOUT_SWEEPS):
+        if best_crossings == 0:
+            break
+        if is_cancelled():
+            return False
+        down = sweep % 2 == 0
+        for r in (keys[1:] if down else keys[-2::-1]):
+            sort_keys = {}
+            for node in layers[r]:
+                fixed = sorted(pos[m] for m in neighbours[node] if (ranks[m] < r if down else ranks[m] > r))
+                sort_keys[node] = (*_median_key(fixed), pos[node]) if fixed else (pos[node], pos[node], pos[node])
+            layers[r].sort(key=sort_keys.__getitem__)
+            reindex(r)
+        crossings = _count_crossings(layers, comp_edges, ranks, index)
+        if crossings < best_crossings:
+            best_crossings = crossings
+            best = {r: list(layers[r]) for r in keys}
+
+    layers.update(best)
+    return True
+
+
+def _position_layers(layers: dict, sizes: list) -> tuple[dict, float, float]:
+    """Place ranks left to right with each rank's tables stacked and vertically centred."""
+    keys = sorted(layers)
+    layer_heights = [
+        sum(sizes[n][1] + LAYOUT_PADDING_Y for n in layers[r]) - LAYOUT_PADDING_Y
+        for r in keys
+    ]
+    max_height = max(layer_heights)
+
+    positions = {}
+    x = 0.0
+    for r, layer_height in zip(keys, layer_heights):
         nodes = layers[r]
-        max_w = max(node_sizes[n][0] for n in nodes)
-        layer_h = layer_heights[i]
-        start_y = current_y_offset + (max_comp_height - layer_h) / 2
-        local_y = start_y
-        for name in nodes:
-            item_map[name].setPos(current_x, local_y)
-            local_y += node_sizes[name][1] + padding_y
-        current_x += max_w + padding_x
+        y = (max_height - layer_height) / 2
+        for node in nodes:
+            positions[node] = (x, y)
+            y += sizes[node][1] + LAYOUT_PADDING_Y
+        x += max(sizes[n][0] for n in nodes) + LAYOUT_PADDING_X
+    return positions, x - LAYOUT_PADDING_X, max_height
+
+
+# --- Force-directed layout ---
+
+def _grid_cells(pos: np.ndarray, cell: float) -> tuple[np.ndarray, int]:
+    """Integer grid coordinates of *pos* for cells at least *cell* wide, and the grid side."""
+    lo = pos.min(axis=0)
+    extent = float(np.ptp(pos, axis=0).max())
+    side = min(int(extent / cell) + 1, LAYOUT_GRID_MAX_SIDE)
+    cell = max(cell, extent / side + 1e-9)
+    ij = np.minimum(((pos - lo) / cell).astype(np.int64), side - 1)
+    return ij, side
+
 
-    return current_y_offset + max_comp_height + 150
+def _neighbour_pairs(ij: np.ndarray, side: int) -> tuple[np.ndarray, np.ndarray]:
+    """Index pairs ``(i, j)``, i != j, of nodes in the same or adjacent grid cells."""
+    n = len(ij)
+    cell_id = ij[:, 0] * side + ij[:, 1]
+    order = np.argsort(cell_id, kind="stable")
+    counts = np.bincount(cell_id, minlength=side * side)
+    starts = np.cumsum(counts) - counts
+    sources, targets = [], []
+    for di in (-1, 0, 1):
+        for dj in (-1, 0, 1):
+            ni = ij[:, 0] + di
+            nj = ij[:, 1] + dj
+            valid = (ni >= 0) & (ni < side) & (nj >= 0) & (nj < side)
+            cells = np.where(valid, ni * side + nj, 0)
+            found = np.where(valid, counts[cells], 0)
+            total = int(found.sum())
+            if not total:
+                continue
+            src = np.repeat(np.arange(n), found)
+            first = np.repeat(starts[cells] - (np.cumsum(found) - found), found)
+            dst = order[first + np.arange(total)]
+            keep = src != dst
+            sources.append(src[keep])
+            targets.append(dst[keep])
+    if not sources:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+    return np.concatenate(sources), np.concatenate(targets)
 
 
-def auto_layout(schema_data: dict, item_map: dict) -> None:
+def _repulsion(pos: np.ndarray, mass: np.ndarray, k: float) -> np.ndarray:
+    """Repulsive forces ``k^2 * m / d`` between all nodes.
+
+    Small levels are computed exactly. Larger ones use a Barnes-Hut style
+    approximation on a uniform grid: exact forces from nodes in the same and
+    adjacent cells, and one force per farther cell from its centre of mass,
+    evaluated at the centre of mass of the node's own cell.
     """
-    Apply Sugiyama-style hierarchical layout to all items in *item_map*.
+    n = len(pos)
+    floor = (0.01 * k) ** 2
+    if n <= LAYOUT_EXACT_REPULSION:
+        delta = pos[:, None, :] - pos[None, :, :]
+        d2 = (delta ** 2).sum(axis=2) + floor
+        return (delta * (k * k * mass[None, :] / d2)[:, :, None]).sum(axis=1)
+
+    side = max(2, int(math.sqrt(n / LAYOUT_CELL_TABLES)))
+    extent = float(np.ptp(pos, axis=0).max())
+    ij, side = _grid_cells(pos, extent / side + 1e-9)
+    cell_id = ij[:, 0] * side + ij[:, 1]
+    cell_mass = np.bincount(cell_id, weights=mass, minlength=side * side)
+    occupied = np.nonzero(cell_mass)[0]
+    occupied_mass = cell_mass[occupied]
+    centroid = np.stack([
+        np.bincount(cell_id, weights=mass * pos[:, 0], minlength=side * side)[occupied],
+        np.bincount(cell_id, weights=mass * pos[:, 1], minlength=side * side)[occupied],
+    ], axis=1) / occupied_mass[:, None]
+
+    # Far field is evaluated per cell pair and shared by the nodes of a cell
+    cell_i, cell_j = occupied // side, occupied % side
+    near = (
+        (np.abs(cell_i[:, None] - cell_i[None, :]) <= 1)
+        & (np.abs(cell_j[:, None] - cell_j[None, :]) <= 1)
+    )
+    delta = centroid[:, None, :] - centroid[None, :, :]
+    d2 = (delta ** 2).sum(axis=2) + floor
+    weight = np.where(near, 0.0, k * k * occupied_mass[None, :] / d2)
+    far = np.zeros((side * side, 2))
+    far[occupied] = (delta * weight[:, :, None]).sum(axis=1)
+    force = far[cell_id]
+
+    src, dst = _neighbour_pairs(ij, side)
+    delta = pos[src] - pos[dst]
+    weight = k * k * mass[dst] / ((delta ** 2).sum(axis=1) + floor)
+    force[:, 0] += np.bincount(src, weights=delta[:, 0] * weight, minlength=n)
+    force[:, 1] += np.bincount(src, weights=delta[:, 1] * weight, minlength=n)
+    return force
+
 
-    Mutates item positions directly via QGraphicsItem.setPos().
+def _force_iterations(pos, eu, ev, mass, k, iterations, start_temperature, is_cancelled):
+    """Fruchterman-Reingold iterations with geometric cooling; returns None if cancelled."""
+    n = len(pos)
+    end_temperature = 0.05 * k
+    cooling = (end_temperature / start_temperature) ** (1 / max(1, iterations - 1)) if start_temperature > end_temperature else 1.0
+    temperature = start_temperature
+    for step in range(iterations):
+        if step % 10 == 0 and is_cancelled():
+            return None
+        force = _repulsion(pos, mass, k)
+        if len(eu):
+            delta = pos[ev] - pos[eu]
+            pull = delta * (np.sqrt((delta ** 2).sum(axis=1)) / k)[:, None]
+            for axis in (0, 1):
+                force[:, axis] += np.bincount(eu, weights=pull[:, axis], minlength=n)
+                force[:, axis] -= np.bincount(ev, weights=pull[:, axis], minlength=n)
+        length = np.sqrt((force ** 2).sum(axis=1)) + 1e-9
+        pos = pos + force * (np.minimum(length, temperature) / length)[:, None]
+        temperature *= cooling
+    return pos
+
+
+def _coarsen(n: int, eu: np.ndarray, ev: np.ndarray, rng) -> list:
+    """Multilevel hierarchy from matching neighbours, finest level first.
+
+    Each level is ``(n, eu, ev, mass, parent)`` where ``parent`` maps a node to
+    its cluster on the next coarser level (None on the coarsest). Unmatched
+    leaves join their neighbour's cluster so star-shaped schemas still shrink.
     """
-    if not item_map:
-        return
+    mass = np.ones(n)
+    levels = []
+    while n > LAYOUT_COARSEST_SIZE and len(eu):
+        adj = [[] for _ in range(n)]
+        for a, b in zip(eu.tolist(), ev.tolist()):
+            adj[a].append(b)
+            adj[b].append(a)
+        parent = [-1] * n
+        clusters = 0
+        for node in rng.permutation(n).tolist():
+            if parent[node] >= 0:
+                continue
+            partner = min((m for m in adj[node] if parent[m] < 0), key=mass.__getitem__, default=None)
+            parent[node] = clusters
+            if partner is not None:
+                parent[partner] = clusters
+            clusters += 1
+        sizes = np.bincount(parent, minlength=clusters)
+        for node in range(n):
+            if len(adj[node]) == 1 and sizes[parent[node]] == 1:
+                parent[node] = parent[adj[node][0]]
+        _, parent = np.unique(np.asarray(parent), return_inverse=True)
+        clusters = int(parent.max()) + 1
+        if clusters > 0.9 * n:
+            break
+
+        levels.append((n, eu, ev, mass, parent))
+        cu, cv = parent[eu], parent[ev]
+        keep = cu != cv
+        pairs = np.unique(np.stack([np.minimum(cu, cv)[keep], np.maximum(cu, cv)[keep]], axis=1), axis=0)
+        n, eu, ev = clusters, pairs[:, 0], pairs[:, 1]
+        mass = np.bincount(parent, weights=mass, minlength=clusters)
+    levels.append((n, eu, ev, mass, None))
+    return levels
+
+
+def _remove_overlaps(pos: np.ndarray, width: np.ndarray, height: np.ndarray, is_cancelled) -> np.ndarray | None:
+    """Push overlapping tables apart along their axis of least overlap."""
+    gap = LAYOUT_FORCE_GAP / 2
+    cell = float(max(width.max(), height.max())) + gap
+    n = len(pos)
+    for _ in range(LAYOUT_OVERLAP_PASSES):
+        if is_cancelled():
+            return None
+        ij, side = _grid_cells(pos, cell)
+        src, dst = _neighbour_pairs(ij, side)
+        delta = pos[src] - pos[dst]
+        overlap_x = (width[src] + width[dst]) / 2 + gap - np.abs(delta[:, 0])
+        overlap_y = (height[src] + height[dst]) / 2 + gap - np.abs(delta[:, 1])
+        hit = (overlap_x > 0) & (overlap_y > 0)
+        if not hit.any():
+            break
+        src, dst = src[hit], dst[hit]
+        delta, overlap_x, overlap_y = delta[hit], overlap_x[hit], overlap_y[hit]
+        along_x = overlap_x < overlap_y
+        # Coincident centres separate by index so the pair does not move together
+        direction = np.where(delta == 0, np.where(src > dst, 1.0, -1.0)[:, None], np.sign(delta))
+        shift_x = np.where(along_x, direction[:, 0] * overlap_x / 2, 0.0)
+        shift_y = np.where(along_x, 0.0, direction[:, 1] * overlap_y / 2)
+        pos = pos + np.stack([
+            np.bincount(src, weights=shift_x, minlength=n),
+            np.bincount(src, weights=shift_y, minlength=n),
+        ], axis=1)
+    else:
+        # Crowded spots can oscillate; move tables that still overlap to the nearest free spot
+        _relocate_overlapping(pos, width, height, gap)
+    return pos
+
+
+def _relocate_overlapping(pos: np.ndarray, width: np.ndarray, height: np.ndarray, gap: float) -> None:
+    """Move each table that overlaps another to the nearest position on rings around it with *gap* clearance."""
+    step = float(max(width.max(), height.max())) / 2
+
+    def clashes(i, points, clearance):
+        overlap_x = (width[i] + width)[None, :] / 2 + clearance - np.abs(points[:, None, 0] - pos[None, :, 0])
+        overlap_y = (height[i] + height)[None, :] / 2 + clearance - np.abs(points[:, None, 1] - pos[None, :, 1])
+        hit = (overlap_x > 0) & (overlap_y > 0)
+        hit[:, i] = False
+        return hit.any(axis=1)
+
+    ij, side = _grid_cells(pos, step * 2)
+    src, dst = _neighbour_pairs(ij, side)
+    delta = np.abs(pos[src] - pos[dst])
+    overlapping = (delta[:, 0] < (width[src] + width[dst]) / 2) & (delta[:, 1] < (height[src] + height[dst]) / 2)
+    for i in np.unique(src[overlapping]).tolist():
+        if not clashes(i, pos[i:i + 1], 0.0)[0]:
+            continue
+        for ring in range(1, LAYOUT_GRID_MAX_SIDE):
+            angles = np.linspace(0, 2 * math.pi, 8 * ring, endpoint=False)
+            points = pos[i] + ring * step * np.stack([np.cos(angles), np.sin(angles)], axis=1)
+            free = np.nonzero(~clashes(i, points, gap))[0]
+            if len(free):
+                pos[i] = points[free[0]]
+                break
+
+
+def _force_component(comp: list, comp_edges: list, sizes: list, is_cancelled):
+    """Multilevel force-directed layout of one component, then overlap removal."""
+    local = {node: i for i, node in enumerate(comp)}
+    width = np.array([sizes[node][0] for node in comp], dtype=np.float64)
+    height = np.array([sizes[node][1] for node in comp], dtype=np.float64)
+    eu = np.array([local[u] for u, _ in comp_edges], dtype=np.int64)
+    ev = np.array([local[v] for _, v in comp_edges], dtype=np.int64)
+    k = float(np.mean(np.maximum(width, height))) + LAYOUT_FORCE_GAP
+    rng = np.random.default_rng(0)
+
+    levels = _coarsen(len(comp), eu, ev, rng)
+    n, eu_c, ev_c, mass, _ = levels[-1]
+    spread = k * math.sqrt(n)
+    pos = rng.uniform(-spread, spread, (n, 2))
+    pos = _force_iterations(pos, eu_c, ev_c, mass, k, LAYOUT_FORCE_ITERATIONS, spread / 2, is_cancelled)
+    for n, eu_f, ev_f, mass, parent in reversed(levels[:-1]):
+        if pos is None:
+            return None
+        pos = pos[parent] + rng.uniform(-0.1 * k, 0.1 * k, (n, 2))
+        # Finer levels start from their coarser parent's placement, so the
+        # largest ones need fewer passes; this keeps big schemas in budget
+        iterations = max(LAYOUT_MIN_REFINE_ITERATIONS, min(LAYOUT_REFINE_ITERATIONS, LAYOUT_REFINE_WORK // n))
+        pos = _force_iterations(pos, eu_f, ev_f, mass, k, iterations, k, is_cancelled)
+    if pos is None:
+        return None
+
+    # Scale the drawing to a fixed multiple of the tables' own area before removing overlaps
+    needed = LAYOUT_FORCE_AREA * float(((width + LAYOUT_FORCE_GAP) * (height + LAYOUT_FORCE_GAP)).sum())
+    extent = np.ptp(pos, axis=0) + [width.mean(), height.mean()]
+    pos = pos * math.sqrt(needed / (extent[0] * extent[1]))
+    pos = _remove_overlaps(pos, width, height, is_cancelled)
+    if pos is None:
+        return None
+    left = pos[:, 0] - width / 2
+    top = pos[:, 1] - height / 2
+    x0, y0 = float(left.min()), float(top.min())
+    positions = {node: (float(left[i]) - x0, float(top[i]) - y0) for i, node in enumerate(comp)}
+    return positions, float((left + width).max()) - x0, float((top + height).max()) - y0
+
+
+# --- Background job ---
+
+class LayoutSignals(QObject):
+    finished = Signal(int, object)  # generation, {table name: (x, y)}
+    error = Signal(int, str)
+
+
+class RunnableERDLayout(QRunnable):
+    """Computes an ERD layout from a plain-data snapshot on the thread pool."""
 
-    adj = _build_bidirectional_adjacency(schema_data)
-    components = _detect_components(schema_data, adj)
+    def __init__(self, generation, token, signals, names, sizes, edges, mode="auto"):
+        super().__init__()
+        self.generation = generation
+        self.token = token
+        self.signals = signals
+        self.names = names
+        self.sizes = sizes
+        self.edges = edges
+        self.mode = mode
 
-    current_y_offset = 100.0
-    for comp_nodes in components:
-        sub_total_degree, _ranks, layers = _rank_component(comp_nodes, schema_data)
-        _reduce_crossings(layers, sub_total_degree)
-        current_y_offset = _position_component(
-            comp_nodes, layers, item_map, current_y_offset
-        )
+    def run(self):
+        try:
+            positions = compute_layout(self.names, self.sizes, self.edges, self.mode, lambda: self.token.cancelled)
+            if positions is None or self.token.cancelled:
+                return
+            self.signals.finished.emit(self.generation, positions)
+        except Exception as e:
+            try:
+                self.signals.error.emit(self.generation, str(e))
+            except RuntimeError:
+                pass
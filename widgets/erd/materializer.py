@@ -0,0 +1,325 @@
+"""Progressive, time-sliced construction of ERD scenes from schema data."""
+import time
+
+import numpy as np
+from PySide6.QtCore import QObject, QPointF, QRectF, QThreadPool, QTimer, Signal
+
+from widgets.erd.items.connection_item import ERDConnectionItem
+from widgets.erd.items.table_item import ERDTableItem, table_auto_size
+from widgets.erd.layout_engine import (
+    LAYOUT_ASYNC_MIN_TABLES,
+    LayoutSignals,
+    RunnableERDLayout,
+    compute_layout,
+    layout_input_from_sizes,
+)
+from widgets.erd.model import DEFAULT_SCHEMA, normalize_entity
+from widgets.erd.scene import SCENE_MARGIN
+from workers.grid_filter import FilterToken
+
+MATERIALIZE_SLICE_MS: int = 12     # GUI-thread work per slice; the event loop runs in between
+MATERIALIZE_CHECK_EVERY: int = 16  # items built between deadline checks
+
+
+def prepare_table(full_name: str, table_info: dict) -> tuple[str, str, list]:
+    """``(table_name, schema_name, columns)`` for one schema entry, with FK columns flagged."""
+    info = normalize_entity(table_info)
+    table_name = info.get('table', full_name)
+    schema_name = info.get('schema', DEFAULT_SCHEMA)
+    columns = info['columns']
+    fk_cols = {fk['from'] for fk in info.get('foreign_keys', [])}
+    for col in columns:
+        if col['name'] in fk_cols:
+            col['fk'] = True
+    return table_name, schema_name, columns
+
+
+def iter_connection_specs(schema_data: dict, tables: dict):
+    """Yield ``(source_item, target_item, from_col, to_col, is_identifying, is_unique, fk)`` per FK."""
+    for full_name, table_info in schema_data.items():
+        info = normalize_entity(table_info)
+        source_item = tables.get(full_name)
+        if not source_item:
+            continue
+        pk_cols = {col['name'] for col in info['columns'] if col.get('pk')}
+        for fk in info.get('foreign_keys', []):
+            target_item = tables.get(fk['table'])
+            if not target_item:
+                continue
+            is_identifying = fk['from'] in pk_cols
+            is_unique = (
+                fk.get("type") == "one-to-one"
+                or is_identifying
+                or any(
+                    col['name'] == fk['from'] and col.get('unique')
+                    for col in info['columns']
+                )
+            )
+            yield source_item, target_item, fk['from'], fk['to'], is_identifying, is_unique, fk
+
+
+class SchemaMaterializer(QObject):
+    """Builds a widget's ERD scene from schema data in time slices so the GUI stays responsive.
+
+    Tables are measured first and laid out from plain data on the thread
+    pool. Their items are then created in batches, nearest the viewport
+    first. Connections are created unrouted and are routed in a last pass
+    once every table has its final position, again nearest the viewport
+    first.
+
+    Saved documents skip measuring and layout: ``start_saved`` takes table
+    records with their stored geometry, already ordered viewport-first.
+    """
+
+    progress = Signal(str, int, int)      # phase, done, total (0 while the total is unknown)
+    tables_ready = Signal(float, float, float)  # first batch is in the scene; scene point to centre on, zoom
+    finished = Signal()
+    failed = Signal(str)
+
+    def __init__(self, widget) -> None:
+        super().__init__(widget)
+        self._widget = widget
+        self._generation = 0
+        self._token = None
+        self._phase = None
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._step)
+        self._layout_signals = LayoutSignals(self)
+        self._layout_signals.finished.connect(self._on_layout_finished)
+        self._layout_signals.error.connect(self._on_layout_error)
+
+    @property
+    def active(self) -> bool:
+        return self._phase is not None
+
+    def cancel(self) -> None:
+        """Stop building; items already in the scene stay."""
+        self._generation += 1
+        if self._token is not None:
+            self._token.cancel()
+            self._token = None
+        self._timer.stop()
+        self._phase = None
+        self._records = None
+
+    def start(self, schema_data: dict) -> None:
+        self.cancel()
+        self._schema_data = schema_data
+        self._names = list(schema_data.keys())
+        self._prepared = {}
+        self._sizes = {}
+        self._done = 0
+        self._phase = "measure"
+        self._timer.start()
+
+    def start_saved(self, schema_data: dict, records, total: int, centre: QPointF, scale: float) -> None:
+        """Build tables from ``(name, definition, view_state)`` *records*, filling *schema_data* as they arrive."""
+        self.cancel()
+        self._schema_data = schema_data
+        self._records = iter(records)
+        self._records_total = total
+        self._anchor = centre
+        self._scale = scale
+        self._shown = False
+        self._done = 0
+        self._phase = "records"
+        self._timer.start()
+
+    # --- Phases ---
+
+    def _step(self) -> None:
+        deadline = time.perf_counter() + MATERIALIZE_SLICE_MS / 1000
+        if self._phase == "measure":
+            self._measure(deadline)
+        elif self._phase == "records":
+            self._create_saved_tables(deadline)
+        elif self._phase == "tables":
+            self._create_tables(deadline)
+        elif self._phase == "connections":
+            self._create_connections(deadline)
+        elif self._phase == "routing":
+            self._route(deadline)
+
+    def _measure(self, deadline: float) -> None:
+        total = len(self._names)
+        while self._done < total:
+            name = self._names[self._done]
+            table_name, schema_name, columns = prepare_table(name, self._schema_data[name])
+            self._prepared[name] = (table_name, schema_name, columns)
+            self._sizes[name] = table_auto_size(table_name, schema_name, columns)
+            self._done += 1
+            if self._done % MATERIALIZE_CHECK_EVERY == 0 and time.perf_counter() > deadline:
+                break
+        self.progress.emit("Measuring tables", self._done, total)
+        if self._done == total:
+            self._start_layout()
+
+    def _start_layout(self) -> None:
+        self._timer.stop()
+        self._phase = "layout"
+        names, sizes, edges = layout_input_from_sizes(self._schema_data, self._sizes)
+        self.progress.emit(f"Laying out {len(names)} tables", 0, 0)
+        if len(names) < LAYOUT_ASYNC_MIN_TABLES:
+            self._on_layout_finished(self._generation, compute_layout(names, sizes, edges))
+            return
+        self._token = FilterToken()
+        QThreadPool.globalInstance().start(
+            RunnableERDLayout(self._generation, self._token, self._layout_signals, names, sizes, edges)
+        )
+
+    def _on_layout_error(self, generation, message) -> None:
+        if generation != self._generation:
+            return
+        self.cancel()
+        self.failed.emit(message)
+
+    def _on_layout_finished(self, generation, positions) -> None:
+        if generation != self._generation:
+            return
+        self._token = None
+        self._positions = positions
+        self._table_names = list(positions.keys())
+        centres = [
+            (x + self._sizes[name][0] / 2, y + self._sizes[name][1] / 2)
+            for name, (x, y) in positions.items()
+        ]
+        self._centres = np.asarray(centres, dtype=np.float64).reshape(-1, 2)
+        self._pending = np.arange(len(self._table_names))
+        self._group_colors = self._widget._group_colors()
+        self._shown = False
+        self._scale = 1.0
+
+        scene = self._widget.scene
+        if positions:
+            left = min(x for x, _ in positions.values())
+            top = min(y for _, y in positions.values())
+            right = max(x + self._sizes[name][0] for name, (x, _) in positions.items())
+            bottom = max(y + self._sizes[name][1] for name, (_, y) in positions.items())
+            bounds = QRectF(left, top, right - left, bottom - top)
+            scene.setSceneRect(bounds.adjusted(-SCENE_MARGIN, -SCENE_MARGIN, SCENE_MARGIN, SCENE_MARGIN))
+            # Same initial viewpoint as ERDWidget._center_view_deferred
+            self._anchor = QPointF(bounds.center().x(), bounds.top() + bounds.height() * 0.25)
+        else:
+            self._anchor = QPointF(0, 0)
+        self._done = 0
+        self._phase = "tables"
+        self._timer.start()
+
+    def _nearest_first(self, pending: np.ndarray, centres: np.ndarray) -> np.ndarray:
+        """*pending* indices ordered by distance from the centre of the viewport."""
+        if self._shown:
+            view = self._widget.view
+            focus = view.mapToScene(view.viewport().rect().center())
+        else:
+            focus = self._anchor
+        d2 = (centres[pending, 0] - focus.x()) ** 2 + (centres[pending, 1] - focus.y()) ** 2
+        return pending[np.argsort(d2, kind="stable")]
+
+    def _create_tables(self, deadline: float) -> None:
+        scene = self._widget.scene
+        order = self._nearest_first(self._pending, self._centres)
+        built = 0
+        for index in order.tolist():
+            name = self._table_names[index]
+            table_name, schema_name, columns = self._prepared[name]
+            item = ERDTableItem(table_name, columns, schema_name=schema_name)
+            item.group_color = self._group_colors.get(name, item.group_color)
+            item.setPos(*self._positions[name])
+            scene.addItem(item)
+            scene.tables[name] = item
+            built += 1
+            if built % MATERIALIZE_CHECK_EVERY == 0 and time.perf_counter() > deadline:
+                break
+        self._pending = order[built:]
+        self._done += built
+        self.progress.emit("Creating tables", self._done, len(self._table_names))
+        if not self._shown:
+            self._shown = True
+            self.tables_ready.emit(self._anchor.x(), self._anchor.y(), self._scale)
+        if not len(self._pending):
+            self._start_connections()
+
+    def _create_saved_tables(self, deadline: float) -> None:
+        scene = self._widget.scene
+        built = 0
+        exhausted = False
+        while True:
+            record = next(self._records, None)
+            if record is None:
+                exhausted = True
+                break
+            name, definition, view_state = record
+            self._schema_data[name] = definition
+            table_name, schema_name, columns = prepare_table(name, definition)
+            item = ERDTableItem(table_name, columns, schema_name=schema_name)
+            item.restore_view_state(view_state)
+            scene.addItem(item)
+            scene.tables[name] = item
+            built += 1
+            if built % MATERIALIZE_CHECK_EVERY == 0 and time.perf_counter() > deadline:
+                break
+        self._done += built
+        self.progress.emit("Loading tables", self._done, self._records_total)
+        if not self._shown:
+            self._shown = True
+            self.tables_ready.emit(self._anchor.x(), self._anchor.y(), self._scale)
+        if exhausted:
+            self._records = None
+            # Group colours need the whole FK graph, so they are applied once every table is in
+            self._widget._assign_group_colors()
+            self._start_connections()
+
+    def _start_connections(self) -> None:
+        self._specs = list(iter_connection_specs(self._schema_data, self._widget.scene.tables))
+        self._connections = []
+        self._done = 0
+        self._phase = "connections"
+
+    def _create_connections(self, deadline: float) -> None:
+        scene = self._widget.scene
+        total = len(self._specs)
+        while self._done < total:
+            source, target, from_col, to_col, is_identifying, is_unique, fk = self._specs[self._done]
+            conn = ERDConnectionItem(
+                source, target, from_col, to_col,
+                is_identifying=is_identifying,
+                is_unique=is_unique,
+                fk_meta=fk,
+                route=False,
+            )
+            scene.addItem(conn)
+            self._connections.append(conn)
+            self._done += 1
+            if self._done % MATERIALIZE_CHECK_EVERY == 0 and time.perf_counter() > deadline:
+                break
+        self.progress.emit("Creating relationships", self._done, total)
+        if self._done == total:
+            midpoints = []
+            for conn in self._connections:
+                a = conn.source_item.sceneBoundingRect().center()
+                b = conn.target_item.sceneBoundingRect().center()
+                midpoints.append(((a.x() + b.x()) / 2, (a.y() + b.y()) / 2))
+            self._midpoints = np.asarray(midpoints, dtype=np.float64).reshape(-1, 2)
+            self._pending = np.arange(len(self._connections))
+            self._done = 0
+            self._phase = "routing"
+
+    def _route(self, deadline: float) -> None:
+        order = self._nearest_first(self._pending, self._midpoints)
+        routed = 0
+        for index in order.tolist():
+            conn = self._connections[index]
+            if conn.scene() is self._widget.scene:
+                conn.updatePath()
+            routed += 1
+            if routed % 4 == 0 and time.perf_counter() > deadline:
+                break
+        self._pending = order[routed:]
+        self._done += routed
+        self.progress.emit("Routing relationships", self._done, len(self._connections))
+        if not len(self._pending):
+            self._timer.stop()
+            self._phase = None
+            self._widget.scene.update_scene_rect()
+            self.finished.emit()
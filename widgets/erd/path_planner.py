@@ -1,9 +1,11 @@
 """Manhattan-path planner for ERD connections: slot assignment, obstacle avoidance, orthogonalisation."""
-from PySide6.QtCore import QPointF
+from PySide6.QtCore import QPointF, QRectF
 
 
+import widgets.erd.items.table_item
 from widgets.erd.items.resizable import item_visual_scene_rect
 from widgets.erd.routing import get_chen_boundary_anchor, get_dynamic_anchor
+from widgets.erd.slot_allocator import item_slots, preferred_side, relationship_key
 
 
 class ERDConnectionPathPlanner:
@@ -12,18 +14,7 @@ class ERDConnectionPathPlanner:
 
     def _relationship_key(self, conn=None):
         """Stable key for a pair of items to ensure they share a routing slot."""
-        relation_conn = conn or self.connection_item
-        def get_name(it):
-            if hasattr(it, "label"):
-                return it.label
-            if hasattr(it, "table_name"):
-                return it.table_name
-            return str(id(it))
-        names = sorted([
-            get_name(relation_conn.source_item),
-            get_name(relation_conn.target_item)
-        ])
-        return "-".join(names)
+        return relationship_key(conn or self.connection_item)
 
     def _is_chen_connection(self) -> bool:
         """Returns True if both ends of the connection are Chen ERD elements."""
@@ -33,46 +24,13 @@ class ERDConnectionPathPlanner:
                 getattr(t_item, "is_chen_item", False))
 
     def _preferred_side(self, item, other_item) -> str:
-        item_rect = item_visual_scene_rect(item)
-        other_rect = item_visual_scene_rect(other_item)
-        dx = other_rect.center().x() - item_rect.center().x()
-        dy = other_rect.center().y() - item_rect.center().y()
-        if abs(dx) >= abs(dy):
-            return "right" if dx >= 0 else "left"
-        return "bottom" if dy >= 0 else "top"
-
-    def _get_side_relationship_keys(self, item, side) -> list:
-        keys = []
-        seen: set = set()
-        for conn in item.connections:
-            if conn.source_item == item:
-                other_item = conn.target_item
-                conn_side = getattr(conn, "_last_source_side", None)
-            else:
-                other_item = conn.source_item
-                conn_side = getattr(conn, "_last_target_side", None)
-            if conn_side is None:
-                conn_side = self._preferred_side(item, other_item)
-            if conn_side != side:
-                continue
-            rel_key = self._relationship_key(conn)
-            if rel_key in seen:
-                continue
-            seen.add(rel_key)
-            keys.append(rel_key)
-        keys.sort()
-        return keys
+        return preferred_side(item_visual_scene_rect(item), item_visual_scene_rect(other_item))
 
     def _apply_slot_offset(self, item, side: str, anchor: QPointF) -> QPointF:
-        rel_key = self._relationship_key()
-        keys = self._get_side_relationship_keys(item, side)
-        if rel_key not in keys:
-            keys.append(rel_key)
-            keys.sort()
-        if len(keys) <= 1:
+        slot_index, slot_count = item_slots(item).side_slot(side, self._relationship_key())
+        if slot_count <= 1:
             return anchor
-        slot_index = keys.index(rel_key)
-        centered_index = slot_index - ((len(keys) - 1) / 2.0)
+        centered_index = slot_index - ((slot_count - 1) / 2.0)
         spacing = 22.0
         offset = centered_index * spacing
         rect = item_visual_scene_rect(item)
@@ -169,15 +127,16 @@ class ERDConnectionPathPlanner:
 
     def _path_hits_obstacles(self, points: list) -> bool:
         scene = self.connection_item.scene()
-        if not scene:
+        if not scene or not hasattr(scene, "get_router"):
             return False
-        for item in scene.items():
-            if not isinstance(item, ERDTableItem):
-                continue
-            if item in (self.connection_item.source_item, self.connection_item.target_item):
-                continue
-            rect = item_visual_scene_rect(item).adjusted(2, 2, -2, -2)
-            for i in range(len(points) - 1):
+        index = scene.get_router().index
+        endpoints = (self.connection_item.source_item, self.connection_item.target_item)
+        for i in range(len(points) - 1):
+            segment_rect = QRectF(points[i], points[i + 1]).normalized().adjusted(-1, -1, 1, 1)
+            for item in index.query(segment_rect):
+                if item in endpoints or not isinstance(item, widgets.erd.items.table_item.ERDTableItem):
+                    continue
+                rect = index.rect(item).adjusted(2, 2, -2, -2)
                 if self._segment_hits_rect(points[i], points[i + 1], rect):
                     return True
         return False
@@ -197,34 +156,11 @@ class ERDConnectionPathPlanner:
             return cand
         return None
 
-    def _get_pair_relationship_keys(self, item_a, item_b) -> list:
-        keys = []
-        seen: set = set()
-        for conn in item_a.connections:
-            pair_match = (
-                (conn.source_item == item_a and conn.target_item == item_b) or
-                (conn.source_item == item_b and conn.target_item == item_a)
-            )
-            if not pair_match:
-                continue
-            rel_key = self._relationship_key(conn)
-            if rel_key in seen:
-                continue
-            seen.add(rel_key)
-            keys.append(rel_key)
-        keys.sort()
-        return keys
-
     def _get_pair_slot_offset(self, item_a, item_b, spacing: float = 16.0) -> float:
-        rel_key = self._relationship_key()
-        keys = self._get_pair_relationship_keys(item_a, item_b)
-        if rel_key not in keys:
-            keys.append(rel_key)
-            keys.sort()
-        if len(keys) <= 1:
+        slot_index, slot_count = item_slots(item_a).pair_slot(item_b, self._relationship_key())
+        if slot_count <= 1:
             return 0.0
-        slot_index = keys.index(rel_key)
-        return (slot_index - ((len(keys) - 1) / 2.0)) * spacing
+        return (slot_index - ((slot_count - 1) / 2.0)) * spacing
 
     def _get_direct_vertical_points(self, s_rect, t_rect):
         inner_padding = 2
@@ -327,6 +263,21 @@ class ERDConnectionPathPlanner:
             )
         return points
 
+    def compute_preview_path(self) -> tuple:
+        """Cheap path for use while an end is being dragged: preferred sides,
+        one elbow path and no obstacle checks or slot offsets."""
+        if self._is_chen_connection():
+            return self.compute_best_path()
+        src_item = self.connection_item.source_item
+        tgt_item = self.connection_item.target_item
+        s_side = self._preferred_side(src_item, tgt_item)
+        t_side = self._preferred_side(tgt_item, src_item)
+        start = self._get_base_anchor(src_item, s_side)
+        end = self._get_base_anchor(tgt_item, t_side)
+        points = self._force_manhattan(_build_path_candidates(start, end, s_side, t_side)[0])
+        points = self._orthogonalize_end_segments(points, s_side, t_side)
+        return self._force_manhattan(points), s_side, t_side
+
     def compute_best_path(self) -> tuple:
         s_rect = item_visual_scene_rect(self.connection_item.source_item)
         t_rect = item_visual_scene_rect(self.connection_item.target_item)
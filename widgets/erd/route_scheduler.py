@@ -0,0 +1,95 @@
+"""Frame-coalesced connection re-routing for ERD scenes."""
+from PySide6.QtCore import QObject, QTimer
+
+ROUTE_FRAME_MS: int = 16  # dirty connections are re-routed at most once per frame
+
+
+class ConnectionRouteScheduler(QObject):
+    """Collects moved items and dirty connections and routes them in one batch per frame.
+
+    While the mouse is grabbed (a drag or an interactive resize) connections
+    get the planner's cheap preview path; ``finish_interaction`` replaces the
+    previews with full obstacle-avoiding routes once the mouse is released.
+    Moved items update the router's obstacle index one by one instead of
+    invalidating it.
+    """
+
+    def __init__(self, scene) -> None:
+        super().__init__(scene)
+        self._scene = scene
+        self._moved_items = {}   # item -> None (ordered set)
+        self._dirty = {}         # connection -> preview flag
+        self._previewed = {}     # connections currently showing a preview path
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(ROUTE_FRAME_MS)
+        self._timer.timeout.connect(self.flush)
+
+    def reset(self) -> None:
+        """Forget pending work, e.g. before the scene is cleared."""
+        self._timer.stop()
+        self._moved_items = {}
+        self._dirty = {}
+        self._previewed = {}
+
+    def _interactive(self) -> bool:
+        return self._scene.mouseGrabberItem() is not None
+
+    def item_moved(self, item) -> None:
+        """Record that ``item`` moved or changed size; its connections re-route next frame."""
+        self._moved_items[item] = None
+        preview = self._interactive()
+        for conn in getattr(item, "connections", []):
+            self.mark_dirty(conn, preview)
+
+    def mark_dirty(self, conn, preview: bool = False) -> None:
+        # A pending full route wins over a preview
+        self._dirty[conn] = self._dirty.get(conn, True) and preview
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self) -> None:
+        """Update the obstacle index for moved items, then route every dirty connection once."""
+        self._timer.stop()
+        moved, self._moved_items = self._moved_items, {}
+        dirty, self._dirty = self._dirty, {}
+        for item in moved:
+            if item.scene() is self._scene:
+                self._scene.item_geometry_changed(item)
+        for conn, preview in dirty.items():
+            if conn.scene() is not self._scene:
+                continue
+            conn.updatePath(preview=preview)
+            if preview:
+                self._previewed[conn] = None
+            else:
+                self._previewed.pop(conn, None)
+
+    def finish_interaction(self) -> None:
+        """Replace preview paths with full routes and refit the scene rect after a drag or resize."""
+        for item in self._scene.selectedItems():
+            # Notes and subject areas move without notifying; resync them here
+            self._scene.item_geometry_changed(item)
+        previewed, self._previewed = self._previewed, {}
+        for conn in previewed:
+            self._dirty[conn] = False
+        for conn in self._dirty:
+            self._dirty[conn] = False
+        had_work = bool(self._dirty or self._moved_items or previewed)
+        self.flush()
+        if had_work:
+            self._scene.update_scene_rect()
+
+
+def notify_item_moved(item) -> None:
+    """Re-route ``item``'s connections through its scene's scheduler, or at once if there is none."""
+    scene = item.scene()
+    allocator = getattr(scene, "slot_allocator", None)
+    if allocator is not None:
+        allocator.item_moved(item)
+    scheduler = getattr(scene, "route_scheduler", None)
+    if scheduler is None:
+        for conn in getattr(item, "connections", []):
+            conn.updatePath()
+        return
+    scheduler.item_moved(item)
@@ -1,5 +1,8 @@
+import bisect
 import heapq
 import math
+
+import numpy as np
 from PySide6.QtCore import QPointF, QRectF
 from widgets.erd.items.resizable import item_visual_scene_rect
 from widgets.erd.items.attribute_item import ERDAttributeItem
@@ -49,102 +52,275 @@ def get_chen_boundary_anchor(item, target_point):
         t = half_h / abs(dy)
     return QPointF(cx + t * dx, cy + t * dy)
 
+OBSTACLE_INDEX_CELL = 400  # bucket size of the obstacle spatial index, in scene pixels
+ROUTE_BEND_COST = 5  # cost of one bend, in multiples of the router grid size
+ROUTE_SEARCH_MARGIN = 4  # initial search margin around a route's bbox, in grid sizes
+ROUTE_SEARCH_WIDENINGS = 4  # margin doublings tried before falling back to a stub path
+
+# Travel directions: right, down, left, up
+_DIRECTIONS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+_SIDE_DIRECTION = {"right": 0, "bottom": 1, "left": 2, "top": 3}
+
+
+def _needed_bends(needed, direction):
+    """Lower bound on the bends left when travelling ``direction`` and still
+    needing to move in each direction whose bit is set in ``needed``."""
+    count = bin(needed).count("1")
+    if direction is None or not count:
+        return 0
+    return count - 1 if needed & (1 << direction) else count
+
+
+# _NEEDED_BENDS[needed bitmask][direction or None]
+_NEEDED_BENDS = [
+    {direction: _needed_bends(needed, direction) for direction in (None, 0, 1, 2, 3)}
+    for needed in range(16)
+]
+
+
+class ObstacleIndex:
+    """Uniform-grid bucket index of obstacle rectangles keyed by owner."""
+
+    def __init__(self, cell_size=OBSTACLE_INDEX_CELL):
+        self.cell_size = cell_size
+        self._rects = {}
+        self._cells = {}
+
+    def __len__(self):
+        return len(self._rects)
+
+    def __contains__(self, key):
+        return key in self._rects
+
+    def _cell_range(self, rect: QRectF):
+        size = self.cell_size
+        return (
+            range(int(rect.left() // size), int(rect.right() // size) + 1),
+            range(int(rect.top() // size), int(rect.bottom() // size) + 1),
+        )
+
+    def insert(self, key, rect: QRectF) -> None:
+        if key in self._rects:
+            self.remove(key)
+        rect = QRectF(rect)
+        self._rects[key] = rect
+        xs, ys = self._cell_range(rect)
+        for cx in xs:
+            for cy in ys:
+                self._cells.setdefault((cx, cy), set()).add(key)
+
+    def remove(self, key) -> None:
+        rect = self._rects.pop(key, None)
+        if rect is None:
+            return
+        xs, ys = self._cell_range(rect)
+        for cx in xs:
+            for cy in ys:
+                bucket = self._cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.discard(key)
+                    if not bucket:
+                        del self._cells[(cx, cy)]
+
+    def rect(self, key) -> QRectF | None:
+        return self._rects.get(key)
+
+    def items(self):
+        return self._rects.items()
+
+    def query(self, rect: QRectF) -> list:
+        """Keys of the obstacles intersecting ``rect``."""
+        xs, ys = self._cell_range(rect)
+        if len(xs) * len(ys) > len(self._cells):
+            # Query larger than the populated area: scan buckets instead of cells
+            candidates = set()
+            for (cx, cy), bucket in self._cells.items():
+                if cx in xs and cy in ys:
+                    candidates.update(bucket)
+        else:
+            candidates = set()
+            for cx in xs:
+                for cy in ys:
+                    bucket = self._cells.get((cx, cy))
+                    if bucket:
+                        candidates.update(bucket)
+        return [key for key in candidates if self._rects[key].intersects(rect)]
+
+
 class ERDRouter:
-    def __init__(self, scene_rect: QRectF, obstacles: list[QRectF], grid_size=20):
+    """
+    Orthogonal connector router over a sparse visibility grid.
+
+    Each route only considers the obstacles near it: their padded edges,
+    the route's end stubs and the search window supply the grid lines, and
+    A* runs over the grid intersections with a bend penalty. Paths are
+    rebuilt from parent pointers. When no route exists inside the window,
+    the window is widened a few times before falling back to a stub path.
+    """
+
+    def __init__(self, scene_rect: QRectF, obstacles, grid_size=20):
         self.grid_size = grid_size
-        self.min_x = int(scene_rect.left() // grid_size)
-        self.max_x = int(scene_rect.right() // grid_size)
-        self.min_y = int(scene_rect.top() // grid_size)
-        self.max_y = int(scene_rect.bottom() // grid_size)
-        
-        self.blocked = set()
-        for obs in obstacles:
-            ox_start = int((obs.left() - grid_size/2) // grid_size)
-            ox_end = int((obs.right() + grid_size/2) // grid_size)
-            oy_start = int((obs.top() - grid_size/2) // grid_size)
-            oy_end = int((obs.bottom() + grid_size/2) // grid_size)
-            
-            for x in range(ox_start, ox_end + 1):
-                for y in range(oy_start, oy_end + 1):
-                    self.blocked.add((x, y))
+        self.clearance = grid_size
+        self.scene_rect = QRectF(scene_rect)
+        self.index = ObstacleIndex()
+        entries = obstacles.items() if isinstance(obstacles, dict) else enumerate(obstacles)
+        for key, rect in entries:
+            self.index.insert(key, rect)
 
-    def _to_grid(self, pt: QPointF):
-        return (int(pt.x() // self.grid_size), int(pt.y() // self.grid_size))
-        
-    def _from_grid(self, gx, gy):
-        return QPointF(gx * self.grid_size, gy * self.grid_size)
+    def update_obstacle(self, key, rect: QRectF | None) -> None:
+        """Move, add (``rect`` given) or remove (``rect`` None) one obstacle."""
+        if rect is None:
+            self.index.remove(key)
+        else:
+            self.index.insert(key, rect)
+
+    def _stub(self, pt: QPointF, side: str) -> QPointF:
+        dist = 2 * self.grid_size
+        if side == "left":
+            return QPointF(pt.x() - dist, pt.y())
+        if side == "right":
+            return QPointF(pt.x() + dist, pt.y())
+        if side == "top":
+            return QPointF(pt.x(), pt.y() - dist)
+        if side == "bottom":
+            return QPointF(pt.x(), pt.y() + dist)
+        return QPointF(pt)
+
+    def _padded_obstacles(self, window: QRectF, stub_start: QPointF, stub_end: QPointF) -> list:
+        pad = self.clearance
+        rects = []
+        for key in self.index.query(window.adjusted(-pad, -pad, pad, pad)):
+            rect = self.index.rect(key).adjusted(-pad, -pad, pad, pad)
+            # An obstacle around a stub (e.g. a subject area holding both
+            # tables, or a neighbour closer than the stub) cannot be avoided
+            if rect.contains(stub_start) or rect.contains(stub_end):
+                continue
+            rects.append(rect)
+        return rects
+
+    def _search(self, stub_start, start_dir, stub_end, end_dir, window):
+        obstacles = self._padded_obstacles(window, stub_start, stub_end)
+
+        xs = {stub_start.x(), stub_end.x(), window.left(), window.right()}
+        ys = {stub_start.y(), stub_end.y(), window.top(), window.bottom()}
+        for rect in obstacles:
+            xs.update((rect.left(), rect.right()))
+            ys.update((rect.top(), rect.bottom()))
+        xs = sorted(x for x in xs if window.left() <= x <= window.right())
+        ys = sorted(y for y in ys if window.top() <= y <= window.bottom())
+        nx, ny = len(xs), len(ys)
+
+        # Blocked nodes, and blocked grid edges to the right (h) / below (v).
+        # Obstacle borders are grid lines, so an edge is blocked exactly when
+        # its interior lies inside an obstacle.
+        node_blocked = np.zeros((nx, ny), dtype=bool)
+        h_blocked = np.zeros((nx, ny), dtype=bool)
+        v_blocked = np.zeros((nx, ny), dtype=bool)
+        for rect in obstacles:
+            x0 = bisect.bisect_left(xs, rect.left())
+            x1 = bisect.bisect_right(xs, rect.right())
+            y0 = bisect.bisect_left(ys, rect.top())
+            y1 = bisect.bisect_right(ys, rect.bottom())
+            # Lines strictly inside the rectangle
+            ix0 = x0 + (x0 < nx and xs[x0] == rect.left())
+            iy0 = y0 + (y0 < ny and ys[y0] == rect.top())
+            ix1 = x1 - (x1 > 0 and xs[x1 - 1] == rect.right())
+            iy1 = y1 - (y1 > 0 and ys[y1 - 1] == rect.bottom())
+            node_blocked[ix0:ix1, iy0:iy1] = True
+            h_blocked[x0:max(x0, x1 - 1), iy0:iy1] = True
+            v_blocked[ix0:ix1, y0:max(y0, y1 - 1)] = True
+        # Nested lists index faster than NumPy scalars in the search loop
+        node_blocked = node_blocked.tolist()
+        h_blocked = h_blocked.tolist()
+        v_blocked = v_blocked.tolist()
+
+        x_pos = {x: i for i, x in enumerate(xs)}
+        y_pos = {y: j for j, y in enumerate(ys)}
+        start = (x_pos[stub_start.x()], y_pos[stub_start.y()])
+        goal = (x_pos[stub_end.x()], y_pos[stub_end.y()])
+        bend_cost = ROUTE_BEND_COST * self.grid_size
+        gx, gy = xs[goal[0]], ys[goal[1]]
+
+        def heuristic(i, j, direction):
+            # Remaining length plus the bends the remaining directions force
+            x, y = xs[i], ys[j]
+            needed = ((x < gx) and 1) | ((y < gy) and 2) | ((x > gx) and 4) | ((y > gy) and 8)
+            bends = _NEEDED_BENDS[needed][direction]
+            return abs(x - gx) + abs(y - gy) + bends * bend_cost
+
+        start_state = (start[0], start[1], start_dir)
+        best = {start_state: 0.0}
+        parents = {start_state: None}
+        counter = 0
+        queue = [(heuristic(start[0], start[1], start_dir), 0, counter, start_state)]
+        while queue:
+            _f, neg_g, _order, state = heapq.heappop(queue)
+            cost = -neg_g
+            if cost > best.get(state, math.inf):
+                continue
+            i, j, direction = state
+            if (i, j) == goal:
+                return self._trace(parents, state, xs, ys)
+            for new_dir, (dx, dy) in enumerate(_DIRECTIONS):
+                if direction is not None and new_dir == (direction + 2) % 4:
+                    continue
+                ni, nj = i + dx, j + dy
+                if not (0 <= ni < nx and 0 <= nj < ny) or node_blocked[ni][nj]:
+                    continue
+                if dx and h_blocked[min(i, ni)][j]:
+                    continue
+                if dy and v_blocked[i][min(j, nj)]:
+                    continue
+                new_cost = cost + abs(xs[ni] - xs[i]) + abs(ys[nj] - ys[j])
+                if direction is not None and new_dir != direction:
+                    new_cost += bend_cost
+                if (ni, nj) == goal and end_dir is not None and new_dir != end_dir:
+                    new_cost += bend_cost
+                new_state = (ni, nj, new_dir)
+                if new_cost < best.get(new_state, math.inf):
+                    best[new_state] = new_cost
+                    parents[new_state] = state
+                    counter += 1
+                    # Ties on f prefer the deeper state
+                    heapq.heappush(queue, (new_cost + heuristic(ni, nj, new_dir), -new_cost, counter, new_state))
+        return None
+
+    @staticmethod
+    def _trace(parents, state, xs, ys) -> list[QPointF]:
+        points = []
+        while state is not None:
+            points.append(QPointF(xs[state[0]], ys[state[1]]))
+            state = parents[state]
+        points.reverse()
+        return points
 
     def find_path(self, start: QPointF, start_side: str, end: QPointF, end_side: str) -> list[QPointF]:
-        def get_stub(pt, side, dist=2):
-            gx, gy = self._to_grid(pt)
-            if side == "left":
-                return (gx - dist, gy)
-            if side == "right":
-                return (gx + dist, gy)
-            if side == "top":
-                return (gx, gy - dist)
-            if side == "bottom":
-                return (gx, gy + dist)
-            return (gx, gy)
-            
-        start_grid = self._to_grid(start)
-        end_grid = self._to_grid(end)
-        
-        stub_start = get_stub(start, start_side, 2)
-        stub_end = get_stub(end, end_side, 2)
-        
-        safe_blocked = self.blocked.copy()
-        for pt in [start_grid, stub_start, stub_end, end_grid]:
-            if pt in safe_blocked:
-                safe_blocked.remove(pt)
-                
-        def heuristic(a, b):
-            return abs(a[0] - b[0]) + abs(a[1] - b[1])
-            
-        queue = [(0, stub_start, [stub_start])]
-        visited = {stub_start: 0}
-        
+        stub_start = self._stub(start, start_side)
+        stub_end = self._stub(end, end_side)
+        start_dir = _SIDE_DIRECTION.get(start_side)
+        # Arriving at a "left" anchor means travelling right, and so on
+        end_dir = _SIDE_DIRECTION.get(end_side)
+        if end_dir is not None:
+            end_dir = (end_dir + 2) % 4
+
+        bounds = QRectF(stub_start, stub_end).normalized()
+        margin = ROUTE_SEARCH_MARGIN * self.grid_size
+        limit = self.scene_rect.united(bounds)
         best_path = None
-        iter_count = 0
-        
-        while queue and iter_count < 1500: # Limit iterations to prevent UI freeze
-            iter_count += 1
-            cost, current, path = heapq.heappop(queue)
-            
-            if current == stub_end:
-                best_path = path
+        for _attempt in range(ROUTE_SEARCH_WIDENINGS + 1):
+            window = bounds.adjusted(-margin, -margin, margin, margin)
+            best_path = self._search(stub_start, start_dir, stub_end, end_dir, window)
+            if best_path is not None or window.contains(limit):
                 break
-                
-            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                nxt = (current[0] + dx, current[1] + dy)
-                
-                if nxt[0] < self.min_x or nxt[0] > self.max_x or nxt[1] < self.min_y or nxt[1] > self.max_y:
-                    continue
-                    
-                if nxt in safe_blocked and nxt != stub_end:
-                    continue
-                    
-                new_cost = cost + 1
-                
-                if len(path) > 1:
-                    prev = path[-2]
-                    # Penalize turns
-                    if (nxt[0] - current[0] != current[0] - prev[0]) or (nxt[1] - current[1] != current[1] - prev[1]):
-                        new_cost += 5
-                        
-                if nxt not in visited or new_cost < visited[nxt]:
-                    visited[nxt] = new_cost
-                    priority = new_cost + heuristic(nxt, stub_end)
-                    heapq.heappush(queue, (priority, nxt, path + [nxt]))
-                    
+            margin *= 2
+
         res = [start]
         if best_path:
-            for pt in best_path:
-                res.append(self._from_grid(pt[0], pt[1]))
+            res.extend(best_path)
         else:
             # Fallback direct path
-            res.append(self._from_grid(stub_start[0], stub_start[1]))
-            res.append(self._from_grid(stub_end[0], stub_end[1]))
+            res.append(stub_start)
+            res.append(stub_end)
             
         res.append(end)
         
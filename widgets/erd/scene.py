@@ -1,8 +1,8 @@
 import math
 from typing import Any
 
-from PySide6.QtCore import QLineF, QPointF, Qt
-from PySide6.QtGui import QBrush, QColor, QPen, QTransform
+from PySide6.QtCore import QLineF, QPointF, QRectF, Qt
+from PySide6.QtGui import QBrush, QColor, QPainter, QPen, QPixmap, QTransform
 from PySide6.QtWidgets import QDialog, QGraphicsScene
 
 from widgets.erd.commands import AddConnectionCommand, DeleteItemCommand, UpdateTableCommand
@@ -17,10 +17,17 @@ from widgets.erd.items.resizable import item_visual_scene_rect
 from widgets.erd.items.subject_area_item import ERDSubjectAreaItem
 from widgets.erd.items.table_item import ERDTableItem
 from widgets.erd.items.weak_entity_item import ERDWeakEntityItem
+from widgets.erd.route_scheduler import ConnectionRouteScheduler
 from widgets.erd.routing import ERDRouter
+from widgets.erd.slot_allocator import ConnectionSlotAllocator
+from widgets.erd.spatial_index import TableSpatialIndex
 
 SCENE_MARGIN: int = 500  # padding around item bounding box when resizing scene rect
 BACKGROUND_GRID_SIZE: int = 20  # dot-grid spacing in pixels
+BACKGROUND_COLOR = QColor("#F8F9FA")
+GRID_LINE_COLOR = QColor("#E0E0E0")
+GRID_TILE_MIN_PX: int = 128     # background brush tiles hold enough grid cells to be at least this wide
+GRID_MIN_CELL_PX: float = 4.0   # zoomed out further than this the grid is left off instead of turning grey
 
 # All non-table items that can be deleted with the Delete key
 _DELETABLE_TYPES = (
@@ -38,30 +45,96 @@ _ROUTING_OBSTACLE_TYPES = (
 class ERDScene(QGraphicsScene):
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
-        self.setBackgroundBrush(QBrush(QColor("#F8F9FA")))
+        self.setBackgroundBrush(QBrush(BACKGROUND_COLOR))
         self.tables = {}
         self.setSceneRect(0, 0, 2000, 2000)
-        self.alignment_lines = []
+        self._guides_x: tuple = ()
+        self._guides_y: tuple = ()
+        self._guide_pen = QPen(QColor(26, 115, 232, 180))
+        self._guide_pen.setStyle(Qt.PenStyle.DashLine)
+        self._grid_brush = None
+        self._grid_brush_key = None  # (view scale, device pixel ratio) the cached tile was built for
         self._router_cache = None
+        self.route_scheduler = ConnectionRouteScheduler(self)
+        self.table_index = TableSpatialIndex()
+        self.slot_allocator = ConnectionSlotAllocator()
+        self._highlighted_tables = set()
+        self._drag_highlights = set()
+        self.effects_enabled = True
         
     def update_scene_rect(self) -> None:
         # Calculate the bounding box of all items and add a 500px margin
         rect = self.itemsBoundingRect()
         if not rect.isNull():
             self.setSceneRect(rect.adjusted(-SCENE_MARGIN, -SCENE_MARGIN, SCENE_MARGIN, SCENE_MARGIN))
-            self._router_cache = None 
+            if self._router_cache is not None:
+                self._router_cache.scene_rect = self.sceneRect()
+
+    def item_geometry_changed(self, item) -> None:
+        """Move ``item``'s obstacle in the router index and grow the scene rect to fit it."""
+        if not isinstance(item, _ROUTING_OBSTACLE_TYPES):
+            return
+        self.slot_allocator.item_moved(item)
+        if isinstance(item, ERDTableItem):
+            self.table_index.update(item)
+        rect = item_visual_scene_rect(item)
+        if self._router_cache is not None:
+            self._router_cache.update_obstacle(item, rect)
+        # Growing is cheap; shrinking waits for update_scene_rect
+        padded = rect.adjusted(-SCENE_MARGIN, -SCENE_MARGIN, SCENE_MARGIN, SCENE_MARGIN)
+        if not self.sceneRect().contains(padded):
+            self.setSceneRect(self.sceneRect().united(padded))
+            if self._router_cache is not None:
+                self._router_cache.scene_rect = self.sceneRect()
+
+    def clear(self) -> None:
+        self.route_scheduler.reset()
+        self._router_cache = None
+        self.table_index.clear()
+        self.slot_allocator.reset()
+        self._highlighted_tables = set()
+        self._drag_highlights = set()
+        super().clear()
+
+    def addItem(self, item) -> None:
+        super().addItem(item)
+        if isinstance(item, ERDTableItem):
+            self.table_index.update(item)
+        if self._router_cache is not None and isinstance(item, _ROUTING_OBSTACLE_TYPES):
+            self._router_cache.update_obstacle(item, item_visual_scene_rect(item))
+        if not self.effects_enabled and not isinstance(item, ERDTableItem) and item.graphicsEffect() is not None:
+            item.graphicsEffect().setEnabled(False)
+
+    def removeItem(self, item) -> None:
+        if self._router_cache is not None:
+            self._router_cache.update_obstacle(item, None)
+        self.table_index.remove(item)
+        self.slot_allocator.invalidate(item)
+        self._highlighted_tables.discard(item)
+        self._drag_highlights.discard(item)
+        super().removeItem(item)
             
     def get_router(self) -> ERDRouter:
         if self._router_cache is None:
-            obstacles = []
+            obstacles = {}
             for item in self.items():
                 if isinstance(item, _ROUTING_OBSTACLE_TYPES):
-                    obstacles.append(item_visual_scene_rect(item))
+                    obstacles[item] = item_visual_scene_rect(item)
             self._router_cache = ERDRouter(self.sceneRect(), obstacles)
         return self._router_cache
 
-    def update_alignment_guides(self) -> None:
-        self.update()
+    def set_effects_enabled(self, enabled: bool) -> None:
+        """Turn drop shadows and flow animations on or off, e.g. while panning or zoomed out."""
+        if enabled == self.effects_enabled:
+            return
+        self.effects_enabled = enabled
+        for item in self.items():
+            if isinstance(item, ERDTableItem):
+                item.sync_shadow()
+            elif isinstance(item, ERDConnectionItem):
+                item.sync_animation()
+            elif item.graphicsEffect() is not None:
+                item.graphicsEffect().setEnabled(enabled)
 
     def delete_selected_items(self) -> None:
         items_to_delete = []
@@ -75,97 +148,119 @@ class ERDScene(QGraphicsScene):
 
 
     def highlight_related(self, table_item: Any) -> None:
-        for item in self.items():
-            if isinstance(item, ERDTableItem):
-                item.is_highlighted = item == table_item
+        # Only the tables whose state changes are repainted
+        for item in self._highlighted_tables:
+            if item != table_item:
+                item.is_highlighted = False
                 item.update()
-        self.update()
+        self._highlighted_tables = {table_item} if table_item is not None else set()
+        if table_item is not None and not table_item.is_highlighted:
+            table_item.is_highlighted = True
+            table_item.update()
 
     def clear_highlight(self) -> None:
-        for item in self.items():
-            if isinstance(item, ERDTableItem):
-                item.is_highlighted = False
-                item.update()
-        self.update()
+        self.highlight_related(None)
 
     def apply_search_filter(self, text: str) -> None:
         text = text.strip().lower()
-        for item in self.items():
-            if isinstance(item, ERDTableItem):
-                if not text:
-                    item.is_dimmed = False
-                else:
-                    match_name = text in item.table_name.lower()
-                    match_schema = item.schema_name and text in item.schema_name.lower()
-                    item.is_dimmed = not (match_name or match_schema)
+        for item in self.table_index.items():
+            if not text:
+                dimmed = False
+            else:
+                match_name = text in item.table_name.lower()
+                match_schema = item.schema_name and text in item.schema_name.lower()
+                dimmed = not (match_name or match_schema)
+            if item.is_dimmed != dimmed:
+                item.is_dimmed = dimmed
                 item.update()
 
     def find_table_item(self, text: str) -> ERDTableItem | None:
-        text = text.strip().lower()
-        if not text:
-            return None
-        
-        candidates = []
-        for item in self.items():
-            if isinstance(item, ERDTableItem):
-                name = item.table_name.lower()
-                if name == text:
-                    return item 
-                if name.startswith(text):
-                    candidates.insert(0, item)
-                elif text in name:
-                    candidates.append(item)
-        
-        return candidates[0] if candidates else None
+        return self.table_index.find(text)
+
+    def mark_drag_highlight(self, item) -> None:
+        """Remember an item highlighted as a connection-drag target so it can be cleared cheaply."""
+        self._drag_highlights.add(item)
+
+    def clear_drag_highlights(self) -> None:
+        for item in self._drag_highlights:
+            if getattr(item, "target_highlight", False):
+                item.target_highlight = False
+                item.update()
+            col = getattr(item, "_drag_highlighted_col", None)
+            if col:
+                if col in item.highlighted_cols:
+                    item.highlighted_cols.remove(col)
+                item._drag_highlighted_col = None
+                item.update()
+        self._drag_highlights = set()
         
+    def _grid_brush_for(self, scale: float, device_pixel_ratio: float = 1.0) -> QBrush:
+        """Background brush for the given view scale: one pixmap tile of grid cells, aligned to the scene origin.
+
+        The tile is rendered at the screen's device pixel ratio so grid lines
+        stay one physical pixel wide on HiDPI displays.
+        """
+        key = (round(scale, 3), round(device_pixel_ratio, 3))
+        if key == self._grid_brush_key:
+            return self._grid_brush
+        scale, dpr = key
+        cell = BACKGROUND_GRID_SIZE * scale
+        cells = max(1, math.ceil(GRID_TILE_MIN_PX / cell))
+        size = max(1, round(cell * cells * dpr))
+        tile = QPixmap(size, size)
+        tile.fill(BACKGROUND_COLOR)
+        if cell >= GRID_MIN_CELL_PX:
+            # Painted in physical pixels before the ratio is set, so lines land on whole pixels
+            tile_painter = QPainter(tile)
+            tile_painter.setPen(QPen(GRID_LINE_COLOR, 0))
+            for i in range(cells):
+                offset = round(i * size / cells)
+                tile_painter.drawLine(offset, 0, offset, size)
+                tile_painter.drawLine(0, offset, size, offset)
+            tile_painter.end()
+        tile.setDevicePixelRatio(dpr)
+        brush = QBrush(tile)
+        # Map the tile's logical size back onto exactly `cells` grid cells in scene units
+        tile_scale = BACKGROUND_GRID_SIZE * cells * dpr / size
+        brush.setTransform(QTransform.fromScale(tile_scale, tile_scale))
+        self._grid_brush, self._grid_brush_key = brush, key
+        return brush
+
     def drawBackground(self, painter, rect):
         if not painter.isActive():
             return
-        painter.fillRect(rect, QBrush(QColor("#F8F9FA")))
-        if rect.width() < 500: 
+        device = painter.device()
+        dpr = device.devicePixelRatioF() if device is not None else 1.0
+        painter.fillRect(rect, self._grid_brush_for(painter.transform().m11(), dpr))
+
+    # --- Alignment guides ---
+
+    def set_alignment_guides(self, vertical=(), horizontal=()) -> None:
+        """Show snap guides at scene x positions *vertical* and y positions *horizontal*; repaint only their strips."""
+        vertical, horizontal = tuple(vertical), tuple(horizontal)
+        if vertical == self._guides_x and horizontal == self._guides_y:
             return
+        bounds = self.sceneRect()
+        for x in set(self._guides_x) ^ set(vertical):
+            self.update(QRectF(x - 1, bounds.top(), 2, bounds.height()))
+        for y in set(self._guides_y) ^ set(horizontal):
+            self.update(QRectF(bounds.left(), y - 1, bounds.width(), 2))
+        self._guides_x, self._guides_y = vertical, horizontal
 
-        grid_size = BACKGROUND_GRID_SIZE
-        left = math.floor(rect.left() / grid_size) * grid_size
-        top = math.floor(rect.top() / grid_size) * grid_size
-        right = rect.right()
-        bottom = rect.bottom()
-        
-        pen = QPen(QColor("#E0E0E0"), 0) 
-        painter.setPen(pen)
-        
-        lines = []
-        x = float(left)
-        while x <= right:
-            lines.append(QLineF(x, top, x, bottom))
-            x += grid_size
-            
-        y = float(top)
-        while y <= bottom:
-            lines.append(QLineF(left, y, right, y))
-            y += grid_size
-            
-        if lines:
-            painter.drawLines(lines)
+    def clear_alignment_guides(self) -> None:
+        self.set_alignment_guides()
 
     def drawForeground(self, painter, rect):
-        if not painter.isActive() or not self.alignment_lines:
+        if not painter.isActive() or not (self._guides_x or self._guides_y):
             return
-            
-        pen = QPen(QColor(26, 115, 232, 180)) 
-        pen.setWidth(1)
-        pen.setStyle(Qt.PenStyle.DashLine)
-        painter.setPen(pen)
-        
-        adjusted_lines = []
-        for line in self.alignment_lines:
-            if abs(line.x1() - line.x2()) < 0.1:
-                adjusted_lines.append(QLineF(line.x1(), rect.top(), line.x2(), rect.bottom()))
-            elif abs(line.y1() - line.y2()) < 0.1:
-                adjusted_lines.append(QLineF(rect.left(), line.y1(), rect.right(), line.y2()))
-        
-        if adjusted_lines:
-            painter.drawLines(adjusted_lines)
+        painter.setPen(self._guide_pen)
+        top, bottom, left, right = rect.top(), rect.bottom(), rect.left(), rect.right()
+        for x in self._guides_x:
+            if left <= x <= right:
+                painter.drawLine(QLineF(x, top, x, bottom))
+        for y in self._guides_y:
+            if top <= y <= bottom:
+                painter.drawLine(QLineF(left, y, right, y))
 
     def mouseDoubleClickEvent(self, event) -> None:
         item = self.itemAt(event.scenePos(), QTransform())
@@ -203,13 +298,7 @@ class ERDScene(QGraphicsScene):
             self._temp_line.setLine(line)
 
             # Clear previous drag highlights
-            for item in self.items():
-                if isinstance(item, ERDTableItem):
-                    if hasattr(item, '_drag_highlighted_col') and item._drag_highlighted_col:
-                        if item._drag_highlighted_col in item.highlighted_cols:
-                            item.highlighted_cols.remove(item._drag_highlighted_col)
-                        item._drag_highlighted_col = None
-                        item.update()
+            self.clear_drag_highlights()
             
             # Find table item under cursor and highlight column
             items_under = self.items(scene_pos)
@@ -224,6 +313,7 @@ class ERDScene(QGraphicsScene):
                         target_table_item.highlighted_cols.add(target_col)
                         target_table_item._drag_highlighted_col = target_col
                         target_table_item.update()
+                        self.mark_drag_highlight(target_table_item)
 
     def finish_connection_drag(self, scene_pos: QPointF) -> None:
         if hasattr(self, '_temp_line') and self._temp_line:
@@ -233,12 +323,7 @@ class ERDScene(QGraphicsScene):
             self._temp_conn_start = None
 
             # Clean up drag highlighting
-            for table_item in self.items():
-                if isinstance(table_item, ERDTableItem) and getattr(table_item, '_drag_highlighted_col', None):
-                    if table_item._drag_highlighted_col in table_item.highlighted_cols:
-                        table_item.highlighted_cols.remove(table_item._drag_highlighted_col)
-                    table_item._drag_highlighted_col = None
-                    table_item.update()
+            self.clear_drag_highlights()
 
             item = self.itemAt(scene_pos, QTransform())
             if isinstance(item, ERDTableItem):
@@ -263,3 +348,4 @@ class ERDScene(QGraphicsScene):
     def mouseReleaseEvent(self, event) -> None:
         self.finish_connection_drag(event.scenePos())
         super().mouseReleaseEvent(event)
+        self.route_scheduler.finish_interaction()
@@ -1,16 +1,24 @@
 """ERD diagram serialization: save/load .erd files and image/PDF export."""
 import json
 import base64
+import os
 from widgets.erd.items.note_item import ERDNoteItem
-from PySide6.QtWidgets import QFileDialog, QMessageBox
-from PySide6.QtGui import QPixmap, QPainter, QPdfWriter, QPageSize, QPageLayout
-from PySide6.QtCore import Qt, QRectF, QSizeF, QMarginsF, QBuffer, QIODevice
+from PySide6.QtWidgets import QFileDialog, QMessageBox, QProgressDialog
+from PySide6.QtGui import QPixmap, QPainter
+from PySide6.QtCore import Qt, QPointF, QRectF, QBuffer, QIODevice
 from widgets.erd.items.entity_item import ERDEntityItem
 from widgets.erd.items.weak_entity_item import ERDWeakEntityItem
 from widgets.erd.items.attribute_item import ERDAttributeItem
 from widgets.erd.items.relationship_diamond_item import ERDRelationshipDiamondItem
 from widgets.erd.items.subject_area_item import ERDSubjectAreaItem
 from widgets.erd.items.floating_connection import ERDFloatingConnectionItem
+from widgets.erd.document import ERDDocument, is_erd_document
+from widgets.erd.tiled_export import (
+    export_pdf_pages,
+    export_pdf_single_page,
+    export_png_tiled,
+    export_tiff_tiled,
+)
 
 
 
@@ -92,8 +100,11 @@ def restore_view_state(state: dict, scene, free_item_types: tuple) -> None:
 
 # .erd file save / load
 
-def save_erd(widget) -> None:
-    """Prompt for a file path and save the full ERD state as JSON."""
+def save_erd(widget, save_as: bool = False) -> None:
+    """Save the ERD to its .erd document, writing only what changed; prompt for a path if there is none."""
+    if widget._materializer.active:
+        widget.status_message("The diagram is still loading; save again once it has finished.")
+        return
 
     floating = any(isinstance(i, ERDFloatingConnectionItem) for i in widget.scene.items())
     if floating:
@@ -107,30 +118,29 @@ def save_erd(widget) -> None:
         if reply == QMessageBox.StandardButton.No:
             return
 
-    file_path, _ = QFileDialog.getSaveFileName(widget, "Save ERD State", "", "ERD Files (*.erd)")
-    if not file_path:
-        return
-
-    state = {
-        "version": 3,
-        "schema_data": widget.schema_data,
-        "view_state": widget._serialize_view_state(),
-        "positions": {},
-        "notes": [],
-    }
-    for full_name, item in widget.scene.tables.items():
-        pos = item.pos()
-        state["positions"][full_name] = {"x": pos.x(), "y": pos.y()}
-    for item in widget.scene.items():
-        if isinstance(item, ERDNoteItem):
-            pos = item.pos()
-            state["notes"].append({"text": item.text(), "x": pos.x(), "y": pos.y()})
-
+    document = None if save_as else widget._document
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(state, f, indent=4)
+        if document is None:
+            file_path, _ = QFileDialog.getSaveFileName(widget, "Save ERD State", "", "ERD Files (*.erd)")
+            if not file_path:
+                return
+            _close_document(widget)
+            document = ERDDocument.create(file_path)
+        view_state = widget._serialize_view_state()
+        view = widget.view
+        centre = view.mapToScene(view.viewport().rect().center())
+        meta = {
+            "free_items": view_state["free_items"],
+            "viewport": [centre.x(), centre.y(), view.transform().m11()],
+        }
+        written = document.save(widget.schema_data, view_state["tables"], meta)
     except Exception as e:
+        if document is not None and document is not widget._document:
+            document.discard()
         QMessageBox.critical(widget, "Error", f"Failed to save ERD: {str(e)}")
+        return
+    widget._document = document
+    widget.status_message(f"Saved {os.path.basename(document.file_path)} ({written} changed record(s))")
 
 
 def load_erd_file(widget, file_path: str | None = None) -> None:
@@ -141,11 +151,16 @@ def load_erd_file(widget, file_path: str | None = None) -> None:
     if not file_path:
         return
 
+    if is_erd_document(file_path):
+        _load_erd_document(widget, file_path)
+        return
+
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             state = json.load(f)
 
         if "schema_data" in state:
+            _close_document(widget)
             widget.schema_data = state["schema_data"]
             widget.notes_data = state.get("notes", [])
             widget.view_state_data = state.get("view_state")
@@ -171,8 +186,54 @@ def load_erd_file(widget, file_path: str | None = None) -> None:
         QMessageBox.critical(widget, "Error", f"Failed to load ERD: {str(e)}")
 
 
+def _close_document(widget) -> None:
+    if widget._document is not None:
+        widget._document.close()
+        widget._document = None
+
+
+def _load_erd_document(widget, file_path: str) -> None:
+    """Open an SQLite .erd document and stream its tables in, those under the saved viewport first."""
+    try:
+        document = ERDDocument.open(file_path)
+        centre_x, centre_y, scale = document.meta("viewport", [0.0, 0.0, 1.0])
+        free_items = document.meta("free_items", [])
+        total = document.table_count()
+    except Exception as e:
+        QMessageBox.critical(widget, "Error", f"Failed to load ERD: {str(e)}")
+        return
+
+    _close_document(widget)
+    widget._materializer.cancel()
+    widget._cancel_auto_layout()
+    widget.scene.clear()
+    widget.undo_stack.clear()
+    widget.scene.tables = {}
+    widget.schema_data = {}
+    widget.notes_data = []
+    widget.view_state_data = None
+    widget._document = document
+
+    size = widget.view.viewport().size()
+    half_w, half_h = size.width() / scale / 2, size.height() / scale / 2
+    viewport = QRectF(centre_x - half_w, centre_y - half_h, half_w * 2, half_h * 2)
+    for item_state in free_items:
+        widget._create_free_item_from_state(item_state)
+    widget._materializer.start_saved(
+        widget.schema_data,
+        document.iter_tables(viewport),
+        total,
+        QPointF(centre_x, centre_y),
+        scale,
+    )
+
+
 # Image / PDF export
 
+PDF_SINGLE_FILTER = "PDF Document (*.pdf)"
+PDF_PAGES_FILTER = "PDF Poster, A4 pages (*.pdf)"
+
+
 def _render_to_pixmap(scene, items_rect: QRectF, scale_factor: float) -> QPixmap:
     """Render the scene area into a high-res QPixmap."""
     w = int(items_rect.width() * scale_factor)
@@ -214,26 +275,31 @@ def _export_svg(scene, items_rect: QRectF, file_path: str) -> None:
         f.write(svg_content)
 
 
-def _export_pdf(scene, items_rect: QRectF, file_path: str) -> None:
-    """Export scene to a PDF page sized to match the diagram."""
-    scale_factor = 3.0
-    pixmap = _render_to_pixmap(scene, items_rect, scale_factor)
-    base_dpi = 96
-    width_mm = items_rect.width() * 25.4 / base_dpi
-    height_mm = items_rect.height() * 25.4 / base_dpi
-    printer = QPdfWriter(file_path)
-    printer.setResolution(int(base_dpi * scale_factor))
-    custom_size = QPageSize(QSizeF(width_mm, height_mm), QPageSize.Unit.Millimeter)
-    layout = QPageLayout(custom_size, QPageLayout.Orientation.Portrait, QMarginsF(0, 0, 0, 0))
-    printer.setPageLayout(layout)
-    pdf_painter = QPainter()
-    pdf_painter.begin(printer)
-    pdf_painter.drawPixmap(0, 0, printer.width(), printer.height(), pixmap)
-    pdf_painter.end()
-
-
-def _export_raster(scene, items_rect: QRectF, file_path: str, widget) -> None:
-    """Export scene to PNG or JPG with OOM guard."""
+def _export_pdf(scene, items_rect: QRectF, file_path: str, widget, pages: bool = False) -> bool:
+    """Export scene to PDF: one page sized to the diagram, or a poster tiled across A4 pages."""
+    if not pages:
+        export_pdf_single_page(scene, items_rect, file_path)
+        return True
+    return _with_progress(widget, "Printing pages\u2026", file_path, lambda progress: export_pdf_pages(
+        scene, items_rect, file_path, progress=progress,
+    ))
+
+
+def _export_raster(scene, items_rect: QRectF, file_path: str, widget) -> bool:
+    """Export scene to PNG or TIFF tile by tile, or to JPG through a capped in-memory buffer."""
+    lower = file_path.lower()
+    if lower.endswith('.png'):
+        exporter = export_png_tiled
+    elif lower.endswith(('.tif', '.tiff')):
+        exporter = export_tiff_tiled
+    else:
+        exporter = None
+    if exporter is not None:
+        return _with_progress(widget, "Rendering image\u2026", file_path, lambda progress: exporter(
+            scene, items_rect, file_path, scale=2.0, progress=progress,
+        ))
+
+    # JPEG cannot be streamed; render it whole with an OOM guard
     MAX_DIM = 16000
     scale_factor = 2.0
     w = int(items_rect.width() * scale_factor)
@@ -245,11 +311,8 @@ def _export_raster(scene, items_rect: QRectF, file_path: str, widget) -> None:
     img = QPixmap(w, h)
     if img.isNull():
         QMessageBox.critical(widget, "Error", "Failed to create image buffer (Out of Memory?).")
-        return
-    if file_path.endswith('.png'):
-        img.fill(Qt.GlobalColor.transparent)
-    else:
-        img.fill(Qt.GlobalColor.white)
+        return False
+    img.fill(Qt.GlobalColor.white)
     painter = QPainter(img)
     painter.setRenderHint(QPainter.RenderHint.Antialiasing)
     painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
@@ -257,16 +320,41 @@ def _export_raster(scene, items_rect: QRectF, file_path: str, widget) -> None:
     scene.render(painter, QRectF(0, 0, items_rect.width(), items_rect.height()), items_rect)
     painter.end()
     img.save(file_path)
+    return True
+
+
+def _with_progress(widget, label: str, file_path: str, run) -> bool:
+    """Run a tiled exporter behind a modal, cancellable progress dialog; drop the file if cancelled."""
+    dialog = QProgressDialog(label, "Cancel", 0, 0, widget)
+    dialog.setWindowTitle("Exporting ERD")
+    dialog.setWindowModality(Qt.WindowModality.WindowModal)
+    dialog.setMinimumDuration(500)
+
+    def progress(done: int, total: int) -> bool:
+        dialog.setMaximum(total)
+        dialog.setValue(done)
+        return not dialog.wasCanceled()
+
+    try:
+        completed = run(progress)
+    finally:
+        dialog.close()
+    if not completed:
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+    return completed
 
 
 def save_as_image(widget, ext: str = "png") -> None:
-    """Prompt for file path and export the ERD as PNG, SVG, or PDF."""
+    """Prompt for file path and export the ERD as PNG, TIFF, JPG, SVG, or PDF."""
     filter_map = {
         "svg": "SVG Vector (*.svg)",
-        "pdf": "PDF Document (*.pdf)",
+        "pdf": f"{PDF_SINGLE_FILTER};;{PDF_PAGES_FILTER}",
     }
-    filter_str = filter_map.get(ext, "PNG Image (*.png);;JPG Image (*.jpg)")
-    file_path, _ = QFileDialog.getSaveFileName(
+    filter_str = filter_map.get(ext, "PNG Image (*.png);;TIFF Image (*.tif *.tiff);;JPG Image (*.jpg)")
+    file_path, selected_filter = QFileDialog.getSaveFileName(
         widget,
         f"Export ERD Diagram as {ext.upper()}",
         "",
@@ -284,10 +372,14 @@ def save_as_image(widget, ext: str = "png") -> None:
     try:
         if file_path.endswith('.svg'):
             _export_svg(widget.scene, items_rect, file_path)
+            completed = True
         elif file_path.endswith('.pdf'):
-            _export_pdf(widget.scene, items_rect, file_path)
+            pages = selected_filter == PDF_PAGES_FILTER
+            completed = _export_pdf(widget.scene, items_rect, file_path, widget, pages=pages)
         else:
-            _export_raster(widget.scene, items_rect, file_path, widget)
+            completed = _export_raster(widget.scene, items_rect, file_path, widget)
+        if not completed:
+            return
         QMessageBox.information(widget, "Success", f"ERD successfully exported to {file_path}")
     except Exception as e:
         QMessageBox.critical(widget, "Error", f"Failed to export diagram: {str(e)}")
@@ -0,0 +1,155 @@
+"""Per-item connection slot allocation for the ERD path planner.
+
+A connection leaving an item is fanned out from its neighbours on the same
+side by a slot index: relationships are sorted by key and spread around
+the side's anchor. Working that out per connection means walking every
+connection of the item, so routing all connections of a hub table was
+quadratic. The allocator does the walk once per item and keeps the result
+until one of the item's connections is added or removed, or the item or
+anything it connects to moves. A connection switching sides only moves its
+key between two sorted lists.
+"""
+from bisect import bisect_left, insort
+
+from widgets.erd.items.resizable import item_visual_scene_rect
+
+
+def relationship_key(conn) -> str:
+    """Stable key for the pair of items a connection joins; connections between the same pair share a slot."""
+    def get_name(it):
+        if hasattr(it, "label"):
+            return it.label
+        if hasattr(it, "table_name"):
+            return it.table_name
+        return str(id(it))
+    return "-".join(sorted([get_name(conn.source_item), get_name(conn.target_item)]))
+
+
+def preferred_side(item_rect, other_rect) -> str:
+    dx = other_rect.center().x() - item_rect.center().x()
+    dy = other_rect.center().y() - item_rect.center().y()
+    if abs(dx) >= abs(dy):
+        return "right" if dx >= 0 else "left"
+    return "bottom" if dy >= 0 else "top"
+
+
+class ItemSlots:
+    """Sorted relationship keys of one item, per side and per connected item."""
+
+    __slots__ = ("connection_count", "sides", "pairs", "_side_of", "_side_counts")
+
+    def __init__(self, item) -> None:
+        connections = item.connections
+        self.connection_count = len(connections)
+        # Connections between the same pair share a key, so each side counts its users of a key
+        side_counts: dict[str, dict[str, int]] = {}
+        side_of: dict = {}
+        pairs: dict[int, set] = {}
+        item_rect = None
+        for conn in connections:
+            if conn.source_item == item:
+                other_item = conn.target_item
+                side = getattr(conn, "_last_source_side", None)
+            else:
+                other_item = conn.source_item
+                side = getattr(conn, "_last_target_side", None)
+            if side is None:
+                if item_rect is None:
+                    item_rect = item_visual_scene_rect(item)
+                side = preferred_side(item_rect, item_visual_scene_rect(other_item))
+            key = relationship_key(conn)
+            counts = side_counts.setdefault(side, {})
+            counts[key] = counts.get(key, 0) + 1
+            side_of[conn] = (side, key)
+            pairs.setdefault(id(other_item), set()).add(key)
+        self._side_counts = side_counts
+        self._side_of = side_of
+        self.sides = {side: sorted(counts) for side, counts in side_counts.items()}
+        self.pairs = {other: sorted(keys) for other, keys in pairs.items()}
+
+    def move(self, conn, side: str) -> None:
+        """Record that *conn* now leaves this item on *side*, keeping the sorted lists in place."""
+        entry = self._side_of.get(conn)
+        if entry is None or entry[0] == side:
+            return
+        old_side, key = entry
+        counts = self._side_counts[old_side]
+        counts[key] -= 1
+        if not counts[key]:
+            del counts[key]
+            keys = self.sides[old_side]
+            del keys[bisect_left(keys, key)]
+        counts = self._side_counts.setdefault(side, {})
+        counts[key] = counts.get(key, 0) + 1
+        if counts[key] == 1:
+            insort(self.sides.setdefault(side, []), key)
+        self._side_of[conn] = (side, key)
+
+    @staticmethod
+    def _slot(keys: list, key: str) -> tuple[int, int]:
+        # A key not on this side yet (a candidate side being scored) is slotted in as if it were
+        index = bisect_left(keys, key)
+        if index < len(keys) and keys[index] == key:
+            return index, len(keys)
+        return index, len(keys) + 1
+
+    def side_slot(self, side: str, key: str) -> tuple[int, int]:
+        """``(slot_index, slot_count)`` for *key* on *side*."""
+        return self._slot(self.sides.get(side, []), key)
+
+    def pair_slot(self, other_item, key: str) -> tuple[int, int]:
+        """``(slot_index, slot_count)`` for *key* among the relationships with *other_item*."""
+        return self._slot(self.pairs.get(id(other_item), []), key)
+
+
+class ConnectionSlotAllocator:
+    """Scene-wide cache of ``ItemSlots``, invalidated by moves and connection changes."""
+
+    def __init__(self) -> None:
+        self._slots: dict = {}
+
+    def slots(self, item) -> ItemSlots:
+        entry = self._slots.get(item)
+        if entry is None or entry.connection_count != len(item.connections):
+            entry = self._slots[item] = ItemSlots(item)
+        return entry
+
+    def invalidate(self, item) -> None:
+        self._slots.pop(item, None)
+
+    def side_changed(self, item, conn, side: str) -> None:
+        """*conn* was re-routed to leave *item* on *side*; update cached slots without a rebuild."""
+        entry = self._slots.get(item)
+        if entry is not None:
+            entry.move(conn, side)
+
+    def item_moved(self, item) -> None:
+        """Drop *item*'s slots and those of every item it connects to, whose preferred sides may change."""
+        self._slots.pop(item, None)
+        for conn in getattr(item, "connections", []):
+            self._slots.pop(conn.source_item, None)
+            self._slots.pop(conn.target_item, None)
+
+    def reset(self) -> None:
+        self._slots = {}
+
+
+def item_slots(item) -> ItemSlots:
+    """Cached slots from the item's scene allocator, or freshly computed outside an ERD scene."""
+    allocator = getattr(item.scene(), "slot_allocator", None)
+    if allocator is None:
+        return ItemSlots(item)
+    return allocator.slots(item)
+
+
+def invalidate_slots(*items) -> None:
+    for item in items:
+        allocator = getattr(item.scene(), "slot_allocator", None)
+        if allocator is not None:
+            allocator.invalidate(item)
+
+
+def connection_side_changed(item, conn, side: str) -> None:
+    allocator = getattr(item.scene(), "slot_allocator", None)
+    if allocator is not None:
+        allocator.side_changed(item, conn, side)
@@ -0,0 +1,126 @@
+"""Spatial and name index of ERD tables for snapping, search and hit-testing."""
+import bisect
+
+from PySide6.QtCore import QRectF
+
+from widgets.erd.routing import ObstacleIndex
+
+_SNAP_AXES = ("left", "top", "center_x", "center_y")
+
+
+class TableSpatialIndex:
+    """Table rectangles in a bucket grid, plus sorted coordinates and names.
+
+    Snap lookups bisect sorted left/top/centre coordinate lists, so finding
+    the guide for a dragged table costs O(log n) instead of a scan over every
+    scene item. The scene keeps the index current as tables are added,
+    moved, resized, renamed and removed.
+    """
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self._rects = ObstacleIndex()
+        self._entries = {}   # id(item) -> (item, left, top, center_x, center_y, lower-case name)
+        self._coords = {axis: [] for axis in _SNAP_AXES}  # sorted (value, id(item))
+        self._names = []     # sorted (lower-case name, id(item))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, item) -> bool:
+        return id(item) in self._entries
+
+    def items(self) -> list:
+        return [entry[0] for entry in self._entries.values()]
+
+    def update(self, item) -> None:
+        """Insert ``item`` or refresh its position, size and name."""
+        self.remove(item)
+        pos = item.pos()
+        left, top = pos.x(), pos.y()
+        key = id(item)
+        name = (item.table_name or "").lower()
+        entry = (item, left, top, left + item.width / 2, top + item.height / 2, name)
+        self._entries[key] = entry
+        for axis, value in zip(_SNAP_AXES, entry[1:5]):
+            bisect.insort(self._coords[axis], (value, key))
+        bisect.insort(self._names, (name, key))
+        self._rects.insert(key, QRectF(left, top, item.width, item.height))
+
+    def remove(self, item) -> None:
+        key = id(item)
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for axis, value in zip(_SNAP_AXES, entry[1:5]):
+            _remove_sorted(self._coords[axis], (value, key))
+        _remove_sorted(self._names, (entry[5], key))
+        self._rects.remove(key)
+
+    def query(self, rect: QRectF) -> list:
+        """Tables whose rectangle intersects ``rect``."""
+        return [self._entries[key][0] for key in self._rects.query(rect)]
+
+    def _nearest(self, axis: str, value: float, tolerance: float, skip: set):
+        """Closest indexed coordinate within ``tolerance`` of ``value``, ignoring ``skip`` ids."""
+        coords = self._coords[axis]
+        best = None
+        index = bisect.bisect_right(coords, (value - tolerance, float("inf")))
+        while index < len(coords) and coords[index][0] < value + tolerance:
+            coord, key = coords[index]
+            if key not in skip and (best is None or abs(coord - value) < abs(best - value)):
+                best = coord
+            index += 1
+        return best
+
+    def snap(self, x: float, y: float, width: float, height: float, tolerance: float, skip: set):
+        """Snap a ``width`` x ``height`` box at ``(x, y)`` to other tables' edges and centres.
+
+        Returns:
+            ``(x, y, vertical_guides, horizontal_guides)``; the guide lists hold
+            the x (or y) coordinates of the matched edges or centres and are empty
+            for an axis that did not snap.
+        """
+        vertical, horizontal = [], []
+
+        left = self._nearest("left", x, tolerance, skip)
+        center_x = self._nearest("center_x", x + width / 2, tolerance, skip)
+        if center_x is not None and (left is None or abs(center_x - width / 2 - x) < abs(left - x)):
+            x = center_x - width / 2
+            vertical.append(center_x)
+        elif left is not None:
+            x = left
+            vertical.append(left)
+
+        top = self._nearest("top", y, tolerance, skip)
+        center_y = self._nearest("center_y", y + height / 2, tolerance, skip)
+        if center_y is not None and (top is None or abs(center_y - height / 2 - y) < abs(top - y)):
+            y = center_y - height / 2
+            horizontal.append(center_y)
+        elif top is not None:
+            y = top
+            horizontal.append(top)
+
+        return x, y, vertical, horizontal
+
+    def find(self, text: str):
+        """Table named ``text`` (case-insensitive), else the first name starting with it, else one containing it."""
+        text = text.strip().lower()
+        if not text:
+            return None
+        index = bisect.bisect_left(self._names, (text, -1))
+        if index < len(self._names) and self._names[index][0].startswith(text):
+            # Exact matches sort first among the names sharing the prefix
+            return self._entries[self._names[index][1]][0]
+        for name, key in self._names:
+            if text in name:
+                return self._entries[key][0]
+        return None
+
+
+def _remove_sorted(values: list, value) -> None:
+    index = bisect.bisect_left(values, value)
+    if index < len(values) and values[index] == value:
+        del values[index]
@@ -0,0 +1,257 @@
+"""Tiled, streaming export of ERD scenes to PNG, TIFF and paged PDF.
+
+The scene is rendered one tile at a time through ``QGraphicsScene.render``
+and each tile is written out before the next is painted, so peak memory is
+bounded by the tile (PNG: one band of tiles, since scanlines must be written
+in order) rather than by the size of the diagram.
+"""
+import math
+import struct
+import zlib
+
+import numpy as np
+from PySide6.QtCore import QMarginsF, QRectF, QSizeF, Qt
+from PySide6.QtGui import QImage, QPageLayout, QPageSize, QPainter, QPdfWriter
+
+EXPORT_TILE_SIZE: int = 1024            # rendered tile edge in pixels (TIFF tiles must be a multiple of 16)
+EXPORT_BAND_BYTES: int = 64 * 1024**2   # PNG band buffer cap; the band height shrinks for very wide images
+EXPORT_MIN_BAND: int = 16               # PNG band height floor in pixels
+EXPORT_IDAT_BYTES: int = 1024**2        # compressed bytes per PNG IDAT chunk
+EXPORT_DEFLATE_LEVEL: int = 6
+SCENE_DPI: int = 96                     # one scene unit is one pixel at this resolution
+PDF_PAGE_MARGIN_MM: float = 10.0        # printer-safe margin on every poster page
+PDF_LABEL_HEIGHT_MM: float = 5.0        # strip in the bottom margin that carries the page label
+
+
+def _render_tile(scene, items_rect: QRectF, scale: float, x: int, y: int, w: int, h: int) -> QImage:
+    """Render the *w* x *h* pixel tile at output pixel (*x*, *y*) into an RGBA image."""
+    image = QImage(w, h, QImage.Format.Format_RGBA8888)
+    if image.isNull():
+        raise MemoryError(f"Failed to allocate a {w}x{h} export tile")
+    image.fill(Qt.GlobalColor.transparent)
+    source = QRectF(items_rect.x() + x / scale, items_rect.y() + y / scale, w / scale, h / scale)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+    painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+    scene.render(painter, QRectF(0, 0, w, h), source, Qt.AspectRatioMode.IgnoreAspectRatio)
+    painter.end()
+    return image
+
+
+def _tile_array(image: QImage) -> np.ndarray:
+    """``(height, width * 4)`` uint8 view of an RGBA8888 image, without row padding."""
+    w, h = image.width(), image.height()
+    data = np.frombuffer(image.constBits(), dtype=np.uint8, count=image.bytesPerLine() * h)
+    return data.reshape(h, image.bytesPerLine())[:, : w * 4]
+
+
+def output_size(items_rect: QRectF, scale: float) -> tuple[int, int]:
+    return max(1, math.ceil(items_rect.width() * scale)), max(1, math.ceil(items_rect.height() * scale))
+
+
+# --- PNG ---
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+
+def export_png_tiled(scene, items_rect: QRectF, file_path: str, scale: float = 2.0, progress=None) -> bool:
+    """Stream the scene into an RGBA PNG band by band. Returns False if *progress* cancelled.
+
+    *progress* is called as ``progress(done, total)`` after every tile and may
+    return False to abort; the partial file is left for the caller to remove.
+    """
+    width, height = output_size(items_rect, scale)
+    band = max(EXPORT_MIN_BAND, min(EXPORT_TILE_SIZE, EXPORT_BAND_BYTES // (width * 4)))
+    columns = math.ceil(width / EXPORT_TILE_SIZE)
+    total = columns * math.ceil(height / band)
+    done = 0
+    compressor = zlib.compressobj(EXPORT_DEFLATE_LEVEL)
+    pending = bytearray()
+    with open(file_path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(_png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)))
+        rows = np.empty((band, width * 4 + 1), dtype=np.uint8)
+        for y in range(0, height, band):
+            h = min(band, height - y)
+            rows[:h, 0] = 0  # filter type None
+            for x in range(0, width, EXPORT_TILE_SIZE):
+                w = min(EXPORT_TILE_SIZE, width - x)
+                tile = _render_tile(scene, items_rect, scale, x, y, w, h)
+                rows[:h, 1 + x * 4: 1 + (x + w) * 4] = _tile_array(tile)
+                done += 1
+                if progress is not None and progress(done, total) is False:
+                    return False
+            pending += compressor.compress(rows[:h].tobytes())
+            while len(pending) >= EXPORT_IDAT_BYTES:
+                f.write(_png_chunk(b"IDAT", bytes(pending[:EXPORT_IDAT_BYTES])))
+                del pending[:EXPORT_IDAT_BYTES]
+        pending += compressor.flush()
+        if pending:
+            f.write(_png_chunk(b"IDAT", bytes(pending)))
+        f.write(_png_chunk(b"IEND", b""))
+    return True
+
+
+# --- TIFF ---
+
+_TIFF_SHORT, _TIFF_LONG = 3, 4
+
+
+def export_tiff_tiled(scene, items_rect: QRectF, file_path: str, scale: float = 2.0, progress=None) -> bool:
+    """Stream the scene into a tiled, deflate-compressed RGBA TIFF. Returns False if cancelled.
+
+    TIFF stores tiles natively, so each tile is compressed and written as
+    soon as it is rendered; only the tile offsets are kept until the
+    directory is written at the end.
+    """
+    width, height = output_size(items_rect, scale)
+    tile = EXPORT_TILE_SIZE
+    across, down = math.ceil(width / tile), math.ceil(height / tile)
+    total = across * down
+    offsets: list[int] = []
+    counts: list[int] = []
+    padded = np.zeros((tile, tile * 4), dtype=np.uint8)
+    with open(file_path, "wb") as f:
+        f.write(b"II*\x00" + struct.pack("<I", 0))
+        for row in range(down):
+            for col in range(across):
+                x, y = col * tile, row * tile
+                w, h = min(tile, width - x), min(tile, height - y)
+                data = _tile_array(_render_tile(scene, items_rect, scale, x, y, w, h))
+                if w != tile or h != tile:
+                    # Edge tiles are stored at full size, padded with transparent pixels
+                    padded.fill(0)
+                    padded[:h, : w * 4] = data
+                    data = padded
+                payload = zlib.compress(np.ascontiguousarray(data).tobytes(), EXPORT_DEFLATE_LEVEL)
+                offsets.append(f.tell())
+                counts.append(len(payload))
+                f.write(payload)
+                if f.tell() + 8 * total + 512 > 0xFFFFFFFF:
+                    raise ValueError("Export exceeds the 4 GB TIFF limit; lower the export scale")
+                if progress is not None and progress(len(offsets), total) is False:
+                    return False
+        _write_tiff_directory(f, width, height, offsets, counts)
+    return True
+
+
+def _write_tiff_directory(f, width: int, height: int, offsets: list[int], counts: list[int]) -> None:
+    """Append the image directory after the tile data and point the header at it."""
+    if f.tell() % 2:
+        f.write(b"\x00")
+    bits_at = f.tell()
+    f.write(struct.pack("<4H", 8, 8, 8, 8))
+    offsets_at = f.tell()
+    f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+    counts_at = f.tell()
+    f.write(struct.pack(f"<{len(counts)}I", *counts))
+
+    def array(values: list[int], at: int) -> int:
+        return values[0] if len(values) == 1 else at
+
+    entries = [
+        (256, _TIFF_LONG, 1, width),                    # ImageWidth
+        (257, _TIFF_LONG, 1, height),                   # ImageLength
+        (258, _TIFF_SHORT, 4, bits_at),                 # BitsPerSample
+        (259, _TIFF_SHORT, 1, 8),                       # Compression: Deflate
+        (262, _TIFF_SHORT, 1, 2),                       # PhotometricInterpretation: RGB
+        (277, _TIFF_SHORT, 1, 4),                       # SamplesPerPixel
+        (284, _TIFF_SHORT, 1, 1),                       # PlanarConfiguration: chunky
+        (322, _TIFF_LONG, 1, EXPORT_TILE_SIZE),         # TileWidth
+        (323, _TIFF_LONG, 1, EXPORT_TILE_SIZE),         # TileLength
+        (324, _TIFF_LONG, len(offsets), array(offsets, offsets_at)),
+        (325, _TIFF_LONG, len(counts), array(counts, counts_at)),
+        (338, _TIFF_SHORT, 1, 2),                       # ExtraSamples: unassociated alpha
+    ]
+    ifd_at = f.tell()
+    f.write(struct.pack("<H", len(entries)))
+    for tag, kind, count, value in entries:
+        if kind == _TIFF_SHORT and count == 1:
+            f.write(struct.pack("<HHIHH", tag, kind, count, value, 0))
+        else:
+            f.write(struct.pack("<HHII", tag, kind, count, value))
+    f.write(struct.pack("<I", 0))
+    f.seek(4)
+    f.write(struct.pack("<I", ifd_at))
+
+
+# --- PDF ---
+
+def export_pdf_pages(
+    scene,
+    items_rect: QRectF,
+    file_path: str,
+    page_size: QPageSize | None = None,
+    scale: float = 1.0,
+    progress=None,
+) -> bool:
+    """Print the scene as a poster tiled across pages at *scale* (1.0 = 96 scene units per inch).
+
+    Each page renders its own slice of the scene straight into the PDF, so
+    the output stays vector and no page-sized raster is ever allocated.
+    Returns False if *progress* cancelled.
+    """
+    page_size = page_size or QPageSize(QPageSize.PageSizeId.A4)
+    landscape = items_rect.width() >= items_rect.height()
+    orientation = QPageLayout.Orientation.Landscape if landscape else QPageLayout.Orientation.Portrait
+    margins = QMarginsF(PDF_PAGE_MARGIN_MM, PDF_PAGE_MARGIN_MM, PDF_PAGE_MARGIN_MM, PDF_PAGE_MARGIN_MM)
+    layout = QPageLayout(page_size, orientation, margins, QPageLayout.Unit.Millimeter)
+    writer = QPdfWriter(file_path)
+    writer.setPageLayout(layout)
+    writer.setTitle("Database ERD Diagram")
+    dpi = writer.resolution()
+    paint = layout.paintRectPixels(dpi)
+    label_px = PDF_LABEL_HEIGHT_MM / 25.4 * dpi
+    device_per_unit = dpi / SCENE_DPI * scale
+    page_w = paint.width() / device_per_unit
+    page_h = (paint.height() - label_px) / device_per_unit
+    across = max(1, math.ceil(items_rect.width() / page_w))
+    down = max(1, math.ceil(items_rect.height() / page_h))
+    total = across * down
+    painter = QPainter()
+    if not painter.begin(writer):
+        raise OSError(f"Cannot write {file_path}")
+    try:
+        for row in range(down):
+            for col in range(across):
+                if row or col:
+                    writer.newPage()
+                source = QRectF(
+                    items_rect.x() + col * page_w,
+                    items_rect.y() + row * page_h,
+                    min(page_w, items_rect.right() - (items_rect.x() + col * page_w)),
+                    min(page_h, items_rect.bottom() - (items_rect.y() + row * page_h)),
+                )
+                target = QRectF(0, 0, source.width() * device_per_unit, source.height() * device_per_unit)
+                scene.render(painter, target, source, Qt.AspectRatioMode.IgnoreAspectRatio)
+                if total > 1:
+                    painter.setPen(Qt.GlobalColor.darkGray)
+                    painter.drawText(
+                        QRectF(0, paint.height() - label_px, paint.width(), label_px),
+                        Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignBottom,
+                        f"Row {row + 1}/{down}, column {col + 1}/{across}",
+                    )
+                if progress is not None and progress(row * across + col + 1, total) is False:
+                    return False
+    finally:
+        painter.end()
+    return True
+
+
+def export_pdf_single_page(scene, items_rect: QRectF, file_path: str) -> None:
+    """Render the scene as vectors onto one PDF page sized to match the diagram."""
+    width_mm = items_rect.width() * 25.4 / SCENE_DPI
+    height_mm = items_rect.height() * 25.4 / SCENE_DPI
+    writer = QPdfWriter(file_path)
+    writer.setTitle("Database ERD Diagram")
+    custom_size = QPageSize(QSizeF(width_mm, height_mm), QPageSize.Unit.Millimeter)
+    writer.setPageLayout(QPageLayout(custom_size, QPageLayout.Orientation.Portrait, QMarginsF(0, 0, 0, 0)))
+    painter = QPainter()
+    if not painter.begin(writer):
+        raise OSError(f"Cannot write {file_path}")
+    try:
+        scene.render(painter, QRectF(0, 0, writer.width(), writer.height()), items_rect)
+    finally:
+        painter.end()
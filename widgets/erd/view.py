@@ -12,7 +12,7 @@ from widgets.erd.items.subject_area_item import ERDSubjectAreaItem
 import widgets.erd.widget
 
 from widgets.erd.commands import MoveTableCommand, AddTableCommand, AddColumnCommand
-from widgets.erd.constants import NUDGE_STEP, DUPLICATE_OFFSET
+from widgets.erd.constants import NUDGE_STEP, DUPLICATE_OFFSET, EFFECTS_MIN_SCALE, PAN_SETTLE_MS
 from widgets.erd.items.table_item import ERDTableItem
 
 class ERDView(QGraphicsView):
@@ -30,6 +30,8 @@ class ERDView(QGraphicsView):
         self.setResizeAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
         self.setFrameShape(QFrame.Shape.NoFrame)
         self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.FullViewportUpdate)
+        # The grid brush is redrawn only when the zoom changes; pans reuse the cached background
+        self.setCacheMode(QGraphicsView.CacheModeFlag.CacheBackground)
         
         # Smooth Zoom Setup
         self._zoom_anim = QTimeLine(150, self)
@@ -45,6 +47,23 @@ class ERDView(QGraphicsView):
         self._tooltip_timer.timeout.connect(self._show_pending_tooltip)
         self._pending_tooltip_pos = None
 
+        # Shadows and flow animations pause while panning and when zoomed out
+        self._panning = False
+        self._pan_timer = QTimer(self)
+        self._pan_timer.setSingleShot(True)
+        self._pan_timer.setInterval(PAN_SETTLE_MS)
+        self._pan_timer.timeout.connect(self._end_pan)
+        self.viewport_changed.connect(self._sync_effects)
+
+    def _end_pan(self) -> None:
+        self._panning = False
+        self._sync_effects()
+
+    def _sync_effects(self) -> None:
+        scene = self.scene()
+        if hasattr(scene, "set_effects_enabled"):
+            scene.set_effects_enabled(not self._panning and self.transform().m11() >= EFFECTS_MIN_SCALE)
+
     def _setup_zoom(self, factor):
         if self._zoom_anim.state() == QTimeLine.State.Running:
             self._zoom_anim.stop()
@@ -95,6 +114,8 @@ class ERDView(QGraphicsView):
         
     def scrollContentsBy(self, dx, dy):
         super().scrollContentsBy(dx, dy)
+        self._panning = True
+        self._pan_timer.start()
         self.viewport_changed.emit()
 
     def resizeEvent(self, event):
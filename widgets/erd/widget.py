@@ -8,7 +8,7 @@ from PySide6.QtWidgets import (
     QFrame, QLabel, QProgressBar, QStackedWidget
 )
 from PySide6.QtGui import QAction, QTransform, QColor, QUndoStack
-from PySide6.QtCore import Qt, QSize, QTimer, QPointF
+from PySide6.QtCore import Qt, QSize, QTimer, QPointF, QThreadPool
 
 from widgets.erd.items.table_item import ERDTableItem
 from widgets.erd.items.connection_item import ERDConnectionItem
@@ -27,7 +27,15 @@ from ui.components import ToolbarActionButton, SearchBox
 from widgets.erd.commands import AddTableCommand, AddConnectionCommand, AddNoteCommand
 from widgets.erd.model import DEFAULT_SCHEMA, normalize_entity
 from widgets.erd.sql_generator import SQLPreviewDialog, generate_sql_script
-from widgets.erd.layout_engine import auto_layout as _auto_layout
+from widgets.erd.materializer import SchemaMaterializer, iter_connection_specs, prepare_table
+from widgets.erd.layout_engine import (
+    LAYOUT_ASYNC_MIN_TABLES,
+    LayoutSignals,
+    RunnableERDLayout,
+    apply_layout as _apply_layout_positions,
+    compute_layout as _compute_layout,
+    layout_input as _layout_input,
+)
 from widgets.erd.serialization import (
     serialize_view_state as _serialize_view_state_fn,
     restore_view_state as _restore_view_state_fn,
@@ -38,6 +46,7 @@ from widgets.erd.serialization import (
     save_as_image as _save_as_image,
 )
 from workers.connection_workers import AvailableSchemasWorker
+from workers.grid_filter import FilterToken
 
 
 
@@ -54,6 +63,18 @@ class ERDWidget(QWidget):
         self._available_schemas_cache = None
         self._schema_worker = None
         self._drop_item_data_resolver = None
+        self._layout_generation = 0
+        self._layout_token = None
+        self._layout_signals = LayoutSignals(self)
+        self._layout_signals.finished.connect(self._on_layout_finished)
+        self._layout_signals.error.connect(self._on_layout_error)
+        self._materializer = SchemaMaterializer(self)
+        self._materializer.progress.connect(self._on_materialize_progress)
+        self._materializer.tables_ready.connect(self._on_materialize_tables_ready)
+        self._materializer.finished.connect(self._on_materialize_finished)
+        self._materializer.failed.connect(self.show_load_error)
+        self._progress_percent = -1
+        self._document = None  # open ERDDocument once saved to or loaded from an .erd file
         self.initUI()
         self._start_schema_prefetch()
         
@@ -100,8 +121,12 @@ class ERDWidget(QWidget):
         self.toolbar.addAction(open_action)
         save_action = QAction(qta.icon('fa5s.save', color='#555555'), "Save ERD (.erd)", self)
         save_action.setShortcut("Ctrl+S")
-        save_action.triggered.connect(self.save_erd)
+        save_action.triggered.connect(lambda: self.save_erd())
         self.toolbar.addAction(save_action)
+        save_as_action = QAction(qta.icon('fa5s.file-export', color='#555555'), "Save ERD As\u2026", self)
+        save_as_action.setShortcut("Ctrl+Shift+S")
+        save_as_action.triggered.connect(lambda: self.save_erd(save_as=True))
+        self.toolbar.addAction(save_as_action)
         self.toolbar.addSeparator()
         export_png = QAction(qta.icon('fa5s.image', color='#555555'), "Export to PNG", self)
         export_png.triggered.connect(lambda: self.save_as_image("png"))
@@ -157,8 +182,11 @@ class ERDWidget(QWidget):
         self.toolbar.addSeparator()
         align_action = QAction(qta.icon('fa5s.magic', color='#555555'), "Auto Align", self)
         align_action.setShortcut("Alt+Ctrl+L")
-        align_action.triggered.connect(self.auto_layout)
+        align_action.triggered.connect(lambda: self.auto_layout())
         self.toolbar.addAction(align_action)
+        force_layout_action = QAction(qta.icon('fa5s.project-diagram', color='#555555'), "Force-Directed Layout", self)
+        force_layout_action.triggered.connect(lambda: self.auto_layout("force"))
+        self.toolbar.addAction(force_layout_action)
         self.undo_action = self.undo_stack.createUndoAction(self, "Undo")
         self.undo_action.setIcon(qta.icon('fa5s.undo', color='#555555'))
         self.undo_action.setShortcut("Ctrl+Z")
@@ -438,7 +466,7 @@ class ERDWidget(QWidget):
         overlay_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
         overlay_layout.setSpacing(14)
 
-        spinner = QProgressBar()
+        spinner = self._load_progress = QProgressBar()
         spinner.setRange(0, 0)
         spinner.setFixedWidth(240)
         spinner.setFixedHeight(5)
@@ -461,7 +489,7 @@ class ERDWidget(QWidget):
             "color: #1f2937; font-size: 14px; font-weight: 600; background: transparent;"
         )
 
-        subtitle = QLabel("Reading database structure\u2026")
+        subtitle = self._load_subtitle = QLabel("Reading database structure\u2026")
         subtitle.setAlignment(Qt.AlignmentFlag.AlignCenter)
         subtitle.setStyleSheet(
             "color: #6b7280; font-size: 10px; background: transparent;"
@@ -482,11 +510,39 @@ class ERDWidget(QWidget):
         return frame
 
     def populate(self, schema_data):
-        """Called by the async worker when the schema fetch completes."""
+        """Called by the async worker when the schema fetch completes; builds the diagram progressively."""
         self.schema_data = schema_data
-        self.load_schema()
-        self.auto_layout()
+        self._cancel_auto_layout()
+        self._progress_percent = -1
+        if self._document is not None:
+            # A freshly read schema is a new, unsaved diagram
+            self._document.close()
+            self._document = None
+        if self.scene.tables:
+            self.scene.clear()
+            self.scene.tables = {}
+        self._materializer.start(schema_data)
+
+    def _on_materialize_progress(self, phase, done, total):
+        percent = int(done * 100 / total) if total else -1
+        if percent == self._progress_percent:
+            return
+        self._progress_percent = percent
+        if self._canvas_stack.currentIndex() == 0:
+            self._load_progress.setRange(0, 100 if total else 0)
+            self._load_progress.setValue(max(percent, 0))
+            self._load_subtitle.setText(f"{phase}\u2026 {done:,} / {total:,}" if total else f"{phase}\u2026")
+        elif total:
+            self.status_message(f"{phase}: {done:,} / {total:,}")
+
+    def _on_materialize_tables_ready(self, x, y, scale):
+        # The nearest tables are in; the rest stream in while the canvas is usable
         self._canvas_stack.setCurrentIndex(1)
+        self.view.setTransform(QTransform.fromScale(scale, scale))
+        self.view.centerOn(QPointF(x, y))
+
+    def _on_materialize_finished(self):
+        self.status_message(f"Diagram ready: {len(self.scene.tables):,} tables")
 
     def show_load_error(self, message):
         """Display an inline error on the loading overlay (worker failed)."""
@@ -503,21 +559,21 @@ class ERDWidget(QWidget):
     def _build_table_items(self) -> None:
         """Create ERDTableItem for each entry in schema_data and assign group colours."""
         for full_name, table_info in self.schema_data.items():
-            info = normalize_entity(table_info)
-            table_name = info.get('table', full_name)
-            schema_name = info.get('schema', DEFAULT_SCHEMA)
-            columns = info['columns']
-            fk_cols = {fk['from'] for fk in info.get('foreign_keys', [])}
-            for col in columns:
-                if col['name'] in fk_cols:
-                    col['fk'] = True
+            table_name, schema_name, columns = prepare_table(full_name, table_info)
             table_item = ERDTableItem(table_name, columns, schema_name=schema_name)
             self.scene.addItem(table_item)
             self.scene.tables[full_name] = table_item
         self._assign_group_colors()
 
     def _assign_group_colors(self) -> None:
-        """Colour-code connected table groups via DFS on FK adjacency."""
+        """Colour-code connected table groups."""
+        for name, color in self._group_colors().items():
+            if name in self.scene.tables:
+                self.scene.tables[name].group_color = color
+
+    def _group_colors(self) -> dict:
+        """Group colour per table name, one colour per connected FK group (DFS on FK adjacency)."""
+        colors: dict = {}
         adj: dict = {name: [] for name in self.schema_data.keys()}
         for full_name, table_info in self.schema_data.items():
             info = normalize_entity(table_info)
@@ -540,51 +596,82 @@ class ERDWidget(QWidget):
                         stack.extend(adj[curr])
                 color = self._GROUP_COLORS[group_idx % len(self._GROUP_COLORS)]
                 for comp_name in component:
-                    if comp_name in self.scene.tables:
-                        self.scene.tables[comp_name].group_color = color
+                    colors[comp_name] = color
                 group_idx += 1
+        return colors
 
     def _build_connections(self) -> None:
         """Create ERDConnectionItem for each FK relationship in schema_data."""
-        for full_name, table_info in self.schema_data.items():
-            info = normalize_entity(table_info)
-            source_item = self.scene.tables.get(full_name)
-            if not source_item:
-                continue
-            pk_cols = {col['name'] for col in info['columns'] if col.get('pk')}
-            for fk in info.get('foreign_keys', []):
-                target_item = self.scene.tables.get(fk['table'])
-                if not target_item:
-                    continue
-                is_identifying = fk['from'] in pk_cols
-                is_unique = (
-                    fk.get("type") == "one-to-one"
-                    or is_identifying
-                    or any(
-                        col['name'] == fk['from'] and col.get('unique')
-                        for col in info['columns']
-                    )
-                )
-                conn_item = ERDConnectionItem(
-                    source_item, target_item,
-                    fk['from'], fk['to'],
-                    is_identifying=is_identifying,
-                    is_unique=is_unique,
-                    fk_meta=fk,
-                )
-                self.scene.addItem(conn_item)
+        specs = iter_connection_specs(self.schema_data, self.scene.tables)
+        for source_item, target_item, from_col, to_col, is_identifying, is_unique, fk in specs:
+            conn_item = ERDConnectionItem(
+                source_item, target_item,
+                from_col, to_col,
+                is_identifying=is_identifying,
+                is_unique=is_unique,
+                fk_meta=fk,
+            )
+            self.scene.addItem(conn_item)
 
     def load_schema(self) -> None:
         """Populate scene from schema_data: tables, group colours, and connections."""
+        self._materializer.cancel()
+        self._cancel_auto_layout()
         self._build_table_items()
         self._build_connections()
         self.scene.update_scene_rect()
 
-    def auto_layout(self):
-        """Delegate hierarchical layout to layout_engine and refresh view."""
+    def auto_layout(self, mode: str = "auto"):
+        """Lay out all tables with layout_engine; large diagrams are laid out on the thread pool."""
+        self._cancel_auto_layout()
         if not self.scene.tables:
             return
-        _auto_layout(self.schema_data, self.scene.tables)
+        names, sizes, edges = _layout_input(self.schema_data, self.scene.tables)
+        if len(names) < LAYOUT_ASYNC_MIN_TABLES:
+            self._apply_layout(_compute_layout(names, sizes, edges, mode))
+            return
+        self._layout_token = FilterToken()
+        self.status_message(f"Laying out {len(names)} tables...")
+        QThreadPool.globalInstance().start(
+            RunnableERDLayout(
+                self._layout_generation,
+                self._layout_token,
+                self._layout_signals,
+                names,
+                sizes,
+                edges,
+                mode,
+            )
+        )
+
+    def _cancel_auto_layout(self) -> None:
+        """Drop any in-flight layout job, e.g. before the scene is rebuilt."""
+        self._layout_generation += 1
+        if self._layout_token is not None:
+            self._layout_token.cancel()
+            self._layout_token = None
+
+    def _on_layout_finished(self, generation, positions):
+        if generation != self._layout_generation:
+            return
+        self._layout_token = None
+        self._apply_layout(positions)
+
+    def _on_layout_error(self, generation, message):
+        if generation != self._layout_generation:
+            return
+        self._layout_token = None
+        self.status_message(f"Auto layout failed: {message}")
+
+    def _apply_layout(self, positions: dict) -> None:
+        """Move all tables in one batch, route their connections once and refresh the view."""
+        viewport = self.view.viewport()
+        viewport.setUpdatesEnabled(False)
+        try:
+            _apply_layout_positions(self.scene.tables, positions)
+            self.scene.route_scheduler.flush()
+        finally:
+            viewport.setUpdatesEnabled(True)
         self.scene.update_scene_rect()
         if self.scene.items():
             QTimer.singleShot(0, self._center_view_deferred)
@@ -605,9 +692,9 @@ class ERDWidget(QWidget):
     def toggle_types(self, checked):
         self.update_scene_items(ERDTableItem, 'show_types', checked)
         
-    def save_erd(self) -> None:
+    def save_erd(self, save_as: bool = False) -> None:
         """Delegate to serialization module."""
-        _save_erd(self)
+        _save_erd(self, save_as)
 
     def load_erd_file(self, file_path: str | None = None) -> None:
         """Delegate to serialization module."""
@@ -1,7 +1,18 @@
-from PySide6.QtCore import Qt
+import io
+import os
+
+from PySide6.QtCore import QMimeData, Qt, QUrl
 from PySide6.QtWidgets import QApplication, QTableView, QTextEdit
 
-def copy_current_result_table(manager):
+from widgets.results_view.value_state import editor_text_to_db_value
+from workers.grid_copy import COPY_FORMATS, GridCopySignals, RunnableGridCopy, iter_copy_rows, serialize_rows
+from workers.grid_filter import FilterToken
+
+# Selections up to this many cells are serialized right away on the GUI thread
+INLINE_COPY_CELLS = 20_000
+
+
+def copy_current_result_table(manager, fmt="tsv"):
     tab = manager.tab_widget.currentWidget()
     if not tab:
         return
@@ -10,65 +21,180 @@ def copy_current_result_table(manager):
     if not table_view:
         return
 
-    copy_result_with_header(manager, table_view)
-
-
-def copy_result_with_header(manager, table_view: QTableView):
+    copy_result_with_header(manager, table_view, fmt)
+
+
+def _selected_ranges(table_view):
+    """Return the selected proxy rows and columns, sorted, from the selection ranges."""
+    rows = set()
+    columns = set()
+    for selection_range in table_view.selectionModel().selection():
+        rows.update(range(selection_range.top(), selection_range.bottom() + 1))
+        columns.update(range(selection_range.left(), selection_range.right() + 1))
+    return sorted(rows), sorted(columns)
+
+
+def _copy_overlays(source_model, raw_count, source_rows, output_state):
+    """Collect unsaved cell edits and rows typed in by the user, which the raw rows do not hold."""
+    overrides = {}
+    for row, column in output_state.get("modified_coords") or ():
+        item = source_model.item(row, column)
+        if item is not None:
+            text = item.data(Qt.ItemDataRole.EditRole)
+            overrides.setdefault(row, {})[column] = editor_text_to_db_value("" if text is None else str(text))
+
+    extra_rows = {}
+    for row in source_rows:
+        if row < raw_count:
+            continue
+        values = []
+        for column in range(source_model.columnCount()):
+            item = source_model.item(row, column)
+            text = item.data(Qt.ItemDataRole.EditRole) if item else None
+            values.append(editor_text_to_db_value("" if text is None else str(text)))
+        extra_rows[row] = tuple(values)
+    return overrides, extra_rows
+
+
+def copy_result_with_header(manager, table_view: QTableView, fmt="tsv"):
+    """
+    Copy the selected cells with a header row, in ``fmt`` (a key of ``COPY_FORMATS``).
+
+    Selections resolve to source rows and columns once and are serialized
+    from the raw result rows; large ones are serialized on the thread pool.
+    Output above ``CLIPBOARD_TEXT_LIMIT`` goes to a temp file that is put on
+    the clipboard as a file, for pasting or dropping elsewhere.
+    """
     model = table_view.model()
     sel = table_view.selectionModel()
 
-    if not model or not sel:
+    if not model or not sel or not sel.hasSelection():
+        return
+    if not hasattr(model, "raw_rows"):
+        _copy_from_model(table_view)
         return
 
-    rows = []
+    proxy_rows, columns = _selected_ranges(table_view)
+    if not proxy_rows or not columns:
+        return
 
-    selected_rows = sel.selectedRows()
-    selected_indexes = sel.selectedIndexes()
+    source_model = model.sourceModel()
+    rows = model.raw_rows()
+    source_rows = model.source_rows(proxy_rows)
+    output_state = table_view.property("output_state") or {}
+    names = output_state.get("column_names") or []
+    column_names = [
+        names[column] if column < len(names) else (source_model.headerData(column, Qt.Orientation.Horizontal) or "")
+        for column in columns
+    ]
+    overrides, extra_rows = _copy_overlays(source_model, len(rows), source_rows, output_state)
+    table_name = output_state.get("qualified_table_name")
+
+    if len(source_rows) * len(columns) <= INLINE_COPY_CELLS:
+        out = io.StringIO()
+        count = serialize_rows(
+            out, fmt, column_names,
+            iter_copy_rows(rows, source_rows, columns, overrides, extra_rows),
+            table_name,
+        )
+        _deliver_copy(manager, fmt, out.getvalue(), None, count)
+        return
 
-    if selected_rows:
-        columns = range(model.columnCount())
+    state = getattr(manager, "_copy_state", None)
+    if state is None:
+        state = manager._copy_state = {"generation": 0, "token": None, "temp_path": None}
+    state["generation"] += 1
+    if state["token"] is not None:
+        state["token"].cancel()
+    generation = state["generation"]
+    total = len(source_rows)
+
+    def on_progress(job_generation, done, job_total):
+        if job_generation == state["generation"]:
+            manager.status.showMessage(f"Copying rows... {done:,}/{job_total:,}")
+
+    def on_finished(job_generation, text, path, count):
+        if job_generation != state["generation"]:
+            if path:
+                _remove_file(path)
+            return
+        state["token"] = None
+        _deliver_copy(manager, fmt, text, path, count)
+
+    def on_error(job_generation, message):
+        if job_generation == state["generation"]:
+            state["token"] = None
+            manager.status.showMessage(f"Copy failed: {message}", 5000)
+
+    signals = GridCopySignals()
+    signals.progress.connect(on_progress)
+    signals.finished.connect(on_finished)
+    signals.error.connect(on_error)
+    state["signals"] = signals
+
+    token = FilterToken()
+    state["token"] = token
+    manager.status.showMessage(f"Copying {total:,} rows...")
+    manager.thread_pool.start(
+        RunnableGridCopy(
+            generation, token, signals, list(rows), source_rows, columns, column_names,
+            fmt, table_name, overrides, extra_rows,
+        )
+    )
 
-        header = [
-            str(model.headerData(col, Qt.Orientation.Horizontal) or "")
-            for col in columns
-        ]
-        rows.append("\t".join(header))
 
-        for selected_row in selected_rows:
-            row = selected_row.row()
-            row_data = [
-                str(model.index(row, col).data() or "")
-                for col in columns
-            ]
-            rows.append("\t".join(row_data))
-    elif selected_indexes:
-        selected_indexes = sorted(
-            selected_indexes, key=lambda index: (index.row(), index.column())
-        )
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
 
-        columns = sorted({index.column() for index in selected_indexes})
 
-        header = [
-            str(model.headerData(col, Qt.Orientation.Horizontal) or "")
-            for col in columns
-        ]
-        rows.append("\t".join(header))
+def _deliver_copy(manager, fmt, text, path, count):
+    label = COPY_FORMATS.get(fmt, (fmt,))[0]
+    if path is None:
+        QApplication.clipboard().setText(text)
+        manager.status.showMessage(f"Copied {count:,} rows as {label}", 3000)
+        return
 
-        current_row = selected_indexes[0].row()
-        row_data = []
+    # Only the latest spilled copy can still be on the clipboard
+    state = getattr(manager, "_copy_state", None) or {}
+    previous = state.get("temp_path")
+    if previous and previous != path:
+        _remove_file(previous)
+    state["temp_path"] = path
 
-        for index in selected_indexes:
-            if index.row() != current_row:
-                rows.append("\t".join(row_data))
-                row_data = []
-                current_row = index.row()
+    mime_data = QMimeData()
+    mime_data.setUrls([QUrl.fromLocalFile(path)])
+    QApplication.clipboard().setMimeData(mime_data)
+    manager.status.showMessage(
+        f"Copied {count:,} rows as {label} to {path} (too large for clipboard text; paste or drop it as a file)",
+        10000,
+    )
 
-            row_data.append(str(index.data() or ""))
 
-        rows.append("\t".join(row_data))
-    else:
+def _copy_from_model(table_view):
+    """Copy selected cells as TSV through the view's model (models without raw rows)."""
+    model = table_view.model()
+    selected_indexes = sorted(
+        table_view.selectionModel().selectedIndexes(), key=lambda index: (index.row(), index.column())
+    )
+    if not selected_indexes:
         return
 
+    columns = sorted({index.column() for index in selected_indexes})
+    rows = ["\t".join(str(model.headerData(col, Qt.Orientation.Horizontal) or "") for col in columns)]
+
+    current_row = selected_indexes[0].row()
+    row_data = []
+    for index in selected_indexes:
+        if index.row() != current_row:
+            rows.append("\t".join(row_data))
+            row_data = []
+            current_row = index.row()
+        row_data.append(str(index.data() or ""))
+    rows.append("\t".join(row_data))
+
     QApplication.clipboard().setText("\n".join(rows))
 
 
@@ -1,15 +1,30 @@
-import json
 import os
+from collections import deque
 
 from PySide6.QtWidgets import (
-    QGraphicsView, QGraphicsScene, QGraphicsItem, QGraphicsLineItem, QToolBar, QFrame,
+    QGraphicsView, QGraphicsScene, QGraphicsItem, QToolBar, QFrame,
     QVBoxLayout, QHBoxLayout, QWidget, QLabel, QSplitter, QTabWidget,
     QTableWidget, QTableWidgetItem, QHeaderView, QStyledItemDelegate, QStyle, 
     QStyleOptionProgressBar, QApplication, QTreeWidget, QTreeWidgetItem
 )
 from ui.components import SecondaryButton
-from PySide6.QtCore import Qt, QRectF, Signal
+from PySide6.QtCore import Qt, QLineF, QRectF, QThreadPool, QTimer, Signal
 from PySide6.QtGui import QPen, QBrush, QColor, QFont, QPainter, QPixmap
+from workers.grid_filter import FilterToken
+from workers.plan_analysis import (
+    PLAN_NODE_HEIGHT,
+    PLAN_NODE_WIDTH,
+    PlanAnalysisSignals,
+    PlanGroup,
+    RunnablePlanAnalysis,
+)
+
+# Analysis-tab rows created up front; the rest are created as nodes are expanded
+PLAN_TREE_EAGER_ITEMS = 300
+# Item role marking an Analysis-tab row whose children have not been created yet
+PLAN_CHILDREN_PENDING_ROLE = Qt.ItemDataRole.UserRole + 2
+# Above this many nodes in view, the graph is painted as outlines instead of items
+PLAN_MAX_VIEW_ITEMS = 400
 
 
 class AnalysisItemDelegate(QStyledItemDelegate):
@@ -86,18 +101,24 @@ class ExplainVisualizer(QWidget):
         
         self.btn_zoom_in = SecondaryButton("+")
         self.btn_zoom_in.setFixedSize(24, 24)
-        self.btn_zoom_in.clicked.connect(lambda: self.graph_view.scale(1.2, 1.2))
+        self.btn_zoom_in.clicked.connect(lambda: self.graph_view.zoom(1.2))
         
         self.btn_zoom_out = SecondaryButton("-")
         self.btn_zoom_out.setFixedSize(24, 24)
-        self.btn_zoom_out.clicked.connect(lambda: self.graph_view.scale(0.8, 0.8))
+        self.btn_zoom_out.clicked.connect(lambda: self.graph_view.zoom(0.8))
         
         self.btn_reset = SecondaryButton("Reset")
         self.btn_reset.clicked.connect(lambda: self.graph_view.reset_view())
         
+        self.btn_collapse_groups = SecondaryButton("Collapse Groups")
+        self.btn_collapse_groups.setToolTip("Fold expanded groups of similar sibling nodes back into summary nodes")
+        self.btn_collapse_groups.setEnabled(False)
+        self.btn_collapse_groups.clicked.connect(self._collapse_groups)
+        
         self.graph_toolbar.addWidget(self.btn_zoom_in)
         self.graph_toolbar.addWidget(self.btn_zoom_out)
         self.graph_toolbar.addWidget(self.btn_reset)
+        self.graph_toolbar.addWidget(self.btn_collapse_groups)
         graphics_layout.addWidget(self.graph_toolbar)
         
         # Splitter for Graph | Details
@@ -105,6 +126,7 @@ class ExplainVisualizer(QWidget):
         
         self.graph_view = ExplainGraphView()
         self.graph_view.nodeSelected.connect(self._show_details)
+        self.graph_view.groupExpandRequested.connect(self._expand_group)
         self.graph_splitter.addWidget(self.graph_view)
         
         # Side Details Panel
@@ -160,6 +182,7 @@ class ExplainVisualizer(QWidget):
         self.analysis_delegate = AnalysisItemDelegate(self.analysis_tree)
         self.analysis_tree.setItemDelegateForColumn(2, self.analysis_delegate)  # Exclusive
         self.analysis_tree.setItemDelegateForColumn(3, self.analysis_delegate)  # Inclusive
+        self.analysis_tree.itemExpanded.connect(self._populate_analysis_children)
         self.tabs.addTab(self.analysis_tree, "Analysis")
         
         # 3. Statistics Tab
@@ -190,50 +213,139 @@ class ExplainVisualizer(QWidget):
         
         self.layout.addWidget(self.tabs)
 
+        # Background plan analysis
+        self._plan_generation = 0
+        self._plan_token = None
+        self._plan_analysis = None
+        self._expanded_groups = set()
+        self._plan_signals = PlanAnalysisSignals()
+        self._plan_signals.finished.connect(self._on_plan_analyzed)
+        self._plan_signals.error.connect(self._on_plan_error)
+
     def load_plan(self, plan_json):
-        self.graph_view.scene().clear()
+        self._cancel_plan_job()
+        self._plan_analysis = None
+        self._expanded_groups = set()
+        self.graph_view.clear_plan()
         self.analysis_tree.clear()
         self.node_stats_table.setRowCount(0)
         self.rel_stats_tree.clear()
         self.details_table.setRowCount(0)
         self.details_container.hide()
-        
+        self.btn_collapse_groups.setEnabled(False)
+
         if not plan_json:
             self.summary_label.setText("No plan to display.")
             return
 
-        try:
-            if isinstance(plan_json, str):
-                data = json.loads(plan_json)
-            else:
-                data = plan_json
-            
-            if isinstance(data, list) and len(data) > 0:
-                root_plan = data[0].get('Plan')
-                total_runtime = data[0].get('Execution Time') or data[0].get('Total Runtime')
-                if total_runtime:
-                     self.summary_label.setText(f"Total Execution Time: {total_runtime} ms")
-                else:
-                    self.summary_label.setText(f"Plan Cost: {root_plan.get('Total Cost', 'N/A')}")
-                
-                # 0. Enrich Plan Data (Calculate derived metrics)
-                self._enrich_plan_data(root_plan)
+        # Parsing, enrichment, statistics and layout run on the thread pool
+        self.summary_label.setText("Analyzing plan...")
+        self._start_plan_job(plan_json=plan_json)
 
-                # 1. Populate Graphical
-                self.graph_view.load_plan(root_plan)
-                
-                # 2. Populate Analysis
-                self._populate_analysis(root_plan, self.analysis_tree.invisibleRootItem())
-                self.analysis_tree.expandAll()
-                self._apply_analysis_heatmap()
-                
-                # 3. Populate Statistics
-                self._populate_statistics(root_plan, total_runtime)
-            
-        except Exception as e:
-            self.summary_label.setText(f"Error parsing plan: {str(e)}")
+    def _cancel_plan_job(self):
+        self._plan_generation += 1
+        if self._plan_token is not None:
+            self._plan_token.cancel()
+            self._plan_token = None
+
+    def _start_plan_job(self, plan_json=None, analysis=None):
+        self._cancel_plan_job()
+        self._plan_token = FilterToken()
+        QThreadPool.globalInstance().start(
+            RunnablePlanAnalysis(
+                self._plan_generation,
+                self._plan_token,
+                self._plan_signals,
+                plan_json=plan_json,
+                analysis=analysis,
+                expanded_groups=self._expanded_groups,
+            )
+        )
+
+    def _on_plan_analyzed(self, generation, analysis, layout):
+        if generation != self._plan_generation:
+            return
+        self._plan_token = None
+        self.btn_collapse_groups.setEnabled(bool(self._expanded_groups))
+
+        if analysis is self._plan_analysis:
+            # Re-layout after a group was expanded or the groups were collapsed
+            self.graph_view.set_layout(layout, fit=False)
+            return
+
+        self._plan_analysis = analysis
+        root_plan = analysis.root
+        if analysis.total_runtime:
+            self.summary_label.setText(f"Total Execution Time: {analysis.total_runtime} ms")
+        else:
+            self.summary_label.setText(f"Plan Cost: {root_plan.get('Total Cost', 'N/A')}")
+        self.summary_label.setText(f"{self.summary_label.text()} | {len(analysis.nodes):,} plan nodes")
+
+        # 1. Populate Graphical
+        self.graph_view.set_layout(layout)
 
-    def _populate_analysis(self, plan_node, parent_item, row_num=1):
+        # 2. Populate Analysis
+        self.analysis_delegate.max_exclusive = analysis.max_exclusive
+        self.analysis_delegate.max_inclusive = analysis.max_inclusive
+        self._populate_analysis(analysis)
+
+        # 3. Populate Statistics
+        self._populate_statistics(analysis)
+
+    def _on_plan_error(self, generation, message):
+        if generation != self._plan_generation:
+            return
+        self._plan_token = None
+        self.summary_label.setText(f"Error parsing plan: {message}")
+
+    def _expand_group(self, group):
+        if self._plan_analysis is None:
+            return
+        self._expanded_groups.add(group.key)
+        self.graph_view.set_focus_entry(group.members[0])
+        self._start_plan_job(analysis=self._plan_analysis)
+
+    def _collapse_groups(self):
+        if self._plan_analysis is None or not self._expanded_groups:
+            return
+        self._expanded_groups = set()
+        self._start_plan_job(analysis=self._plan_analysis)
+
+    def _populate_analysis(self, analysis):
+        root_item = self._add_analysis_item(self.analysis_tree.invisibleRootItem(), analysis.root)
+
+        # Expand breadth-first while the item budget lasts; deeper levels and
+        # wide nodes (Append over many partitions) are filled in on expansion
+        created = 1
+        pending = deque([root_item])
+        while pending:
+            item = pending.popleft()
+            plan_node = self._analysis_node(item)
+            child_count = len(plan_node.get("Plans") or []) if plan_node else 0
+            if not child_count:
+                continue
+            if created + child_count > PLAN_TREE_EAGER_ITEMS:
+                break
+            self._populate_analysis_children(item)
+            item.setExpanded(True)
+            created += child_count
+            pending.extend(item.child(i) for i in range(item.childCount()))
+
+    def _analysis_node(self, item):
+        row_num = item.data(0, Qt.ItemDataRole.UserRole + 1)
+        if self._plan_analysis is None or not row_num:
+            return None
+        return self._plan_analysis.nodes[row_num - 1]
+
+    def _populate_analysis_children(self, item):
+        if not item.data(1, PLAN_CHILDREN_PENDING_ROLE):
+            return
+        item.setData(1, PLAN_CHILDREN_PENDING_ROLE, False)
+        plan_node = self._analysis_node(item)
+        for child_plan in (plan_node.get("Plans") or []) if plan_node else []:
+            self._add_analysis_item(item, child_plan)
+
+    def _add_analysis_item(self, parent_item, plan_node):
         node_type = plan_node.get("Node Type", "Unknown")
         relation = plan_node.get("Relation Name")
         alias = plan_node.get("Alias")
@@ -257,25 +369,18 @@ class ExplainVisualizer(QWidget):
         plan_width = plan_node.get("Plan Width", 0)
         operation_text += f" (cost={startup_cost:.2f}..{total_cost:.2f} rows={plan_rows} width={plan_width})"
         
-        # Timing - Inclusive/Exclusive
-        inclusive = plan_node.get("Actual Total Time", 0)
-        children_inclusive = 0
-        if "Plans" in plan_node:
-            for child in plan_node["Plans"]:
-                children_inclusive += child.get("Actual Total Time", 0)
-        exclusive = max(0, inclusive - children_inclusive)
+        # Timing - Inclusive/Exclusive (computed during analysis)
+        inclusive = plan_node.get("inclusive", 0)
+        exclusive = plan_node.get("exclusive", 0)
         
         # Rows
         actual_rows = plan_node.get("Actual Rows", 0)
-        rows_x = ""
-        if plan_rows > 0:
-            ratio = actual_rows / plan_rows
-            rows_x = f"{ratio:.2f}"
+        rows_x = f"{plan_node.get('rowsx', 0):.2f}" if plan_rows > 0 else ""
         
         loops = plan_node.get("Actual Loops", 1)
 
         item = QTreeWidgetItem(parent_item)
-        item.setText(0, str(row_num))
+        item.setText(0, str(self._plan_analysis.row_numbers[id(plan_node)]))
         item.setText(1, operation_text)
         item.setText(2, f"{exclusive:.2f} ms")
         item.setText(3, f"{inclusive:.2f} ms")
@@ -288,87 +393,22 @@ class ExplainVisualizer(QWidget):
         item.setData(2, Qt.ItemDataRole.UserRole, exclusive)
         item.setData(3, Qt.ItemDataRole.UserRole, inclusive)
         
-        # Store node data
-        item.setData(0, Qt.ItemDataRole.UserRole + 1, plan_node)
+        # Store the node's row number; the node itself stays in the analysis
+        item.setData(0, Qt.ItemDataRole.UserRole + 1, self._plan_analysis.row_numbers[id(plan_node)])
         
         # Color Rows X if > 1 (yellow)
-        if rows_x:
-            try:
-                if float(rows_x) > 1.0:
-                    item.setForeground(4, QBrush(QColor(180, 120, 0)))
-            except (TypeError, ValueError):
-                pass
-        
-        current_row = row_num
-        if "Plans" in plan_node:
-            for child_plan in plan_node["Plans"]:
-                current_row = self._populate_analysis(child_plan, item, current_row + 1)
-        
-        return current_row
-
-    def _apply_analysis_heatmap(self):
-        # Find max inclusive and exclusive times for delegate normalization
-        max_incl = 0
-        max_excl = 0
-        
-        def find_max(item):
-            nonlocal max_incl, max_excl
-            try:
-                excl = item.data(2, Qt.ItemDataRole.UserRole)
-                incl = item.data(3, Qt.ItemDataRole.UserRole)
-                if excl:
-                    max_excl = max(max_excl, excl)
-                if incl:
-                    max_incl = max(max_incl, incl)
-            except (TypeError, ValueError):
-                pass
-            for i in range(item.childCount()):
-                find_max(item.child(i))
-                
-        for i in range(self.analysis_tree.topLevelItemCount()):
-            find_max(self.analysis_tree.topLevelItem(i))
-        
-        # Store max values in delegate
-        if hasattr(self, 'analysis_delegate'):
-            self.analysis_delegate.max_exclusive = max_excl
-            self.analysis_delegate.max_inclusive = max_incl
-
-    def _populate_statistics(self, root_plan, total_runtime):
-        node_stats = {}  # {node_type: {count, time}}
-        rel_node_stats = {}  # {rel_name: {node_type: {count, time}}}
-        
-        def traverse(node):
-            ntype = node.get("Node Type")
-            rel = node.get("Relation Name")
-            time = node.get("Actual Total Time", 0)
-            
-            # Calculate exclusive time
-            children_time = 0
-            if "Plans" in node:
-                for c in node["Plans"]:
-                    children_time += c.get("Actual Total Time", 0)
-            excl_time = max(0, time - children_time)
-            
-            # Node Stats
-            if ntype not in node_stats:
-                node_stats[ntype] = {"count": 0, "time": 0}
-            node_stats[ntype]["count"] += 1
-            node_stats[ntype]["time"] += excl_time
-            
-            # Relation Stats - hierarchical
-            if rel:
-                if rel not in rel_node_stats:
-                    rel_node_stats[rel] = {}
-                if ntype not in rel_node_stats[rel]:
-                    rel_node_stats[rel][ntype] = {"count": 0, "time": 0}
-                rel_node_stats[rel][ntype]["count"] += 1
-                rel_node_stats[rel][ntype]["time"] += excl_time
-                
-            if "Plans" in node:
-                for c in node["Plans"]:
-                    traverse(c)
-                    
-        traverse(root_plan)
+        if rows_x and plan_node.get("rowsx", 0) > 1.0:
+            item.setForeground(4, QBrush(QColor(180, 120, 0)))
+
+        if plan_node.get("Plans"):
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+            item.setData(1, PLAN_CHILDREN_PENDING_ROLE, True)
+        
+        return item
+
+    def _populate_statistics(self, analysis):
+        node_stats = analysis.node_stats
+        rel_node_stats = analysis.relation_stats
         
         # Populate Node Stats Table
         total_time = sum(s["time"] for s in node_stats.values())
@@ -406,55 +446,6 @@ class ExplainVisualizer(QWidget):
         
         self.rel_stats_tree.expandAll()
 
-    def _enrich_plan_data(self, node):
-        """
-        Recursively calculates and adds derived metrics (inclusive, exclusive, rowsx)
-        to the plan node dictionary, matching pgAdmin's display fields.
-        """
-        # 1. Inclusive Time (Actual Total Time)
-        inclusive = node.get("Actual Total Time", 0)
-        node["inclusive"] = inclusive
-
-        # 2. Exclusive Time (Inclusive - Children Inclusive)
-        children_inclusive = 0
-        if "Plans" in node:
-            for child in node["Plans"]:
-                # Recurse first so children have their times calculated
-                self._enrich_plan_data(child)
-                children_inclusive += child.get("Actual Total Time", 0)
-        
-        exclusive = max(0, inclusive - children_inclusive)
-        node["exclusive"] = exclusive
-
-        # 3. Rows X (Actual / Plan)
-        plan_rows = node.get("Plan Rows", 0)
-        actual_rows = node.get("Actual Rows", 0)
-        rows_x = 0
-        if plan_rows > 0:
-            rows_x = actual_rows / plan_rows
-        
-        # Determine direction
-        rows_x_direction = "none"
-        if rows_x > 1:
-            rows_x_direction = "underestimation" # Plan was lower than actual
-        elif rows_x < 1 and rows_x > 0:
-            rows_x_direction = "overestimation"
-        
-        node["rowsx"] = rows_x
-        node["rowsx_direction"] = rows_x_direction
-
-        # 4. Other Aliases/Format matches
-        if "Actual Loops" in node:
-            node["loops"] = node["Actual Loops"]
-        
-
-        node["inclusive_factor"] = 1 # Placeholder
-        node["exclusive_factor"] = 1 # Placeholder
-        node["inclusive_flag"] = 4 # Placeholder (pgAdmin enum?)
-        node["exclusive_flag"] = 4 # Placeholder
-        node["rowsx_flag"] = 2 if rows_x > 1 else 0 # Placeholder approximation
-
-
     def _show_details(self, plan_node):
         self.details_table.setRowCount(0)
         if not plan_node:
@@ -496,8 +487,8 @@ class PlanNodeItem(QGraphicsItem):
         super().__init__(parent)
         self.plan_node = plan_node
         self.node_type = plan_node.get("Node Type", "Unknown")
-        self.width = 200
-        self.height = 80
+        self.width = PLAN_NODE_WIDTH
+        self.height = PLAN_NODE_HEIGHT
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable)
         
         if PlanNodeItem._atlas is None:
@@ -557,8 +548,47 @@ class PlanNodeItem(QGraphicsItem):
         cost_text = f"Cost: {self.total_cost}"
         painter.drawText(QRectF(8, 62, self.width-16, 15), Qt.AlignmentFlag.AlignLeft, cost_text)
 
+class PlanGroupItem(PlanNodeItem):
+    """A run of same-shaped sibling subtrees, drawn as a stack; double-click expands it."""
+
+    STACK_OFFSET = 4
+
+    def __init__(self, group, parent=None):
+        self.group = group
+        super().__init__(group.summary(), parent)
+        self.setToolTip(
+            f"<b>{len(group.members):,} × {group.node_type}</b><br/>"
+            f"Similar sibling subtrees folded into one node.<br/>Double-click to expand."
+        )
+
+    def boundingRect(self):
+        return QRectF(0, 0, self.width + 2 * self.STACK_OFFSET, self.height + 2 * self.STACK_OFFSET)
+
+    def paint(self, painter, option, widget):
+        painter.setBrush(QBrush(QColor(248, 248, 248)))
+        painter.setPen(QPen(QColor(200, 200, 200), 1))
+        for step in (2, 1):
+            offset = step * self.STACK_OFFSET
+            painter.drawRoundedRect(offset, offset, self.width, self.height, 4, 4)
+        super().paint(painter, option, widget)
+
+        font = QFont("Segoe UI", 8)
+        painter.setFont(font)
+        painter.setPen(QColor(90, 90, 90))
+        painter.drawText(
+            QRectF(48, 26, self.width - 56, 16),
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            f"× {len(self.group.members):,} similar nodes",
+        )
+
 class ExplainGraphView(QGraphicsView):
+    """
+    Plan graph drawn from a ``PlanLayout``. Only the nodes inside the viewport
+    exist as graphics items; connectors, and the nodes themselves when too many
+    are in view, are painted straight from the layout arrays.
+    """
     nodeSelected = Signal(object)
+    groupExpandRequested = Signal(object)
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -568,68 +598,149 @@ class ExplainGraphView(QGraphicsView):
         self.setDragMode(QGraphicsView.DragMode.ScrollHandDrag)
         self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
         self.setBackgroundBrush(QBrush(QColor(245, 245, 245)))
+
+        self._layout = None
+        self._items = {}  # layout entry index -> materialized item
+        self._outline_mode = False
+        self._selected_entry = None
+        self._focus_entry = None
+
+        # Scrolls, zooms and resizes within one event-loop pass share one sync
+        self._sync_timer = QTimer(self)
+        self._sync_timer.setSingleShot(True)
+        self._sync_timer.setInterval(0)
+        self._sync_timer.timeout.connect(self._sync_visible_items)
+        self.horizontalScrollBar().valueChanged.connect(self._schedule_sync)
+        self.verticalScrollBar().valueChanged.connect(self._schedule_sync)
         
     def reset_view(self):
         self.resetTransform()
-        if self.scene_obj.items():
-            self.fitInView(self.scene_obj.itemsBoundingRect().adjusted(-50, -50, 50, 50), Qt.AspectRatioMode.KeepAspectRatio)
+        if self._layout is not None and self._layout.entries:
+            self.fitInView(self.sceneRect(), Qt.AspectRatioMode.KeepAspectRatio)
+        self._schedule_sync()
 
-    def load_plan(self, root_plan):
+    def zoom(self, factor):
+        self.scale(factor, factor)
+        self._schedule_sync()
+
+    def clear_plan(self):
+        self._layout = None
+        self._items = {}
+        self._selected_entry = None
+        self._focus_entry = None
         self.scene_obj.clear()
-        if not root_plan:
+
+    def set_focus_entry(self, entry):
+        """Centre the view on ``entry`` once the next layout arrives."""
+        self._focus_entry = entry
+
+    def set_layout(self, layout, fit=True):
+        self.scene_obj.clear()
+        self._items = {}
+        self._layout = layout
+        if not layout.entries:
             return
-            
-        # Layout parameters
-        self.node_spacing_x = 240
-        self.node_spacing_y = 120
-        
-        self._draw_plan_recursive(root_plan, 0, 0)
-        
-        # Center the plan
-        rect = self.scene_obj.itemsBoundingRect().adjusted(-50, -50, 50, 50)
-        self.setSceneRect(rect)
-        self.fitInView(rect, Qt.AspectRatioMode.KeepAspectRatio)
-        
-    def _draw_plan_recursive(self, node, x, y):
-        # Create the node item
-        item = PlanNodeItem(node)
-        item.setPos(x - item.width/2, y)
-        self.scene_obj.addItem(item)
-        
-        child_plans = node.get("Plans", [])
-        if not child_plans:
-            return item
-            
-        # Draw children below
-        num_children = len(child_plans)
-        total_width = (num_children - 1) * self.node_spacing_x
-        start_x = x - total_width / 2
-        
-        for i, child in enumerate(child_plans):
-            child_x = start_x + i * self.node_spacing_x
-            child_y = y + self.node_spacing_y
-            self._draw_plan_recursive(child, child_x, child_y)
-            
-            # Draw line/arrow from parent to child (bottom of parent to top of child)
-            line = QGraphicsLineItem(x, y + 80, child_x, child_y)
-            line.setZValue(-1)
-            pen = QPen(QColor(150, 150, 150), 2)
-            line.setPen(pen)
-            self.scene_obj.addItem(line)
-            
-        return item
+
+        left, top, right, bottom = layout.bounds
+        self.setSceneRect(QRectF(left, top, right - left, bottom - top).adjusted(-50, -50, 50, 50))
+        if fit:
+            self.resetTransform()
+            self.fitInView(self.sceneRect(), Qt.AspectRatioMode.KeepAspectRatio)
+        focus_index = layout.index_of(self._focus_entry) if self._focus_entry is not None else None
+        self._focus_entry = None
+        if focus_index is not None:
+            self.centerOn(layout.xs[focus_index], layout.ys[focus_index] + PLAN_NODE_HEIGHT / 2)
+        self._sync_visible_items()
+        self.viewport().update()
+
+    def _schedule_sync(self, *_args):
+        if self._layout is not None:
+            self._sync_timer.start()
+
+    def _visible_scene_rect(self):
+        rect = self.mapToScene(self.viewport().rect()).boundingRect()
+        return rect.adjusted(-PLAN_NODE_WIDTH, -PLAN_NODE_HEIGHT, PLAN_NODE_WIDTH, PLAN_NODE_HEIGHT)
+
+    def _sync_visible_items(self):
+        """Create items for the nodes in view and drop the ones that scrolled away."""
+        if self._layout is None:
+            return
+        rect = self._visible_scene_rect()
+        visible = self._layout.nodes_in_rect(rect.left(), rect.top(), rect.right(), rect.bottom())
+
+        outline_mode = len(visible) > PLAN_MAX_VIEW_ITEMS
+        if outline_mode != self._outline_mode:
+            self._outline_mode = outline_mode
+            self.viewport().update()
+        wanted = set() if outline_mode else set(visible.tolist())
+
+        for index in [index for index in self._items if index not in wanted]:
+            self.scene_obj.removeItem(self._items.pop(index))
+        for index in wanted:
+            if index in self._items:
+                continue
+            entry = self._layout.entries[index]
+            item = PlanGroupItem(entry) if isinstance(entry, PlanGroup) else PlanNodeItem(entry)
+            item.setPos(self._layout.xs[index] - item.width / 2, self._layout.ys[index])
+            self.scene_obj.addItem(item)
+            if entry is self._selected_entry:
+                item.setSelected(True)
+            self._items[index] = item
+
+    def drawBackground(self, painter, rect):
+        super().drawBackground(painter, rect)
+        if self._layout is None or not self._layout.entries:
+            return
+
+        # Connectors (bottom of parent to top of child)
+        x1, y1, x2, y2 = self._layout.edges_in_rect(rect.left(), rect.top(), rect.right(), rect.bottom())
+        if len(x1):
+            painter.setPen(QPen(QColor(150, 150, 150), 2))
+            painter.drawLines([
+                QLineF(a, b, c, d) for a, b, c, d in zip(x1.tolist(), y1.tolist(), x2.tolist(), y2.tolist())
+            ])
+
+        if self._outline_mode:
+            visible = self._layout.nodes_in_rect(rect.left(), rect.top(), rect.right(), rect.bottom())
+            painter.setPen(QPen(QColor(200, 200, 200), 0))
+            painter.setBrush(QBrush(QColor(255, 255, 255)))
+            half = PLAN_NODE_WIDTH / 2
+            painter.drawRects([
+                QRectF(x - half, y, PLAN_NODE_WIDTH, PLAN_NODE_HEIGHT)
+                for x, y in zip(self._layout.xs[visible].tolist(), self._layout.ys[visible].tolist())
+            ])
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._schedule_sync()
+
+    def _item_at(self, pos):
+        item = self.itemAt(pos)
+        return item if isinstance(item, PlanNodeItem) else None
 
     def mousePressEvent(self, event):
-        item = self.itemAt(event.pos())
-        if isinstance(item, PlanNodeItem):
+        item = self._item_at(event.pos())
+        if isinstance(item, PlanGroupItem):
+            self._selected_entry = item.group
+            self.nodeSelected.emit(item.plan_node)
+        elif item is not None:
+            self._selected_entry = item.plan_node
             self.nodeSelected.emit(item.plan_node)
         else:
             # Deselect current if clicking background
+            self._selected_entry = None
             for i in self.scene_obj.selectedItems():
                 i.setSelected(False)
             self.nodeSelected.emit(None)
         super().mousePressEvent(event)
 
+    def mouseDoubleClickEvent(self, event):
+        item = self._item_at(event.pos())
+        if isinstance(item, PlanGroupItem):
+            self.groupExpandRequested.emit(item.group)
+            return
+        super().mouseDoubleClickEvent(event)
+
     def wheelEvent(self, event):
         zoom_in_factor = 1.25
         zoom_out_factor = 1 / zoom_in_factor
@@ -639,7 +750,7 @@ class ExplainGraphView(QGraphicsView):
         else:
             zoom_factor = zoom_out_factor
             
-        self.scale(zoom_factor, zoom_factor)
+        self.zoom(zoom_factor)
 
 
 def create_explain_view():
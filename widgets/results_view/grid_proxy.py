@@ -0,0 +1,398 @@
+import threading
+from collections.abc import Sequence
+
+from PySide6.QtCore import QAbstractProxyModel, QModelIndex, QThreadPool, QTimer, Qt, Signal
+
+from workers.grid_filter import FilterToken, GridFilterSignals, RunnableGridFilter
+
+
+class ResultGridProxyModel(QAbstractProxyModel):
+    """Filter/sort proxy for result grids whose row order is computed off the GUI thread.
+
+    Search text, per-column predicates and the sort column are evaluated on
+    the thread pool against the raw, typed result rows (see
+    ``workers/grid_filter.py``), producing a list of source rows that is
+    swapped in with a single model reset. A new request cancels the job in
+    flight. With nothing filtered or sorted the proxy maps rows 1:1.
+
+    When a push-down handler is set (paged results), changes are handed to
+    it to re-run the query with ORDER BY/WHERE instead of being applied to
+    the rows of the current page.
+    """
+
+    filter_applied = Signal(int, int)  # visible rows, total rows
+
+    RERUN_DELAY_MS = 250
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._raw_rows = []
+        self._row_order = None
+        self._source_to_proxy = None
+        self._filter_text = ""
+        self._column_predicates = {}
+        self._sort_column = -1
+        self._sort_order = Qt.SortOrder.AscendingOrder
+
+        self._generation = 0
+        self._token = None
+        self._text_cache = []
+        self._cache_lock = threading.Lock()
+        self._worker_signals = GridFilterSignals()
+        self._worker_signals.finished.connect(self._apply_row_order)
+        self._worker_signals.error.connect(self._on_filter_error)
+
+        self._rerun_timer = QTimer(self)
+        self._rerun_timer.setSingleShot(True)
+        self._rerun_timer.setInterval(self.RERUN_DELAY_MS)
+        self._rerun_timer.timeout.connect(self._start_filter)
+
+        self._source_connections = []
+        self._pushdown_handler = None
+
+    # --- Configuration ---
+
+    def setSourceModel(self, source_model):
+        self.beginResetModel()
+        for signal, slot in self._source_connections:
+            try:
+                signal.disconnect(slot)
+            except (RuntimeError, TypeError):
+                pass
+        self._source_connections = []
+
+        self._cancel_filter()
+        self._raw_rows = []
+        self._text_cache = []
+        self._row_order = None
+        self._source_to_proxy = None
+        self._column_predicates = {}
+        self._sort_column = -1
+        self._pushdown_handler = None
+        super().setSourceModel(source_model)
+
+        if source_model is not None:
+            for signal, slot in (
+                (source_model.dataChanged, self._on_source_data_changed),
+                (source_model.headerDataChanged, self._on_source_header_changed),
+                (source_model.rowsAboutToBeInserted, self._on_source_rows_about_to_be_inserted),
+                (source_model.rowsInserted, self._on_source_rows_inserted),
+                (source_model.rowsAboutToBeRemoved, self._on_source_rows_about_to_be_removed),
+                (source_model.rowsRemoved, self._on_source_rows_removed),
+                (source_model.columnsAboutToBeInserted, self._begin_reset),
+                (source_model.columnsInserted, self._end_reset),
+                (source_model.columnsAboutToBeRemoved, self._begin_reset),
+                (source_model.columnsRemoved, self._end_reset),
+                (source_model.modelAboutToBeReset, self._begin_reset),
+                (source_model.modelReset, self._end_reset),
+                (source_model.layoutAboutToBeChanged, self._begin_reset),
+                (source_model.layoutChanged, self._end_reset),
+            ):
+                signal.connect(slot)
+                self._source_connections.append((signal, slot))
+        self.endResetModel()
+
+    def set_raw_rows(self, rows):
+        """Give the engine the typed rows backing the source model, in source order.
+
+        Lists are copied; other sequences (e.g. a memory-mapped snapshot's
+        rows) are read-only and kept by reference.
+        """
+        if rows is not None and not isinstance(rows, (list, tuple)) and isinstance(rows, Sequence):
+            self._raw_rows = rows
+        else:
+            self._raw_rows = list(rows or [])
+        self._text_cache = []
+        if self.is_filtered() and self._pushdown_handler is None:
+            self._start_filter()
+
+    def raw_rows(self):
+        """Typed rows backing the source model, in source order (shared; do not modify).
+
+        The proxy never edits this list in place while a filter job may be
+        reading it; removals and edits swap in a new list instead.
+        """
+        return self._raw_rows
+
+    def set_raw_value(self, row, column, value):
+        """Record a saved edit of source cell (``row``, ``column``) in the raw rows."""
+        if 0 <= row < len(self._raw_rows):
+            values = list(self._raw_rows[row])
+            if 0 <= column < len(values):
+                values[column] = value
+                if self._token is not None:
+                    # A filter job is reading the list; give it a new one instead
+                    self._raw_rows = list(self._raw_rows)
+                self._raw_rows[row] = tuple(values)
+                self._text_cache = []
+
+    def source_rows(self, proxy_rows):
+        """Map proxy row numbers to source row numbers in one pass."""
+        if self._row_order is None:
+            return list(proxy_rows)
+        order = self._row_order
+        return [order[row] for row in proxy_rows if row < len(order)]
+
+    def setFilterFixedString(self, text):
+        text = text or ""
+        if text == self._filter_text:
+            return
+        self._filter_text = text
+        self._state_changed()
+
+    def filter_text(self):
+        return self._filter_text
+
+    def set_column_predicate(self, column, predicate):
+        """Filter ``column`` with ``predicate(raw_value) -> bool``; None removes it."""
+        if predicate is None:
+            if self._column_predicates.pop(column, None) is None:
+                return
+        else:
+            self._column_predicates[column] = predicate
+        self._state_changed()
+
+    def clear_column_predicates(self):
+        if not self._column_predicates:
+            return
+        self._column_predicates = {}
+        self._state_changed()
+
+    def column_predicates(self):
+        return dict(self._column_predicates)
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        if column == self._sort_column and (column < 0 or order == self._sort_order):
+            return
+        self._sort_column = column
+        self._sort_order = order
+        self._state_changed()
+
+    def sort_column(self):
+        return self._sort_column
+
+    def sort_order(self):
+        return self._sort_order
+
+    def is_filtered(self):
+        return bool(self._filter_text or self._column_predicates or self._sort_column >= 0)
+
+    def set_pushdown_handler(self, handler):
+        """Route sort/filter changes to ``handler()`` instead of the local engine; None restores local mode."""
+        self._pushdown_handler = handler
+
+    def restore_state(self, sort_column, sort_order, column_predicates, filter_text):
+        """Adopt sort/filter state already applied by the database, without re-running anything."""
+        self._sort_column = sort_column
+        self._sort_order = sort_order
+        self._column_predicates = dict(column_predicates or {})
+        self._filter_text = filter_text or ""
+
+    def apply_locally(self):
+        """Apply the current sort/filters to the loaded rows with the local engine."""
+        self._start_filter()
+
+    def _state_changed(self):
+        if self._pushdown_handler is not None:
+            self._pushdown_handler()
+        else:
+            self._start_filter()
+
+    # --- Engine ---
+
+    def _cancel_filter(self):
+        self._rerun_timer.stop()
+        self._generation += 1
+        if self._token is not None:
+            self._token.cancel()
+            self._token = None
+
+    def _start_filter(self):
+        self._cancel_filter()
+        source = self.sourceModel()
+        if source is None:
+            return
+
+        if not self.is_filtered():
+            self._apply_row_order(self._generation, None)
+            return
+
+        self._token = FilterToken()
+        QThreadPool.globalInstance().start(
+            RunnableGridFilter(
+                self._generation,
+                self._token,
+                self._worker_signals,
+                self._raw_rows,
+                source.rowCount(),
+                self._filter_text,
+                dict(self._column_predicates),
+                self._sort_column,
+                self._sort_order == Qt.SortOrder.DescendingOrder,
+                self._text_cache,
+                self._cache_lock,
+            )
+        )
+
+    def _apply_row_order(self, generation, order):
+        if generation != self._generation:
+            return
+        self._token = None
+        if order is None and self._row_order is None:
+            return
+        self.beginResetModel()
+        self._row_order = order
+        self._source_to_proxy = None
+        self.endResetModel()
+        source = self.sourceModel()
+        self.filter_applied.emit(self.rowCount(), source.rowCount() if source else 0)
+
+    def _on_filter_error(self, generation, message):
+        if generation == self._generation:
+            self._token = None
+            print(f"Result filter failed: {message}")
+
+    # --- Mapping ---
+
+    def _source_row_map(self):
+        if self._source_to_proxy is None:
+            self._source_to_proxy = {source_row: row for row, source_row in enumerate(self._row_order)}
+        return self._source_to_proxy
+
+    def mapToSource(self, proxy_index):
+        source = self.sourceModel()
+        if source is None or not proxy_index.isValid():
+            return QModelIndex()
+        row = proxy_index.row()
+        if self._row_order is not None:
+            if row >= len(self._row_order):
+                return QModelIndex()
+            row = self._row_order[row]
+        return source.index(row, proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        row = source_index.row()
+        if self._row_order is not None:
+            row = self._source_row_map().get(row)
+            if row is None:
+                return QModelIndex()
+        return self.index(row, source_index.column())
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or row < 0 or column < 0:
+            return QModelIndex()
+        if row >= self.rowCount() or column >= self.columnCount():
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, *args):
+        if not args:
+            return super().parent()
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        source = self.sourceModel()
+        if parent.isValid() or source is None:
+            return 0
+        if self._row_order is not None:
+            return len(self._row_order)
+        return source.rowCount()
+
+    def columnCount(self, parent=QModelIndex()):
+        source = self.sourceModel()
+        if parent.isValid() or source is None:
+            return 0
+        return source.columnCount()
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        source = self.sourceModel()
+        if source is None:
+            return None
+        if orientation == Qt.Orientation.Vertical and self._row_order is not None:
+            if 0 <= section < len(self._row_order):
+                section = self._row_order[section]
+        return source.headerData(section, orientation, role)
+
+    # --- Source model signals ---
+
+    def _begin_reset(self, *args):
+        self.beginResetModel()
+
+    def _end_reset(self, *args):
+        self._row_order = None
+        self._source_to_proxy = None
+        self.endResetModel()
+        if self.is_filtered() and self._pushdown_handler is None:
+            self._start_filter()
+
+    def _on_source_data_changed(self, top_left, bottom_right, roles=()):
+        if self._row_order is None:
+            self.dataChanged.emit(
+                self.index(top_left.row(), top_left.column()),
+                self.index(bottom_right.row(), bottom_right.column()),
+                roles,
+            )
+            return
+        for source_row in range(top_left.row(), bottom_right.row() + 1):
+            row = self._source_row_map().get(source_row)
+            if row is not None:
+                self.dataChanged.emit(
+                    self.index(row, top_left.column()), self.index(row, bottom_right.column()), roles
+                )
+
+    def _on_source_header_changed(self, orientation, first, last):
+        if orientation == Qt.Orientation.Horizontal or self._row_order is None:
+            self.headerDataChanged.emit(orientation, first, last)
+
+    def _on_source_rows_about_to_be_inserted(self, parent, first, last):
+        if self._row_order is None:
+            self.beginInsertRows(QModelIndex(), first, last)
+
+    def _on_source_rows_inserted(self, parent, first, last):
+        if self._row_order is None:
+            self.endInsertRows()
+            return
+
+        # Rows typed in by the user have no raw data and are shown at the end
+        # right away; fetched rows wait for the next engine pass.
+        added = [row for row in range(first, last + 1) if row >= len(self._raw_rows)]
+        if added:
+            start = len(self._row_order)
+            self.beginInsertRows(QModelIndex(), start, start + len(added) - 1)
+            self._row_order.extend(added)
+            self._source_to_proxy = None
+            self.endInsertRows()
+        if len(added) != last - first + 1:
+            self._rerun_timer.start()
+
+    def _on_source_rows_about_to_be_removed(self, parent, first, last):
+        if self._row_order is None:
+            self.beginRemoveRows(QModelIndex(), first, last)
+        else:
+            self.beginResetModel()
+
+    def _on_source_rows_removed(self, parent, first, last):
+        # Results of a job started before the removal refer to the old row numbers
+        rerun = self._token is not None or self._rerun_timer.isActive()
+        self._cancel_filter()
+        if first < len(self._raw_rows):
+            # Rebuilt rather than edited in place: a cancelled job may still be reading the old list
+            self._raw_rows = list(self._raw_rows[:first]) + list(self._raw_rows[last + 1:])
+            self._text_cache = []
+
+        if self._row_order is None:
+            self.endRemoveRows()
+            return
+
+        removed = last - first + 1
+        self._row_order = [
+            row - removed if row > last else row
+            for row in self._row_order
+            if row < first or row > last
+        ]
+        self._source_to_proxy = None
+        self.endResetModel()
+        if rerun:
+            self._start_filter()
@@ -1,7 +1,6 @@
 import os
 import uuid
 import datetime
-import re
 import copy
 from numbers import Number
 
@@ -17,19 +16,23 @@ from PySide6.QtGui import (
     QAction
 )
 
-from db.query_context import resolve_writable_table_context
+from db.query_info import analyze_query
 from widgets.results_view.notifications import add_connection_event
 import widgets.results_view.clipboard as clipboard
 import widgets.results_view.output_tabs as output_tabs
 import widgets.results_view.processes as processes
+import widgets.results_view.profile as profile_panel
 from ui.components import PrimaryButton, SecondaryButton
 import widgets.results_view.query_handler as query_handler
+import widgets.results_view.result_diff as result_diff
 import widgets.results_view.row_crud as row_crud
+import widgets.results_view.snapshot as snapshot
 import widgets.results_view.ui as ui
 from widgets.results_view.perf_metrics import perf_snapshot
 from dialogs import ExportDialog
 from workers import RunnableExportFromModel, ProcessSignals
 from workers.signals import emit_process_started
+from workers.grid_copy import COPY_FORMATS
 
 class ResultsManager(QObject):
     PROCESS_STATUS_META = {
@@ -69,7 +72,8 @@ class ResultsManager(QObject):
         self.result_chunk_backpressure_ms = 30
         self.result_chunk_idle_interval_ms = 0
         self.result_chunk_inactive_tab_ms = 60
-        self.process_refresh_debounce_ms = 50
+        self._process_status_counts = None
+        self._running_process_rows = {}
         self._default_result_chunk_backpressure_ms = self.result_chunk_backpressure_ms
         self._default_result_chunk_idle_interval_ms = self.result_chunk_idle_interval_ms
         self._default_result_chunk_inactive_tab_ms = self.result_chunk_inactive_tab_ms
@@ -125,19 +129,7 @@ class ResultsManager(QObject):
         return str(status_text or "").strip().upper()
 
     def _extract_query_table_name(self, query):
-        table_context = resolve_writable_table_context(query)
-        if table_context:
-            return table_context.get("real_table_name")
-
-        match = re.search(r"FROM\s+([\"\[\]\w\.]+)", query or "", re.IGNORECASE)
-        if not match:
-            return None
-        extracted_table = match.group(1)
-        table_name = extracted_table.replace('"', '').replace('[', '').replace(']', '')
-        if "." in table_name:
-            parts = table_name.split('.')
-            return parts[-1]
-        return table_name
+        return analyze_query(query).table_name
 
     def _get_output_tabs_widget(self, tab_content):
         return output_tabs.get_output_tabs_widget(self, tab_content)
@@ -183,6 +175,8 @@ class ResultsManager(QObject):
 
     def cleanup_tab_resources(self, tab_content):
         output_tabs.stop_all_chunk_loaders_for_tab(self, tab_content)
+        output_tabs.close_all_snapshots_for_tab(self, tab_content)
+        profile_panel.cancel_column_profile(self, tab_content)
 
     def sync_row_action_state(self, tab_content=None):
         target_tab = tab_content or self.tab_widget.currentWidget()
@@ -207,6 +201,9 @@ class ResultsManager(QObject):
     def _update_process_summary_ui(self, target_tab, status_counts, total_count, visible_count):
         processes.update_process_summary_ui(self, target_tab, status_counts, total_count, visible_count)
 
+    def _ensure_processes_loaded(self, tab_content):
+        processes.ensure_processes_loaded(self, tab_content)
+
     def _handle_process_cell_click(self, tab_content, index):
         processes.handle_process_cell_click(self, tab_content, index)
 
@@ -222,12 +219,15 @@ class ResultsManager(QObject):
     def _filter_processes_table(self, tab_content, text):
         processes.filter_processes_table(self, tab_content, text)
 
+    def _refresh_column_profile(self, tab_content):
+        profile_panel.refresh_column_profile(self, tab_content)
+
     def copy_current_result_table(self):
         clipboard.copy_current_result_table(self)
 
 
-    def copy_result_with_header(self, table_view: QTableView):
-        clipboard.copy_result_with_header(self, table_view)
+    def copy_result_with_header(self, table_view: QTableView, fmt="tsv"):
+        clipboard.copy_result_with_header(self, table_view, fmt)
 
 
     def paste_to_editor(self):
@@ -246,6 +246,15 @@ class ResultsManager(QObject):
     def download_result(self, tab_content):
         row_crud.download_result(self, tab_content)
 
+    def save_result_snapshot(self, tab_content):
+        snapshot.save_result_snapshot(self, tab_content)
+
+    def open_result_snapshot(self, tab_content):
+        snapshot.open_result_snapshot(self, tab_content)
+
+    def compare_results(self, table_view):
+        result_diff.compare_results(self, table_view)
+
 
 
     def add_empty_row(self):
@@ -349,8 +358,8 @@ class ResultsManager(QObject):
             self.status.showMessage("Messages cleared.", 2000)
 
 
-    def handle_query_result(self, target_tab, conn_data, query, results, columns, column_specs, row_count, elapsed_time, is_select_query, output_mode="current", output_tab_index=None):
-        query_handler.handle_query_result(self, target_tab, conn_data, query, results, columns, column_specs, row_count, elapsed_time, is_select_query, output_mode, output_tab_index)
+    def handle_query_result(self, target_tab, conn_data, query, results, columns, column_specs, row_count, elapsed_time, is_select_query, output_mode="current", output_tab_index=None, query_info=None):
+        query_handler.handle_query_result(self, target_tab, conn_data, query, results, columns, column_specs, row_count, elapsed_time, is_select_query, output_mode, output_tab_index, query_info)
 
     def add_connection_notification(self, conn_name):
         target_tab = self.tab_widget.currentWidget()
@@ -445,6 +454,30 @@ class ResultsManager(QObject):
         export_action.triggered.connect(lambda: self.export_result_rows(results_table))
         menu.addAction(export_action)
 
+        copy_menu = menu.addMenu("Copy As")
+        for fmt, (label, _suffix) in COPY_FORMATS.items():
+            copy_action = QAction(label, self.main_window)
+            copy_action.triggered.connect(lambda checked=False, fmt=fmt: self.copy_result_with_header(results_table, fmt))
+            copy_menu.addAction(copy_action)
+        copy_menu.setEnabled(results_table.selectionModel().hasSelection())
+
+        compare_action = QAction("Compare With...", self.main_window)
+        compare_action.triggered.connect(lambda: self.compare_results(results_table))
+        compare_action.setEnabled(hasattr(results_table.model(), "raw_rows"))
+        menu.addAction(compare_action)
+
+        column = results_table.indexAt(position).column()
+        model = results_table.model()
+        if column >= 0 and hasattr(model, "set_column_predicate"):
+            menu.addSeparator()
+            filter_action = QAction("Filter Column...", self.main_window)
+            filter_action.triggered.connect(lambda: query_handler.prompt_column_filter(self, results_table, column))
+            menu.addAction(filter_action)
+            if model.column_predicates():
+                clear_action = QAction("Clear Column Filters", self.main_window)
+                clear_action.triggered.connect(lambda: query_handler.clear_column_filters(self, results_table))
+                menu.addAction(clear_action)
+
         menu.exec(results_table.viewport().mapToGlobal(position))
 
       
@@ -36,6 +36,18 @@ def _stop_chunk_loader_for_container(output_container):
     _stop_chunk_loader_for_table(table_view)
 
 
+def _close_snapshot_for_container(output_container):
+    """Unmap the snapshot file an output tab was showing, if any."""
+    if not output_container:
+        return
+    table_view = output_container.findChild(QTableView, "results_table")
+    output_state = (table_view.property("output_state") or {}) if table_view else {}
+    snapshot = output_state.get("snapshot")
+    if snapshot is not None:
+        snapshot.close()
+        output_state["snapshot"] = None
+
+
 class FlatSelectionDelegate(QStyledItemDelegate):
     """Paints result-table selection like the process tab (full-cell blue, no inner focus frame)."""
 
@@ -220,6 +232,10 @@ def create_output_table_view(manager, tab_content):
     table_view.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
     table_view.customContextMenuRequested.connect(manager.show_results_context_menu)
     table_view.setEditTriggers(QAbstractItemView.EditTrigger.DoubleClicked)
+    # Sorting is done by ResultGridProxyModel on the raw typed values
+    table_view.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+    table_view.horizontalHeader().setSortIndicatorClearable(True)
+    table_view.setSortingEnabled(True)
 
     output_state = {
         "table_name": None,
@@ -310,6 +326,7 @@ def handle_output_tab_close(manager, tab_content, index):
     output_container = output_tabs.widget(index)
     _stop_chunk_loader_for_container(output_container)
     output_tabs.removeTab(index)
+    _close_snapshot_for_container(output_container)
     if output_tabs.count() == 0:
         create_output_tab(manager, tab_content, title="Result 1", activate=True)
     manager.sync_row_action_state(tab_content)
@@ -371,3 +388,11 @@ def stop_all_chunk_loaders_for_tab(manager, tab_content):
         return
     for idx in range(output_tabs.count()):
         _stop_chunk_loader_for_container(output_tabs.widget(idx))
+
+
+def close_all_snapshots_for_tab(manager, tab_content):
+    output_tabs = get_output_tabs_widget(manager, tab_content)
+    if not output_tabs:
+        return
+    for idx in range(output_tabs.count()):
+        _close_snapshot_for_container(output_tabs.widget(idx))
@@ -0,0 +1,188 @@
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+import db
+
+
+PROCESS_HEADERS = [
+    "PID", "Name", "Type", "Status", "Server", "Object",
+    "Time Taken (sec)", "Start Time", "End Time", "Message / Command",
+]
+
+STATUS_COLUMN = 3
+DETAILS_COLUMN = 9
+
+
+class ProcessTableModel(QAbstractTableModel):
+    """Process tracker rows, newest first, kept current by process signals.
+
+    Historic rows are paged in from ``usf_processes`` ``PAGE_SIZE`` at a time
+    as the view scrolls, filtered in SQL by ``status``. Processes started
+    while the model is alive are prepended via ``upsert_process`` and updated
+    in place by pid, so a start/finish costs one row signal regardless of how
+    many historic rows exist.
+    """
+
+    PAGE_SIZE = 200
+
+    def __init__(self, status=None, parent=None):
+        super().__init__(parent)
+        self.status = status
+        self._live_rows = []     # newest last; shown reversed above the pages
+        self._paged_rows = []
+        self._locations = {}     # pid -> (is_live, list index)
+        self._last_rowid = None
+        self._exhausted = False
+
+    # --- Qt model API ---
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._live_rows) + len(self._paged_rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(PROCESS_HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return PROCESS_HEADERS[section] if 0 <= section < len(PROCESS_HEADERS) else None
+        return str(section + 1)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._row_at(index.row())
+        if row is None:
+            return None
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            value = row[index.column()]
+            return "" if value is None else str(value)
+        if role == Qt.ItemDataRole.TextAlignmentRole and index.column() == STATUS_COLUMN:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted:
+            return
+
+        page = db.get_process_page(self.status, self.PAGE_SIZE, self._last_rowid)
+        if len(page) < self.PAGE_SIZE:
+            self._exhausted = True
+        if not page:
+            return
+        self._last_rowid = page[-1][0]
+
+        # Rows already pushed in by signals before their page was read
+        fresh = [list(row[1:]) for row in page if row[1] not in self._locations]
+        if not fresh:
+            return
+
+        first = self.rowCount()
+        self.beginInsertRows(QModelIndex(), first, first + len(fresh) - 1)
+        for row in fresh:
+            self._locations[row[0]] = (False, len(self._paged_rows))
+            self._paged_rows.append(row)
+        self.endInsertRows()
+
+    # --- Incremental updates ---
+
+    def reload(self):
+        """Drop all rows; the attached view pages them back in."""
+        self.beginResetModel()
+        self._live_rows = []
+        self._paged_rows = []
+        self._locations = {}
+        self._last_rowid = None
+        self._exhausted = False
+        self.endResetModel()
+
+    def set_status_filter(self, status):
+        self.status = status
+        self.reload()
+
+    def upsert_process(self, row):
+        """Insert or update one process row (values in ``PROCESS_HEADERS`` order)."""
+        row = list(row)
+        pid = row[0]
+        location = self._locations.get(pid)
+
+        if not self._matches(row[STATUS_COLUMN]):
+            if location is not None:
+                self.remove_processes([pid])
+            return
+
+        if location is not None:
+            is_live, position = location
+            (self._live_rows if is_live else self._paged_rows)[position] = row
+            model_row = self._model_row(is_live, position)
+            self.dataChanged.emit(
+                self.index(model_row, 0), self.index(model_row, len(PROCESS_HEADERS) - 1)
+            )
+            return
+
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        self._locations[pid] = (True, len(self._live_rows))
+        self._live_rows.append(row)
+        self.endInsertRows()
+
+    def process_row(self, pid):
+        """Return a copy of the loaded row for ``pid``, or None."""
+        location = self._locations.get(pid)
+        if location is None:
+            return None
+        is_live, position = location
+        return list((self._live_rows if is_live else self._paged_rows)[position])
+
+    def remove_processes(self, pids):
+        removed = False
+        for pid in pids:
+            location = self._locations.pop(pid, None)
+            if location is None:
+                continue
+            is_live, position = location
+            model_row = self._model_row(is_live, position)
+            self.beginRemoveRows(QModelIndex(), model_row, model_row)
+            del (self._live_rows if is_live else self._paged_rows)[position]
+            self.endRemoveRows()
+            self._reindex()
+            removed = True
+        return removed
+
+    # --- Helpers ---
+
+    def _matches(self, status):
+        if not self.status:
+            return True
+        return str(status or "").strip().upper() == self.status.upper()
+
+    def _model_row(self, is_live, position):
+        if is_live:
+            return len(self._live_rows) - 1 - position
+        return len(self._live_rows) + position
+
+    def _row_at(self, model_row):
+        live_count = len(self._live_rows)
+        if model_row < live_count:
+            return self._live_rows[live_count - 1 - model_row]
+        position = model_row - live_count
+        if position < len(self._paged_rows):
+            return self._paged_rows[position]
+        return None
+
+    def _reindex(self):
+        # Removals are rare (filtered-out status changes), so a full rebuild is fine
+        self._locations = {row[0]: (True, i) for i, row in enumerate(self._live_rows)}
+        self._locations.update({row[0]: (False, i) for i, row in enumerate(self._paged_rows)})
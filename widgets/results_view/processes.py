@@ -1,15 +1,16 @@
 import datetime
-import sqlite3 as sqlite
 
-from db.db_connections import DB_FILE
-from PySide6.QtCore import Qt, QTimer, QSortFilterProxyModel
-from PySide6.QtGui import QColor, QPalette, QStandardItem, QStandardItemModel, QFont
+import db
+from PySide6.QtCore import Qt, QSortFilterProxyModel
+from PySide6.QtGui import QColor, QPalette, QFont
 from PySide6.QtWidgets import (
     QComboBox, QPushButton, QStackedWidget, QStyledItemDelegate, 
     QStyle, QStyleOptionViewItem, QTableView, QWidget, QAbstractItemView,
     QDialog, QVBoxLayout, QTextEdit, QDialogButtonBox, QMessageBox
 )
 
+from widgets.results_view.process_model import ProcessTableModel
+
 
 class ProcessRowDelegate(QStyledItemDelegate):
     """Draws status-based row background while preserving distinct cell/row/column selection behavior."""
@@ -141,25 +142,15 @@ def get_process_status_meta(manager, status_text):
     return manager.PROCESS_STATUS_META.get(status_key, manager.DEFAULT_PROCESS_STATUS_META)
 
 
-def _request_processes_refresh(manager, delay_ms=None):
-    requested_delay = delay_ms
-    if requested_delay is None:
-        requested_delay = int(getattr(manager, "process_refresh_debounce_ms", 50) or 50)
-
-    refresh_timer = getattr(manager, "_process_refresh_timer", None)
-    if refresh_timer is None:
-        refresh_timer = QTimer(manager)
-        refresh_timer.setSingleShot(True)
-        refresh_timer.timeout.connect(manager.refresh_processes_view)
-        manager._process_refresh_timer = refresh_timer
-
-    refresh_timer.stop()
-    refresh_timer.start(max(0, int(requested_delay)))
-
-
 def set_process_filter(manager, tab_content, filter_key):
     tab_content.process_status_filter = filter_key
-    manager.refresh_processes_view()
+    model = getattr(tab_content, "processes_model", None)
+    if model is None:
+        return
+    model.set_status_filter(_status_filter_label(manager, filter_key))
+    if model.canFetchMore():
+        model.fetchMore()
+    ensure_processes_loaded(manager, tab_content)
 
 
 def update_process_summary_ui(manager, target_tab, status_counts, total_count, visible_count):
@@ -235,10 +226,7 @@ def initialize_processes_model(manager, tab_content):
 
     tab_content.process_status_filter = "ALL"
 
-    tab_content.processes_model = QStandardItemModel()
-    tab_content.processes_model.setHorizontalHeaderLabels(
-        ["PID", "Name", "Type", "Status", "Server", "Object", "Time Taken (sec)", "Start Time", "End Time", "Message / Command"]
-    )
+    tab_content.processes_model = ProcessTableModel()
     
     # Use proxy for filtering
     tab_content.processes_proxy = QSortFilterProxyModel()
@@ -273,11 +261,82 @@ def switch_to_processes_view(manager):
         if process_info_bar:
             process_info_bar.hide()
 
-        manager.refresh_processes_view()
+        ensure_processes_loaded(manager, current_tab)
+
+
+def _process_models(manager):
+    for i in range(manager.tab_widget.count()):
+        tab = manager.tab_widget.widget(i)
+        model = getattr(tab, "processes_model", None)
+        if model is not None:
+            yield tab, model
+
+
+def _status_filter_label(manager, filter_key):
+    if not filter_key or filter_key == "ALL":
+        return None
+    meta = manager.PROCESS_STATUS_META.get(filter_key)
+    return meta["label"] if meta else filter_key
+
+
+def _load_process_counts(manager):
+    counts = {key: 0 for key in manager.PROCESS_STATUS_META.keys()}
+    for status, count in db.get_process_status_counts().items():
+        status_key = manager._normalize_process_status(status)
+        counts[status_key] = counts.get(status_key, 0) + count
+    manager._process_status_counts = counts
+
+
+def _adjust_process_count(manager, status, delta):
+    counts = getattr(manager, "_process_status_counts", None)
+    if counts is None:
+        return
+    status_key = manager._normalize_process_status(status)
+    counts[status_key] = max(0, counts.get(status_key, 0) + delta)
+
+
+def _publish_process_summary(manager, tabs=None):
+    counts = getattr(manager, "_process_status_counts", None)
+    if counts is None:
+        return
+    total = sum(counts.values())
+    for tab, model in (tabs if tabs is not None else _process_models(manager)):
+        manager._update_process_summary_ui(tab, counts, total, model.rowCount())
+
+
+def _known_process_row(manager, process_id):
+    row = manager._running_process_rows.pop(process_id, None)
+    if row is not None:
+        return row
+    for _, model in _process_models(manager):
+        row = model.process_row(process_id)
+        if row is not None:
+            return row
+    return None
+
+
+def _apply_process_row(manager, row, previous_status=None):
+    """Push one changed row into every worksheet's process model and the counts."""
+    if previous_status is not None:
+        _adjust_process_count(manager, previous_status, -1)
+    _adjust_process_count(manager, row[3], 1)
+    for _, model in _process_models(manager):
+        model.upsert_process(row)
+    _publish_process_summary(manager)
+
+
+def ensure_processes_loaded(manager, tab_content):
+    model = getattr(tab_content, "processes_model", None)
+    if model is None:
+        return
+    if getattr(manager, "_process_status_counts", None) is None:
+        _load_process_counts(manager)
+    _publish_process_summary(manager, [(tab_content, model)])
 
 
 def handle_process_started(manager, process_id, data):
     target_conn_id = data.get("_conn_id")
+    server_name = None
     if target_conn_id:
         current_tab = manager.tab_widget.currentWidget()
         if current_tab:
@@ -286,99 +345,72 @@ def handle_process_started(manager, process_id, data):
                 for i in range(db_combo_box.count()):
                     item_data = db_combo_box.itemData(i)
                     if item_data and item_data.get("id") == target_conn_id:
+                        server_name = item_data.get("short_name")
                         if db_combo_box.currentIndex() != i:
                             db_combo_box.setCurrentIndex(i)
                         break
 
     manager.switch_to_processes_view()
 
-    conn = sqlite.connect(DB_FILE)
-    cursor = conn.cursor()
-    if target_conn_id:
-        cursor.execute(
-            """
-            DELETE FROM usf_processes
-            WHERE status = 'Running'
-              AND server = (
-                  SELECT short_name FROM usf_connections WHERE id = ?
-               )
-            """,
-            (target_conn_id,),
-        )
-
-    cursor.execute(
-        """
-        INSERT OR REPLACE INTO usf_processes
-        (pid, process_name, type, status, server, object, time_taken, start_time, end_time, details)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            process_id,
-            data.get("process_name", ""),
-            data.get("type", ""),
-            "Running",
-            data.get("server", ""),
-            data.get("object", ""),
-            0.0,
-            datetime.datetime.now().strftime("%Y-%m-%d, %I:%M:%S %p"),
-            "",
-            data.get("details", ""),
-        ),
-    )
-    conn.commit()
-    conn.close()
-
-    _request_processes_refresh(manager)
+    row = [
+        process_id,
+        data.get("process_name", ""),
+        data.get("type", ""),
+        "Running",
+        data.get("server", ""),
+        data.get("object", ""),
+        0.0,
+        datetime.datetime.now().strftime(db.PROCESS_TIME_FORMAT),
+        "",
+        data.get("details", ""),
+    ]
+    db.record_process_started(row, target_conn_id)
+
+    # Mirror the stale 'Running' cleanup for this server in the open models
+    running = manager._running_process_rows
+    if server_name:
+        stale = [pid for pid, r in running.items() if r[4] == server_name and pid != process_id]
+        for pid in stale:
+            del running[pid]
+            _adjust_process_count(manager, "Running", -1)
+        if stale:
+            for _, model in _process_models(manager):
+                model.remove_processes(stale)
+
+    previous = running.get(process_id)
+    running[process_id] = row
+    _apply_process_row(manager, row, previous[3] if previous else None)
 
 
 def handle_process_finished(manager, process_id, message, time_taken, row_count):
     status = "Successful"
-    conn = sqlite.connect(DB_FILE)
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        UPDATE usf_processes
-        SET status = ?, 
-            time_taken = ?, 
-            end_time = ?, 
-            details = CASE 
-                WHEN type LIKE '%Backup%' OR type LIKE '%Restore%' THEN details 
-                ELSE ? 
-            END
-        WHERE pid = ?
-        """,
-        (
-            status,
-            time_taken,
-            datetime.datetime.now().strftime("%Y-%m-%d, %I:%M:%S %p"),
-            message,
-            process_id,
-        ),
-    )
-    conn.commit()
-    conn.close()
-    _request_processes_refresh(manager)
+    end_time = datetime.datetime.now().strftime(db.PROCESS_TIME_FORMAT)
+    db.record_process_finished(process_id, status, time_taken, end_time, message)
+
+    row = _known_process_row(manager, process_id)
+    if row is None:
+        return
+    previous_status = row[3]
+    row[3] = status
+    row[6] = time_taken
+    row[8] = end_time
+    if "Backup" not in str(row[2]) and "Restore" not in str(row[2]):
+        row[9] = message
+    _apply_process_row(manager, row, previous_status)
 
 
 def handle_process_error(manager, process_id, error_message):
-    conn = sqlite.connect(DB_FILE)
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        UPDATE usf_processes
-        SET status = ?, end_time = ?, details = ?
-        WHERE pid = ?
-        """,
-        (
-            "Error",
-            datetime.datetime.now().strftime("%Y-%m-%d, %I:%M:%S %p"),
-            error_message,
-            process_id,
-        ),
-    )
-    conn.commit()
-    conn.close()
-    _request_processes_refresh(manager)
+    end_time = datetime.datetime.now().strftime(db.PROCESS_TIME_FORMAT)
+    db.record_process_error(process_id, end_time, error_message)
+
+    row = _known_process_row(manager, process_id)
+    if row is None:
+        return
+    previous_status = row[3]
+    row[3] = "Error"
+    row[8] = end_time
+    row[9] = error_message
+    _apply_process_row(manager, row, previous_status)
 
 
 def refresh_processes_view(manager):
@@ -386,60 +418,18 @@ def refresh_processes_view(manager):
     if not current_tab:
         return
 
-    db_combo_box = current_tab.findChild(QComboBox, "db_combo_box")
-    if db_combo_box:
-        index = db_combo_box.currentIndex()
-        if index >= 0:
-            data = db_combo_box.itemData(index)
-            data.get("short_name") if data else None
-
     processes_view = current_tab.findChild(QTableView, "processes_view")
     model = getattr(current_tab, "processes_model", None)
     if not processes_view or not model:
         return
 
-    conn = sqlite.connect(DB_FILE)
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        SELECT pid, process_name, type, status, server, object, time_taken, start_time, end_time, details
-        FROM usf_processes
-        ORDER BY start_time DESC
-        """
-    )
-
-    data = cursor.fetchall()
-    conn.close()
-
     active_filter = getattr(current_tab, "process_status_filter", "ALL")
-    status_counts = {key: 0 for key in manager.PROCESS_STATUS_META.keys()}
-    filtered_data = []
-
-    for row in data:
-        status_key = manager._normalize_process_status(row[3])
-        if status_key in status_counts:
-            status_counts[status_key] += 1
-
-        if active_filter == "ALL" or status_key == active_filter:
-            filtered_data.append(row)
-
-    model.clear()
-    model.setHorizontalHeaderLabels(
-        ["PID", "Name", "Type", "Status", "Server", "Object", "Time Taken (sec)", "Start Time", "End Time", "Message / Command"]
-    )
-
-    for _, row in enumerate(filtered_data):
-        items = [QStandardItem(str(col)) for col in row]
-        for item in items:
-            item.setEditable(False)
-
-        if len(items) > 3:
-            items[3].setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-
-        model.appendRow(items)
+    model.set_status_filter(_status_filter_label(manager, active_filter))
+    if model.canFetchMore():
+        model.fetchMore()
 
-    manager._update_process_summary_ui(current_tab, status_counts, len(data), len(filtered_data))
+    _load_process_counts(manager)
+    _publish_process_summary(manager, [(current_tab, model)])
     processes_view.resizeColumnsToContents()
     
     last_col = model.columnCount() - 1
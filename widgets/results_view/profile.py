@@ -0,0 +1,275 @@
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QThreadPool, Qt
+from PySide6.QtWidgets import QAbstractItemView, QLabel, QTableView, QVBoxLayout, QWidget
+
+from workers.column_profile import ColumnProfile, ColumnProfileSignals, RunnableColumnProfile
+from workers.grid_filter import FilterToken, display_text
+
+
+PROFILE_HEADERS = [
+    "Column", "Type", "Rows", "Nulls", "Distinct (≈)",
+    "Min", "Max", "Mean", "Median", "Distribution",
+]
+
+SPARK_BARS = "▁▂▃▄▅▆▇█"
+MAX_VALUE_TEXT = 60
+
+
+def _short_text(value):
+    if value is None:
+        return ""
+    text = display_text(value)
+    return text if len(text) <= MAX_VALUE_TEXT else text[:MAX_VALUE_TEXT - 1] + "…"
+
+
+def _format_number(value):
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return f"{value:,.4g}" if abs(value) < 1e6 else f"{value:,.0f}"
+    return f"{value:,}"
+
+
+def _sparkline(counts):
+    peak = max(counts) if counts else 0
+    if not peak:
+        return ""
+    return "".join(
+        SPARK_BARS[min(len(SPARK_BARS) - 1, count * len(SPARK_BARS) // peak)] if count else " "
+        for count in counts
+    )
+
+
+def _distribution_text(summary):
+    if summary.get("histogram"):
+        return _sparkline(summary["histogram"])
+    if summary.get("top_values"):
+        return ", ".join(f"{_short_text(text)} ({hits:,})" for text, hits in summary["top_values"])
+    return ""
+
+
+class ColumnProfileModel(QAbstractTableModel):
+    """One row per result column, showing the latest profile snapshot."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._summaries = []
+        self._data_types = []
+
+    def set_summaries(self, summaries, data_types=None):
+        if data_types is not None or len(summaries) != len(self._summaries):
+            self.beginResetModel()
+            self._summaries = list(summaries)
+            if data_types is not None:
+                self._data_types = list(data_types)
+            self.endResetModel()
+            return
+        self._summaries = list(summaries)
+        if self._summaries:
+            self.dataChanged.emit(
+                self.index(0, 1), self.index(len(self._summaries) - 1, len(PROFILE_HEADERS) - 1)
+            )
+
+    def clear(self):
+        self.set_summaries([], [])
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._summaries)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(PROFILE_HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return PROFILE_HEADERS[section] if 0 <= section < len(PROFILE_HEADERS) else None
+        return str(section + 1)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._summaries):
+            return None
+        summary = self._summaries[index.row()]
+        column = index.column()
+
+        if role == Qt.ItemDataRole.ToolTipRole:
+            if column == 9 and summary.get("quantiles"):
+                q1, median, q3 = (_short_text(value) for value in summary["quantiles"])
+                return f"25%: {q1}\n50%: {median}\n75%: {q3}"
+            if column in (5, 6) and summary.get("max_length") is not None:
+                return f"Length {summary['min_length']:,} - {summary['max_length']:,}"
+            return None
+        if role == Qt.ItemDataRole.TextAlignmentRole and 2 <= column <= 4:
+            return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+
+        if column == 0:
+            return str(summary["name"])
+        if column == 1:
+            data_type = self._data_types[index.row()] if index.row() < len(self._data_types) else ""
+            return data_type or summary["kind"]
+        if column == 2:
+            return _format_number(summary["count"])
+        if column == 3:
+            return _format_number(summary["nulls"])
+        if column == 4:
+            return _format_number(summary["distinct"])
+        if column == 5:
+            return _short_text(summary["min"])
+        if column == 6:
+            return _short_text(summary["max"])
+        if column == 7:
+            return _format_number(summary["mean"])
+        if column == 8:
+            quantiles = summary.get("quantiles")
+            if not quantiles:
+                return ""
+            median = quantiles[1]
+            return _format_number(median) if isinstance(median, float) else _short_text(median)
+        if column == 9:
+            return _distribution_text(summary)
+        return None
+
+
+def create_profile_view(manager, tab_content):
+    profile_container = QWidget()
+    layout = QVBoxLayout(profile_container)
+    layout.setContentsMargins(0, 0, 0, 0)
+    layout.setSpacing(0)
+
+    status_label = QLabel("Run a query to profile its columns.")
+    status_label.setObjectName("profile_status_label")
+    status_label.setContentsMargins(8, 3, 8, 3)
+    layout.addWidget(status_label)
+
+    profile_table = QTableView()
+    profile_table.setObjectName("profile_table")
+    profile_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+    profile_table.setAlternatingRowColors(True)
+    profile_table.verticalHeader().setDefaultSectionSize(28)
+    profile_table.horizontalHeader().setStretchLastSection(True)
+    profile_table.setModel(ColumnProfileModel(profile_table))
+    layout.addWidget(profile_table)
+
+    tab_content.profile_state = {
+        "generation": 0,
+        "token": None,
+        "rows_key": None,
+        "signals": None,
+    }
+    return profile_container
+
+
+def _cancel_profile(state):
+    state["generation"] += 1
+    if state["token"] is not None:
+        state["token"].cancel()
+        state["token"] = None
+
+
+def cancel_column_profile(manager, tab_content):
+    """Stop the tab's profile job and drop its results, e.g. when a new result replaces the buffer."""
+    state = getattr(tab_content, "profile_state", None)
+    if state is None:
+        return
+    _cancel_profile(state)
+    state["rows_key"] = None
+    profile_table = tab_content.findChild(QTableView, "profile_table")
+    if profile_table is not None:
+        profile_table.model().clear()
+    status_label = tab_content.findChild(QLabel, "profile_status_label")
+    if status_label:
+        status_label.setText("Run a query to profile its columns.")
+
+
+def refresh_column_profile(manager, tab_content):
+    """Profile the active output tab's result buffer, unless it is already profiled."""
+    state = getattr(tab_content, "profile_state", None)
+    profile_table = tab_content.findChild(QTableView, "profile_table")
+    status_label = tab_content.findChild(QLabel, "profile_status_label")
+    if state is None or profile_table is None:
+        return
+    model = profile_table.model()
+
+    table_view = manager._get_result_table_for_tab(tab_content)
+    proxy_model = table_view.model() if table_view else None
+    rows = proxy_model.raw_rows() if hasattr(proxy_model, "raw_rows") else None
+    output_state = (table_view.property("output_state") or {}) if table_view else {}
+    column_names = output_state.get("column_names") or []
+
+    if rows is None or not column_names:
+        _cancel_profile(state)
+        state["rows_key"] = None
+        model.clear()
+        if status_label:
+            status_label.setText("No result to profile. Execute a query to get output.")
+        return
+
+    # Same buffer at the same length as last time: the finished (or running)
+    # profile still applies. Row edits and deletes change the buffer in place.
+    total = len(rows)
+    rows_key = (id(rows), total)
+    if rows_key == state["rows_key"]:
+        return
+
+    _cancel_profile(state)
+    state["rows_key"] = rows_key
+    generation = state["generation"]
+    # The worker gets its own copy so later edits to the grid cannot race it;
+    # read-only sequences (memory-mapped snapshots) are shared as they are
+    snapshot = rows[:total] if isinstance(rows, list) else rows
+    column_specs = output_state.get("column_specs") or []
+    data_types = [
+        (column_specs[index].get("data_type") or "") if index < len(column_specs) else ""
+        for index in range(len(column_names))
+    ]
+    profiles = [ColumnProfile(name) for name in column_names]
+    model.set_summaries([profile.summary() for profile in profiles], data_types)
+
+    if status_label:
+        status_label.setText(f"Profiling {total:,} rows...")
+
+    def on_progress(job_generation, done, summaries):
+        if job_generation != state["generation"]:
+            return
+        model.set_summaries(summaries)
+        if status_label:
+            status_label.setText(f"Profiled {done:,} of {total:,} rows...")
+
+    def on_finished(job_generation, done, summaries):
+        if job_generation != state["generation"]:
+            return
+        state["token"] = None
+        model.set_summaries(summaries)
+        if status_label:
+            status_label.setText(f"Profiled {done:,} rows | distinct counts are estimates")
+
+    def on_error(job_generation, message):
+        if job_generation != state["generation"]:
+            return
+        state["token"] = None
+        state["rows_key"] = None
+        if status_label:
+            status_label.setText(f"Column profile failed: {message}")
+
+    # A fresh signals object per job so late emits from a cancelled job have no receivers
+    signals = ColumnProfileSignals()
+    signals.progress.connect(on_progress)
+    signals.finished.connect(on_finished)
+    signals.error.connect(on_error)
+    state["signals"] = signals
+
+    token = FilterToken()
+    state["token"] = token
+    QThreadPool.globalInstance().start(
+        RunnableColumnProfile(generation, token, signals, snapshot, profiles)
+    )
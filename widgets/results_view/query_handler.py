@@ -1,15 +1,18 @@
 import re
 import datetime
 
-import sqlparse
-from PySide6.QtCore import Qt, QSortFilterProxyModel, QTimer
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QColor, QStandardItem, QStandardItemModel
-from PySide6.QtWidgets import QAbstractItemView, QLabel, QLineEdit, QPushButton, QStackedWidget, QTextEdit, QWidget, QTabWidget, QTableView
+from PySide6.QtWidgets import QAbstractItemView, QInputDialog, QLabel, QLineEdit, QMessageBox, QPushButton, QStackedWidget, QTextEdit, QWidget, QTabWidget, QTableView
 
-from db.query_context import resolve_writable_table_context
+from db.query_info import analyze_query
 from widgets.results_view.explain import ExplainVisualizer
+from widgets.results_view.grid_proxy import ResultGridProxyModel
 from widgets.results_view.perf_metrics import perf_elapsed_ms, perf_record, perf_take, perf_now
+from widgets.results_view.profile import cancel_column_profile
 from widgets.results_view.value_state import display_cell_text, editor_text_from_raw, values_equal_for_editor
+from workers.grid_filter import ColumnPredicate
+from workers.result_snapshot import snapshot_source
 
 
 DEFAULT_CHUNK_PROFILES = [
@@ -36,15 +39,11 @@ DEFAULT_CHUNK_PROFILES = [
 ]
 
 
-def _extract_object_type(query_upper, fallback="Object"):
+def _extract_object_type(words, fallback="Object"):
     """
     Helper to extract the object type (TABLE, VIEW, SEQUENCE, etc.) 
-    from a SQL command.
+    from the leading upper-case words of a SQL command.
     """
-    if not query_upper:
-        return fallback
-
-    words = query_upper.split()
     if not words:
         return fallback
 
@@ -209,6 +208,36 @@ def toggle_table_search(manager):
         search_box.setFocus()
 
 
+def prompt_column_filter(manager, table_view, column):
+    proxy_model = table_view.model()
+    if not isinstance(proxy_model, ResultGridProxyModel) or column < 0:
+        return
+
+    column_name = str(proxy_model.headerData(column, Qt.Orientation.Horizontal) or "").split("\n")[0]
+    current = proxy_model.column_predicates().get(column)
+    text, ok = QInputDialog.getText(
+        manager.main_window,
+        "Filter Column",
+        f"Filter '{column_name}' (e.g. > 100, = active, ~text, NULL, NOT NULL).\nLeave empty to remove the filter:",
+        text=current.text if current is not None else "",
+    )
+    if not ok:
+        return
+    if not text.strip():
+        proxy_model.set_column_predicate(column, None)
+        return
+    try:
+        proxy_model.set_column_predicate(column, ColumnPredicate(text))
+    except ValueError as e:
+        QMessageBox.warning(manager.main_window, "Filter Column", str(e))
+
+
+def clear_column_filters(manager, table_view):
+    proxy_model = table_view.model()
+    if isinstance(proxy_model, ResultGridProxyModel):
+        proxy_model.clear_column_predicates()
+
+
 def handle_query_result(
     manager,
     target_tab,
@@ -222,8 +251,11 @@ def handle_query_result(
     is_select_query,
     output_mode="current",
     output_tab_index=None,
+    query_info=None,
 ):
     render_start = perf_now()
+    if query_info is None:
+        query_info = analyze_query(query)
     if target_tab in manager.tab_timers:
         manager.tab_timers[target_tab]["timer"].stop()
         manager.tab_timers[target_tab]["timeout_timer"].stop()
@@ -261,6 +293,8 @@ def handle_query_result(
 
     output_state = table_view.property("output_state") or {}
     _stop_chunk_loader(output_state)
+    # The profile belongs to the previous result; it is recomputed when the Profile page is next shown
+    cancel_column_profile(manager, target_tab)
     message_view = target_tab.findChild(QTextEdit, "message_view")
     tab_status_label = target_tab.findChild(QLabel, "tab_status_label")
     rows_info_label = target_tab.findChild(QLabel, "rows_info_label")
@@ -276,7 +310,7 @@ def handle_query_result(
         message_view.clear()
 
     if is_select_query:
-        if query.upper().strip().startswith("EXPLAIN (ANALYZE,"):
+        if query_info.first_keyword == "EXPLAIN" and query.strip().upper().startswith("EXPLAIN (ANALYZE,"):
             try:
                 if results and len(results) > 0 and len(results[0]) > 0:
                     json_data = results[0][0]
@@ -308,22 +342,9 @@ def handle_query_result(
             except Exception as e:
                 print(f"Error parsing explain result: {e}")
 
-    match_query = re.sub(r"--.*?\n|/\*.*?\*/", "", query, flags=re.DOTALL).strip().upper()
-    first_word = match_query.split()[0] if match_query.split() else ""
-
-    q_type_parsed = ""
-    parsed = sqlparse.parse(query)
-    if parsed:
-        for statement in parsed:
-            statement_type = statement.get_type().upper()
-            if statement_type != "UNKNOWN":
-                q_type_parsed = statement_type
-                break
-
-    q_type = q_type_parsed if q_type_parsed and q_type_parsed != "UNKNOWN" else first_word
-
-    is_structural = q_type in ["CREATE", "DROP", "ALTER", "TRUNCATE", "GRANT", "REVOKE", "COMMENT", "RENAME"]
-    is_select = q_type == "SELECT" or first_word == "SELECT"
+    q_type = query_info.kind
+    is_structural = query_info.is_structural
+    is_select = query_info.is_select
 
     final_tab_index = 0
 
@@ -331,10 +352,13 @@ def handle_query_result(
         final_tab_index = 0
         output_state["column_names"] = list(columns)
         output_state["column_specs"] = list(column_specs)
+        output_state["query"] = query
+        output_state["source"] = snapshot_source(conn_data)
+        output_state["snapshot"] = None
         output_state["modified_coords"] = set()
         output_state["new_row_index"] = None
 
-        table_context = resolve_writable_table_context(query)
+        table_context = manager.main_window.worksheet_manager.resolve_result_table_context(target_tab, query, query_info)
         output_state["table_name"] = None
         output_state["qualified_table_name"] = None
         output_state["real_table_name"] = None
@@ -383,12 +407,16 @@ def handle_query_result(
 
         proxy_model = output_state.get("cached_proxy_model")
         if proxy_model is None:
-            proxy_model = QSortFilterProxyModel(table_view)
-            proxy_model.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
-            proxy_model.setFilterKeyColumn(-1)
+            proxy_model = ResultGridProxyModel(table_view)
+            proxy_model.filter_applied.connect(
+                lambda visible, total: manager.status.showMessage(f"Showing {visible:,} of {total:,} rows", 3000)
+            )
             output_state["cached_proxy_model"] = proxy_model
 
         proxy_model.setSourceModel(model)
+        table_view.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        manager.main_window.worksheet_manager.attach_grid_pushdown(target_tab, table_view, proxy_model, conn_data)
+        proxy_model.set_raw_rows(results)
         table_view.setModel(proxy_model)
         if output_state["is_editable"]:
             table_view.setEditTriggers(QAbstractItemView.EditTrigger.DoubleClicked)
@@ -509,25 +537,25 @@ def handle_query_result(
             msg = f"{status_text}\n\nQuery returned successfully in {time_str}."
             tab_status = f"{status_text} | Time: {time_str}"
         elif q_type.startswith("CREATE"):
-            obj_type = _extract_object_type(match_query, "Object")
+            obj_type = _extract_object_type(query_info.leading_words, "Object")
             status_text = f"CREATED {obj_type.upper()}"
             msg = f"{status_text}\n\nQuery returned successfully in {time_str}."
             tab_status = f"{status_text} | Time: {time_str}"
             should_refresh_tree = True
         elif q_type.startswith("DROP"):
-            obj_type = _extract_object_type(match_query, "Object")
+            obj_type = _extract_object_type(query_info.leading_words, "Object")
             status_text = f"DROPED {obj_type.upper()}"
             msg = f"{status_text}\n\nQuery returned successfully in {time_str}."
             tab_status = f"{status_text} | Time: {time_str}"
             should_refresh_tree = True
         elif q_type.startswith("ALTER"):
-            obj_type = _extract_object_type(match_query, "Object")
+            obj_type = _extract_object_type(query_info.leading_words, "Object")
             status_text = f"ALTERED {obj_type.upper()}"
             msg = f"{status_text}\n\nQuery returned successfully in {time_str}."
             tab_status = f"{status_text} | Time: {time_str}"
             should_refresh_tree = True
         elif q_type.startswith("TRUNCATE"):
-            obj_type = _extract_object_type(match_query, "TABLE")
+            obj_type = _extract_object_type(query_info.leading_words, "TABLE")
             status_text = f"TRUNCATED {obj_type.upper()}"
             msg = f"{status_text}\n\nQuery returned successfully in {time_str}."
             tab_status = f"{status_text} | Time: {time_str}"
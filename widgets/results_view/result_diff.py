@@ -0,0 +1,283 @@
+import os
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QThreadPool, Qt
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QComboBox,
+    QDialog,
+    QFileDialog,
+    QHBoxLayout,
+    QInputDialog,
+    QLabel,
+    QMessageBox,
+    QTableView,
+    QTabWidget,
+    QVBoxLayout,
+)
+
+from widgets.results_view.snapshot import SNAPSHOT_FILTER
+from workers.grid_filter import FilterToken, display_text
+from workers.result_diff import ADDED, CHANGED, REMOVED, ResultDiffSignals, RunnableResultDiff
+from workers.result_snapshot import ResultSnapshot, SnapshotFormatError
+
+SNAPSHOT_CHOICE = "Snapshot file..."
+
+STATUS_FILTERS = [
+    ("All differences", None),
+    ("Added rows", ADDED),
+    ("Removed rows", REMOVED),
+    ("Changed rows", CHANGED),
+]
+
+STATUS_COLORS = {
+    ADDED: QColor("#E8F5E9"),
+    REMOVED: QColor("#FDECEC"),
+    CHANGED: QColor("#FFF4CC"),
+}
+CHANGED_CELL_COLOR = QColor("#FFE08A")
+
+
+class ResultDiffModel(QAbstractTableModel):
+    """Differing rows of a ``ResultDiff``; cell values are read from the two result buffers on demand."""
+
+    def __init__(self, left_rows, right_rows, left_positions, right_positions, parent=None):
+        super().__init__(parent)
+        self._left_rows = left_rows
+        self._right_rows = right_rows
+        self._left_positions = left_positions
+        self._right_positions = right_positions
+        self._diff = None
+        self._entries = []
+
+    def set_diff(self, diff, status=None):
+        self.beginResetModel()
+        self._diff = diff
+        if diff is None:
+            self._entries = []
+        elif status is None:
+            self._entries = diff.entries
+        else:
+            self._entries = [entry for entry in diff.entries if entry[0] == status]
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._entries)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid() or self._diff is None:
+            return 0
+        return len(self._diff.columns) + 1
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Vertical:
+            return str(section + 1)
+        if section == 0:
+            return "Status"
+        if self._diff is not None and 0 < section <= len(self._diff.columns):
+            name = self._diff.columns[section - 1]
+            return f"{name} [KEY]" if name in self._diff.key_columns else name
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def _cell(self, rows, positions, row, column):
+        values = rows[row]
+        position = positions[column]
+        return values[position] if position < len(values) else None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._entries):
+            return None
+        status, left_row, right_row, changed = self._entries[index.row()]
+        column = index.column() - 1
+
+        if role == Qt.ItemDataRole.BackgroundRole:
+            if column >= 0 and column in changed:
+                return CHANGED_CELL_COLOR
+            return STATUS_COLORS.get(status)
+        if role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return None
+        if column < 0:
+            return status.capitalize()
+
+        if status == ADDED:
+            return display_text(self._cell(self._right_rows, self._right_positions, right_row, column))
+        left_text = display_text(self._cell(self._left_rows, self._left_positions, left_row, column))
+        if status == CHANGED and column in changed:
+            right_text = display_text(self._cell(self._right_rows, self._right_positions, right_row, column))
+            return f"{left_text} → {right_text}"
+        return left_text
+
+
+class ResultDiffDialog(QDialog):
+    """Runs a result diff on the thread pool and lists the added, removed and changed rows."""
+
+    def __init__(self, parent, left, right, key_columns):
+        super().__init__(parent)
+        self.setWindowTitle(f"Compare: {left['title']} ↔ {right['title']}")
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        self.resize(1000, 600)
+        self._left = left
+        self._right = right
+        self._diff = None
+
+        layout = QVBoxLayout(self)
+        header = QHBoxLayout()
+        self.summary_label = QLabel("Comparing...")
+        self.summary_label.setWordWrap(True)
+        header.addWidget(self.summary_label, 1)
+        self.status_combo = QComboBox()
+        for label, status in STATUS_FILTERS:
+            self.status_combo.addItem(label, status)
+        self.status_combo.setEnabled(False)
+        self.status_combo.currentIndexChanged.connect(self._apply_status_filter)
+        header.addWidget(self.status_combo)
+        layout.addLayout(header)
+
+        right_index = {str(name): index for index, name in enumerate(right["columns"])}
+        common = [str(name) for name in left["columns"] if str(name) in right_index]
+        left_index = {str(name): index for index, name in enumerate(left["columns"])}
+        self.model = ResultDiffModel(
+            left["rows"],
+            right["rows"],
+            [left_index[name] for name in common],
+            [right_index[name] for name in common],
+            self,
+        )
+        self.table = QTableView()
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setDefaultSectionSize(28)
+        self.table.setModel(self.model)
+        layout.addWidget(self.table)
+
+        self._token = FilterToken()
+        # Closing the dialog cancels the job through the token
+        self._signals = ResultDiffSignals()
+        self._signals.progress.connect(self._on_progress)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.error.connect(self._on_error)
+        QThreadPool.globalInstance().start(
+            RunnableResultDiff(
+                0,
+                self._token,
+                self._signals,
+                left["rows"],
+                left["columns"],
+                right["rows"],
+                right["columns"],
+                key_columns,
+            )
+        )
+
+    def _on_progress(self, _generation, done, total):
+        percent = int(done * 100 / total) if total else 100
+        self.summary_label.setText(f"Comparing {len(self._left['rows']):,} and {len(self._right['rows']):,} rows... {percent}%")
+
+    def _on_finished(self, _generation, diff):
+        self._diff = diff
+        text = diff.summary_text()
+        if diff.truncated:
+            text += f" | showing the first {len(diff.entries):,} differences"
+        self.summary_label.setText(text)
+        self.status_combo.setEnabled(True)
+        self._apply_status_filter()
+
+    def _on_error(self, _generation, message):
+        self.summary_label.setText(f"Compare failed: {message}")
+
+    def _apply_status_filter(self, *_args):
+        if self._diff is not None:
+            self.model.set_diff(self._diff, self.status_combo.currentData())
+
+    def done(self, result):
+        self._token.cancel()
+        super().done(result)
+
+
+def _result_source(table_view, title):
+    proxy_model = table_view.model() if table_view else None
+    rows = proxy_model.raw_rows() if hasattr(proxy_model, "raw_rows") else None
+    output_state = (table_view.property("output_state") or {}) if table_view else {}
+    columns = output_state.get("column_names") or []
+    if rows is None or not columns:
+        return None
+    return {
+        "title": title,
+        "rows": rows,
+        "columns": list(columns),
+        "column_specs": list(output_state.get("column_specs") or []),
+    }
+
+
+def _key_columns(source):
+    columns = source["columns"]
+    specs = source["column_specs"]
+    return [str(columns[index]) for index, spec in enumerate(specs) if index < len(columns) and spec.get("pk")]
+
+
+def compare_results(manager, table_view):
+    """Compare the given output tab's result with another output tab or a snapshot file."""
+    tab_content = manager.tab_widget.currentWidget()
+    output_tabs = tab_content.findChild(QTabWidget, "output_tabs") if tab_content else None
+    if not output_tabs:
+        return
+
+    left = None
+    candidates = {}
+    for index in range(output_tabs.count()):
+        other_table = output_tabs.widget(index).findChild(QTableView, "results_table")
+        title = output_tabs.tabText(index) or f"Result {index + 1}"
+        source = _result_source(other_table, title)
+        if other_table is table_view:
+            left = source
+        elif source is not None:
+            candidates[f"{index + 1}: {title}"] = source
+
+    if left is None:
+        QMessageBox.warning(manager.main_window, "Compare Results", "This output tab has no result to compare.")
+        return
+
+    choice, ok = QInputDialog.getItem(
+        manager.main_window,
+        "Compare Results",
+        f"Compare '{left['title']}' with:",
+        list(candidates) + [SNAPSHOT_CHOICE],
+        0,
+        False,
+    )
+    if not ok:
+        return
+
+    if choice == SNAPSHOT_CHOICE:
+        file_path, _ = QFileDialog.getOpenFileName(manager.main_window, "Compare With Snapshot", "", SNAPSHOT_FILTER)
+        if not file_path:
+            return
+        try:
+            snapshot = ResultSnapshot(file_path)
+        except SnapshotFormatError as e:
+            QMessageBox.critical(manager.main_window, "Compare Results", str(e))
+            return
+        right = {
+            "title": os.path.basename(file_path),
+            "rows": snapshot.rows,
+            "columns": list(snapshot.columns),
+            "column_specs": list(snapshot.column_specs),
+            "snapshot": snapshot,
+        }
+    else:
+        right = candidates[choice]
+
+    key_columns = _key_columns(left) or _key_columns(right)
+    dialog = ResultDiffDialog(manager.main_window, left, right, key_columns)
+    if choice == SNAPSHOT_CHOICE:
+        # Opened just for this comparison
+        dialog.finished.connect(lambda _result: snapshot.close())
+    dialog.show()
@@ -1,5 +1,5 @@
 import pandas as pd
-from PySide6.QtCore import Qt, QSortFilterProxyModel
+from PySide6.QtCore import Qt, QAbstractProxyModel
 from PySide6.QtGui import QColor
 from PySide6.QtWidgets import QComboBox, QFileDialog, QMessageBox
 
@@ -29,7 +29,7 @@ def delete_selected_row(manager):
     if not display_model or not selection_model:
         return
 
-    if isinstance(display_model, QSortFilterProxyModel):
+    if isinstance(display_model, QAbstractProxyModel):
         source_model = display_model.sourceModel()
     else:
         source_model = display_model
@@ -37,13 +37,13 @@ def delete_selected_row(manager):
     selected_source_rows = set()
 
     for idx in selection_model.selectedRows():
-        if isinstance(display_model, QSortFilterProxyModel):
+        if isinstance(display_model, QAbstractProxyModel):
             idx = display_model.mapToSource(idx)
         selected_source_rows.add(idx.row())
 
     if not selected_source_rows:
         for idx in selection_model.selectedIndexes():
-            if isinstance(display_model, QSortFilterProxyModel):
+            if isinstance(display_model, QAbstractProxyModel):
                 idx = display_model.mapToSource(idx)
             selected_source_rows.add(idx.row())
 
@@ -67,63 +67,42 @@ def delete_selected_row(manager):
         QMessageBox.critical(manager.main_window, "Error", "No active database connection found.")
         return
 
-    db_code = (conn_data.get("code") or conn_data.get("db_type", "")).upper()
-    deleted_count = 0
+    rows_by_key = {}
+    pk_col = None
     errors = []
+    for row_idx in sorted(selected_source_rows):
+        item = source_model.item(row_idx, 0)
+        if not item:
+            continue
 
-    conn = None
-    try:
-        if db_code == "POSTGRES":
-            conn = db.create_postgres_connection(**{k: v for k, v in conn_data.items() if k in ["host", "port", "database", "user", "password"]})
-        elif "SQLITE" in str(db_code):
-            conn = db.create_sqlite_connection(conn_data.get("db_path"))
-        elif "SERVICENOW" in str(db_code):
-            conn = db.create_servicenow_connection(conn_data)
-
-        if not conn:
-            QMessageBox.critical(manager.main_window, "Error", "Could not create database connection.")
-            return
-
-        cursor = conn.cursor()
-
-        for row_idx in sorted(selected_source_rows, reverse=True):
-            item = source_model.item(row_idx, 0)
-            if not item:
-                continue
-
-            item_data = item.data(Qt.ItemDataRole.UserRole)
-            pk_col = item_data.get("pk_col")
-            pk_val = item_data.get("pk_val")
+        item_data = item.data(Qt.ItemDataRole.UserRole) or {}
+        row_pk_col = item_data.get("pk_col")
+        pk_val = item_data.get("pk_val")
 
-            if not pk_col or pk_val is None:
-                errors.append(f"Row {row_idx + 1}: No Primary Key found. Cannot delete safely.")
-                continue
+        if not row_pk_col or pk_val is None:
+            errors.append(f"Row {row_idx + 1}: No Primary Key found. Cannot delete safely.")
+            continue
+        pk_col = pk_col or row_pk_col
+        rows_by_key.setdefault(pk_val, []).append(row_idx)
 
-            try:
-                if db_code == "POSTGRES":
-                    sql = f'DELETE FROM {qualified_table_name} WHERE "{pk_col}" = %s'
-                    cursor.execute(sql, (pk_val,))
-                elif "SQLITE" in str(db_code):
-                    sql = f'DELETE FROM {qualified_table_name} WHERE "{pk_col}" = ?'
-                    cursor.execute(sql, (pk_val,))
-                elif "SERVICENOW" in str(db_code):
-                    sql = f"DELETE FROM {qualified_table_name} WHERE {pk_col} = ?"
-                    cursor.execute(sql, (pk_val,))
-
-                source_model.removeRow(row_idx)
-                deleted_count += 1
-
-            except Exception as inner_e:
-                errors.append(f"Row {row_idx + 1} Error: {str(inner_e)}")
+    deleted_count = 0
+    if rows_by_key:
+        try:
+            result = db.apply_grid_edits(conn_data, qualified_table_name, pk_col, deleted_keys=list(rows_by_key))
+        except Exception as e:
+            QMessageBox.critical(manager.main_window, "Database Error", str(e))
+            return
 
-        conn.commit()
-        conn.close()
+        if result.deleted_keys is None:
+            deleted_keys = rows_by_key.keys()
+        else:
+            deleted_keys = set(result.deleted_keys)
+            for pk_val in rows_by_key.keys() - deleted_keys:
+                errors.append(f"No row deleted for PK '{pk_col}'={pk_val}")
 
-    except Exception as e:
-        QMessageBox.critical(manager.main_window, "Database Error", str(e))
-        if conn:
-            conn.close()
-        return
+        removed_rows = sorted((row for key in deleted_keys for row in rows_by_key[key]), reverse=True)
+        _remove_source_rows(source_model, removed_rows)
+        deleted_count = result.deleted
 
     if deleted_count > 0:
         manager.status.showMessage(f"Successfully deleted {deleted_count} row(s).", 3000)
@@ -133,6 +112,19 @@ def delete_selected_row(manager):
         QMessageBox.warning(manager.main_window, "Deletion Errors", "\n".join(errors[:5]))
 
 
+def _remove_source_rows(source_model, rows_descending):
+    # One removeRows call per contiguous block instead of one per row
+    index = 0
+    while index < len(rows_descending):
+        last = rows_descending[index]
+        first = last
+        index += 1
+        while index < len(rows_descending) and rows_descending[index] == first - 1:
+            first -= 1
+            index += 1
+        source_model.removeRows(first, last - first + 1)
+
+
 def model_to_dataframe(manager, model):
     rows = model.rowCount()
     cols = model.columnCount()
@@ -204,8 +196,9 @@ def add_empty_row(manager):
     if not output_state.get("is_editable") or not output_state.get("qualified_table_name"):
         QMessageBox.warning(manager.main_window, "Warning", "This result set is read-only. Run a simple single-table SELECT to add rows.")
         return
-    model = table.model()
-    if isinstance(model, QSortFilterProxyModel):
+    display_model = table.model()
+    model = display_model
+    if isinstance(model, QAbstractProxyModel):
         model = model.sourceModel()
 
     if not model:
@@ -217,9 +210,13 @@ def add_empty_row(manager):
     output_state["new_row_index"] = row
     table.setProperty("output_state", output_state)
 
+    new_index = model.index(row, 0)
+    if isinstance(display_model, QAbstractProxyModel):
+        new_index = display_model.mapFromSource(new_index)
+
     table.scrollToBottom()
-    table.setCurrentIndex(model.index(row, 0))
-    table.edit(model.index(row, 0))
+    table.setCurrentIndex(new_index)
+    table.edit(new_index)
 
 
 def save_new_row(manager):
@@ -241,166 +238,132 @@ def save_new_row(manager):
     if not output_state.get("is_editable") or not output_state.get("qualified_table_name"):
         QMessageBox.warning(manager.main_window, "Warning", "This result set is read-only. Run a simple single-table SELECT to save changes.")
         return
-    model = table.model()
-    if isinstance(model, QSortFilterProxyModel):
+    proxy_model = table.model()
+    model = proxy_model
+    if isinstance(model, QAbstractProxyModel):
         model = model.sourceModel()
 
-    if output_state.get("new_row_index") is not None:
+    table_name = output_state.get("qualified_table_name")
+    insert_columns = None
+    insert_rows = None
+    new_row_idx = output_state.get("new_row_index")
+    if new_row_idx is not None:
         if not output_state.get("table_name") or not output_state.get("column_names"):
             QMessageBox.warning(manager.main_window, "Error", "Table context missing.")
+            new_row_idx = None
         else:
-            row_idx = output_state["new_row_index"]
             values = []
             for col_idx in range(model.columnCount()):
-                item = model.item(row_idx, col_idx)
+                item = model.item(new_row_idx, col_idx)
                 raw_text = item.data(Qt.ItemDataRole.EditRole) if item else None
                 raw_text = "" if raw_text is None else str(raw_text)
                 val = editor_text_to_db_value(raw_text) if item else None
                 values.append(val)
-
-            cols_str = ", ".join([f'"{c}"' for c in output_state["column_names"]])
-            db_code = (conn_data.get("code") or conn_data.get("db_type", "")).upper()
-
-            conn = None
-
-            try:
-                if db_code == "POSTGRES":
-                    placeholders = ", ".join(["%s"] * len(values))
-                    sql = f'INSERT INTO {output_state["qualified_table_name"]} ({cols_str}) VALUES ({placeholders})'
-                    conn = db.create_postgres_connection(**{k: v for k, v in conn_data.items() if k in ["host", "port", "database", "user", "password"]})
-
-                elif "SQLITE" in str(db_code):
-                    placeholders = ", ".join(["?"] * len(values))
-                    sql = f'INSERT INTO {output_state["qualified_table_name"]} ({cols_str}) VALUES ({placeholders})'
-                    conn = db.create_sqlite_connection(conn_data.get("db_path"))
-
-                elif "SERVICENOW" in str(db_code):
-                    placeholders = ", ".join(["?"] * len(values))
-                    sql = f'INSERT INTO {output_state["qualified_table_name"]} ({cols_str}) VALUES ({placeholders})'
-                    conn = db.create_servicenow_connection(conn_data)
-                if conn:
-                    cursor = conn.cursor()
-                    cursor.execute(sql, values)
-                    conn.commit()
-                    conn.close()
-                    output_state["new_row_index"] = None
-                    for col_idx in range(model.columnCount()):
-                        item = model.item(row_idx, col_idx)
-                        if not item:
-                            continue
-                        raw_value = values[col_idx]
-                        edit_data = item.data(Qt.ItemDataRole.UserRole) or {}
-                        edit_data["orig_val"] = raw_value
-                        edit_data["raw_val"] = raw_value
-                        edit_data["is_db_null"] = raw_value is None
-                        item.setData(edit_data, Qt.ItemDataRole.UserRole)
-                        item.setData(display_cell_text(raw_value), Qt.ItemDataRole.DisplayRole)
-                        item.setData(editor_text_from_raw(raw_value), Qt.ItemDataRole.EditRole)
-                        item.setBackground(QColor(Qt.GlobalColor.white))
-                    table.setProperty("output_state", output_state)
-                    saved_any = True
-
-            except Exception as e:
-                QMessageBox.critical(manager.main_window, "Insert Error", f"Failed to insert row:\n{str(e)}")
+            insert_columns = output_state["column_names"]
+            insert_rows = [values]
 
     modified_coords = output_state.get("modified_coords", set())
-    updates_count = 0
+    coords_to_process = list(modified_coords)
     update_errors = []
-    if modified_coords:
-        coords_to_process = list(modified_coords)
-        db_code = (conn_data.get("code") or conn_data.get("db_type", "")).upper()
-        conn = None
+    row_updates = {}
+    cells_by_key = {}
+    pk_col = None
+    for row, col in coords_to_process:
+        item = model.item(row, col)
+        if not item:
+            continue
+
+        edit_data = item.data(Qt.ItemDataRole.UserRole) or {}
+        row_pk_col = edit_data.get("pk_col")
+        pk_val = edit_data.get("pk_val")
+        col_name = edit_data.get("col_name")
+        new_val = item.data(Qt.ItemDataRole.EditRole)
+        new_val = "" if new_val is None else str(new_val)
+        val_to_update = editor_text_to_db_value(new_val)
+
+        if not row_pk_col or pk_val is None:
+            update_errors.append(f"Missing PK for column {col_name}")
+            continue
+        pk_col = pk_col or row_pk_col
+        row_updates.setdefault(pk_val, {})[col_name] = val_to_update
+        cells_by_key.setdefault(pk_val, []).append((row, col, val_to_update))
+
+    if not insert_rows and not row_updates:
+        if update_errors:
+            QMessageBox.warning(manager.main_window, "Update Failed", "Update failed. No values were updated.")
+            QMessageBox.warning(manager.main_window, "Update Details", "\n".join(update_errors[:8]))
+        elif new_row_idx is None and not modified_coords:
+            manager.status.showMessage("No changes to save.", 3000)
+        return
 
-        try:
-            if db_code == "POSTGRES":
-                conn = db.create_postgres_connection(**{k: v for k, v in conn_data.items() if k in ["host", "port", "database", "user", "password"]})
-            elif "SQLITE" in str(db_code):
-                conn = db.create_sqlite_connection(conn_data.get("db_path"))
-            elif "SERVICENOW" in str(db_code):
-                conn = db.create_servicenow_connection(conn_data)
+    try:
+        result = db.apply_grid_edits(
+            conn_data,
+            table_name,
+            pk_col,
+            row_updates=row_updates,
+            insert_columns=insert_columns,
+            insert_rows=insert_rows,
+        )
+    except Exception as e:
+        QMessageBox.critical(manager.main_window, "Save Error", f"Failed to save changes. Nothing was written:\n{str(e)}")
+        return
 
-            if not conn:
-                raise Exception("Could not create database connection for updates.")
+    if insert_rows:
+        output_state["new_row_index"] = None
+        for col_idx, raw_value in enumerate(insert_rows[0]):
+            item = model.item(new_row_idx, col_idx)
+            if item:
+                _mark_cell_saved(item, raw_value)
+        saved_any = True
 
-            cursor = conn.cursor()
-            table_name_for_update = output_state.get("qualified_table_name")
+    updates_count = 0
+    if row_updates:
+        if result.updated_keys is None:
+            saved_keys = row_updates.keys()
+            if result.updated < len(row_updates):
+                update_errors.append(f"{len(row_updates) - result.updated} row(s) were not found by primary key '{pk_col}'.")
+        else:
+            saved_keys = set(result.updated_keys)
+            for pk_val in row_updates.keys() - saved_keys:
+                update_errors.append(f"No row updated for PK '{pk_col}'={pk_val}")
 
-            for row, col in coords_to_process:
+        for pk_val in saved_keys:
+            for row, col, val_to_update in cells_by_key[pk_val]:
                 item = model.item(row, col)
-                if not item:
-                    continue
-
-                edit_data = item.data(Qt.ItemDataRole.UserRole) or {}
-                pk_col = edit_data.get("pk_col")
-                pk_val = edit_data.get("pk_val")
-                col_name = edit_data.get("col_name")
-                new_val = item.data(Qt.ItemDataRole.EditRole)
-                new_val = "" if new_val is None else str(new_val)
-                val_to_update = editor_text_to_db_value(new_val)
-
-                if not table_name_for_update:
-                    update_errors.append("Missing table context for update.")
-                    continue
-                if not pk_col or pk_val is None:
-                    update_errors.append(f"Missing PK for column {col_name}")
-                    continue
-
-                try:
-                    if db_code == "POSTGRES":
-                        sql = f'UPDATE {table_name_for_update} SET "{col_name}" = %s WHERE "{pk_col}" = %s'
-                        cursor.execute(sql, (val_to_update, pk_val))
-                    elif "SQLITE" in str(db_code):
-                        sql = f'UPDATE {table_name_for_update} SET "{col_name}" = ? WHERE "{pk_col}" = ?'
-                        cursor.execute(sql, (val_to_update, pk_val))
-                    elif "SERVICENOW" in str(db_code):
-                        sql = f"UPDATE {table_name_for_update} SET {col_name} = ? WHERE {pk_col} = ?"
-                        cursor.execute(sql, (val_to_update, pk_val))
-                    else:
-                        update_errors.append(f"Unsupported DB type for updates: {db_code}")
-                        continue
-
-                    if hasattr(cursor, "rowcount") and cursor.rowcount == 0:
-                        update_errors.append(f"No row updated for PK '{pk_col}'={pk_val}")
-                        continue
-
-                    edit_data["orig_val"] = val_to_update
-                    edit_data["raw_val"] = val_to_update
-                    edit_data["is_db_null"] = val_to_update is None
-                    item.setData(edit_data, Qt.ItemDataRole.UserRole)
-                    item.setData(display_cell_text(val_to_update), Qt.ItemDataRole.DisplayRole)
-                    item.setData(editor_text_from_raw(val_to_update), Qt.ItemDataRole.EditRole)
-                    item.setBackground(QColor(Qt.GlobalColor.white))
-                    if (row, col) in modified_coords:
-                        modified_coords.remove((row, col))
-                    updates_count += 1
-                except Exception as inner_e:
-                    update_errors.append(str(inner_e))
-
-            conn.commit()
-            if updates_count > 0:
-                saved_any = True
-
-        except Exception as e:
-            QMessageBox.critical(manager.main_window, "Connection Error", f"Failed to update rows:\n{str(e)}")
-        finally:
-            if conn:
-                conn.close()
+                if item:
+                    _mark_cell_saved(item, val_to_update)
+                if hasattr(proxy_model, "set_raw_value"):
+                    proxy_model.set_raw_value(row, col, val_to_update)
+                modified_coords.discard((row, col))
+                updates_count += 1
+        if updates_count > 0:
+            saved_any = True
 
-        output_state["modified_coords"] = modified_coords
-        table.setProperty("output_state", output_state)
+    output_state["modified_coords"] = modified_coords
+    table.setProperty("output_state", output_state)
 
-        if updates_count > 0:
-            update_popup_shown = True
-            QMessageBox.information(manager.main_window, "Update Success", f"Updated {updates_count} value(s) successfully.")
-        elif coords_to_process:
-            QMessageBox.warning(manager.main_window, "Update Failed", "Update failed. No values were updated.")
+    if updates_count > 0:
+        update_popup_shown = True
+        QMessageBox.information(manager.main_window, "Update Success", f"Updated {updates_count} value(s) successfully.")
+    elif coords_to_process:
+        QMessageBox.warning(manager.main_window, "Update Failed", "Update failed. No values were updated.")
 
-        if update_errors:
-            QMessageBox.warning(manager.main_window, "Update Details", "\n".join(update_errors[:8]))
+    if update_errors:
+        QMessageBox.warning(manager.main_window, "Update Details", "\n".join(update_errors[:8]))
 
     if saved_any:
         manager.status.showMessage("Changes saved successfully!", 3000)
         if not update_popup_shown:
             QMessageBox.information(manager.main_window, "Success", "Changes saved successfully!")
-    elif output_state.get("new_row_index") is None and not modified_coords:
-        manager.status.showMessage("No changes to save.", 3000)
+
+
+def _mark_cell_saved(item, raw_value):
+    edit_data = item.data(Qt.ItemDataRole.UserRole) or {}
+    edit_data["orig_val"] = raw_value
+    edit_data["raw_val"] = raw_value
+    edit_data["is_db_null"] = raw_value is None
+    item.setData(edit_data, Qt.ItemDataRole.UserRole)
+    item.setData(display_cell_text(raw_value), Qt.ItemDataRole.DisplayRole)
+    item.setData(editor_text_from_raw(raw_value), Qt.ItemDataRole.EditRole)
+    item.setBackground(QColor(Qt.GlobalColor.white))
@@ -0,0 +1,206 @@
+import datetime
+import os
+import uuid
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PySide6.QtWidgets import QAbstractItemView, QComboBox, QFileDialog, QLabel, QMessageBox, QTextEdit
+
+from widgets.results_view.grid_proxy import ResultGridProxyModel
+from widgets.results_view.query_handler import _build_header_text, _set_row_action_state, _stop_chunk_loader
+from widgets.results_view.value_state import display_cell_text, editor_text_from_raw
+from workers import ProcessSignals
+from workers.result_snapshot import (
+    SNAPSHOT_EXTENSION,
+    ResultSnapshot,
+    RunnableSaveSnapshot,
+    SnapshotFormatError,
+    snapshot_source,
+)
+from workers.signals import emit_process_started
+
+SNAPSHOT_FILTER = f"Result Snapshot (*{SNAPSHOT_EXTENSION})"
+
+
+class SnapshotTableModel(QAbstractTableModel):
+    """Read-only grid model that decodes cells from a memory-mapped snapshot as they are painted."""
+
+    def __init__(self, snapshot, header_texts, parent=None):
+        super().__init__(parent)
+        self._snapshot = snapshot
+        self._header_texts = list(header_texts)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._snapshot.row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._snapshot.columns)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal:
+            if not 0 <= section < len(self._header_texts):
+                return None
+            if role == Qt.ItemDataRole.DisplayRole:
+                return self._header_texts[section]
+            if role == Qt.ItemDataRole.ToolTipRole and section < len(self._snapshot.column_specs):
+                return self._snapshot.column_specs[section].get("data_type") or None
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return str(section + 1)
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return display_cell_text(self._snapshot.value(index.row(), index.column()))
+        if role == Qt.ItemDataRole.EditRole:
+            return editor_text_from_raw(self._snapshot.value(index.row(), index.column()))
+        return None
+
+
+def save_result_snapshot(manager, tab_content):
+    """Write the active output tab's result buffer to a snapshot file on the thread pool."""
+    table_view = manager._get_result_table_for_tab(tab_content)
+    proxy_model = table_view.model() if table_view else None
+    rows = proxy_model.raw_rows() if hasattr(proxy_model, "raw_rows") else None
+    output_state = (table_view.property("output_state") or {}) if table_view else {}
+    column_names = output_state.get("column_names") or []
+    if rows is None or not column_names:
+        QMessageBox.warning(manager.main_window, "No Data", "No result data to save as a snapshot.")
+        return
+    if output_state.get("chunk_loader") is not None:
+        QMessageBox.information(manager.main_window, "Snapshot", "The result is still loading. Try again when it has finished.")
+        return
+
+    file_path, _ = QFileDialog.getSaveFileName(
+        manager.main_window,
+        "Save Result Snapshot",
+        f"query_result{SNAPSHOT_EXTENSION}",
+        SNAPSHOT_FILTER,
+    )
+    if not file_path:
+        return
+    if not file_path.endswith(SNAPSHOT_EXTENSION):
+        file_path += SNAPSHOT_EXTENSION
+
+    db_combo_box = tab_content.findChild(QComboBox, "db_combo_box")
+    conn_data = (db_combo_box.currentData() if db_combo_box else None) or {}
+    source = output_state.get("source") or snapshot_source(conn_data)
+
+    short_id = str(uuid.uuid4())[:8]
+    initial_data = {
+        "pid": short_id,
+        "type": "Save Snapshot",
+        "status": "Running",
+        "server": source.get("connection") or "Unknown",
+        "object": "Query Results",
+        "time_taken": "...",
+        "start_time": datetime.datetime.now().strftime("%Y-%m-%d, %I:%M:%S %p"),
+        "details": f"Saving snapshot to {os.path.basename(file_path)}",
+        "_conn_id": conn_data.get("id"),
+    }
+
+    signals = ProcessSignals()
+    signals.started.connect(manager.handle_process_started)
+    signals.finished.connect(manager.handle_process_finished)
+    signals.error.connect(manager.handle_process_error)
+    emit_process_started(signals, short_id, initial_data)
+
+    manager.thread_pool.start(
+        RunnableSaveSnapshot(
+            short_id,
+            file_path,
+            rows,
+            column_names,
+            output_state.get("column_specs") or [],
+            output_state.get("query") or "",
+            source,
+            signals,
+        )
+    )
+
+
+def open_result_snapshot(manager, tab_content):
+    """Open a snapshot file into a new, read-only output tab without contacting a server."""
+    file_path, _ = QFileDialog.getOpenFileName(manager.main_window, "Open Result Snapshot", "", SNAPSHOT_FILTER)
+    if not file_path:
+        return
+
+    try:
+        snapshot = ResultSnapshot(file_path)
+    except SnapshotFormatError as e:
+        QMessageBox.critical(manager.main_window, "Open Snapshot", str(e))
+        return
+
+    output_tab_index = manager.create_output_tab(tab_content, title=os.path.basename(file_path), activate=True)
+    table_view, _resolved_index = manager._ensure_result_table_for_tab(tab_content, output_tab_index)
+    if not table_view:
+        return
+
+    output_state = table_view.property("output_state") or {}
+    _stop_chunk_loader(output_state)
+    column_specs = [
+        snapshot.column_specs[index] if index < len(snapshot.column_specs) else {}
+        for index in range(len(snapshot.columns))
+    ]
+    header_texts = [
+        _build_header_text(manager, str(name), spec) for name, spec in zip(snapshot.columns, column_specs)
+    ]
+    model = SnapshotTableModel(snapshot, header_texts, table_view)
+
+    output_state.update({
+        "column_names": list(snapshot.columns),
+        "column_specs": column_specs,
+        "modified_coords": set(),
+        "new_row_index": None,
+        "table_name": None,
+        "qualified_table_name": None,
+        "real_table_name": None,
+        "schema_name": None,
+        "is_editable": False,
+        "query": snapshot.query,
+        "source": snapshot.source,
+        "snapshot": snapshot,
+    })
+
+    proxy_model = output_state.get("cached_proxy_model")
+    if proxy_model is None:
+        proxy_model = ResultGridProxyModel(table_view)
+        proxy_model.filter_applied.connect(
+            lambda visible, total: manager.status.showMessage(f"Showing {visible:,} of {total:,} rows", 3000)
+        )
+        output_state["cached_proxy_model"] = proxy_model
+    proxy_model.setSourceModel(model)
+    proxy_model.set_raw_rows(snapshot.rows)
+    table_view.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+    table_view.setModel(proxy_model)
+    table_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+    table_view.setProperty("output_state", output_state)
+    _set_row_action_state(tab_content, False)
+
+    rows_info_label = tab_content.findChild(QLabel, "rows_info_label")
+    if rows_info_label:
+        rows_info_label.setText(f"Snapshot: {snapshot.row_count:,} rows")
+
+    source_name = snapshot.source.get("connection") or "unknown connection"
+    tab_status = f"Snapshot opened | Total rows: {snapshot.row_count} | Saved: {snapshot.created_at}"
+    message_view = tab_content.findChild(QTextEdit, "message_view")
+    if message_view:
+        message_view.setPlainText(
+            f"Opened result snapshot {file_path}\n\n"
+            f"Saved: {snapshot.created_at} from {source_name}\n"
+            f"Total rows: {snapshot.row_count}\n\n{snapshot.query}"
+        )
+    tab_status_label = tab_content.findChild(QLabel, "tab_status_label")
+    if tab_status_label:
+        tab_status_label.setText(tab_status)
+    manager.stop_spinner(tab_content, success=True, target_index=0)
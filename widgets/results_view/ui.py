@@ -16,6 +16,7 @@ from widgets.results_view.messages import create_message_view
 from widgets.results_view.notifications import create_notification_view
 from widgets.results_view.output_tabs import create_output_tabs_view
 from widgets.results_view.processes import create_processes_view
+from widgets.results_view.profile import create_profile_view
 from ui.toolbars import NavigationHeader, ResultsInfoToolbar, ProcessFilterBar
 
 
@@ -32,7 +33,8 @@ def create_results_ui(manager, tab_content):
         ("Messages", 100, 1),
         ("Notifications", 120, 2),
         ("Processes", 100, 3),
-        ("Explain", 100, 5)
+        ("Explain", 100, 5),
+        ("Profile", 100, 7)
     ]
     results_header = NavigationHeader("resultsHeader", results_tabs)
     results_layout.addWidget(results_header)
@@ -131,6 +133,8 @@ def create_results_ui(manager, tab_content):
     placeholder_layout.addWidget(placeholder_content)
     results_stack.addWidget(placeholder_widget)
 
+    results_stack.addWidget(create_profile_view(manager, tab_content))
+
     results_stack.setCurrentIndex(6)
 
     results_layout.addWidget(results_stack)
@@ -155,7 +159,12 @@ def create_results_ui(manager, tab_content):
             results_info_bar.hide()
             process_filter_bar.show()
             process_info_bar.hide()
-            manager.refresh_processes_view()
+            manager._ensure_processes_loaded(tab_content)
+        elif index == 7:
+            results_info_bar.hide()
+            process_info_bar.hide()
+            process_filter_bar.hide()
+            manager._refresh_column_profile(tab_content)
         else:
             results_info_bar.hide()
             process_info_bar.hide()
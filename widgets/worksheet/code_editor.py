@@ -1,4 +1,5 @@
 # code_editor.py
+import os
 import re
 from PySide6.QtWidgets import (
     QPlainTextEdit,
@@ -18,11 +19,18 @@ from PySide6.QtGui import (
     QTextDocument,
     QSyntaxHighlighter,
     QTextCharFormat,
+    QTextLayout,
     QPen,
 )
-from PySide6.QtCore import QRect, QSize, Qt, QPoint, QEvent
+from PySide6.QtCore import QRect, QSize, Qt, QPoint, QEvent, QTimer
 
 
+# Documents larger than this (in characters) switch the editor into
+# large-file mode: viewport-only highlighting and deferred folding.
+LARGE_FILE_THRESHOLD = 2 * 1024 * 1024
+LARGE_FILE_FOLDING_DELAY_MS = 750
+LARGE_FILE_FOLDING_WINDOW = 2000
+
 
 class SqlHighlighter(QSyntaxHighlighter):
     def __init__(self, document):
@@ -55,13 +63,55 @@ class SqlHighlighter(QSyntaxHighlighter):
         self.comment_format = QTextCharFormat()
         self.comment_format.setForeground(QColor("#2f7d4a"))
 
-    def highlightBlock(self, text):
+    def format_ranges(self, text):
+        """Yield (start, length, format) tuples for one line of SQL."""
         for pattern, fmt in self.rules:
             for match in re.finditer(pattern, text, re.IGNORECASE):
-                self.setFormat(match.start(), match.end() - match.start(), fmt)
+                yield match.start(), match.end() - match.start(), fmt
 
         for match in re.finditer(r"--.*$", text):
-            self.setFormat(match.start(), match.end() - match.start(), self.comment_format)
+            yield match.start(), match.end() - match.start(), self.comment_format
+
+    def highlightBlock(self, text):
+        for start, length, fmt in self.format_ranges(text):
+            self.setFormat(start, length, fmt)
+
+
+class ViewportHighlighter:
+    """Applies SqlHighlighter rules only to blocks scrolled into view.
+
+    Used in large-file mode instead of attaching a QSyntaxHighlighter, which
+    would format every block of the document up front. Each block remembers
+    the revision it was highlighted at (via userState), so edited blocks are
+    re-formatted the next time they are visible.
+    """
+
+    def __init__(self, editor, rules):
+        self.editor = editor
+        self.rules = rules
+
+    def highlight_visible(self):
+        editor = self.editor
+        document = editor.document()
+        offset = editor.contentOffset()
+        viewport_bottom = editor.viewport().rect().bottom()
+
+        block = editor.firstVisibleBlock()
+        while block.isValid():
+            if editor.blockBoundingGeometry(block).translated(offset).top() > viewport_bottom:
+                break
+            if block.isVisible() and block.userState() != block.revision():
+                ranges = []
+                for start, length, fmt in self.rules.format_ranges(block.text()):
+                    format_range = QTextLayout.FormatRange()
+                    format_range.start = start
+                    format_range.length = length
+                    format_range.format = fmt
+                    ranges.append(format_range)
+                block.layout().setFormats(ranges)
+                block.setUserState(block.revision())
+                document.markContentsDirty(block.position(), block.length())
+            block = block.next()
 
 class LineNumberArea(QWidget):
     def __init__(self, editor):
@@ -93,14 +143,29 @@ class CodeEditor(QPlainTextEdit):
         self._ghost_full_match = ""
         self._ghost_accepting = False
         self.folding_gutter_width = 18
+        self._has_hidden_blocks = False
+        self.large_file_mode = False
+        self.source_path = None
+        self.session_buffer_path = None  # sidecar file this editor's content was last spilled to
 
         self._sync_document_font_from_widget()
 
         self.highlighter = SqlHighlighter(self.document())
+        self._viewport_highlighter = ViewportHighlighter(self, self.highlighter)
+
+        self._viewport_highlight_timer = QTimer(self)
+        self._viewport_highlight_timer.setSingleShot(True)
+        self._viewport_highlight_timer.setInterval(0)
+        self._viewport_highlight_timer.timeout.connect(self._viewport_highlighter.highlight_visible)
+
+        self._folding_timer = QTimer(self)
+        self._folding_timer.setSingleShot(True)
+        self._folding_timer.setInterval(LARGE_FILE_FOLDING_DELAY_MS)
+        self._folding_timer.timeout.connect(self.updateFoldingMarkers)
 
         self.blockCountChanged.connect(self.updateLineNumberAreaWidth)
         self.updateRequest.connect(self.updateLineNumberArea)
-        self.textChanged.connect(self.updateFoldingMarkers)
+        self.textChanged.connect(self._on_text_changed_folding)
         #self.textChanged.connect(self.on_text_changed)
 
         self.cursorPositionChanged.connect(self.highlightCurrentLine)
@@ -119,6 +184,53 @@ class CodeEditor(QPlainTextEdit):
         self.updateFoldingMarkers()
         self.highlightCurrentLine()
 
+    # --- LARGE-FILE MODE ---
+
+    def setPlainText(self, text):
+        """Replace the document, switching large-file mode on or off by size."""
+        # Switch modes while the smaller of the two documents is loaded, so the
+        # highlighter never has to attach to (or detach from) a huge document.
+        is_large = len(text) > LARGE_FILE_THRESHOLD
+        if is_large:
+            self.set_large_file_mode(True)
+        self.source_path = None
+        super().setPlainText(text)
+        if not is_large:
+            self.set_large_file_mode(False)
+        else:
+            self._viewport_highlight_timer.start()
+
+    def load_file(self, file_path):
+        """Load a SQL file into the editor and remember where it came from."""
+        with open(file_path, "r", encoding="utf-8") as f:
+            content = f.read()
+        self.setPlainText(content)
+        self.source_path = os.path.abspath(file_path)
+        self.document().setModified(False)
+
+    def set_large_file_mode(self, enabled):
+        """Toggle viewport-only highlighting, deferred folding and no-wrap layout."""
+        enabled = bool(enabled)
+        if enabled == self.large_file_mode:
+            return
+        self.large_file_mode = enabled
+        self._folding_timer.stop()
+        self._viewport_highlight_timer.stop()
+
+        if enabled:
+            self.highlighter.setDocument(None)
+            self.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        else:
+            self.highlighter.setDocument(self.document())
+            self.setLineWrapMode(QPlainTextEdit.LineWrapMode.WidgetWidth)
+
+    def _on_text_changed_folding(self):
+        """Recompute folding now, or once typing pauses in large-file mode."""
+        if self.large_file_mode:
+            self._folding_timer.start()
+        else:
+            self.updateFoldingMarkers()
+
     def _sync_document_font_from_widget(self):
         widget_font = self.font()
         if self.document().defaultFont() != widget_font:
@@ -211,16 +323,36 @@ class CodeEditor(QPlainTextEdit):
             bottom = top + int(self.blockBoundingRect(block).height())
             blockNumber += 1
 
+    def _folding_scan_range(self):
+        """Return the (first, last) block numbers folding should scan.
+
+        Large files only scan a window around the viewport; everything else is
+        scanned in full.
+        """
+        last_block = self.document().blockCount() - 1
+        if not self.large_file_mode:
+            return 0, last_block
+        first_visible = self.firstVisibleBlock().blockNumber()
+        return (
+            max(0, first_visible - LARGE_FILE_FOLDING_WINDOW),
+            min(last_block, first_visible + LARGE_FILE_FOLDING_WINDOW),
+        )
+
     def updateFoldingMarkers(self):
         new_regions = {}
         new_statement_map = {}
-        text = self.toPlainText()
+        scan_first, scan_last = self._folding_scan_range()
+
+        # Folded regions outside the scanned window stay folded in large-file mode
+        for start in self.folded_blocks:
+            if not scan_first <= start <= scan_last and start in self.fold_regions:
+                new_regions[start] = self.fold_regions[start]
 
         # 1) Statement-based folding and statement map
-        block = self.document().begin()
+        block = self.document().findBlockByNumber(scan_first)
         stmt_start_block = -1
 
-        while block.isValid():
+        while block.isValid() and block.blockNumber() <= scan_last:
             b_idx = block.blockNumber()
             line_text = block.text().strip()
             is_comment = line_text.startswith('--') or line_text.startswith('/*')
@@ -240,44 +372,33 @@ class CodeEditor(QPlainTextEdit):
             block = block.next()
 
         # fill single-line defaults for statement selection
-        total_blocks = self.document().blockCount()
-        for i in range(total_blocks):
-            if i not in new_statement_map:
-                new_statement_map[i] = (i, i)
+        # (large files fall back to .get() lookups instead of a dense map)
+        if not self.large_file_mode:
+            total_blocks = self.document().blockCount()
+            for i in range(total_blocks):
+                if i not in new_statement_map:
+                    new_statement_map[i] = (i, i)
+
+        # 2) Parenthesis-based folding (skipped for large files: unbalanced
+        #    parentheses would make this pass quadratic in the document size)
+        if not self.large_file_mode:
+            block = self.document().begin()
+            while block.isValid():
+                b_idx = block.blockNumber()
+                line_text = block.text()
 
-        # 2) Parenthesis-based folding
-        block = self.document().begin()
-        while block.isValid():
-            b_idx = block.blockNumber()
-            line_text = block.text()
-
-            if '(' in line_text and not line_text.strip().startswith('--') and b_idx not in new_regions:
-                stack = 0
-                found_end = -1
-                start_pos = block.position() + line_text.find('(')
-
-                remaining_text = text[start_pos:]
-                for i, char in enumerate(remaining_text):
-                    if char == '(':
-                        stack += 1
-                    elif char == ')':
-                        stack -= 1
-                        if stack == 0:
-                            found_end = start_pos + i
-                            break
-
-                if found_end != -1:
-                    end_block = self.document().findBlock(found_end)
-                    if end_block.isValid() and end_block.blockNumber() > b_idx:
-                        new_regions[b_idx] = list(range(b_idx + 1, end_block.blockNumber() + 1))
+                if '(' in line_text and not line_text.strip().startswith('--') and b_idx not in new_regions:
+                    end_block_number = self._find_closing_paren_block(block, line_text.find('('))
+                    if end_block_number > b_idx:
+                        new_regions[b_idx] = list(range(b_idx + 1, end_block_number + 1))
 
-            block = block.next()
+                block = block.next()
 
         # 3) Consecutive comment lines folding
-        block = self.document().begin()
+        block = self.document().findBlockByNumber(scan_first)
         comment_start = -1
 
-        while block.isValid():
+        while block.isValid() and block.blockNumber() <= scan_last:
             b_idx = block.blockNumber()
             line = block.text().strip()
 
@@ -292,8 +413,8 @@ class CodeEditor(QPlainTextEdit):
 
             block = block.next()
 
-        if comment_start != -1 and self.document().blockCount() - 1 > comment_start:
-            new_regions[comment_start] = list(range(comment_start + 1, self.document().blockCount()))
+        if comment_start != -1 and scan_last > comment_start:
+            new_regions[comment_start] = list(range(comment_start + 1, scan_last + 1))
 
         self.fold_regions = new_regions
         self.statement_map = new_statement_map
@@ -314,6 +435,23 @@ class CodeEditor(QPlainTextEdit):
 
 
 
+    def _find_closing_paren_block(self, block, column):
+        """Return the block number holding the parenthesis that closes the
+        one at ``column`` in ``block``, or -1 if it is never closed."""
+        stack = 0
+        line_text = block.text()[column:]
+        while block.isValid():
+            for char in line_text:
+                if char == '(':
+                    stack += 1
+                elif char == ')':
+                    stack -= 1
+                    if stack == 0:
+                        return block.blockNumber()
+            block = block.next()
+            line_text = block.text() if block.isValid() else ""
+        return -1
+
     def toggleFold(self, block_number: int) -> None:
         if not hasattr(self, "fold_regions") or block_number not in self.fold_regions:
             return
@@ -341,6 +479,11 @@ class CodeEditor(QPlainTextEdit):
             if parent_idx in self.folded_blocks:
                 hidden_blocks.update(children)
 
+        # Nothing folded before or now: every block is already visible.
+        if not hidden_blocks and not self._has_hidden_blocks:
+            return
+        self._has_hidden_blocks = bool(hidden_blocks)
+
         block = self.document().begin()
         while block.isValid():
             block_idx = block.blockNumber()
@@ -428,8 +571,8 @@ class CodeEditor(QPlainTextEdit):
                     self.toggleFold(bn)
                 
             
-                elif hasattr(self, 'statement_map') and bn in self.statement_map:
-                    start_bn, end_bn = self.statement_map[bn]
+                elif hasattr(self, 'statement_map'):
+                    start_bn, end_bn = self.statement_map.get(bn, (bn, bn))
                     
                     
                     start_block = self.document().findBlockByNumber(start_bn)
@@ -659,8 +802,8 @@ class CodeEditor(QPlainTextEdit):
     def _current_word_prefix(self):
         """Return the identifier fragment immediately left of the cursor."""
         cursor = self.textCursor()
-        pos = cursor.position()
-        text = self.toPlainText()
+        pos = cursor.positionInBlock()
+        text = cursor.block().text()
         start = pos
         while start > 0 and (text[start - 1].isalnum() or text[start - 1] == '_'):
             start -= 1
@@ -669,8 +812,12 @@ class CodeEditor(QPlainTextEdit):
     def _word_before_cursor(self):
         """Return the full identifier immediately before the cursor position."""
         cursor = self.textCursor()
-        pos = cursor.position()
-        text = self.toPlainText()[:pos]
+        block = cursor.block()
+        text = block.text()[:cursor.positionInBlock()]
+        # Only walk back over whitespace-only lines; never read the whole document.
+        while not text.strip() and block.previous().isValid():
+            block = block.previous()
+            text = block.text()
         match = re.search(r'(\w+)\s*$', text)
         return match.group(1) if match else ""
 
@@ -754,9 +901,14 @@ class CodeEditor(QPlainTextEdit):
             self._clear_ghost()
 
     def _on_update_request(self, _rect, dy):
-        """Reposition the ghost label when the viewport scrolls."""
+        """Reposition the ghost label and lazily highlight newly visible blocks."""
         if dy and self._ghost_text:
             self._update_ghost_label_pos()
+        if self.large_file_mode:
+            if not self._viewport_highlight_timer.isActive():
+                self._viewport_highlight_timer.start()
+            if dy:
+                self._folding_timer.start()
 
     def keyPressEvent(self, event):
         engine = self._engine
@@ -1,9 +1,8 @@
-import datetime
-
 from PySide6.QtWidgets import (
     QApplication,
     QMessageBox,
     QComboBox,
+    QLineEdit,
     QTreeView,
     QTextEdit,
     QStackedWidget,
@@ -11,9 +10,9 @@ from PySide6.QtWidgets import (
     QPushButton,
 )
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QStandardItemModel, QStandardItem, QBrush, QColor
 
 import db
+from widgets.worksheet.history_model import QueryHistoryModel
 
 
 def save_query_to_history(manager, conn_data, query, status, rows, duration):
@@ -29,52 +28,21 @@ def save_query_to_history(manager, conn_data, query, status, rows, duration):
 def load_connection_history(manager, target_tab):
     history_list_view = target_tab.findChild(QTreeView, "history_list_view")
     history_details_view = target_tab.findChild(QTextEdit, "history_details_view")
+    history_search_input = target_tab.findChild(QLineEdit, "history_search_input")
     db_combo_box = target_tab.findChild(QComboBox, "db_combo_box")
 
-    model = QStandardItemModel()
-    model.setHorizontalHeaderLabels(["Connection History"])
-    history_list_view.setModel(model)
+    conn_data = db_combo_box.currentData()
+    conn_id = conn_data.get("id") if conn_data else None
+    search_text = history_search_input.text() if history_search_input else ""
+
     history_details_view.clear()
-    history_list_view.expandAll()
-    history_list_view.setUniformRowHeights(False)
+    history_list_view.setUniformRowHeights(True)
     history_list_view.setItemsExpandable(False)
 
-    conn_data = db_combo_box.currentData()
-    if not conn_data:
-        return
-
-    conn_id = conn_data.get("id")
     try:
-        history = db.get_query_history(conn_id)
-        for row in history:
-            history_id, query, ts, status, rows, duration = row
-            clean_query = " ".join(query.split())
-            short_query = clean_query[:90] + ("..." if len(clean_query) > 90 else "")
-            dt = datetime.datetime.fromisoformat(ts)
-            status_text = (status or "Unknown").upper()
-            display_text = f"{short_query}\n{dt.strftime('%Y-%m-%d %H:%M:%S')}  |  {status_text}  |  {duration:.3f}s"
-
-            item = QStandardItem(display_text)
-            item.setData(
-                {
-                    "id": history_id,
-                    "query": query,
-                    "timestamp": dt.strftime("%Y-%m-%d %H:%M:%S"),
-                    "status": status,
-                    "rows": rows,
-                    "duration": f"{duration:.3f} sec",
-                },
-                Qt.ItemDataRole.UserRole,
-            )
-            item.setEditable(False)
-            item.setToolTip(query)
-
-            if status_text == "SUCCESS":
-                item.setForeground(QBrush(QColor("#1f7a1f")))
-            elif status_text == "FAILURE":
-                item.setForeground(QBrush(QColor("#b42318")))
-
-            model.appendRow(item)
+        model = QueryHistoryModel(conn_id, search_text, parent=history_list_view)
+        model.fetchMore()
+        history_list_view.setModel(model)
 
         if model.rowCount() > 0:
             first_index = model.index(0, 0)
@@ -89,7 +57,7 @@ def display_history_details(manager, index, target_tab):
     if not index.isValid() or not history_details_view:
         return
 
-    data = index.model().itemFromIndex(index).data(Qt.ItemDataRole.UserRole)
+    data = index.data(Qt.ItemDataRole.UserRole)
     details_text = (
         f"Timestamp : {data['timestamp']}\n"
         f"Status    : {data['status']}\n"
@@ -108,8 +76,7 @@ def get_selected_history_item(manager, target_tab):
         QMessageBox.information(manager.main_window, "No Selection", "Please select a history item first.")
         return None
 
-    item = selected_indexes[0].model().itemFromIndex(selected_indexes[0])
-    return item.data(Qt.ItemDataRole.UserRole)
+    return selected_indexes[0].data(Qt.ItemDataRole.UserRole)
 
 
 def copy_history_query(manager, target_tab):
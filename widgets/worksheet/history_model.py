@@ -0,0 +1,105 @@
+import datetime
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
+from PySide6.QtGui import QBrush, QColor
+
+import db
+
+
+class QueryHistoryModel(QAbstractListModel):
+    """Lazily paged list of a connection's query history.
+
+    Rows are fetched ``PAGE_SIZE`` at a time as the view scrolls (Qt's
+    canFetchMore/fetchMore protocol) and formatted only when painted, so a
+    connection with 100k history entries opens as fast as one with 100.
+    With ``search_text`` set, pages come from the ranked full-text search.
+    """
+
+    PAGE_SIZE = 200
+
+    _SUCCESS_BRUSH = QBrush(QColor("#1f7a1f"))
+    _FAILURE_BRUSH = QBrush(QColor("#b42318"))
+
+    def __init__(self, conn_id=None, search_text="", parent=None):
+        super().__init__(parent)
+        self.conn_id = conn_id
+        self.search_text = (search_text or "").strip()
+        self._rows = []
+        self._exhausted = conn_id is None
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return "Connection History"
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted:
+            return
+
+        if self.search_text:
+            page = db.search_query_history(
+                self.conn_id, self.search_text, self.PAGE_SIZE, len(self._rows)
+            )
+        else:
+            before = (self._rows[-1][2], self._rows[-1][0]) if self._rows else None
+            page = db.get_query_history_page(self.conn_id, self.PAGE_SIZE, before)
+
+        if len(page) < self.PAGE_SIZE:
+            self._exhausted = True
+        if not page:
+            return
+
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        self._rows.extend(page)
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+
+        history_id, query, ts, status, rows, duration = self._rows[index.row()]
+        status_text = (status or "Unknown").upper()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            clean_query = " ".join((query or "").split())
+            short_query = clean_query[:90] + ("..." if len(clean_query) > 90 else "")
+            return f"{short_query}\n{self._format_timestamp(ts)}  |  {status_text}  |  {duration or 0:.3f}s"
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return query
+        if role == Qt.ItemDataRole.ForegroundRole:
+            if status_text == "SUCCESS":
+                return self._SUCCESS_BRUSH
+            if status_text == "FAILURE":
+                return self._FAILURE_BRUSH
+            return None
+        if role == Qt.ItemDataRole.UserRole:
+            return {
+                "id": history_id,
+                "query": query,
+                "timestamp": self._format_timestamp(ts),
+                "status": status,
+                "rows": rows,
+                "duration": f"{duration or 0:.3f} sec",
+            }
+        return None
+
+    @staticmethod
+    def _format_timestamp(ts):
+        try:
+            return datetime.datetime.fromisoformat(ts).strftime("%Y-%m-%d %H:%M:%S")
+        except (TypeError, ValueError):
+            return str(ts or "")
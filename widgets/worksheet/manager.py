@@ -46,7 +46,10 @@ from widgets.worksheet.query_executor import (
     handle_query_error as handle_query_error_action,
     handle_query_timeout as handle_query_timeout_action,
     cancel_current_query as cancel_current_query_action,
+    run_grid_pushdown as run_grid_pushdown_action,
+    attach_grid_pushdown as attach_grid_pushdown_action,
 )
+from widgets.worksheet.query.query_pushdown import pushdown_table_context
 from widgets.worksheet.connections import (
     refresh_all_comboboxes as refresh_all_comboboxes_action,
     load_joined_connections as load_joined_connections_action,
@@ -63,6 +66,10 @@ from widgets.worksheet.history import (
     remove_selected_history as remove_selected_history_action,
     remove_all_history_for_connection as remove_all_history_for_connection_action,
 )
+from widgets.worksheet.query_stats import (
+    load_query_stats as load_query_stats_action,
+    load_query_timeline as load_query_timeline_action,
+)
 from widgets.worksheet.utils import renumber_tabs as renumber_tabs_action, handle_event_filter, show_info as show_info_action
 from widgets.app_shell.file_ops import open_find_dialog as open_find_dialog_action
 from widgets.worksheet.toolbar_actions import build_worksheet_toolbar_actions
@@ -125,8 +132,8 @@ class WorksheetManager(QWidget):
     def _start_query_worker(self, current_tab, conn_data, query, output_mode="current", output_tab_index=None):
         return start_query_worker(self, current_tab, conn_data, query, output_mode, output_tab_index)
 
-    def _on_query_finished_signal(self, conn_data, query, results, columns, column_specs, row_count, elapsed_time, is_select_query):
-        on_query_finished_signal(self, conn_data, query, results, columns, column_specs, row_count, elapsed_time, is_select_query)
+    def _on_query_finished_signal(self, conn_data, query, results, columns, column_specs, row_count, elapsed_time, is_select_query, query_info=None):
+        on_query_finished_signal(self, conn_data, query, results, columns, column_specs, row_count, elapsed_time, is_select_query, query_info)
 
     def _on_query_error_signal(self, conn_data, query, row_count, elapsed_time, error_message):
         on_query_error_signal(self, conn_data, query, row_count, elapsed_time, error_message)
@@ -434,9 +441,15 @@ class WorksheetManager(QWidget):
     def remove_all_history_for_connection(self, target_tab):
         remove_all_history_for_connection_action(self, target_tab)
 
+    def load_query_stats(self, target_tab):
+        load_query_stats_action(self, target_tab)
+
+    def load_query_timeline(self, index, target_tab):
+        load_query_timeline_action(self, index, target_tab)
+
     # --- Delegated Result Methods ---
 
-    def handle_query_result(self, target_tab, output_mode, output_tab_index, conn_data, query, results, columns, column_specs, row_count, elapsed_time, is_select_query):
+    def handle_query_result(self, target_tab, output_mode, output_tab_index, conn_data, query, results, columns, column_specs, row_count, elapsed_time, is_select_query, query_info=None):
         if target_tab in self.tab_timers:
             self.tab_timers[target_tab]["timer"].stop()
             self.tab_timers[target_tab]["timeout_timer"].stop()
@@ -455,6 +468,7 @@ class WorksheetManager(QWidget):
                 is_select_query,
                 output_mode=output_mode,
                 output_tab_index=output_tab_index,
+                query_info=query_info,
             )
         except Exception as e:
             message_view = target_tab.findChild(QTextEdit, "message_view")
@@ -466,6 +480,15 @@ class WorksheetManager(QWidget):
         self._refresh_editor_layout_for_tab(target_tab)
         self._update_transaction_button_states()
 
+    def run_grid_pushdown(self, target_tab, table_view):
+        run_grid_pushdown_action(self, target_tab, table_view)
+
+    def attach_grid_pushdown(self, target_tab, table_view, proxy_model, conn_data):
+        attach_grid_pushdown_action(self, target_tab, table_view, proxy_model, conn_data)
+
+    def resolve_result_table_context(self, target_tab, query, query_info=None):
+        return pushdown_table_context(target_tab, query, query_info)
+
     def _refresh_conn_status_icon(self, tab):
         if not tab:
             return
@@ -1,5 +1,6 @@
 from PySide6.QtWidgets import QComboBox, QPlainTextEdit, QTabWidget
 
+from db.query_info import analyze_query
 from widgets.worksheet.code_editor import CodeEditor
 
 
@@ -62,20 +63,20 @@ def apply_select_pagination(query, current_tab, preserve_pagination=False):
         return query
 
     normalized_query = query.strip().rstrip(";")
-    upper_query = normalized_query.upper()
+    query_info = analyze_query(normalized_query)
+    is_select = query_info.first_keyword == "SELECT"
 
-    if upper_query.startswith("SELECT") and not preserve_pagination and "OFFSET" not in upper_query:
+    if is_select and not preserve_pagination and not query_info.has_offset:
         current_tab.current_offset = 0
         current_tab.current_page = 1
 
     limit = getattr(current_tab, "current_limit", 0)
     offset = getattr(current_tab, "current_offset", 0)
 
-    if upper_query.startswith("SELECT") and limit > 0:
-        if "LIMIT" not in upper_query:
+    if is_select and limit > 0:
+        if not query_info.has_limit:
             normalized_query += f" LIMIT {limit}"
-            upper_query = normalized_query.upper()
-        if offset > 0 and "OFFSET" not in upper_query:
+        if offset > 0 and not query_info.has_offset:
             normalized_query += f" OFFSET {offset}"
 
     return normalized_query + ";"
@@ -0,0 +1,99 @@
+from PySide6.QtCore import Qt
+
+from db.query_context import GRID_PUSHDOWN_DIALECTS, build_grid_pushdown_query
+from db.query_info import analyze_query
+
+
+def _normalize(query):
+    return (query or "").strip().rstrip(";").strip()
+
+
+def _connection_code(conn_data):
+    if not conn_data:
+        return ""
+    return (conn_data.get("code") or conn_data.get("db_type") or "").upper()
+
+
+def remember_base_query(current_tab, query, preserve_pagination=False):
+    """
+    Track the query the grid pages through and return the SQL to paginate.
+
+    Paging (``preserve_pagination``) through the same query keeps an active
+    server-side sort/filter; any other run starts from the plain query.
+    """
+    normalized = _normalize(query)
+    state = getattr(current_tab, "grid_pushdown", None)
+    if preserve_pagination and state and state.get("base_query") == normalized:
+        return state["sql"]
+
+    current_tab.grid_pushdown = None
+    current_tab.grid_base_query = normalized
+    return None
+
+
+def paginate_pushdown_query(sql, current_tab):
+    limit = getattr(current_tab, "current_limit", 0)
+    offset = getattr(current_tab, "current_offset", 0)
+    paged_sql = sql
+    if limit > 0:
+        paged_sql += f"\nLIMIT {limit}"
+        if offset > 0:
+            paged_sql += f" OFFSET {offset}"
+    return paged_sql + ";"
+
+
+def is_pushdown_eligible(manager, current_tab, conn_data):
+    """Paged, auto-commit SELECT results on PostgreSQL/SQLite sort and filter in the database."""
+    if getattr(current_tab, "current_limit", 0) <= 0:
+        return False
+    if not manager.tab_autocommit.get(current_tab, True):
+        return False
+    if _connection_code(conn_data) not in GRID_PUSHDOWN_DIALECTS:
+        return False
+
+    base_query = getattr(current_tab, "grid_base_query", None)
+    if not base_query:
+        return False
+    # Only what apply_select_pagination pages: a SELECT without its own LIMIT/OFFSET
+    query_info = analyze_query(base_query)
+    if query_info.first_keyword != "SELECT" or len(query_info.statement_spans) != 1:
+        return False
+    return not query_info.has_limit and not query_info.has_offset
+
+
+def pushdown_table_context(current_tab, query, query_info=None):
+    """Resolve the editable table for ``query``, looking through a push-down wrapper."""
+    state = getattr(current_tab, "grid_pushdown", None)
+    if state and _normalize(query).startswith(state["sql"]):
+        return analyze_query(state["base_query"]).table_context
+    return (query_info or analyze_query(query)).table_context
+
+
+def build_pushdown_state(current_tab, proxy_model, column_names, conn_data):
+    """Return the push-down state for the proxy's sort/filters, or None when there are none."""
+    base_query = getattr(current_tab, "grid_base_query", None)
+    sort_column = proxy_model.sort_column()
+    descending = proxy_model.sort_order() == Qt.SortOrder.DescendingOrder
+    column_predicates = proxy_model.column_predicates()
+    search_text = proxy_model.filter_text()
+
+    if sort_column < 0 and not column_predicates and not search_text:
+        return None
+
+    sql = build_grid_pushdown_query(
+        base_query,
+        column_names,
+        sort_column=sort_column,
+        descending=descending,
+        column_predicates=column_predicates,
+        search_text=search_text,
+        dialect=_connection_code(conn_data),
+    )
+    return {
+        "base_query": base_query,
+        "sql": sql,
+        "sort_column": sort_column,
+        "descending": descending,
+        "column_predicates": column_predicates,
+        "search_text": search_text,
+    }
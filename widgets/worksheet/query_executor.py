@@ -1,5 +1,6 @@
 import time
 
+from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
     QMessageBox, QLabel
 )
@@ -21,6 +22,12 @@ from widgets.worksheet.query.query_preparation import (
     resolve_output_tab_index,
     resolve_query_context,
 )
+from widgets.worksheet.query.query_pushdown import (
+    build_pushdown_state,
+    is_pushdown_eligible,
+    paginate_pushdown_query,
+    remember_base_query,
+)
 from widgets.worksheet.query.query_runtime import (
     clear_query_timers,
     clear_running_query,
@@ -65,7 +72,7 @@ def _is_stale_query_signal(manager, signals, target_tab):
     return False
 
 
-def on_query_finished_signal(manager, conn_data, query, results, columns, column_specs, row_count, elapsed_time, is_select_query):
+def on_query_finished_signal(manager, conn_data, query, results, columns, column_specs, row_count, elapsed_time, is_select_query, query_info=None):
     signals = manager.sender()
     target_tab = getattr(signals, "_target_tab", manager.tab_widget.currentWidget())
     if _is_stale_query_signal(manager, signals, target_tab):
@@ -87,6 +94,7 @@ def on_query_finished_signal(manager, conn_data, query, results, columns, column
         row_count,
         elapsed_time,
         is_select_query,
+        query_info=query_info,
     )
 
 
@@ -180,7 +188,11 @@ def execute_query(manager, conn_data=None, query=None, output_mode="current", pr
         manager.show_info("Please enter a valid query.")
         return
 
-    query = apply_select_pagination(query, current_tab, preserve_pagination=preserve_pagination)
+    pushdown_sql = remember_base_query(current_tab, query, preserve_pagination)
+    if pushdown_sql:
+        query = paginate_pushdown_query(pushdown_sql, current_tab)
+    else:
+        query = apply_select_pagination(query, current_tab, preserve_pagination=preserve_pagination)
     perf_mark(manager, "query_execute_start")
 
     output_tab_index = resolve_output_tab_index(manager, current_tab, output_mode=output_mode)
@@ -202,6 +214,57 @@ def execute_query(manager, conn_data=None, query=None, output_mode="current", pr
         output_tab_index=output_tab_index,
     )
 
+def run_grid_pushdown(manager, current_tab, table_view):
+    """Re-run the tab's paged query with the grid's sort/filters applied in the database."""
+    proxy_model = table_view.model()
+    conn_data = get_tab_connection_data(current_tab)
+    output_state = table_view.property("output_state") or {}
+    try:
+        state = build_pushdown_state(
+            current_tab, proxy_model, output_state.get("column_names") or [], conn_data
+        )
+    except ValueError as e:
+        manager.show_info(f"{e}\n\nSorting/filtering the loaded page only.")
+        proxy_model.set_pushdown_handler(None)
+        proxy_model.apply_locally()
+        return
+
+    current_tab.grid_pushdown = state
+    current_tab.current_offset = 0
+    current_tab.current_page = 1
+    query = paginate_pushdown_query(state["sql"] if state else current_tab.grid_base_query, current_tab)
+
+    dispatch_query(
+        manager,
+        current_tab,
+        conn_data,
+        query,
+        "Sorting/filtering in database...",
+        start_query_worker,
+        output_mode="current",
+        output_tab_index=resolve_output_tab_index(manager, current_tab),
+    )
+
+
+def attach_grid_pushdown(manager, current_tab, table_view, proxy_model, conn_data):
+    """Hand a result grid's sort/filters to the database when its results are paged."""
+    if not is_pushdown_eligible(manager, current_tab, conn_data):
+        proxy_model.set_pushdown_handler(None)
+        return
+
+    proxy_model.set_pushdown_handler(lambda: manager.run_grid_pushdown(current_tab, table_view))
+    state = getattr(current_tab, "grid_pushdown", None)
+    if not state:
+        return
+
+    order = Qt.SortOrder.DescendingOrder if state["descending"] else Qt.SortOrder.AscendingOrder
+    proxy_model.restore_state(
+        state["sort_column"], order, state["column_predicates"], state["search_text"]
+    )
+    if state["sort_column"] >= 0:
+        table_view.horizontalHeader().setSortIndicator(state["sort_column"], order)
+
+
 def update_timer_label(manager, label, tab):
     if not label or tab not in manager.tab_timers:
         return
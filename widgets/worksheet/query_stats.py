@@ -0,0 +1,142 @@
+from PySide6.QtWidgets import QComboBox, QLabel, QMessageBox, QTableView
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QStandardItemModel, QStandardItem
+
+import db
+
+
+QUERY_STATS_ORDER_OPTIONS = [
+    ("Total time", "total"),
+    ("Mean time", "mean"),
+    ("p95 time", "p95"),
+    ("Max time", "max"),
+    ("Calls", "calls"),
+    ("Rows", "rows"),
+]
+
+QUERY_STATS_HEADERS = [
+    "Query Shape", "Calls", "Errors", "Total (s)", "Mean (s)",
+    "p50 (s)", "p95 (s)", "Max (s)", "Rows", "Last Run",
+]
+
+QUERY_TIMELINE_HEADERS = ["Run At", "Duration (s)", "Status", "Duration"]
+QUERY_TIMELINE_BAR_WIDTH = 40  # characters in the longest run's duration bar
+
+
+def _seconds_item(value):
+    item = QStandardItem("" if value is None else f"{value:.3f}")
+    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+    return item
+
+
+def _count_item(value):
+    item = QStandardItem(str(value or 0))
+    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+    return item
+
+
+def load_query_stats(manager, target_tab):
+    """Rank the connection's heaviest query shapes by the selected metric."""
+    stats_view = target_tab.findChild(QTableView, "query_stats_view")
+    order_combo = target_tab.findChild(QComboBox, "query_stats_order_combo")
+    db_combo_box = target_tab.findChild(QComboBox, "db_combo_box")
+    if not stats_view:
+        return
+
+    model = QStandardItemModel()
+    model.setHorizontalHeaderLabels(QUERY_STATS_HEADERS)
+    stats_view.setModel(model)
+    _clear_query_timeline(target_tab)
+
+    conn_data = db_combo_box.currentData() if db_combo_box else None
+    if not conn_data:
+        return
+
+    order_by = order_combo.currentData() if order_combo else "total"
+    try:
+        shapes = db.get_top_query_fingerprints(conn_data.get("id"), order_by=order_by or "total")
+    except Exception as error:
+        QMessageBox.critical(manager.main_window, "Error", f"Failed to load query statistics:\n{error}")
+        return
+
+    for shape in shapes:
+        query_item = QStandardItem(shape["query"])
+        query_item.setToolTip(shape["query"])
+        query_item.setData(shape["fingerprint"], Qt.ItemDataRole.UserRole)
+        row = [
+            query_item,
+            _count_item(shape["calls"]),
+            _count_item(shape["errors"]),
+            _seconds_item(shape["total_time"]),
+            _seconds_item(shape["mean_time"]),
+            _seconds_item(shape["p50_time"]),
+            _seconds_item(shape["p95_time"]),
+            _seconds_item(shape["max_time"]),
+            _count_item(shape["rows"]),
+            QStandardItem((shape["last_seen"] or "").replace("T", " ")[:19]),
+        ]
+        for item in row:
+            item.setEditable(False)
+        model.appendRow(row)
+
+    stats_view.resizeColumnsToContents()
+    if stats_view.columnWidth(0) > 500:
+        stats_view.setColumnWidth(0, 500)
+
+
+def _clear_query_timeline(target_tab, message="Select a query shape to see its run history."):
+    timeline_view = target_tab.findChild(QTableView, "query_stats_timeline_view")
+    timeline_label = target_tab.findChild(QLabel, "query_stats_timeline_label")
+    if timeline_view:
+        model = QStandardItemModel()
+        model.setHorizontalHeaderLabels(QUERY_TIMELINE_HEADERS)
+        timeline_view.setModel(model)
+    if timeline_label:
+        timeline_label.setText(message)
+    return timeline_view, timeline_label
+
+
+def load_query_timeline(manager, index, target_tab):
+    """Show the recent runs of the query shape in the clicked stats row, newest first."""
+    db_combo_box = target_tab.findChild(QComboBox, "db_combo_box")
+    conn_data = db_combo_box.currentData() if db_combo_box else None
+    fingerprint = index.sibling(index.row(), 0).data(Qt.ItemDataRole.UserRole) if index.isValid() else None
+    timeline_view, timeline_label = _clear_query_timeline(target_tab)
+    if not (timeline_view and conn_data and fingerprint):
+        return
+
+    try:
+        runs = db.get_fingerprint_timeline(conn_data.get("id"), fingerprint)
+    except Exception as error:
+        QMessageBox.critical(manager.main_window, "Error", f"Failed to load query run history:\n{error}")
+        return
+
+    durations = sorted(float(duration or 0.0) for _timestamp, duration, status in runs
+                       if str(status or "").upper() == "SUCCESS")
+    slowest = durations[-1] if durations else 0.0
+    model = timeline_view.model()
+    for timestamp, duration, status in runs:
+        succeeded = str(status or "").upper() == "SUCCESS"
+        bar = ""
+        if succeeded and slowest > 0:
+            bar = "█" * max(1, round(QUERY_TIMELINE_BAR_WIDTH * float(duration or 0.0) / slowest))
+        row = [
+            QStandardItem((timestamp or "").replace("T", " ")[:19]),
+            _seconds_item(duration if succeeded else None),
+            QStandardItem(str(status or "")),
+            QStandardItem(bar),
+        ]
+        for item in row:
+            item.setEditable(False)
+        model.appendRow(row)
+    timeline_view.resizeColumnsToContents()
+
+    if timeline_label:
+        if durations:
+            median = durations[len(durations) // 2]
+            timeline_label.setText(
+                f"Last {len(runs)} runs | {len(runs) - len(durations)} failed | "
+                f"fastest {durations[0]:.3f}s, median {median:.3f}s, slowest {slowest:.3f}s"
+            )
+        else:
+            timeline_label.setText(f"Last {len(runs)} runs | no successful runs")
@@ -13,6 +13,8 @@ from PySide6.QtWidgets import (
     QFrame,
     QListView,
     QApplication,
+    QLineEdit,
+    QTableView,
 )
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont
@@ -23,6 +25,7 @@ from ui.components import SecondaryButton
 from widgets.worksheet.code_editor import CodeEditor
 from widgets.worksheet.autocomplete import CompletionEngine
 from widgets.test_cases.test_cases_widget import TestCasesWidget
+from widgets.worksheet.query_stats import QUERY_STATS_ORDER_OPTIONS
 from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import QFrame
 
@@ -132,7 +135,6 @@ def add_tab(manager):
             conn_status_icon.setPixmap(qta.icon("fa5s.link", color="#72777a").pixmap(16, 16))
 
     db_combo_box.currentIndexChanged.connect(update_conn_status_icon)
-    db_combo_box.currentIndexChanged.connect(lambda: manager.results_manager.refresh_processes_view())
     
     QTimer.singleShot(100, update_conn_status_icon)
 
@@ -182,7 +184,8 @@ def add_tab(manager):
     editor_tabs = [
         ("Query", 120, 0),
         ("Query History", 120, 1),
-        ("Test Case", 120, 2)
+        ("Test Case", 120, 2),
+        ("Query Stats", 120, 3),
     ]
     editor_header = NavigationHeader("editorHeader", editor_tabs)
     editor_layout.addWidget(editor_header)
@@ -212,6 +215,18 @@ def add_tab(manager):
     history_list_view.setIndentation(0)
     history_list_view.setIndentation(0)
 
+    history_search_input = QLineEdit()
+    history_search_input.setObjectName("history_search_input")
+    history_search_input.setPlaceholderText("Search history...")
+    history_search_input.setClearButtonEnabled(True)
+
+    history_list_container = QWidget()
+    history_list_layout = QVBoxLayout(history_list_container)
+    history_list_layout.setContentsMargins(0, 0, 0, 0)
+    history_list_layout.setSpacing(4)
+    history_list_layout.addWidget(history_search_input)
+    history_list_layout.addWidget(history_list_view)
+
     history_details_group = QGroupBox("Query Details")
     history_details_group.setObjectName("history_details_group")
     history_details_layout = QVBoxLayout(history_details_group)
@@ -246,7 +261,7 @@ def add_tab(manager):
     history_button_layout.addStretch()
     history_details_layout.addWidget(history_action_container)
 
-    history_widget.addWidget(history_list_view)
+    history_widget.addWidget(history_list_container)
     history_widget.addWidget(history_details_group)
     history_widget.setSizes([400, 400])
     editor_stack.addWidget(history_widget)
@@ -254,6 +269,53 @@ def add_tab(manager):
     test_cases_widget = TestCasesWidget()
     editor_stack.addWidget(test_cases_widget)
 
+    query_stats_widget = QWidget()
+    query_stats_widget.setObjectName("query_stats_widget")
+    query_stats_layout = QVBoxLayout(query_stats_widget)
+    query_stats_layout.setContentsMargins(6, 6, 6, 6)
+    query_stats_layout.setSpacing(6)
+
+    query_stats_bar = QHBoxLayout()
+    query_stats_bar.addWidget(QLabel("Rank query shapes by:"))
+    query_stats_order_combo = QComboBox()
+    query_stats_order_combo.setObjectName("query_stats_order_combo")
+    for label, key in QUERY_STATS_ORDER_OPTIONS:
+        query_stats_order_combo.addItem(label, key)
+    query_stats_bar.addWidget(query_stats_order_combo)
+    refresh_query_stats_btn = SecondaryButton(qta.icon("fa5s.sync-alt", color="#555555"), "Refresh")
+    query_stats_bar.addWidget(refresh_query_stats_btn)
+    query_stats_bar.addStretch()
+    query_stats_layout.addLayout(query_stats_bar)
+
+    query_stats_view = QTableView()
+    query_stats_view.setObjectName("query_stats_view")
+    query_stats_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+    query_stats_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+    query_stats_view.setAlternatingRowColors(True)
+    query_stats_view.horizontalHeader().setStretchLastSection(True)
+    query_stats_view.verticalHeader().setVisible(False)
+
+    query_timeline_group = QGroupBox("Recent Runs of Selected Shape")
+    query_timeline_group.setObjectName("query_stats_timeline_group")
+    query_timeline_layout = QVBoxLayout(query_timeline_group)
+    query_timeline_label = QLabel("Select a query shape to see its run history.")
+    query_timeline_label.setObjectName("query_stats_timeline_label")
+    query_timeline_layout.addWidget(query_timeline_label)
+    query_timeline_view = QTableView()
+    query_timeline_view.setObjectName("query_stats_timeline_view")
+    query_timeline_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+    query_timeline_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+    query_timeline_view.horizontalHeader().setStretchLastSection(True)
+    query_timeline_view.verticalHeader().setVisible(False)
+    query_timeline_layout.addWidget(query_timeline_view)
+
+    query_stats_splitter = QSplitter(Qt.Orientation.Vertical)
+    query_stats_splitter.addWidget(query_stats_view)
+    query_stats_splitter.addWidget(query_timeline_group)
+    query_stats_splitter.setSizes([500, 300])
+    query_stats_layout.addWidget(query_stats_splitter)
+    editor_stack.addWidget(query_stats_widget)
+
     editor_layout.addWidget(editor_stack)
     editor_layout.setStretchFactor(editor_stack, 1)
     main_vertical_splitter.addWidget(editor_container)
@@ -262,6 +324,8 @@ def add_tab(manager):
         editor_stack.setCurrentIndex(index)
         if index == 1:
             manager.load_connection_history(tab_content)
+        elif index == 3:
+            manager.load_query_stats(tab_content)
 
     editor_header.tab_switched.connect(switch_editor_view)
 
@@ -294,8 +358,21 @@ def add_tab(manager):
     db_combo_box.currentIndexChanged.connect(
         lambda: editor_stack.currentIndex() == 1 and manager.load_connection_history(tab_content)
     )
+    db_combo_box.currentIndexChanged.connect(
+        lambda: editor_stack.currentIndex() == 3 and manager.load_query_stats(tab_content)
+    )
+    query_stats_order_combo.currentIndexChanged.connect(lambda: manager.load_query_stats(tab_content))
+    refresh_query_stats_btn.clicked.connect(lambda: manager.load_query_stats(tab_content))
+    query_stats_view.clicked.connect(lambda index: manager.load_query_timeline(index, tab_content))
     history_list_view.clicked.connect(lambda index: manager.display_history_details(index, tab_content))
 
+    # Debounce history search so each keystroke doesn't re-run the FTS query
+    history_search_timer = QTimer(tab_content)
+    history_search_timer.setSingleShot(True)
+    history_search_timer.setInterval(250)
+    history_search_timer.timeout.connect(lambda: manager.load_connection_history(tab_content))
+    history_search_input.textChanged.connect(lambda _text: history_search_timer.start())
+
     copy_history_btn.clicked.connect(lambda: manager.copy_history_query(tab_content))
     copy_to_edit_btn.clicked.connect(lambda: manager.copy_history_to_editor(tab_content))
     remove_history_btn.clicked.connect(lambda: manager.remove_selected_history(tab_content))
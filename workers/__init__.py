@@ -7,6 +7,12 @@ from workers.connection_workers import (
     ServiceNowTableDetailsWorker,
     SQLiteSchemaWorker,
 )
+from workers.grid_filter import RunnableGridFilter
+from workers.grid_copy import RunnableGridCopy
+from workers.column_profile import RunnableColumnProfile
+from workers.result_snapshot import ResultSnapshot, RunnableSaveSnapshot
+from workers.result_diff import RunnableResultDiff
+from workers.plan_analysis import RunnablePlanAnalysis
 from workers.signals import ProcessSignals, QuerySignals
 
 __all__ = [
@@ -20,6 +26,13 @@ __all__ = [
     "ServiceNowSchemaWorker",
     "ServiceNowTableDetailsWorker",
     "SQLiteSchemaWorker",
+    "RunnableGridFilter",
+    "RunnableGridCopy",
+    "RunnableColumnProfile",
+    "ResultSnapshot",
+    "RunnableSaveSnapshot",
+    "RunnableResultDiff",
+    "RunnablePlanAnalysis",
     "ProcessSignals",
     "QuerySignals",
 ]
@@ -0,0 +1,277 @@
+# workers/column_profile.py
+
+import collections
+import math
+import time
+
+import numpy as np
+import pandas as pd
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from workers.grid_filter import display_text
+
+# Rows folded into the profiles per step (and between cancellation checks)
+PROFILE_CHUNK_ROWS = 50_000
+# Minimum seconds between progress snapshots sent to the UI
+PROFILE_PROGRESS_INTERVAL = 0.3
+
+RESERVOIR_SIZE = 10_000
+HLL_PRECISION = 14
+HISTOGRAM_BINS = 16
+TOP_VALUES = 5
+
+_NUMERIC_KINDS = {"integer", "floating", "mixed-integer-float", "decimal"}
+_TEMPORAL_KINDS = {"datetime", "datetime64", "date", "time", "timedelta", "timedelta64"}
+
+
+class HyperLogLog:
+    """Distinct-count sketch over 64-bit hashes using ``2 ** precision`` one-byte registers."""
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add_hashes(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if not len(hashes):
+            return
+        width = 64 - self.precision
+        index = (hashes >> np.uint64(width)).astype(np.intp)
+        rest = hashes & np.uint64((1 << width) - 1)
+        # frexp's exponent is the bit length, so rank = leading zeros + 1
+        _mantissa, bit_length = np.frexp(rest.astype(np.float64))
+        rank = (width + 1 - bit_length).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / float(np.sum(np.ldexp(1.0, -self.registers.astype(np.int32))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if zeros and raw <= 2.5 * m:
+            # Linear counting is more accurate while registers are sparse
+            return int(round(m * math.log(m / zeros)))
+        return int(round(raw))
+
+
+class Reservoir:
+    """Uniform fixed-size sample of a value stream (Algorithm R, vectorized per chunk)."""
+
+    def __init__(self, size=RESERVOIR_SIZE, rng=None):
+        self.size = size
+        self.seen = 0
+        self.values = []
+        self._rng = rng or np.random.default_rng()
+
+    def add(self, values):
+        count = len(values)
+        if not count:
+            return
+        fill = min(max(self.size - len(self.values), 0), count)
+        if fill:
+            self.values.extend(values[:fill])
+        if fill < count:
+            # The item at 1-based stream position j replaces slot r ~ U[0, j) when r < size
+            positions = np.arange(self.seen + fill + 1, self.seen + count + 1, dtype=np.float64)
+            slots = (self._rng.random(count - fill) * positions).astype(np.int64)
+            for offset in np.nonzero(slots < self.size)[0]:
+                self.values[slots[offset]] = values[fill + offset]
+        self.seen += count
+
+
+def _merge_extreme(current, candidate, pick):
+    if candidate is None:
+        return current
+    if current is None:
+        return candidate
+    return pick(current, candidate)
+
+
+class ColumnProfile:
+    """Streaming statistics for one result column."""
+
+    def __init__(self, name):
+        self.name = name
+        self.kind = None
+        self.count = 0
+        self.nulls = 0
+        self.minimum = None
+        self.maximum = None
+        self.comparable = True
+        self.numeric_count = 0
+        self.numeric_total = 0.0
+        self.min_length = None
+        self.max_length = None
+        self.distinct = HyperLogLog()
+        self.sample = Reservoir()
+
+    def add(self, values):
+        series = pd.Series(values, dtype=object)
+        null_mask = series.isna()
+        self.count += len(series)
+        self.nulls += int(null_mask.sum())
+        series = series[~null_mask]
+        if series.empty:
+            return
+
+        kind = _classify(series)
+        if self.kind is None:
+            self.kind = kind
+        elif self.kind != kind:
+            self.kind = "mixed"
+
+        self.distinct.add_hashes(pd.util.hash_pandas_object(series, index=False).to_numpy())
+        self.sample.add(series.tolist())
+
+        if self.comparable:
+            try:
+                self.minimum = _merge_extreme(self.minimum, series.min(), min)
+                self.maximum = _merge_extreme(self.maximum, series.max(), max)
+            except TypeError:
+                # Values of unrelated types have no order
+                self.comparable = False
+                self.minimum = self.maximum = None
+
+        if kind == "numeric":
+            numbers = series.astype(np.float64).to_numpy()
+            numbers = numbers[np.isfinite(numbers)]
+            self.numeric_count += len(numbers)
+            self.numeric_total += float(numbers.sum())
+        elif kind == "text":
+            lengths = series.astype(str).str.len()
+            self.min_length = _merge_extreme(self.min_length, int(lengths.min()), min)
+            self.max_length = _merge_extreme(self.max_length, int(lengths.max()), max)
+
+    def summary(self):
+        """Return a plain-data snapshot of the statistics gathered so far."""
+        non_null = self.count - self.nulls
+        summary = {
+            "name": self.name,
+            "kind": self.kind or "empty",
+            "count": self.count,
+            "nulls": self.nulls,
+            "distinct": min(self.distinct.estimate(), non_null),
+            "min": self.minimum,
+            "max": self.maximum,
+            "mean": self.numeric_total / self.numeric_count if self.kind == "numeric" and self.numeric_count else None,
+            "quantiles": None,
+            "histogram": None,
+            "top_values": None,
+            "min_length": self.min_length,
+            "max_length": self.max_length,
+        }
+        sample = self.sample.values
+        if not sample:
+            return summary
+
+        if self.kind == "numeric":
+            numbers = np.asarray(sample, dtype=np.float64)
+            numbers = numbers[np.isfinite(numbers)]
+            if len(numbers):
+                summary["quantiles"] = tuple(float(q) for q in np.quantile(numbers, (0.25, 0.5, 0.75)))
+                counts, _edges = np.histogram(numbers, bins=HISTOGRAM_BINS)
+                summary["histogram"] = counts.tolist()
+        elif self.kind == "temporal":
+            try:
+                ordered = sorted(sample)
+                summary["quantiles"] = tuple(ordered[int(q * (len(ordered) - 1))] for q in (0.25, 0.5, 0.75))
+            except TypeError:
+                pass
+
+        if self.kind != "numeric":
+            # Scale sample frequencies up to the whole column
+            scale = non_null / len(sample)
+            counter = collections.Counter(display_text(value) for value in sample)
+            summary["top_values"] = [
+                (text, int(round(hits * scale))) for text, hits in counter.most_common(TOP_VALUES)
+            ]
+        return summary
+
+
+def _classify(series):
+    inferred = pd.api.types.infer_dtype(series, skipna=True)
+    if inferred in _NUMERIC_KINDS:
+        return "numeric"
+    if inferred in _TEMPORAL_KINDS:
+        return "temporal"
+    if inferred == "boolean":
+        return "boolean"
+    if inferred == "string":
+        return "text"
+    return "other"
+
+
+def profile_rows(profiles, rows, start, stop, is_cancelled=lambda: False, on_progress=None):
+    """
+    Fold ``rows[start:stop]`` into ``profiles`` chunk by chunk.
+
+    Args:
+        profiles: One ``ColumnProfile`` per result column
+        rows: Raw result rows
+        start, stop: Row range to add
+        is_cancelled: Polled between chunks; the work stops when it returns True
+        on_progress: Called with the number of rows profiled after each chunk
+
+    Returns:
+        False when cancelled, True otherwise
+    """
+    for chunk_start in range(start, stop, PROFILE_CHUNK_ROWS):
+        if is_cancelled():
+            return False
+        chunk_stop = min(chunk_start + PROFILE_CHUNK_ROWS, stop)
+        columns = list(zip(*rows[chunk_start:chunk_stop]))
+        for index, profile in enumerate(profiles):
+            profile.add(columns[index] if index < len(columns) else ())
+        if on_progress is not None:
+            on_progress(chunk_stop)
+    return True
+
+
+class ColumnProfileSignals(QObject):
+    progress = Signal(int, int, object)   # generation, rows profiled, column summaries
+    finished = Signal(int, int, object)
+    error = Signal(int, str)
+
+
+class RunnableColumnProfile(QRunnable):
+    """Profiles a result buffer on the thread pool, reporting snapshots as it goes."""
+
+    def __init__(self, generation, token, signals, rows, profiles):
+        super().__init__()
+        self.generation = generation
+        self.token = token
+        self.signals = signals
+        self.rows = rows
+        self.profiles = profiles
+
+    def run(self):
+        try:
+            last_emit = time.monotonic()
+
+            def report(done):
+                nonlocal last_emit
+                now = time.monotonic()
+                if now - last_emit >= PROFILE_PROGRESS_INTERVAL and done < len(self.rows):
+                    last_emit = now
+                    self.signals.progress.emit(
+                        self.generation, done, [profile.summary() for profile in self.profiles]
+                    )
+
+            completed = profile_rows(
+                self.profiles,
+                self.rows,
+                0,
+                len(self.rows),
+                lambda: self.token.cancelled,
+                report,
+            )
+            if not completed or self.token.cancelled:
+                return
+            self.signals.finished.emit(
+                self.generation, len(self.rows), [profile.summary() for profile in self.profiles]
+            )
+        except Exception as e:
+            try:
+                self.signals.error.emit(self.generation, str(e))
+            except RuntimeError:
+                pass
@@ -0,0 +1,280 @@
+# workers/grid_copy.py
+
+import csv
+import datetime
+import decimal
+import io
+import json
+import os
+import tempfile
+import time
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from workers.grid_filter import CANCEL_CHECK_ROWS, display_text
+
+# Text above this many characters is written to a temp file instead of the clipboard
+CLIPBOARD_TEXT_LIMIT = 32 * 1024 * 1024
+# Minimum seconds between progress reports
+COPY_PROGRESS_INTERVAL = 0.2
+
+COPY_FORMATS = {
+    "tsv": ("Tab-separated (TSV)", ".tsv"),
+    "csv": ("CSV", ".csv"),
+    "json": ("JSON", ".json"),
+    "sql": ("SQL INSERT statements", ".sql"),
+    "markdown": ("Markdown table", ".md"),
+}
+
+
+# --- Value formatting ---
+
+def _tsv_cell(value):
+    # Tabs and line breaks inside a value would shift cells in the pasted grid
+    return display_text(value).replace("\t", " ").replace("\r", " ").replace("\n", " ")
+
+
+def _csv_cell(value):
+    return "" if value is None else str(value)
+
+
+def _json_value(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, decimal.Decimal):
+        if value.is_finite() and value == value.to_integral_value():
+            return int(value)
+        # Keep values a double would round as text
+        return float(value) if value.is_finite() and len(value.as_tuple().digits) <= 15 else str(value)
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+    if isinstance(value, (list, tuple)):
+        return [_json_value(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _json_value(item) for key, item in value.items()}
+    return str(value)
+
+
+def sql_literal(value):
+    """Render ``value`` as a portable SQL literal."""
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float, decimal.Decimal)):
+        return str(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return f"X'{bytes(value).hex()}'"
+    if isinstance(value, datetime.datetime):
+        text = value.isoformat(sep=" ")
+    elif isinstance(value, (datetime.date, datetime.time)):
+        text = value.isoformat()
+    else:
+        text = str(value)
+    return "'" + text.replace("'", "''") + "'"
+
+
+def _sql_identifier(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _markdown_cell(value):
+    return display_text(value).replace("|", "\\|").replace("\r", " ").replace("\n", "<br>")
+
+
+# --- Serialization ---
+
+class _SpillingWriter:
+    """Text sink that keeps output in memory until it outgrows ``limit``, then moves it to a temp file."""
+
+    def __init__(self, limit, suffix):
+        self.limit = limit
+        self.suffix = suffix
+        self.size = 0
+        self.path = None
+        self._buffer = io.StringIO()
+        self._file = None
+
+    def write(self, text):
+        self.size += len(text)
+        if self._file is None and self.size > self.limit:
+            handle, self.path = tempfile.mkstemp(prefix="db_explorer_copy_", suffix=self.suffix)
+            self._file = os.fdopen(handle, "w", encoding="utf-8", newline="")
+            self._file.write(self._buffer.getvalue())
+            self._buffer = None
+        if self._file is not None:
+            self._file.write(text)
+        else:
+            self._buffer.write(text)
+
+    def close(self):
+        """Return ``(text, None)`` for in-memory output or ``(None, temp_path)``."""
+        if self._file is None:
+            return self._buffer.getvalue(), None
+        self._file.close()
+        return None, self.path
+
+    def discard(self):
+        if self._file is not None:
+            self._file.close()
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+def iter_copy_rows(rows, source_rows, columns, overrides=None, extra_rows=None):
+    """
+    Yield the selected cells of each source row, with unsaved edits applied.
+
+    Args:
+        rows: Raw result rows
+        source_rows: Source row numbers to emit, in output order
+        columns: Column numbers to emit, in output order
+        overrides: ``{source_row: {column: value}}`` for edited cells
+        extra_rows: ``{source_row: values}`` for rows past the raw buffer
+    """
+    overrides = overrides or {}
+    extra_rows = extra_rows or {}
+    for source_row in source_rows:
+        row = extra_rows.get(source_row)
+        if row is None:
+            row = rows[source_row] if source_row < len(rows) else ()
+        edited = overrides.get(source_row)
+        if edited:
+            yield [
+                edited[column] if column in edited else (row[column] if column < len(row) else None)
+                for column in columns
+            ]
+        else:
+            yield [row[column] if column < len(row) else None for column in columns]
+
+
+def serialize_rows(out, fmt, column_names, values_iter, table_name=None,
+                   is_cancelled=lambda: False, on_progress=None):
+    """
+    Write rows to the text sink ``out`` in ``fmt`` (a key of ``COPY_FORMATS``).
+
+    Args:
+        out: Object with a ``write(text)`` method
+        fmt: Output format
+        column_names: Header names of the emitted columns
+        values_iter: Iterable of row value lists (see ``iter_copy_rows``)
+        table_name: Target table for SQL INSERT statements
+        is_cancelled: Polled every ``CANCEL_CHECK_ROWS`` rows
+        on_progress: Called with the number of rows written so far
+
+    Returns:
+        Rows written, or None when cancelled
+    """
+    column_names = [str(name) for name in column_names]
+    csv_writer = None
+
+    if fmt == "tsv":
+        out.write("\t".join(_tsv_cell(name) for name in column_names))
+    elif fmt == "csv":
+        csv_writer = csv.writer(out, lineterminator="\n")
+        csv_writer.writerow(column_names)
+    elif fmt == "json":
+        out.write("[")
+    elif fmt == "sql":
+        insert_prefix = (
+            f"INSERT INTO {table_name or 'result'} ("
+            + ", ".join(_sql_identifier(name) for name in column_names)
+            + ") VALUES ("
+        )
+    elif fmt == "markdown":
+        out.write("| " + " | ".join(_markdown_cell(name) for name in column_names) + " |\n")
+        out.write("|" + "|".join(" --- " for _name in column_names) + "|")
+    else:
+        raise ValueError(f"Unknown copy format: {fmt}")
+
+    count = 0
+    for values in values_iter:
+        if count % CANCEL_CHECK_ROWS == 0:
+            if is_cancelled():
+                return None
+            if on_progress is not None and count:
+                on_progress(count)
+
+        if fmt == "tsv":
+            out.write("\n" + "\t".join(_tsv_cell(value) for value in values))
+        elif fmt == "csv":
+            csv_writer.writerow([_csv_cell(value) for value in values])
+        elif fmt == "json":
+            record = {name: _json_value(value) for name, value in zip(column_names, values)}
+            out.write(("\n  " if count == 0 else ",\n  ") + json.dumps(record, ensure_ascii=False, default=str))
+        elif fmt == "sql":
+            if count:
+                out.write("\n")
+            out.write(insert_prefix + ", ".join(sql_literal(value) for value in values) + ");")
+        else:
+            out.write("\n| " + " | ".join(_markdown_cell(value) for value in values) + " |")
+        count += 1
+
+    if fmt == "json":
+        out.write("\n]" if count else "]")
+    return count
+
+
+class GridCopySignals(QObject):
+    progress = Signal(int, int, int)           # generation, rows written, total rows
+    finished = Signal(int, object, object, int)  # generation, text or None, temp file path or None, rows
+    error = Signal(int, str)
+
+
+class RunnableGridCopy(QRunnable):
+    """Serializes a result-grid selection from the raw result rows on the thread pool."""
+
+    def __init__(self, generation, token, signals, rows, source_rows, columns, column_names,
+                 fmt="tsv", table_name=None, overrides=None, extra_rows=None,
+                 text_limit=CLIPBOARD_TEXT_LIMIT):
+        super().__init__()
+        self.generation = generation
+        self.token = token
+        self.signals = signals
+        self.rows = rows
+        self.source_rows = source_rows
+        self.columns = columns
+        self.column_names = column_names
+        self.fmt = fmt
+        self.table_name = table_name
+        self.overrides = overrides
+        self.extra_rows = extra_rows
+        self.text_limit = text_limit
+
+    def run(self):
+        writer = _SpillingWriter(self.text_limit, COPY_FORMATS.get(self.fmt, ("", ".txt"))[1])
+        try:
+            total = len(self.source_rows)
+            last_emit = time.monotonic()
+
+            def report(done):
+                nonlocal last_emit
+                now = time.monotonic()
+                if now - last_emit >= COPY_PROGRESS_INTERVAL:
+                    last_emit = now
+                    self.signals.progress.emit(self.generation, done, total)
+
+            count = serialize_rows(
+                writer,
+                self.fmt,
+                self.column_names,
+                iter_copy_rows(self.rows, self.source_rows, self.columns, self.overrides, self.extra_rows),
+                self.table_name,
+                lambda: self.token.cancelled,
+                report,
+            )
+            if count is None or self.token.cancelled:
+                writer.discard()
+                return
+            text, path = writer.close()
+            self.signals.finished.emit(self.generation, text, path, count)
+        except Exception as e:
+            writer.discard()
+            try:
+                self.signals.error.emit(self.generation, str(e))
+            except RuntimeError:
+                pass
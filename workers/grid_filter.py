@@ -0,0 +1,264 @@
+# workers/grid_filter.py
+
+import datetime
+import decimal
+import threading
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+# Rows processed between cancellation checks
+CANCEL_CHECK_ROWS = 4096
+
+_COMPARISON_OPS = ("!=", "<>", ">=", "<=", "=", ">", "<")
+
+
+def display_text(value):
+    """Text the result grid shows for a raw value (kept in line with display_cell_text)."""
+    return "NULL" if value is None else str(value)
+
+
+def type_sort_key(value):
+    """
+    Sort key that orders raw values by type first, then naturally.
+
+    Numbers compare numerically, temporal values chronologically and text
+    case-insensitively. NULL (and NaN) rank above everything, so ascending
+    sorts put them last and descending first, as PostgreSQL does.
+    """
+    if value is None:
+        return (9, 0)
+    if isinstance(value, (bool, int, float, decimal.Decimal)):
+        if value != value:  # NaN
+            return (9, 0)
+        return (0, value)
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return (1, value.isoformat())
+    if isinstance(value, (datetime.date, datetime.time)):
+        return (1, value.isoformat())
+    if isinstance(value, str):
+        return (2, value.casefold())
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return (3, bytes(value))
+    return (4, str(value).casefold())
+
+
+class ColumnPredicate:
+    """
+    A per-column filter parsed from a short expression.
+
+    Supported forms: ``NULL``, ``NOT NULL``, ``= x``, ``!= x``, ``<> x``,
+    ``> x``, ``>= x``, ``< x``, ``<= x``, ``!~ x`` (does not contain) and
+    plain text or ``~ x`` (contains, case-insensitive).
+    """
+
+    def __init__(self, text):
+        self.text = (text or "").strip()
+        self.op, self.operand = self._parse(self.text)
+
+    @staticmethod
+    def _parse(text):
+        upper = text.upper()
+        if upper in ("NULL", "IS NULL"):
+            return "is_null", None
+        if upper in ("NOT NULL", "IS NOT NULL"):
+            return "not_null", None
+        if text.startswith("!~"):
+            return "not_contains", text[2:].strip()
+        if text.startswith("~"):
+            return "contains", text[1:].strip()
+        for op in _COMPARISON_OPS:
+            if text.startswith(op):
+                operand = text[len(op):].strip()
+                if not operand:
+                    raise ValueError(f"Missing value after '{op}'")
+                return ("!=" if op == "<>" else op), operand
+        if not text:
+            raise ValueError("Empty column filter")
+        return "contains", text
+
+    def __call__(self, value):
+        op = self.op
+        if op == "is_null":
+            return value is None
+        if op == "not_null":
+            return value is not None
+        if op == "contains":
+            return self.operand.casefold() in display_text(value).casefold()
+        if op == "not_contains":
+            return self.operand.casefold() not in display_text(value).casefold()
+        if value is None:
+            return False
+
+        left, right = self._coerce(value, self.operand)
+        if op == "=":
+            return left == right
+        if op == "!=":
+            return left != right
+        try:
+            if op == ">":
+                return left > right
+            if op == ">=":
+                return left >= right
+            if op == "<":
+                return left < right
+            return left <= right
+        except TypeError:
+            return False
+
+    @staticmethod
+    def _coerce(value, operand):
+        if isinstance(value, bool):
+            return value, operand.strip().lower() in ("true", "t", "1", "yes", "y")
+        if isinstance(value, (int, float, decimal.Decimal)):
+            try:
+                if isinstance(value, decimal.Decimal):
+                    return value, decimal.Decimal(operand)
+                return value, float(operand)
+            except (ValueError, decimal.InvalidOperation):
+                return display_text(value).casefold(), operand.casefold()
+        if isinstance(value, (datetime.date, datetime.time)):
+            # ISO text compares chronologically, and prefixes such as '2024-05' work
+            text = value.isoformat(sep=" ") if isinstance(value, datetime.datetime) else value.isoformat()
+            return text[:len(operand)] if len(operand) < len(text) else text, operand
+        return display_text(value).casefold(), operand.casefold()
+
+    def __repr__(self):
+        return f"ColumnPredicate({self.text!r})"
+
+
+def _extend_text_cache(rows, upto, text_cache, cache_lock, is_cancelled):
+    """Grow the per-row searchable text cache to ``upto`` rows. Returns False if cancelled."""
+    while len(text_cache) < upto:
+        if is_cancelled():
+            return False
+        with cache_lock:
+            start = len(text_cache)
+            end = min(start + CANCEL_CHECK_ROWS, upto)
+            text_cache.extend(
+                "\x00".join(display_text(cell) for cell in rows[i]).casefold()
+                for i in range(start, end)
+            )
+    return True
+
+
+def compute_row_order(rows, row_count, search_text="", column_predicates=None,
+                      sort_column=-1, descending=False,
+                      text_cache=None, cache_lock=None, is_cancelled=lambda: False):
+    """
+    Filter and sort raw result rows into a list of source row numbers.
+
+    Args:
+        rows: Raw result rows (sequences of typed values)
+        row_count: Rows present in the grid; rows past ``len(rows)`` (new,
+            unsaved rows) are always kept, after the others
+        search_text: Case-insensitive substring matched against any cell
+        column_predicates: ``{column: callable(raw_value) -> bool}``
+        sort_column: Column to sort by, or -1 to keep the original order
+        descending: Sort direction
+        text_cache: List reused across calls holding per-row search text
+        cache_lock: Lock guarding ``text_cache`` growth
+        is_cancelled: Polled periodically; the work stops when it returns True
+
+    Returns:
+        List of row numbers, None when nothing is filtered or sorted, or
+        False when cancelled
+    """
+    column_predicates = column_predicates or {}
+    needle = (search_text or "").casefold()
+    if not needle and not column_predicates and sort_column < 0:
+        return None
+
+    raw_count = min(len(rows), row_count)
+
+    if needle:
+        if text_cache is None:
+            text_cache = []
+        if not _extend_text_cache(rows, raw_count, text_cache, cache_lock or threading.Lock(), is_cancelled):
+            return False
+
+    predicates = list(column_predicates.items())
+    if needle or predicates:
+        visible = []
+        for start in range(0, raw_count, CANCEL_CHECK_ROWS):
+            if is_cancelled():
+                return False
+            for i in range(start, min(start + CANCEL_CHECK_ROWS, raw_count)):
+                if needle and needle not in text_cache[i]:
+                    continue
+                row = rows[i]
+                if predicates and not all(
+                    column < len(row) and predicate(row[column]) for column, predicate in predicates
+                ):
+                    continue
+                visible.append(i)
+    else:
+        visible = list(range(raw_count))
+
+    if sort_column >= 0:
+        if is_cancelled():
+            return False
+        visible.sort(
+            key=lambda i: type_sort_key(rows[i][sort_column] if sort_column < len(rows[i]) else None),
+            reverse=descending,
+        )
+
+    visible.extend(range(raw_count, row_count))
+    return visible
+
+
+class GridFilterSignals(QObject):
+    finished = Signal(int, object)   # generation, row order (list or None)
+    error = Signal(int, str)
+
+
+class FilterToken:
+    """Cancellation flag shared between a grid and its in-flight filter job."""
+
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class RunnableGridFilter(QRunnable):
+    """Computes a result grid's row order on the thread pool."""
+
+    def __init__(self, generation, token, signals, rows, row_count, search_text,
+                 column_predicates, sort_column, descending, text_cache, cache_lock):
+        super().__init__()
+        self.generation = generation
+        self.token = token
+        self.signals = signals
+        self.rows = rows
+        self.row_count = row_count
+        self.search_text = search_text
+        self.column_predicates = column_predicates
+        self.sort_column = sort_column
+        self.descending = descending
+        self.text_cache = text_cache
+        self.cache_lock = cache_lock
+
+    def run(self):
+        try:
+            order = compute_row_order(
+                self.rows,
+                self.row_count,
+                self.search_text,
+                self.column_predicates,
+                self.sort_column,
+                self.descending,
+                self.text_cache,
+                self.cache_lock,
+                lambda: self.token.cancelled,
+            )
+            if order is False or self.token.cancelled:
+                return
+            self.signals.finished.emit(self.generation, order)
+        except Exception as e:
+            try:
+                self.signals.error.emit(self.generation, str(e))
+            except RuntimeError:
+                pass
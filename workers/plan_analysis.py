@@ -0,0 +1,373 @@
+# workers/plan_analysis.py
+
+import json
+
+import numpy as np
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+# Runs of at least this many same-shaped sibling subtrees are drawn as one group node
+PLAN_GROUP_MIN_SIBLINGS = 8
+# Plan nodes visited between cancellation checks
+PLAN_CHECK_NODES = 2_000
+# Relation names listed in a group's details before eliding the rest
+PLAN_GROUP_RELATIONS_SHOWN = 5
+
+PLAN_NODE_WIDTH = 200
+PLAN_NODE_HEIGHT = 80
+PLAN_SPACING_X = 240
+PLAN_SPACING_Y = 120
+
+
+def enrich_plan_node(node):
+    """
+    Add the derived metrics shown by pgAdmin (inclusive, exclusive, rowsx)
+    to one plan node dictionary. Children are read but not visited.
+    """
+    # 1. Inclusive Time (Actual Total Time)
+    inclusive = node.get("Actual Total Time", 0)
+    node["inclusive"] = inclusive
+
+    # 2. Exclusive Time (Inclusive - Children Inclusive)
+    children_inclusive = 0
+    for child in node.get("Plans") or []:
+        children_inclusive += child.get("Actual Total Time", 0)
+    exclusive = max(0, inclusive - children_inclusive)
+    node["exclusive"] = exclusive
+
+    # 3. Rows X (Actual / Plan)
+    plan_rows = node.get("Plan Rows", 0)
+    actual_rows = node.get("Actual Rows", 0)
+    rows_x = 0
+    if plan_rows > 0:
+        rows_x = actual_rows / plan_rows
+
+    # Determine direction
+    rows_x_direction = "none"
+    if rows_x > 1:
+        rows_x_direction = "underestimation" # Plan was lower than actual
+    elif rows_x < 1 and rows_x > 0:
+        rows_x_direction = "overestimation"
+
+    node["rowsx"] = rows_x
+    node["rowsx_direction"] = rows_x_direction
+
+    # 4. Other Aliases/Format matches
+    if "Actual Loops" in node:
+        node["loops"] = node["Actual Loops"]
+
+    node["inclusive_factor"] = 1 # Placeholder
+    node["exclusive_factor"] = 1 # Placeholder
+    node["inclusive_flag"] = 4 # Placeholder (pgAdmin enum?)
+    node["exclusive_flag"] = 4 # Placeholder
+    node["rowsx_flag"] = 2 if rows_x > 1 else 0 # Placeholder approximation
+
+
+class PlanAnalysis:
+    """
+    An EXPLAIN (FORMAT JSON) plan after enrichment.
+
+    Attributes:
+        root: Root plan node; every node carries the ``enrich_plan_node`` fields
+        total_runtime: Execution time reported by the server, or None
+        nodes: Plan nodes in pre-order; ``nodes[row - 1]`` is the node shown
+            as row number ``row`` in the Analysis tab
+        row_numbers: ``id(plan node)`` -> its row number
+        signatures: ``id(plan node)`` -> hash of the subtree's node-type shape
+        max_exclusive, max_inclusive: Largest per-node times, for the heatmap
+        node_stats: Node type -> ``{"count", "time"}`` (exclusive time)
+        relation_stats: Relation -> node type -> ``{"count", "time"}``
+    """
+
+    def __init__(self, root, total_runtime):
+        self.root = root
+        self.total_runtime = total_runtime
+        self.nodes = []
+        self.row_numbers = {}
+        self.signatures = {}
+        self.max_exclusive = 0
+        self.max_inclusive = 0
+        self.node_stats = {}
+        self.relation_stats = {}
+
+
+def analyze_plan(plan_json, is_cancelled=lambda: False):
+    """
+    Parse a plan and compute enrichment, numbering, subtree signatures and
+    statistics in a single post-order traversal.
+
+    Returns:
+        PlanAnalysis, or ``None`` if cancelled
+
+    Raises:
+        ValueError: If ``plan_json`` holds no plan
+    """
+    data = json.loads(plan_json) if isinstance(plan_json, str) else plan_json
+    if not isinstance(data, list) or not data or not isinstance(data[0], dict) or not data[0].get("Plan"):
+        raise ValueError("no plan found in EXPLAIN output")
+
+    root = data[0]["Plan"]
+    analysis = PlanAnalysis(root, data[0].get("Execution Time") or data[0].get("Total Runtime"))
+    nodes = analysis.nodes
+    row_numbers = analysis.row_numbers
+    signatures = analysis.signatures
+    node_stats = analysis.node_stats
+    relation_stats = analysis.relation_stats
+
+    # Iterative so deeply nested plans cannot hit the recursion limit
+    stack = [(root, False)]
+    while stack:
+        node, children_done = stack.pop()
+        children = node.get("Plans") or []
+        if not children_done:
+            nodes.append(node)
+            row_numbers[id(node)] = len(nodes)
+            if len(nodes) % PLAN_CHECK_NODES == 0 and is_cancelled():
+                return None
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(children))
+            continue
+
+        enrich_plan_node(node)
+        node_type = node.get("Node Type", "Unknown")
+        # The shape ignores relation names, so scans of different partitions match
+        signatures[id(node)] = hash((node_type, tuple(signatures[id(child)] for child in children)))
+
+        exclusive = node["exclusive"]
+        analysis.max_exclusive = max(analysis.max_exclusive, exclusive)
+        analysis.max_inclusive = max(analysis.max_inclusive, node["inclusive"] or 0)
+
+        stats = node_stats.setdefault(node.get("Node Type"), {"count": 0, "time": 0})
+        stats["count"] += 1
+        stats["time"] += exclusive
+
+        relation = node.get("Relation Name")
+        if relation:
+            stats = relation_stats.setdefault(relation, {}).setdefault(node.get("Node Type"), {"count": 0, "time": 0})
+            stats["count"] += 1
+            stats["time"] += exclusive
+
+    return analysis
+
+
+class PlanGroup:
+    """
+    A run of same-shaped sibling subtrees drawn as one summary node.
+
+    Attributes:
+        key: ``(parent row number, index of the first sibling)``; stays the
+            same across layouts of the same analysis
+        members: Root plan nodes of the grouped subtrees
+        node_type: Node type shared by the members
+    """
+
+    def __init__(self, key, members):
+        self.key = key
+        self.members = members
+        self.node_type = members[0].get("Node Type", "Unknown")
+
+    def summary(self):
+        """Details-panel properties: member counts and summed costs, rows and times."""
+        relations = []
+        seen = set()
+        for member in self.members:
+            relation = member.get("Relation Name")
+            if relation and relation not in seen:
+                seen.add(relation)
+                relations.append(relation)
+        relation_text = ", ".join(relations[:PLAN_GROUP_RELATIONS_SHOWN])
+        if len(relations) > PLAN_GROUP_RELATIONS_SHOWN:
+            relation_text += f", ... ({len(relations):,} relations)"
+
+        summary = {
+            "Node Type": self.node_type,
+            "Grouped Nodes": len(self.members),
+            "Total Cost": round(sum(member.get("Total Cost", 0) or 0 for member in self.members), 2),
+            "Plan Rows": sum(member.get("Plan Rows", 0) or 0 for member in self.members),
+        }
+        if relation_text:
+            summary["Relation Name"] = relation_text
+        if any("Actual Rows" in member for member in self.members):
+            summary["Actual Rows"] = sum(member.get("Actual Rows", 0) or 0 for member in self.members)
+            summary["Actual Total Time"] = round(
+                sum(member.get("Actual Total Time", 0) or 0 for member in self.members), 3
+            )
+        return summary
+
+
+class PlanLayout:
+    """
+    Positions of the drawn plan nodes, with viewport queries.
+
+    Attributes:
+        entries: Plan node dictionaries or ``PlanGroup`` objects, in pre-order
+        xs: Horizontal centre of each entry
+        ys: Top edge of each entry
+        parents: Index of each entry's parent entry, -1 for the root
+        bounds: ``(left, top, right, bottom)`` of the whole drawing
+    """
+
+    def __init__(self, entries, xs, ys, parents):
+        self.entries = entries
+        self.xs = xs
+        self.ys = ys
+        self.parents = parents
+        self._index = {id(entry): index for index, entry in enumerate(entries)}
+
+        child = parents >= 0
+        self._edge_children = np.flatnonzero(child)
+        parent_rows = parents[child]
+        self._edge_x1 = xs[parent_rows]
+        self._edge_y1 = ys[parent_rows] + PLAN_NODE_HEIGHT
+        self._edge_x2 = xs[child]
+        self._edge_y2 = ys[child]
+        self._edge_left = np.minimum(self._edge_x1, self._edge_x2)
+        self._edge_right = np.maximum(self._edge_x1, self._edge_x2)
+
+        if len(entries):
+            self.bounds = (
+                float(xs.min()) - PLAN_NODE_WIDTH / 2,
+                float(ys.min()),
+                float(xs.max()) + PLAN_NODE_WIDTH / 2,
+                float(ys.max()) + PLAN_NODE_HEIGHT,
+            )
+        else:
+            self.bounds = (0.0, 0.0, 0.0, 0.0)
+
+    def index_of(self, entry):
+        """Entry index of a drawn plan node or group, or None if it is folded into a group."""
+        return self._index.get(id(entry))
+
+    def nodes_in_rect(self, left, top, right, bottom):
+        """Indices of the entries whose box intersects the rectangle."""
+        half = PLAN_NODE_WIDTH / 2
+        mask = (
+            (self.xs + half >= left)
+            & (self.xs - half <= right)
+            & (self.ys + PLAN_NODE_HEIGHT >= top)
+            & (self.ys <= bottom)
+        )
+        return np.flatnonzero(mask)
+
+    def edges_in_rect(self, left, top, right, bottom):
+        """``(x1, y1, x2, y2)`` arrays of the parent-child connectors crossing the rectangle's bounding box."""
+        mask = (
+            (self._edge_right >= left)
+            & (self._edge_left <= right)
+            & (self._edge_y2 >= top)
+            & (self._edge_y1 <= bottom)
+        )
+        return self._edge_x1[mask], self._edge_y1[mask], self._edge_x2[mask], self._edge_y2[mask]
+
+
+def _visible_children(analysis, node, expanded_groups):
+    """A node's children with long runs of same-shaped siblings folded into ``PlanGroup`` objects."""
+    children = node.get("Plans") or []
+    if len(children) < PLAN_GROUP_MIN_SIBLINGS:
+        return children
+
+    signatures = analysis.signatures
+    parent_row = analysis.row_numbers[id(node)]
+    visible = []
+    start = 0
+    while start < len(children):
+        signature = signatures[id(children[start])]
+        end = start + 1
+        while end < len(children) and signatures[id(children[end])] == signature:
+            end += 1
+        key = (parent_row, start)
+        if end - start >= PLAN_GROUP_MIN_SIBLINGS and key not in expanded_groups:
+            visible.append(PlanGroup(key, children[start:end]))
+        else:
+            visible.extend(children[start:end])
+        start = end
+    return visible
+
+
+def layout_plan(analysis, expanded_groups=frozenset(), is_cancelled=lambda: False):
+    """
+    Place the plan's nodes top-down, leaves on consecutive slots and each
+    parent centred over its children, so subtrees never overlap.
+
+    Args:
+        analysis: PlanAnalysis of the plan
+        expanded_groups: Keys of the ``PlanGroup`` runs to draw node by node
+
+    Returns:
+        PlanLayout, or ``None`` if cancelled
+    """
+    entries = []
+    parents = []
+    depths = []
+    first_child = []
+    last_child = []
+
+    stack = [(analysis.root, -1, 0)]
+    while stack:
+        entry, parent, depth = stack.pop()
+        index = len(entries)
+        entries.append(entry)
+        parents.append(parent)
+        depths.append(depth)
+        first_child.append(-1)
+        last_child.append(-1)
+        if parent >= 0:
+            if first_child[parent] < 0:
+                first_child[parent] = index
+            last_child[parent] = index
+        if index % PLAN_CHECK_NODES == 0 and is_cancelled():
+            return None
+        if isinstance(entry, PlanGroup):
+            continue
+        children = _visible_children(analysis, entry, expanded_groups)
+        stack.extend((child, index, depth + 1) for child in reversed(children))
+
+    # Pre-order visits leaves left to right; parents come before their children,
+    # so walking the list backwards sees every child before its parent.
+    xs = np.zeros(len(entries), dtype=np.float64)
+    slot = 0
+    for index in range(len(entries)):
+        if first_child[index] < 0:
+            xs[index] = slot * PLAN_SPACING_X
+            slot += 1
+    for index in range(len(entries) - 1, -1, -1):
+        if first_child[index] >= 0:
+            xs[index] = (xs[first_child[index]] + xs[last_child[index]]) / 2
+
+    ys = np.asarray(depths, dtype=np.float64) * PLAN_SPACING_Y
+    return PlanLayout(entries, xs, ys, np.asarray(parents, dtype=np.int64))
+
+
+class PlanAnalysisSignals(QObject):
+    finished = Signal(int, object, object)  # generation, PlanAnalysis, PlanLayout
+    error = Signal(int, str)
+
+
+class RunnablePlanAnalysis(QRunnable):
+    """Analyzes and lays out an EXPLAIN plan, or only re-lays out an analyzed one, on the thread pool."""
+
+    def __init__(self, generation, token, signals, plan_json=None, analysis=None, expanded_groups=frozenset()):
+        super().__init__()
+        self.generation = generation
+        self.token = token
+        self.signals = signals
+        self.plan_json = plan_json
+        self.analysis = analysis
+        self.expanded_groups = frozenset(expanded_groups)
+
+    def run(self):
+        try:
+            is_cancelled = lambda: self.token.cancelled
+            analysis = self.analysis
+            if analysis is None:
+                analysis = analyze_plan(self.plan_json, is_cancelled)
+                if analysis is None:
+                    return
+            layout = layout_plan(analysis, self.expanded_groups, is_cancelled)
+            if layout is None or self.token.cancelled:
+                return
+            self.signals.finished.emit(self.generation, analysis, layout)
+        except Exception as e:
+            try:
+                self.signals.error.emit(self.generation, str(e))
+            except RuntimeError:
+                pass
@@ -0,0 +1,321 @@
+# workers/result_diff.py
+
+import math
+import time
+from decimal import Decimal
+
+import numpy as np
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+# Rows per hash partition; the join's hash table never holds more than about this many rows
+DIFF_PARTITION_ROWS = 250_000
+# Rows processed between cancellation checks
+DIFF_CHUNK_ROWS = 20_000
+# Minimum seconds between progress reports
+DIFF_PROGRESS_INTERVAL = 0.3
+# Differing rows kept for display; counts stay exact beyond this
+DIFF_DETAIL_LIMIT = 200_000
+
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+
+
+# Stands in for NaN in row keys: NaN never equals itself, so NaN cells would never match
+_NAN_KEY = object()
+
+
+def _freeze(value):
+    """Return ``value`` in a hashable form that compares the same way."""
+    try:
+        hash(value)
+        if isinstance(value, (float, np.floating, Decimal)) and value != value:
+            return _NAN_KEY
+        return value
+    except TypeError:
+        pass
+    if isinstance(value, dict):
+        return tuple(sorted((str(key), _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (bytearray, memoryview)):
+        return bytes(value)
+    return str(value)
+
+
+def values_equal(left, right):
+    """Cell equality for diffs: NULL matches only NULL, NaN matches NaN."""
+    if left is None or right is None:
+        return left is None and right is None
+    if left != left and right != right:
+        return True
+    try:
+        return bool(left == right)
+    except Exception:
+        return str(left) == str(right)
+
+
+class ResultDiff:
+    """
+    Outcome of comparing two result sets.
+
+    Attributes:
+        columns: Column names present on both sides, in left order; cell
+            positions in ``entries`` index this list
+        left_only_columns, right_only_columns: Columns present on one side only
+        key_columns: Columns rows were matched on; empty when rows were
+            matched on their full contents
+        added, removed, changed, unchanged: Exact row counts
+        changed_cells: Per column in ``columns``, the number of changed cells
+        duplicate_keys: Rows whose key repeated on the left side
+        entries: ``(status, left_row, right_row, changed_positions)`` for up
+            to ``DIFF_DETAIL_LIMIT`` differing rows
+        truncated: True when more rows differed than ``entries`` holds
+    """
+
+    def __init__(self, columns, left_only_columns, right_only_columns, key_columns):
+        self.columns = columns
+        self.left_only_columns = left_only_columns
+        self.right_only_columns = right_only_columns
+        self.key_columns = key_columns
+        self.added = 0
+        self.removed = 0
+        self.changed = 0
+        self.unchanged = 0
+        self.changed_cells = [0] * len(columns)
+        self.duplicate_keys = 0
+        self.entries = []
+        self.truncated = False
+
+    def _record(self, entry, detail_limit):
+        if len(self.entries) < detail_limit:
+            self.entries.append(entry)
+        else:
+            self.truncated = True
+
+    def summary_text(self):
+        parts = [
+            f"{self.added:,} added",
+            f"{self.removed:,} removed",
+            f"{self.changed:,} changed",
+            f"{self.unchanged:,} unchanged",
+        ]
+        text = ", ".join(parts)
+        if self.key_columns:
+            text += f" | matched on {', '.join(self.key_columns)}"
+        else:
+            text += " | matched on full rows"
+        if self.left_only_columns or self.right_only_columns:
+            text += (
+                f" | columns only in left: {', '.join(self.left_only_columns) or '-'}"
+                f"; only in right: {', '.join(self.right_only_columns) or '-'}"
+            )
+        if self.duplicate_keys:
+            text += f" | {self.duplicate_keys:,} duplicate key(s)"
+        return text
+
+
+def _partition_ids(rows, positions, key_positions, partitions, is_cancelled, advance):
+    """First pass: the hash partition of every row's key, as a compact array."""
+    ids = np.empty(len(rows), dtype=np.uint16)
+    for start in range(0, len(rows), DIFF_CHUNK_ROWS):
+        if is_cancelled():
+            return None
+        chunk = rows[start:start + DIFF_CHUNK_ROWS]
+        ids[start:start + len(chunk)] = [
+            hash(_row_key(row, positions, key_positions)) % partitions for row in chunk
+        ]
+        advance(len(chunk))
+    return ids
+
+
+def _project(row, positions):
+    return tuple(row[position] if position < len(row) else None for position in positions)
+
+
+def _row_key(row, positions, key_positions):
+    values = _project(row, positions)
+    if key_positions:
+        return tuple(_freeze(values[index]) for index in key_positions)
+    return tuple(_freeze(value) for value in values)
+
+
+def diff_rows(left_rows, left_columns, right_rows, right_columns, key_columns=None,
+              is_cancelled=lambda: False, on_progress=None,
+              partition_rows=DIFF_PARTITION_ROWS, detail_limit=DIFF_DETAIL_LIMIT):
+    """
+    Compare two result sets with a partitioned hash join.
+
+    Rows are matched on ``key_columns`` (columns missing on either side are
+    ignored) or, without a key, on their full contents as a multiset. When
+    the inputs are larger than ``partition_rows``, a first pass assigns every
+    row to a hash partition of its key and the join then runs one partition
+    at a time, so the hash table stays bounded whatever the row count.
+
+    Args:
+        left_rows, right_rows: Row sequences (lists of tuples or snapshot rows)
+        left_columns, right_columns: Column names of each side
+        key_columns: Column names to match rows on
+        is_cancelled: Polled between chunks; the diff stops when it returns True
+        on_progress: Called with ``(rows processed, total rows to process)``
+
+    Returns:
+        ResultDiff, or ``None`` if cancelled
+    """
+    left_columns = [str(name) for name in left_columns]
+    right_columns = [str(name) for name in right_columns]
+    right_index = {name: index for index, name in enumerate(right_columns)}
+    left_index = {name: index for index, name in enumerate(left_columns)}
+    columns = [name for name in left_columns if name in right_index]
+    left_positions = [left_index[name] for name in columns]
+    right_positions = [right_index[name] for name in columns]
+    key_columns = [name for name in (key_columns or []) if name in right_index and name in left_index]
+    key_positions = [columns.index(name) for name in key_columns]
+
+    diff = ResultDiff(
+        columns,
+        [name for name in left_columns if name not in right_index],
+        [name for name in right_columns if name not in left_index],
+        key_columns,
+    )
+
+    partitions = max(1, math.ceil(max(len(left_rows), len(right_rows)) / max(1, partition_rows)))
+    passes = 2 if partitions > 1 else 1
+    total = (len(left_rows) + len(right_rows)) * passes
+    done = 0
+    last_emit = time.monotonic()
+
+    def advance(count):
+        nonlocal done, last_emit
+        done += count
+        now = time.monotonic()
+        if on_progress is not None and now - last_emit >= DIFF_PROGRESS_INTERVAL:
+            last_emit = now
+            on_progress(done, total)
+
+    if partitions > 1:
+        left_parts = _partition_ids(left_rows, left_positions, key_positions, partitions, is_cancelled, advance)
+        if left_parts is None:
+            return None
+        right_parts = _partition_ids(right_rows, right_positions, key_positions, partitions, is_cancelled, advance)
+        if right_parts is None:
+            return None
+
+    for partition in range(partitions):
+        if partitions > 1:
+            left_members = np.flatnonzero(left_parts == partition).tolist()
+            right_members = np.flatnonzero(right_parts == partition).tolist()
+        else:
+            left_members = range(len(left_rows))
+            right_members = range(len(right_rows))
+
+        # Build: key -> left row numbers (more than one only for duplicate keys)
+        table = {}
+        for count, left_row in enumerate(left_members, 1):
+            if count % DIFF_CHUNK_ROWS == 0:
+                if is_cancelled():
+                    return None
+                advance(DIFF_CHUNK_ROWS)
+            key = _row_key(left_rows[left_row], left_positions, key_positions)
+            matches = table.get(key)
+            if matches is None:
+                table[key] = [left_row]
+            else:
+                matches.append(left_row)
+                if key_positions:
+                    diff.duplicate_keys += 1
+        advance(len(left_members) % DIFF_CHUNK_ROWS)
+        # Matches are taken from the end of each bucket; reversed, that is still first come first paired
+        for matches in table.values():
+            if len(matches) > 1:
+                matches.reverse()
+
+        # Probe
+        for count, right_row in enumerate(right_members, 1):
+            if count % DIFF_CHUNK_ROWS == 0:
+                if is_cancelled():
+                    return None
+                advance(DIFF_CHUNK_ROWS)
+            right_values = _project(right_rows[right_row], right_positions)
+            if key_positions:
+                key = tuple(_freeze(right_values[index]) for index in key_positions)
+            else:
+                key = tuple(_freeze(value) for value in right_values)
+            matches = table.get(key)
+            if not matches:
+                diff.added += 1
+                diff._record((ADDED, None, right_row, ()), detail_limit)
+                continue
+
+            left_row = matches.pop()
+            if not matches:
+                del table[key]
+            if not key_positions:
+                diff.unchanged += 1
+                continue
+
+            left_values = _project(left_rows[left_row], left_positions)
+            changed = tuple(
+                position for position in range(len(columns))
+                if not values_equal(left_values[position], right_values[position])
+            )
+            if changed:
+                diff.changed += 1
+                for position in changed:
+                    diff.changed_cells[position] += 1
+                diff._record((CHANGED, left_row, right_row, changed), detail_limit)
+            else:
+                diff.unchanged += 1
+        advance(len(right_members) % DIFF_CHUNK_ROWS)
+
+        for matches in table.values():
+            for left_row in matches:
+                diff.removed += 1
+                diff._record((REMOVED, left_row, None, ()), detail_limit)
+
+    # Left-side order first (removed/changed), then added rows in right-side order
+    diff.entries.sort(key=lambda entry: (entry[0] == ADDED, entry[1] if entry[1] is not None else entry[2]))
+    if on_progress is not None:
+        on_progress(total, total)
+    return diff
+
+
+class ResultDiffSignals(QObject):
+    progress = Signal(int, int, int)   # generation, rows processed, total rows to process
+    finished = Signal(int, object)     # generation, ResultDiff
+    error = Signal(int, str)
+
+
+class RunnableResultDiff(QRunnable):
+    """Diffs two result buffers on the thread pool."""
+
+    def __init__(self, generation, token, signals, left_rows, left_columns, right_rows, right_columns, key_columns):
+        super().__init__()
+        self.generation = generation
+        self.token = token
+        self.signals = signals
+        self.left_rows = left_rows
+        self.left_columns = left_columns
+        self.right_rows = right_rows
+        self.right_columns = right_columns
+        self.key_columns = key_columns
+
+    def run(self):
+        try:
+            diff = diff_rows(
+                self.left_rows,
+                self.left_columns,
+                self.right_rows,
+                self.right_columns,
+                self.key_columns,
+                lambda: self.token.cancelled,
+                lambda done, total: self.signals.progress.emit(self.generation, done, total),
+            )
+            if diff is None or self.token.cancelled:
+                return
+            self.signals.finished.emit(self.generation, diff)
+        except Exception as e:
+            try:
+                self.signals.error.emit(self.generation, str(e))
+            except RuntimeError:
+                pass
@@ -0,0 +1,428 @@
+# workers/result_snapshot.py
+
+import datetime
+import decimal
+import json
+import os
+import struct
+import time
+import uuid
+from collections.abc import Sequence
+
+import numpy as np
+from PySide6.QtCore import QRunnable
+
+from workers.signals import emit_process_error, emit_process_finished
+
+SNAPSHOT_EXTENSION = ".usqlsnap"
+SNAPSHOT_MAGIC = b"USQLSNAP"
+SNAPSHOT_VERSION = 1
+# Column buffers start on this boundary so numeric views are aligned
+BUFFER_ALIGNMENT = 64
+# Rows materialized per step when a snapshot is iterated
+SNAPSHOT_ITER_ROWS = 10_000
+
+_PREFIX = struct.Struct("<8sI4x")   # magic, version, padding
+_FOOTER = struct.Struct("<Q8s")     # header length, magic
+
+_FIXED_KINDS = {"bool": np.uint8, "int64": np.int64, "float64": np.float64}
+
+_NUMERIC_KINDS = frozenset({"int64", "bigint", "float64", "decimal"})
+
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+
+class SnapshotFormatError(ValueError):
+    """Raised when a file is not a readable result snapshot."""
+
+
+def snapshot_source(conn_data):
+    """Describe where a result came from, for the snapshot header."""
+    conn_data = conn_data or {}
+    return {
+        "connection": conn_data.get("short_name"),
+        "db_type": conn_data.get("code") or conn_data.get("db_type"),
+        "database": conn_data.get("database") or conn_data.get("db_path"),
+    }
+
+
+# --- Encoding ---
+
+def _column_kind(values):
+    """Pick the storage kind and decode tag for one column of Python values."""
+    kinds = set()
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            kinds.add("bool")
+        elif isinstance(value, int):
+            kinds.add("int64" if _INT64_MIN <= value <= _INT64_MAX else "bigint")
+        elif isinstance(value, float):
+            kinds.add("float64")
+        elif isinstance(value, str):
+            kinds.add("str")
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            kinds.add("bytes")
+        elif isinstance(value, decimal.Decimal):
+            kinds.add("decimal")
+        elif isinstance(value, datetime.datetime):
+            kinds.add("datetime")
+        elif isinstance(value, datetime.date):
+            kinds.add("date")
+        elif isinstance(value, datetime.time):
+            kinds.add("time")
+        elif isinstance(value, uuid.UUID):
+            kinds.add("uuid")
+        elif isinstance(value, (list, dict)):
+            kinds.add("json")
+        else:
+            kinds.add("text")
+        if len(kinds) > 1 and not kinds <= _NUMERIC_KINDS:
+            return "text"
+
+    if len(kinds) > 1:
+        return _widest_numeric_kind(kinds)
+    return kinds.pop() if kinds else "str"
+
+
+def _widest_numeric_kind(kinds):
+    """One storage kind for a column mixing numeric kinds, so it reopens as numbers."""
+    if kinds <= {"int64", "float64"}:
+        return "float64"
+    if kinds <= {"int64", "bigint"}:
+        return "bigint"
+    # Decimals, or integers beyond int64 next to floats: exact text, decoded as Decimal
+    return "decimal"
+
+
+def _encode_text(kind, value):
+    if kind == "str" or kind == "text":
+        return str(value).encode("utf-8")
+    if kind == "bytes":
+        return bytes(value)
+    if kind in ("datetime", "date", "time"):
+        return value.isoformat().encode("ascii")
+    if kind == "json":
+        return json.dumps(value, ensure_ascii=False, default=str).encode("utf-8")
+    return str(value).encode("utf-8")
+
+
+def _decode_text(kind, raw):
+    if kind == "bytes":
+        return raw
+    text = raw.decode("utf-8")
+    if kind == "bigint":
+        return int(text)
+    if kind == "decimal":
+        return decimal.Decimal(text)
+    if kind == "datetime":
+        return datetime.datetime.fromisoformat(text)
+    if kind == "date":
+        return datetime.date.fromisoformat(text)
+    if kind == "time":
+        return datetime.time.fromisoformat(text)
+    if kind == "uuid":
+        return uuid.UUID(text)
+    if kind == "json":
+        return json.loads(text)
+    return text
+
+
+def _encode_column(values, kind):
+    """Return ``{buffer name: ndarray}`` for one column."""
+    count = len(values)
+    buffers = {}
+    valid = np.fromiter((value is not None for value in values), dtype=bool, count=count)
+    has_nulls = not valid.all()
+    if has_nulls:
+        buffers["validity"] = np.packbits(valid)
+
+    if kind in _FIXED_KINDS:
+        buffers["values"] = np.fromiter(
+            (0 if value is None else value for value in values), dtype=_FIXED_KINDS[kind], count=count
+        )
+        return buffers
+
+    encoded = [b"" if value is None else _encode_text(kind, value) for value in values]
+    offsets = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=count), out=offsets[1:])
+    buffers["offsets"] = offsets
+    buffers["data"] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return buffers
+
+
+def _write_padding(handle):
+    remainder = handle.tell() % BUFFER_ALIGNMENT
+    if remainder:
+        handle.write(b"\x00" * (BUFFER_ALIGNMENT - remainder))
+
+
+def write_result_snapshot(path, rows, columns, column_specs=None, query="", source=None,
+                          is_cancelled=None, on_progress=None):
+    """
+    Write ``rows`` to ``path`` as a typed, column-major result snapshot.
+
+    Each column is written as raw NumPy buffers -- fixed-width values for
+    booleans, 64-bit integers and floats; UTF-8 offsets plus data for
+    everything else, with a tag that restores dates, decimals, UUIDs,
+    bytes and JSON on read -- and an optional validity bitmap. A JSON
+    header at the end of the file records the buffer layout, the column
+    names and specs, and the query text. The file is written next to
+    ``path`` and moved into place when complete.
+
+    Returns:
+        int | None: Rows written, or ``None`` if cancelled
+    """
+    columns = [str(name) for name in columns]
+    row_count = len(rows)
+    layouts = []
+    temp_path = f"{path}.partial"
+
+    try:
+        with open(temp_path, "wb") as handle:
+            handle.write(_PREFIX.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION))
+            for index in range(len(columns)):
+                if is_cancelled and is_cancelled():
+                    return None
+                values = [row[index] if index < len(row) else None for row in rows]
+                kind = _column_kind(values)
+                buffers = {}
+                for name, array in _encode_column(values, kind).items():
+                    _write_padding(handle)
+                    buffers[name] = [handle.tell(), int(array.nbytes)]
+                    handle.write(array.tobytes())
+                layouts.append({"kind": kind, "buffers": buffers})
+                del values
+                if on_progress:
+                    on_progress(index + 1, len(columns))
+
+            header = json.dumps(
+                {
+                    "version": SNAPSHOT_VERSION,
+                    "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+                    "query": query or "",
+                    "source": source or {},
+                    "row_count": row_count,
+                    "columns": columns,
+                    "column_specs": list(column_specs or []),
+                    "layouts": layouts,
+                },
+                default=str,
+            ).encode("utf-8")
+            handle.write(header)
+            handle.write(_FOOTER.pack(len(header), SNAPSHOT_MAGIC))
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return row_count
+
+
+# --- Reading ---
+
+class SnapshotColumn:
+    """Lazy, memory-mapped view of one snapshot column."""
+
+    def __init__(self, mapped, layout, row_count):
+        self.kind = layout["kind"]
+        self.row_count = row_count
+        self.released = False
+        buffers = layout["buffers"]
+
+        def view(name, dtype):
+            if name not in buffers:
+                return None
+            offset, nbytes = buffers[name]
+            return mapped[offset:offset + nbytes].view(dtype)
+
+        self.validity = view("validity", np.uint8)
+        if self.kind in _FIXED_KINDS:
+            self.values = view("values", _FIXED_KINDS[self.kind])
+            self.offsets = self.data = None
+        else:
+            self.values = None
+            self.offsets = view("offsets", np.int64)
+            self.data = view("data", np.uint8)
+
+    def release(self):
+        """Drop the views into the mapped file; every value reads as None afterwards."""
+        self.validity = self.values = self.offsets = self.data = None
+        self.released = True
+
+    def is_null(self, row):
+        if self.released:
+            return True
+        if self.validity is None:
+            return False
+        return not (int(self.validity[row >> 3]) >> (7 - (row & 7))) & 1
+
+    def value(self, row):
+        if self.is_null(row):
+            return None
+        if self.values is not None:
+            value = self.values[row].item()
+            return bool(value) if self.kind == "bool" else value
+        start, end = int(self.offsets[row]), int(self.offsets[row + 1])
+        return _decode_text(self.kind, self.data[start:end].tobytes())
+
+    def slice(self, start, stop):
+        """Return the Python values of rows ``start:stop``."""
+        if self.released:
+            return [None] * max(0, stop - start)
+        valid = None
+        if self.validity is not None:
+            first_byte = start >> 3
+            bits = np.unpackbits(self.validity[first_byte:(stop + 7) >> 3])
+            valid = bits[start - (first_byte << 3):stop - (first_byte << 3)].tolist()
+
+        if self.values is not None:
+            values = self.values[start:stop].tolist()
+            if self.kind == "bool":
+                values = [bool(value) for value in values]
+            if valid is not None:
+                values = [value if is_valid else None for value, is_valid in zip(values, valid)]
+            return values
+
+        offsets = self.offsets[start:stop + 1].tolist()
+        base = offsets[0]
+        chunk = self.data[base:offsets[-1]].tobytes()
+        return [
+            _decode_text(self.kind, chunk[offsets[i] - base:offsets[i + 1] - base])
+            if valid is None or valid[i] else None
+            for i in range(len(offsets) - 1)
+        ]
+
+
+class SnapshotRows(Sequence):
+    """Read-only row sequence over a snapshot; rows are built from the columns on access."""
+
+    def __init__(self, snapshot_columns, row_count):
+        self._columns = snapshot_columns
+        self._row_count = row_count
+
+    def __len__(self):
+        return self._row_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._row_count)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            if stop <= start:
+                return []
+            return list(zip(*(column.slice(start, stop) for column in self._columns)))
+        if index < 0:
+            index += self._row_count
+        if not 0 <= index < self._row_count:
+            raise IndexError("snapshot row index out of range")
+        return tuple(column.value(index) for column in self._columns)
+
+    def __iter__(self):
+        for start in range(0, self._row_count, SNAPSHOT_ITER_ROWS):
+            yield from self[start:start + SNAPSHOT_ITER_ROWS]
+
+
+class ResultSnapshot:
+    """
+    A result snapshot opened for reading.
+
+    The file is memory-mapped and only the header is parsed up front; cell
+    values are decoded from the mapped column buffers when they are read,
+    so opening is independent of the row count.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            self._mapped = np.memmap(path, dtype=np.uint8, mode="r")
+        except (OSError, ValueError) as e:
+            raise SnapshotFormatError(f"Cannot open snapshot: {e}") from e
+
+        try:
+            self._read_header()
+        except SnapshotFormatError:
+            self.close()
+            raise
+
+    def _read_header(self):
+        size = len(self._mapped)
+        if size < _PREFIX.size + _FOOTER.size:
+            raise SnapshotFormatError("File is too small to be a result snapshot.")
+        magic, version = _PREFIX.unpack(self._mapped[:_PREFIX.size].tobytes())
+        header_length, end_magic = _FOOTER.unpack(self._mapped[size - _FOOTER.size:].tobytes())
+        if magic != SNAPSHOT_MAGIC or end_magic != SNAPSHOT_MAGIC:
+            raise SnapshotFormatError("Not a result snapshot file.")
+        if version > SNAPSHOT_VERSION:
+            raise SnapshotFormatError(f"Snapshot version {version} is newer than this application supports.")
+
+        header_start = size - _FOOTER.size - header_length
+        try:
+            header = json.loads(self._mapped[header_start:size - _FOOTER.size].tobytes().decode("utf-8"))
+        except ValueError as e:
+            raise SnapshotFormatError(f"Snapshot header is damaged: {e}") from e
+
+        try:
+            self.query = header.get("query") or ""
+            self.source = header.get("source") or {}
+            self.created_at = header.get("created_at") or ""
+            self.row_count = int(header.get("row_count") or 0)
+            self.columns = list(header.get("columns") or [])
+            self.column_specs = list(header.get("column_specs") or [])
+            self._columns = [
+                SnapshotColumn(self._mapped, layout, self.row_count) for layout in header.get("layouts") or []
+            ]
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise SnapshotFormatError(f"Snapshot header is damaged: {e!r}") from e
+        if len(self._columns) != len(self.columns):
+            raise SnapshotFormatError("Snapshot header does not match its columns.")
+        self.rows = SnapshotRows(self._columns, self.row_count)
+
+    def value(self, row, column):
+        return self._columns[column].value(row)
+
+    def close(self):
+        """Unmap the file so it can be overwritten or deleted (Windows locks mapped files).
+
+        Rows read after closing are all NULL; callers close a snapshot once
+        its grid is gone.
+        """
+        mapped, self._mapped = self._mapped, None
+        if mapped is None:
+            return
+        for column in getattr(self, "_columns", []):
+            column.release()
+        mmap_handle = getattr(mapped, "_mmap", None)
+        del mapped
+        if mmap_handle is not None:
+            try:
+                mmap_handle.close()
+            except BufferError:
+                pass  # a worker still holds a slice; the mapping goes when it does
+
+
+class RunnableSaveSnapshot(QRunnable):
+    """Writes a result snapshot on the thread pool, reporting through the process tracker."""
+
+    def __init__(self, process_id, path, rows, columns, column_specs, query, source, signals):
+        super().__init__()
+        self.process_id = process_id
+        self.path = path
+        self.rows = rows
+        self.columns = columns
+        self.column_specs = column_specs
+        self.query = query
+        self.source = source
+        self.signals = signals
+
+    def run(self):
+        start_time = time.time()
+        try:
+            row_count = write_result_snapshot(
+                self.path, self.rows, self.columns, self.column_specs, self.query, self.source
+            )
+            msg = f"Saved {row_count} rows to {os.path.basename(self.path)}"
+            emit_process_finished(self.signals, self.process_id, msg, time.time() - start_time, row_count)
+        except Exception as e:
+            emit_process_error(self.signals, self.process_id, str(e))
@@ -2,13 +2,16 @@
 
 from PySide6.QtCore import QObject, Signal
 
+from db.query_info import analyze_query
+
 class ProcessSignals(QObject):
     started = Signal(object, object)
     finished = Signal(object, object, object, object)
     error = Signal(object, object)
       
 class QuerySignals(QObject):
-    finished = Signal(object, object, object, object, object, object, object, object)
+    # conn_data, query, results, columns, column_specs, row_count, elapsed_time, is_select_query, query_info
+    finished = Signal(object, object, object, object, object, object, object, object, object)
 
     error = Signal(object, object, object, object, object)  
 
@@ -122,23 +125,26 @@ def emit_process_error(signals, process_id, error_message):
         pass
 
 
-def emit_query_finished(signals, conn_data, query, results, columns, column_specs, row_count, elapsed_time, is_select_query):
+def emit_query_finished(signals, conn_data, query, results, columns, column_specs, row_count, elapsed_time, is_select_query, query_info=None):
+    # Classified once here, on the worker thread; the UI reuses it from the payload
+    if query_info is None:
+        query_info = analyze_query(_as_str(query))
+    kinds = query_info.statement_kinds
+
     # Track explicit or implicit commits for worksheet activity
-    q_upper = str(query).upper().strip()
-    
     # 1. Transactions
-    if "ROLLBACK" in q_upper:
+    if "ROLLBACK" in kinds:
         tracker.add_rollback()
-    elif "COMMIT" in q_upper or not is_select_query:
+    elif "COMMIT" in kinds or "END" in kinds or not is_select_query:
         tracker.add_commit()
 
     # 2. Tuples
     rc = int(row_count or 0)
-    if q_upper.startswith("INSERT"):
+    if query_info.kind == "INSERT":
         tracker.add_tuples(ins=rc)
-    elif q_upper.startswith("UPDATE"):
+    elif query_info.kind == "UPDATE":
         tracker.add_tuples(upd=rc)
-    elif q_upper.startswith("DELETE"):
+    elif query_info.kind == "DELETE":
         tracker.add_tuples(delt=rc)
     elif is_select_query:
         # Returned = total rows matched, Fetched = total rows sent to UI
@@ -160,6 +166,7 @@ def emit_query_finished(signals, conn_data, query, results, columns, column_spec
             _as_int(row_count),
             _as_float(elapsed_time),
             _as_bool(is_select_query),
+            query_info,
         )
     except RuntimeError:
         pass
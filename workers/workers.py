@@ -5,10 +5,10 @@ import multiprocessing as mp
 import pandas as pd
 import re
 import shutil
-import sqlparse
 # import cdata.csv as mod # Removed direct import, use db.create_csv_connection instead
 from PySide6.QtCore import QRunnable, Qt
 import db
+from db.query_info import analyze_query
 from db.result_metadata import resolve_column_specs
 from workers.signals import (
     emit_process_error,
@@ -448,9 +448,8 @@ class RunnableQuery(QRunnable):
                 
                 cursor = self._conn.cursor()
                 
-                # Use sqlparse for much more reliable query splitting
-                statements = sqlparse.split(self.query)
-                
+                statements = analyze_query(self.query).statements()
+
                 if not statements:
                     statements = [self.query]
 
@@ -467,6 +466,8 @@ class RunnableQuery(QRunnable):
                     raise ConnectionError("Failed to connect to PostgreSQL database")
                 cursor = self._conn.cursor()
                 cursor.execute(self.query)
+                if analyze_query(self.query).changes_schema:
+                    db.invalidate_pg_catalog_cache(self.conn_data)
             elif code in ("ORACLE", "ORACLE_DB"):
                 self._conn = db.get_pooled_oracle_connection(conn_data=self.conn_data)
                 if not self._conn:
@@ -607,6 +608,8 @@ class RunnableTransactionQuery(QRunnable):
                 cursor.execute(oracle_query)
             else:
                 cursor.execute(self._query)
+                if code == "POSTGRES" and analyze_query(self._query).changes_schema:
+                    db.invalidate_pg_catalog_cache(self._conn_data)
 
             if self._is_cancelled:
                 return